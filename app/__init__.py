@@ -1,10 +1,13 @@
 import logging
+import click
 from flask import Flask
 from flask_wtf.csrf import CSRFProtect
 from app.models.database import init_db, close_db, get_active_baby_id
 from app.models.models import BabyInfo
 from app.i18n import _, get_language
 from app.template_filters import register_template_filters
+from app.profiler import get_profiler, is_enabled_by_env
+from app.maintenance import start_maintenance
 
 csrf = CSRFProtect()
 
@@ -54,7 +57,7 @@ def create_app():
         }
     
     # Routes registrieren
-    from app.routes import main, sleep, feeding, bottle, porridge, diaper, temperature, medicine, illness, edit, trends, entries, settings, i18n, weight, height, head, baby
+    from app.routes import main, sleep, feeding, bottle, porridge, diaper, temperature, medicine, illness, edit, trends, entries, settings, i18n, weight, height, head, baby, profiler, api
     app.register_blueprint(main.bp)
     app.register_blueprint(baby.bp)
     app.register_blueprint(sleep.bp)
@@ -73,6 +76,41 @@ def create_app():
     app.register_blueprint(weight.bp)
     app.register_blueprint(height.bp)
     app.register_blueprint(head.bp)
+    app.register_blueprint(api.bp)
+    # Profiler-Endpunkte nur bei aktiviertem Profiler; sie werden per curl/Skript
+    # mit PROFILER_TOKEN bedient (Header statt CSRF-Formulartoken)
+    if is_enabled_by_env():
+        app.register_blueprint(profiler.bp)
+        csrf.exempt(profiler.bp)
+
+    @app.cli.command('rebuild-sleep-model')
+    def rebuild_sleep_model():
+        """Baut das Nachtschlaf-Modell aller Kinder aus der Historie neu auf."""
+        from app.models.night_sleep_model import NightSleepModel
+        count = NightSleepModel.rebuild_all()
+        print(f'Nachtschlaf-Modell für {count} Kind(er) neu aufgebaut')
+
+    @app.cli.command('check-integrity')
+    @click.option('--fix', is_flag=True, help='Eindeutige Fehler in einer Transaktion reparieren')
+    def check_integrity(fix):
+        """Prüft die Historie aller Kinder auf Überschneidungen und ungültige Einträge."""
+        from app.integrity import scan_integrity
+        report = scan_integrity(fix=fix)
+        print(f'{report.rows_scanned} Zeilen geprüft, {report.total} Auffälligkeit(en)')
+        for check, count in report.counts.items():
+            if count:
+                print(f'  {check}: {count}')
+        if fix:
+            print(f'{report.fixed} Reparatur(en) angewendet')
+        elif report.fixes:
+            print(f'{len(report.fixes)} davon automatisch reparierbar (--fix)')
+
+    # Abgelaufene Cache-Zeilen beim Start und danach periodisch aufräumen
+    start_maintenance(app)
+
+    # Stichproben-Profiler optional direkt beim Start aktivieren
+    if is_enabled_by_env():
+        get_profiler().start()
     
     return app
 
@@ -0,0 +1,56 @@
+"""Downsampling von Zeitreihen für Charts (Largest-Triangle-Three-Buckets).
+
+Über mehrere Jahre hat ein Verlauf schnell tausende Punkte - mehr, als ein
+Chart sinnvoll darstellen kann. lttb() wählt eine Teilmenge mit höchstens
+`threshold` Punkten, die die Form der Kurve erhält: erster und letzter Punkt
+bleiben, dazwischen wird die Reihe in gleich große Buckets geteilt und pro
+Bucket der Punkt gewählt, der mit dem zuvor gewählten Punkt und dem
+Mittelwert des nächsten Buckets das größte Dreieck bildet. Spitzen (z.B. ein
+Fieberschub) bleiben damit sichtbar, anders als bei Mittelwerten oder jedem
+n-ten Punkt.
+
+Steinarsson, "Downsampling Time Series for Visual Representation" (2013).
+"""
+
+
+def lttb(points, threshold, x=lambda p: p[0], y=lambda p: p[1]):
+    """Reduziert nach x sortierte Punkte auf höchstens `threshold` Punkte.
+
+    points: Sequenz beliebiger Objekte; x/y liefern die Koordinaten als Zahl.
+    Zurückgegeben werden die ausgewählten Originalobjekte in ihrer Reihenfolge.
+    """
+    count = len(points)
+    if threshold >= count or count <= 2:
+        return list(points)
+    if threshold < 3:
+        return [points[0], points[-1]]
+
+    xs = [float(x(p)) for p in points]
+    ys = [float(y(p)) for p in points]
+    every = (count - 2) / (threshold - 2)
+
+    sampled = [points[0]]
+    selected = 0
+    for bucket in range(threshold - 2):
+        # Mittelwert des nächsten Buckets (beim letzten: der Endpunkt)
+        next_start = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, count)
+        if next_start >= next_end:
+            next_start, next_end = count - 1, count
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        ax, ay = xs[selected], ys[selected]
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((ax - avg_x) * (ys[i] - ay) - (ax - xs[i]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = i, area
+        sampled.append(points[best])
+        selected = best
+
+    sampled.append(points[-1])
+    return sampled
@@ -0,0 +1,10 @@
+"""Lesen von Konfigurationswerten aus Umgebungsvariablen."""
+import os
+
+
+def env_int(name, default, minimum):
+    """Ganzzahl aus der Umgebung, mindestens `minimum`; ungültige Werte ergeben `default`."""
+    try:
+        return max(minimum, int(os.environ.get(name, default)))
+    except (TypeError, ValueError):
+        return default
@@ -1,7 +1,9 @@
 """Hilfen für Zeiten aus HTML-Formularen (datetime-local vs. ISO mit Offset)."""
 from datetime import datetime
 
-from app.timezone import tz_berlin as TZ_BERLIN
+from app.i18n import _
+from app.timezone import tz_berlin as TZ_BERLIN, to_berlin
+from app.timestamps import parse_timestamp
 
 
 def normalize_form_datetime(value):
@@ -38,6 +40,14 @@ def is_end_before_start(start_time, end_time):
     """
     if not start_time or not end_time:
         return False
-    start_dt = datetime.fromisoformat(str(start_time).replace('Z', '+00:00'))
-    end_dt = datetime.fromisoformat(str(end_time).replace('Z', '+00:00'))
-    return end_dt <= start_dt
+    return to_berlin(end_time) <= to_berlin(start_time)
+
+
+def describe_overlap(error):
+    """Flash-Text für eine OverlapError: nennt den kollidierenden Eintrag (TT.MM. HH:MM)."""
+    def fmt(value):
+        dt = parse_timestamp(value)
+        return dt.strftime('%d.%m. %H:%M') if dt else '…'
+
+    return _('messages.error.entry_overlap',
+             start=fmt(error.conflict['start_time']), end=fmt(error.conflict['end_time']))
@@ -0,0 +1,272 @@
+"""Datenprüfung über die gesamte Historie aller Kinder.
+
+Die Überschneidungsprüfung beim Schreiben (user-037) schützt nur neue
+Einträge; Altbestände, Importe und Backups können weiterhin widersprüchliche
+Daten enthalten. scan_integrity() prüft deshalb jede Tracking-Tabelle in
+einem Durchlauf und meldet:
+
+    unparseable_timestamp  Zeitstempel, die parse_timestamp() nicht versteht
+    negative_duration      Ende vor oder gleich Beginn
+    absurd_duration        Dauer über MAX_DURATION_HOURS (z.B. Nickerchen > 8 h)
+    orphaned_baby_id       baby_id ohne Zeile in baby_info
+    overlapping_sleep      Schlaf-Einträge eines Kindes, die sich überschneiden
+    overlapping_waking     dasselbe für nächtliches Aufwachen
+    waking_outside_night   Aufwachen, das in keinem Nachtschlaf liegt
+
+Schlaf und Aufwachen werden als Sweep über nach (baby_id, start_time)
+sortierte Cursor gelesen (Indizes aus 023/025): pro Kind wird nur der Eintrag
+mit dem bisher spätesten Ende gehalten, Aufwachen und Nachtschlaf laufen als
+zwei Cursor im Gleichschritt. Zeilen werden gestreamt statt mit fetchall()
+geladen; der Speicherbedarf hängt von der Zahl der Funde ab, nicht von der
+Größe der Tabellen (Beispiele pro Prüfung sind auf MAX_EXAMPLES begrenzt).
+
+Für eindeutige Fälle wird eine Reparatur vorgemerkt und mit fix=True in einer
+Transaktion angewendet: vertauschter Tag bei negativer Dauer (Ende + 1 Tag
+ist plausibel), exakte Duplikate löschen, teilweise überlappenden Vorgänger
+am Beginn des Nachfolgers kürzen. Liegt ein Eintrag vollständig in einem
+anderen (Nickerchen mitten in der Nacht), wird nur gemeldet: Kürzen würde
+den Rest des äußeren Eintrags löschen. Alles andere wird ebenfalls nur
+gemeldet.
+
+CLI: ``flask check-integrity [--fix]``, Endpunkte unter /settings/integrity.
+"""
+from datetime import timedelta
+
+from app.models.database import get_db
+from app.timezone import normalize_to_berlin
+from app.timestamps import parse_timestamp
+
+# Obergrenzen für plausible Dauern in Stunden
+MAX_DURATION_HOURS = {
+    'nap': 8,
+    'night': 18,
+    'night_waking': 4,
+    'feeding': 3,
+    'illness': 24 * 90,
+}
+
+# Beispiele pro Prüfung im Bericht (gezählt wird immer vollständig)
+MAX_EXAMPLES = 50
+
+# Tabelle -> (Beginn-Spalte, End-Spalte oder None)
+TIMESTAMP_COLUMNS = {
+    'sleep': ('start_time', 'end_time'),
+    'night_waking': ('start_time', 'end_time'),
+    'illness': ('start_time', 'end_time'),
+    'feeding': ('timestamp', 'end_time'),
+    'bottle': ('timestamp', None),
+    'porridge': ('timestamp', None),
+    'diaper': ('timestamp', None),
+    'temperature': ('timestamp', None),
+    'medicine': ('timestamp', None),
+    'weight': ('timestamp', None),
+    'height': ('timestamp', None),
+    'head_circumference': ('timestamp', None),
+}
+
+CHECKS = ('unparseable_timestamp', 'negative_duration', 'absurd_duration', 'orphaned_baby_id',
+          'overlapping_sleep', 'overlapping_waking', 'waking_outside_night')
+
+
+class IntegrityReport:
+    """Sammelt Funde (Anzahl + begrenzte Beispiele) und vorgemerkte Reparaturen."""
+
+    def __init__(self):
+        self.counts = {check: 0 for check in CHECKS}
+        self.examples = {check: [] for check in CHECKS}
+        self.fixes = []
+        self.fixed = 0
+        self.rows_scanned = 0
+
+    def add(self, check, table, row_id, baby_id, detail, fix=None):
+        self.counts[check] += 1
+        if len(self.examples[check]) < MAX_EXAMPLES:
+            self.examples[check].append({'table': table, 'id': row_id, 'baby_id': baby_id, 'detail': detail})
+        if fix is not None:
+            self.fixes.append(fix)
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def as_dict(self):
+        return {
+            'rows_scanned': self.rows_scanned,
+            'total': self.total,
+            'fixable': len(self.fixes),
+            'fixed': self.fixed,
+            'checks': {check: {'count': self.counts[check], 'examples': self.examples[check]}
+                       for check in CHECKS},
+        }
+
+
+def _next_day(dt):
+    """Gleiche Wanduhrzeit am Folgetag (über Zeitumstellungen hinweg)."""
+    return normalize_to_berlin(dt.replace(tzinfo=None) + timedelta(days=1)).isoformat()
+
+
+def _check_row(report, table, row, start_col, end_col, baby_ids):
+    """Zeitstempel, Dauer und baby_id einer Zeile; liefert (start, end) als datetime oder None."""
+    row_id, baby_id = row['id'], row['baby_id']
+    if baby_id not in baby_ids:
+        report.add('orphaned_baby_id', table, row_id, baby_id, f'baby_id {baby_id} existiert nicht')
+
+    start = parse_timestamp(row[start_col])
+    end = parse_timestamp(row[end_col]) if end_col and row[end_col] else None
+    if start is None or (end_col and row[end_col] and end is None):
+        bad = row[start_col] if start is None else row[end_col]
+        report.add('unparseable_timestamp', table, row_id, baby_id, f'{bad!r}')
+        return None
+    if end is None:
+        return start, None
+
+    limit_key = row['type'] if table == 'sleep' else table
+    max_hours = MAX_DURATION_HOURS.get(limit_key)
+    hours = (end - start).total_seconds() / 3600
+    if hours <= 0:
+        fix = None
+        shifted_hours = hours + 24
+        if max_hours is not None and 0 < shifted_hours <= max_hours:
+            fix = (f'UPDATE {table} SET {end_col} = ? WHERE id = ?', (_next_day(end), row_id))
+        report.add('negative_duration', table, row_id, baby_id,
+                   f'{row[start_col]} - {row[end_col]}', fix)
+    elif max_hours is not None and hours > max_hours:
+        report.add('absurd_duration', table, row_id, baby_id,
+                   f'{hours:.1f} h ({row[start_col]} - {row[end_col]})')
+    return start, end
+
+
+def _sweep_overlaps(report, table, check, rows, baby_ids):
+    """Sweep über nach (baby_id, start_time) sortierte Zeilen; hält pro Kind nur das späteste Ende."""
+    current_baby = None
+    reach = None  # (start, end, row) des bisher am längsten reichenden Eintrags
+    trimmed = set()  # ein Eintrag wird nur auf den Beginn seines ersten Überlappers gekürzt
+    for row in rows:
+        report.rows_scanned += 1
+        parsed = _check_row(report, table, row, 'start_time', 'end_time', baby_ids)
+        if row['baby_id'] != current_baby:
+            current_baby, reach = row['baby_id'], None
+        if parsed is None:
+            continue
+        start, end = parsed
+        if end is not None and end <= start:
+            continue
+
+        # Symmetrischer Test: in der doppelten Herbst-Stunde weicht die
+        # String-Sortierung von der echten Reihenfolge ab
+        if reach is not None and start < reach[1] and (end is None or reach[0] < end):
+            other = reach[2]
+            fix = None
+            relation = 'überschneidet'
+            if end is not None and reach[0] == start and reach[1] == end:
+                fix = (f'DELETE FROM {table} WHERE id = ?', (row['id'],))
+            elif end is not None and end <= reach[1]:
+                # Vollständig enthalten: Kürzen würde den Rest des äußeren
+                # Eintrags verwerfen, welcher Eintrag stimmt ist offen
+                relation = 'liegt vollständig in'
+            elif end is not None and reach[0] < start and other['id'] not in trimmed:
+                trimmed.add(other['id'])
+                fix = (f'UPDATE {table} SET end_time = ? WHERE id = ?', (row['start_time'], other['id']))
+            report.add(check, table, row['id'], row['baby_id'],
+                       f"{relation} Eintrag {other['id']} ({other['start_time']} - {other['end_time']})", fix)
+        if end is not None and (reach is None or end > reach[1]):
+            reach = (start, end, row)
+
+
+def _scan_sleep(db, report, baby_ids):
+    rows = db.execute('SELECT id, baby_id, type, start_time, end_time FROM sleep ORDER BY baby_id, start_time')
+    _sweep_overlaps(report, 'sleep', 'overlapping_sleep', rows, baby_ids)
+
+
+def _scan_night_waking(db, report, baby_ids):
+    """Überschneidungen unter Aufwachen plus Merge-Join gegen die Nachtschläfe (zwei Cursor).
+
+    INDEXED BY: sonst wählt der Planer den type-Index und sortiert alle Nächte vorab.
+    """
+    nights = db.execute(
+        '''SELECT baby_id, start_time, end_time FROM sleep INDEXED BY idx_sleep_baby_start
+           WHERE type = 'night' ORDER BY baby_id, start_time'''
+    )
+    state = {'next': None, 'candidate': None}
+
+    def advance(baby_id, start):
+        """Letzter Nachtschlaf mit (baby_id, Beginn) <= (baby_id, start)."""
+        while True:
+            if state['next'] is None:
+                row = nights.fetchone()
+                if row is None:
+                    break
+                night_start = parse_timestamp(row['start_time'])
+                if night_start is None:
+                    continue
+                night_end = parse_timestamp(row['end_time']) if row['end_time'] else None
+                state['next'] = (row['baby_id'], night_start, night_end)
+            night = state['next']
+            if (night[0], night[1]) > (baby_id, start):
+                break
+            state['candidate'], state['next'] = night, None
+        candidate = state['candidate']
+        return candidate if candidate is not None and candidate[0] == baby_id else None
+
+    def wakings():
+        for row in db.execute(
+            'SELECT id, baby_id, start_time, end_time FROM night_waking ORDER BY baby_id, start_time'
+        ):
+            start = parse_timestamp(row['start_time'])
+            end = parse_timestamp(row['end_time']) if row['end_time'] else None
+            if start is not None and not (row['end_time'] and end is None):
+                night = advance(row['baby_id'], start)
+                inside = (night is not None and night[1] <= start
+                          and (night[2] is None or (end or start) <= night[2]))
+                if not inside:
+                    report.add('waking_outside_night', 'night_waking', row['id'], row['baby_id'],
+                               f"{row['start_time']} - {row['end_time']}")
+            yield row
+
+    _sweep_overlaps(report, 'night_waking', 'overlapping_waking', wakings(), baby_ids)
+
+
+def _scan_plain(db, report, table, baby_ids):
+    start_col, end_col = TIMESTAMP_COLUMNS[table]
+    columns = ', '.join(col for col in ('id', 'baby_id', start_col, end_col) if col)
+    for row in db.execute(f'SELECT {columns} FROM {table}'):
+        report.rows_scanned += 1
+        _check_row(report, table, row, start_col, end_col, baby_ids)
+
+
+def apply_fixes(db, report):
+    """Wendet alle vorgemerkten Reparaturen in einer Transaktion an (alles oder nichts)."""
+    with db:
+        for sql, params in report.fixes:
+            db.execute(sql, params)
+    report.fixed = len(report.fixes)
+    return report.fixed
+
+
+def scan_integrity(fix=False):
+    """Prüft alle Tracking-Tabellen aller Kinder (App-Kontext nötig); liefert einen IntegrityReport."""
+    db = get_db()
+    report = IntegrityReport()
+    baby_ids = {row['id'] for row in db.execute('SELECT id FROM baby_info')}
+
+    _scan_sleep(db, report, baby_ids)
+    _scan_night_waking(db, report, baby_ids)
+    for table in TIMESTAMP_COLUMNS:
+        if table not in ('sleep', 'night_waking'):
+            _scan_plain(db, report, table, baby_ids)
+
+    if fix and report.fixes:
+        apply_fixes(db, report)
+        _rebuild_derived(db)
+    return report
+
+
+def _rebuild_derived(db):
+    """Abgeleitete Caches nach Reparaturen neu aufbauen (wie nach einem Restore)."""
+    from app.models.models import _invalidate_active_state
+    from app.models.night_sleep_model import NightSleepModel
+
+    db.execute('DELETE FROM daily_nap_suggestions')
+    db.commit()
+    _invalidate_active_state()
+    NightSleepModel.rebuild_all()
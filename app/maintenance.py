@@ -0,0 +1,109 @@
+"""Periodische Wartung der abgeleiteten Tabellen.
+
+Caches wie daily_nap_suggestions (Migration 021) sind pro (Kind, Tag)
+geschlüsselt; Zeilen vergangener Tage werden nie mehr gelesen. Ein
+Daemon-Thread räumt sie in festem Takt auf, damit die Tabellen nicht mit
+den Jahren wachsen und der Primärschlüssel-Lookup im Dashboard klein bleibt.
+Im selben Takt werden veraltete Monate der Quantil-Sketches (Migration 029)
+neu berechnet; die Trends-Seite liest sie nur. Beim App-Start läuft die
+Wartung einmal synchron.
+
+Weitere Schritte werden über register_task() angemeldet; jede Aufgabe
+bekommt die Datenbankverbindung und das heutige Datum und liefert die Anzahl
+bearbeiteter Einträge (gelöschte Zeilen, neu berechnete Monate).
+
+Konfiguration über Umgebungsvariablen (analog zu PROFILER_*):
+    MAINTENANCE_INTERVAL_SECONDS  Takt des Hintergrund-Threads (Standard 3600, 0 = aus)
+    NAP_SUGGESTION_TTL_DAYS       Aufbewahrung gespeicherter Vorschläge in Tagen (Standard 2)
+"""
+import threading
+from datetime import date, timedelta
+
+from app.env import env_int
+from app.models.database import get_db
+from app.models.quantile_sketches import refresh_stored_sketches
+
+
+_tasks = {}
+
+
+def register_task(name):
+    """Dekorator: meldet eine Wartungsaufgabe ``func(db, today) -> int`` an."""
+    def decorator(func):
+        _tasks[name] = func
+        return func
+    return decorator
+
+
+@register_task('daily_nap_suggestions')
+def prune_nap_suggestions(db, today):
+    ttl_days = env_int('NAP_SUGGESTION_TTL_DAYS', 2, 0)
+    cutoff = (today - timedelta(days=ttl_days)).isoformat()
+    return db.execute('DELETE FROM daily_nap_suggestions WHERE date < ?', (cutoff,)).rowcount
+
+
+@register_task('quantile_sketches')
+def refresh_quantile_sketches(db, today):
+    baby_ids = [row['id'] for row in db.execute('SELECT id FROM baby_info').fetchall()]
+    return sum(refresh_stored_sketches(baby_id, today) for baby_id in baby_ids)
+
+
+def run_maintenance(today=None):
+    """Führt alle Wartungsaufgaben aus (App-Kontext nötig); liefert {Aufgabe: Anzahl}."""
+    today = today or date.today()
+    db = get_db()
+    results = {name: task(db, today) for name, task in _tasks.items()}
+    db.commit()
+    return results
+
+
+class MaintenanceThread:
+    """Ruft run_maintenance() in einem Daemon-Thread periodisch auf."""
+
+    def __init__(self, app, interval=None):
+        self.app = app
+        if interval is None:
+            interval = env_int('MAINTENANCE_INTERVAL_SECONDS', 3600, 0)
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.last_results = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running or self.interval <= 0:
+            return False
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='maintenance', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        if not self.running:
+            return False
+        self._stop_event.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        return True
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                with self.app.app_context():
+                    self.last_results = run_maintenance()
+            except Exception:
+                # Wartung darf den Server nie beenden; beim nächsten Takt erneut versuchen
+                self.app.logger.exception('Fehler bei der periodischen Wartung')
+
+
+def start_maintenance(app):
+    """Einmal synchron aufräumen und den Hintergrund-Thread starten (falls aktiviert)."""
+    with app.app_context():
+        run_maintenance()
+    worker = MaintenanceThread(app)
+    worker.start()
+    app.extensions['maintenance'] = worker
+    return worker
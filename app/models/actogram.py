@@ -0,0 +1,144 @@
+"""Aktogramm: 24-Stunden-Schlafmuster, eine Zeile pro Tag.
+
+Jeder Tag wird in BINS_PER_DAY Viertelstunden (Wanduhrzeit) geteilt, jedes
+Bin bekommt einen Zustand:
+
+    AWAKE   0  wach
+    ASLEEP  1  Schlaf (Nickerchen oder Nachtschlaf)
+    WAKING  2  nächtliches Aufwachen
+
+Ein Bin gilt als Schlaf bzw. Aufwachen, wenn mindestens die Hälfte seiner
+Minuten davon bedeckt ist; Aufwachen hat Vorrang vor Schlaf. Die Intervalle
+eines Monats werden in einem Schritt gerastert: Beginn/Ende als Minuten-Offsets,
+Differenzen-Array plus kumulative Summe ergibt die bedeckten Minuten, die
+dann auf (Tage, Bins, 15) umgeformt und gemittelt werden. Ohne NumPy rechnet
+ein Python-Pfad dasselbe Intervall für Intervall (vgl. vectorized_stats.py).
+
+Ergebnisse werden pro (Kind, Monat) im Statistik-Cache abgelegt
+(stats_cache.cached_months), mit den Monatsversionen aus Migration 028 im
+Schlüssel: Ein Monat liest nur Zeilen ab dem Vortag seines Ersten, ein neuer
+Eintrag von heute lässt abgeschlossene Monate also gültig.
+Fehlende Monate eines Zeitraums werden gemeinsam geladen (eine Query pro
+Tabelle), die Zahl der Queries hängt also nicht von der Länge des Zeitraums ab. Laufende Einträge
+reichen bis "jetzt"; Monate bis heute verfallen nach CURRENT_RANGE_TTL_SECONDS.
+"""
+from datetime import datetime, timedelta
+
+from app.models.database import get_db, get_active_baby_id
+from app.models.stats_cache import cached_months, month_spans
+from app.models.vectorized_stats import np, epoch_arrays, EPOCH_ORDINAL, SECONDS_PER_DAY
+from app.timezone import tz_berlin
+from app.timestamps import parse_timestamp
+
+BIN_MINUTES = 15
+MINUTES_PER_DAY = 24 * 60
+BINS_PER_DAY = MINUTES_PER_DAY // BIN_MINUTES
+AWAKE, ASLEEP, WAKING = 0, 1, 2
+
+# Längere Intervalle gelten als unplausibel (vgl. integrity.MAX_DURATION_HOURS)
+_MAX_INTERVAL = timedelta(days=1)
+
+
+def _query_intervals(db, table, baby_id, first, after_last):
+    return db.execute(
+        f'''SELECT start_time, end_time FROM {table} INDEXED BY idx_{table}_baby_start
+            WHERE baby_id = ? AND start_time >= ? AND start_time < ?''',
+        (baby_id, (first - _MAX_INTERVAL).isoformat(), after_last.isoformat())
+    ).fetchall()
+
+
+def _load_intervals(db, table, baby_id, first, after_last):
+    """Beginn/Ende als Minuten ab Monatsbeginn (Wanduhrzeit); offene Intervalle bis jetzt."""
+    rows = _query_intervals(db, table, baby_id, first, after_last)
+    now = datetime.now(tz_berlin)
+    now_value = now.isoformat()
+    start_valid, _, start_local = epoch_arrays([row['start_time'] for row in rows])
+    end_valid, _, end_local = epoch_arrays([row['end_time'] or now_value for row in rows])
+    offset = (first.toordinal() - EPOCH_ORDINAL) * SECONDS_PER_DAY
+    keep = start_valid & end_valid
+    return (start_local[keep] - offset) / 60, (end_local[keep] - offset) / 60
+
+
+def _coverage(starts, ends, days):
+    """Anteil bedeckter Minuten je Bin -> Array (days, BINS_PER_DAY)."""
+    total = days * MINUTES_PER_DAY
+    starts = np.clip(np.rint(starts), 0, total).astype(np.int64)
+    ends = np.clip(np.rint(ends), 0, total).astype(np.int64)
+    keep = ends > starts
+    diff = np.zeros(total + 1, dtype=np.int32)
+    np.add.at(diff, starts[keep], 1)
+    np.add.at(diff, ends[keep], -1)
+    covered = np.cumsum(diff[:-1]) > 0
+    return covered.reshape(days, BINS_PER_DAY, BIN_MINUTES).mean(axis=2)
+
+
+def _rasterize(sleep, waking, days):
+    asleep = _coverage(*sleep, days)
+    woke = _coverage(*waking, days)
+    states = np.where(woke >= 0.5, WAKING, np.where(asleep >= 0.5, ASLEEP, AWAKE)).astype(np.uint8)
+    encoded = (states + ord('0')).tobytes().decode('ascii')
+    return [encoded[day * BINS_PER_DAY:(day + 1) * BINS_PER_DAY] for day in range(days)]
+
+
+# --- Python-Pfad (ohne NumPy) ------------------------------------------------
+
+def _load_intervals_py(db, table, baby_id, first, after_last):
+    rows = _query_intervals(db, table, baby_id, first, after_last)
+    origin = datetime.combine(first, datetime.min.time())
+    now = datetime.now(tz_berlin)
+    intervals = []
+    for row in rows:
+        start = parse_timestamp(row['start_time'])
+        end = parse_timestamp(row['end_time']) if row['end_time'] else now
+        if start is None or end is None:
+            continue
+        # Wanduhrzeit: Offset abstreifen
+        intervals.append(((start.replace(tzinfo=None) - origin).total_seconds() / 60,
+                          (end.replace(tzinfo=None) - origin).total_seconds() / 60))
+    return intervals
+
+
+def _coverage_py(intervals, days):
+    total = days * MINUTES_PER_DAY
+    covered = bytearray(total)
+    for start, end in intervals:
+        start, end = max(0, min(total, round(start))), max(0, min(total, round(end)))
+        if end > start:
+            covered[start:end] = b'\x01' * (end - start)
+    return [sum(covered[i:i + BIN_MINUTES]) / BIN_MINUTES for i in range(0, total, BIN_MINUTES)]
+
+
+def _rasterize_py(sleep, waking, days):
+    asleep, woke = _coverage_py(sleep, days), _coverage_py(waking, days)
+    encoded = ''.join(str(WAKING if w >= 0.5 else ASLEEP if s >= 0.5 else AWAKE) for s, w in zip(asleep, woke))
+    return [encoded[day * BINS_PER_DAY:(day + 1) * BINS_PER_DAY] for day in range(days)]
+
+
+def _rasterize_span(db, baby_id, first, last):
+    """Zeilen für alle Tage von first bis last (zwei Queries, unabhängig von der Länge)."""
+    days = (last - first).days + 1
+    after_last = last + timedelta(days=1)
+    if np is not None:
+        sleep = _load_intervals(db, 'sleep', baby_id, first, after_last)
+        waking = _load_intervals(db, 'night_waking', baby_id, first, after_last)
+        return _rasterize(sleep, waking, days)
+    sleep = _load_intervals_py(db, 'sleep', baby_id, first, after_last)
+    waking = _load_intervals_py(db, 'night_waking', baby_id, first, after_last)
+    return _rasterize_py(sleep, waking, days)
+
+
+def get_actogram(start_date, end_date, baby_id=None):
+    """{'days': [ISO-Datum, ...], 'rows': ['0011..', ...]} - je Tag BINS_PER_DAY Zustände als Ziffern."""
+    baby_id = baby_id or get_active_baby_id()
+    months = month_spans(start_date, end_date)
+    by_month = cached_months('actogram', ('sleep', 'night_waking'), baby_id, months,
+                             lambda first, last: _rasterize_span(get_db(), baby_id, first, last))
+
+    days, rows = [], []
+    for first, _ in months:
+        for index, row in enumerate(by_month[first]):
+            day = first + timedelta(days=index)
+            if start_date <= day <= end_date:
+                days.append(day.isoformat())
+                rows.append(row)
+    return {'bin_minutes': BIN_MINUTES, 'days': days, 'rows': rows}
@@ -0,0 +1,84 @@
+"""Kalender-Heatmap: Tageswerte über lange Zeiträume (Jahresübersicht).
+
+Pro Tabelle eine Aggregat-Query mit GROUP BY über das lokale Datum
+(substr(timestamp, 1, 10) - gespeichert wird mit lokalem Offset), damit bleibt
+die Zahl der Queries unabhängig von der Länge des Zeitraums. Alle Queries
+laufen über die (baby_id, timestamp)-Indizes aus Migration 023/026.
+
+Spalten pro Tag (HEATMAP_COLUMNS):
+    sleep_hours  Schlafdauer in Stunden (brutto, ohne Abzug nächtlichen
+                 Aufwachens), wie in den Statistiken dem Tag des Aufwachens
+                 zugerechnet; laufender Schlaf zählt noch nicht
+    feedings     Stillmahlzeiten
+    diapers      Windeln
+    bottle_ml    Flaschenmenge in ml
+    fever        1, wenn an dem Tag mindestens FEVER_THRESHOLD_C gemessen wurde
+
+Tage ohne jeden Eintrag fehlen im Ergebnis (kompakte Ausgabe).
+"""
+from datetime import timedelta
+
+from app.models.database import get_db, get_active_baby_id
+from app.models.stats_cache import cached_statistics
+
+HEATMAP_COLUMNS = ('sleep_hours', 'feedings', 'diapers', 'bottle_ml', 'fever')
+FEVER_THRESHOLD_C = 38.0
+
+# Spalte -> (Tabelle, Aggregat) für Tabellen mit einem Zeitpunkt pro Eintrag
+_POINT_AGGREGATES = {
+    'feedings': ('feeding', 'COUNT(*)'),
+    'diapers': ('diaper', 'COUNT(*)'),
+    'bottle_ml': ('bottle', 'SUM(amount)'),
+    'fever': ('temperature', f'MAX(value >= {FEVER_THRESHOLD_C})'),
+}
+
+
+def _sleep_hours_by_day(db, baby_id, first, after_last):
+    """Schlafstunden je Aufwach-Tag; Beginn bis einen Tag vor dem Zeitraum (Nachtschlaf)."""
+    return db.execute(
+        '''SELECT substr(end_time, 1, 10) AS day,
+                  SUM((julianday(end_time) - julianday(start_time)) * 24) AS hours
+           FROM sleep INDEXED BY idx_sleep_baby_start
+           WHERE baby_id = ? AND start_time >= ? AND start_time < ?
+             AND end_time IS NOT NULL AND julianday(end_time) > julianday(start_time)
+             AND substr(end_time, 1, 10) >= ? AND substr(end_time, 1, 10) < ?
+           GROUP BY day''',
+        (baby_id, (first - timedelta(days=1)).isoformat(), after_last.isoformat(),
+         first.isoformat(), after_last.isoformat())
+    ).fetchall()
+
+
+@cached_statistics('sleep', 'feeding', 'diaper', 'bottle', 'temperature')
+def get_calendar_heatmap(start_date, end_date, baby_id=None):
+    """Tageswerte im Zeitraum: {'columns': [...], 'days': [[datum, werte...], ...]} (nach Datum)."""
+    baby_id = baby_id or get_active_baby_id()
+    db = get_db()
+    first = start_date
+    after_last = end_date + timedelta(days=1)
+
+    days = {}
+
+    def row_for(day):
+        row = days.get(day)
+        if row is None:
+            row = days[day] = [0] * len(HEATMAP_COLUMNS)
+        return row
+
+    for day, hours in _sleep_hours_by_day(db, baby_id, first, after_last):
+        row_for(day)[0] = round(hours, 2)
+
+    for column, (table, aggregate) in _POINT_AGGREGATES.items():
+        index = HEATMAP_COLUMNS.index(column)
+        for day, value in db.execute(
+            f'''SELECT substr(timestamp, 1, 10) AS day, {aggregate}
+                FROM {table}
+                WHERE baby_id = ? AND timestamp >= ? AND timestamp < ?
+                GROUP BY day''',
+            (baby_id, first.isoformat(), after_last.isoformat())
+        ):
+            row_for(day)[index] = value or 0
+
+    return {
+        'columns': list(HEATMAP_COLUMNS),
+        'days': [[day] + days[day] for day in sorted(days)],
+    }
@@ -0,0 +1,279 @@
+"""WHO-z-Scores über LMS-Parameter (Geburt bis 5 Jahre).
+
+Die WHO Child Growth Standards beschreiben jede Messgröße als Box-Cox-
+Verteilung mit drei Parametern je Alter bzw. Länge: L (Schiefe), M (Median)
+und S (Variationskoeffizient). Damit ist für jeden Messwert y ein genauer
+z-Score berechenbar
+
+    z = ((y / M) ** L - 1) / (L * S)      (L != 0)
+    z = ln(y / M) / S                     (L == 0)
+
+und daraus die Perzentile (Standardnormalverteilung). Für gewichtsbasierte
+Indikatoren gilt jenseits von |z| = 3 die "restricted application" der WHO
+(linear im Abstand zwischen SD2 und SD3), sonst würden Ausreißer überbewertet.
+
+Indikatoren:
+    weight             Gewicht-für-Alter (kg)
+    height             Länge/Größe-für-Alter (cm); bis Tag 730 liegend
+                       gemessene Länge, ab Tag 731 stehend gemessene Größe
+    head               Kopfumfang-für-Alter (cm)
+    weight_for_length  Gewicht-für-Länge (kg, 45-110 cm, bis Tag 730)
+    weight_for_height  Gewicht-für-Größe (kg, 65-120 cm, ab Tag 731)
+
+Die Parameter stammen unverändert aus den erweiterten WHO-Tabellen (igrowup,
+Format wie weianthro.txt), abgelegt unter app/data/who: eine Zeile pro
+Lebenstag (0 bis MAX_AGE_DAYS) bzw. pro 0,1 cm. Die Tabellen werden beim
+Import geladen und direkt indiziert, es wird nicht interpoliert. Die WHO-
+Tabelle für Länge/Größe wechselt an Tag 731 von Länge auf Größe (im Median
+rund 0,7 cm weniger); die App speichert keine Messposition und geht wie die
+Tabelle von liegend bis 24 Monate, stehend danach aus. Aus demselben Grund
+wählt weight_for_length_trajectory() ab Tag 731 die Gewicht-für-Größe-
+Tabelle. Ganze Reihen werden mit NumPy in einem Schritt ausgewertet; ohne
+NumPy rechnet ein Python-Pfad dieselben Formeln pro Wert (requirements.txt
+bleibt unverändert, vgl. vectorized_stats.py).
+
+Wie growth_reference.py: Orientierungshilfe, keine medizinische Bewertung.
+"""
+import math
+import os
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - abhängig von der Umgebung
+    np = None
+
+DAYS_PER_MONTH = 30.4375
+# Letzter Tag der WHO-Tabellen für 0-5 Jahre
+MAX_AGE_DAYS = 1856
+# Erster Tag mit stehend gemessener Größe (lenanthro.txt: loh = H)
+HEIGHT_FROM_DAYS = 731
+WFL_STEP_CM = 0.1
+# Erste Zeile der Längen-Tabellen in cm
+LENGTH_AXIS_MIN_CM = {'weight_for_length': 45.0, 'weight_for_height': 65.0}
+
+AGE_INDICATORS = ('weight', 'height', 'head')
+# Indikatoren mit WHO "restricted application" jenseits von |z| = 3
+RESTRICTED_INDICATORS = ('weight', 'weight_for_length', 'weight_for_height')
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'who')
+LMS_FILES = {
+    'weight': 'weianthro.txt',
+    'height': 'lenanthro.txt',
+    'head': 'hcanthro.txt',
+    'weight_for_length': 'wflanthro.txt',
+    'weight_for_height': 'wfhanthro.txt',
+}
+# Kodierung der Spalte sex in den WHO-Dateien
+_SEXES = {'1': 'm', '2': 'f'}
+
+
+def _load_lms(filename):
+    """{gender: (L, M, S)} als Listen, eine Zeile je Tag bzw. 0,1 cm (Datei ist sortiert)."""
+    columns = {gender: ([], [], []) for gender in _SEXES.values()}
+    with open(os.path.join(DATA_DIR, filename), encoding='utf-8') as f:
+        next(f)  # Kopfzeile
+        for line in f:
+            sex, _, l, m, s = line.split('\t')[:5]
+            for column, value in zip(columns[_SEXES[sex]], (l, m, s)):
+                column.append(float(value))
+    return columns
+
+
+# {(indicator, gender): (L, M, S)} - WHO-Werte als Listen
+LMS_TABLES = {(indicator, gender): columns
+              for indicator, filename in LMS_FILES.items()
+              for gender, columns in _load_lms(filename).items()}
+
+# Dieselben Tabellen als NumPy-Arrays, falls verfügbar
+_TABLES = LMS_TABLES if np is None else {
+    key: tuple(np.asarray(column, dtype=np.float64) for column in columns)
+    for key, columns in LMS_TABLES.items()
+}
+
+
+def is_vectorized():
+    return np is not None
+
+
+def _row_index(indicator, position):
+    """Zeile der Tabelle zu Alter in Tagen bzw. Länge in cm (Fließkomma)."""
+    if indicator in AGE_INDICATORS:
+        return position
+    return (position - LENGTH_AXIS_MIN_CM[indicator]) / WFL_STEP_CM
+
+
+# --- NumPy-Pfad --------------------------------------------------------------
+
+def _box_cox_np(y, l, m, s):
+    near_zero = np.abs(l) < 1e-6
+    safe_l = np.where(near_zero, 1.0, l)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(near_zero, np.log(y / m) / s, (np.power(y / m, safe_l) - 1) / (safe_l * s))
+
+
+def _value_at_z_np(z, l, m, s):
+    near_zero = np.abs(l) < 1e-6
+    safe_l = np.where(near_zero, 1.0, l)
+    with np.errstate(invalid='ignore'):
+        return np.where(near_zero, m * np.exp(s * z), m * np.power(1 + safe_l * s * z, 1 / safe_l))
+
+
+def _zscores_np(indicator, gender, positions, values):
+    lms = _TABLES[(indicator, gender)]
+    rows = _row_index(indicator, np.asarray(positions, dtype=np.float64))
+    y = np.asarray(values, dtype=np.float64)
+    size = len(lms[0])
+    valid = np.isfinite(rows) & np.isfinite(y) & (y > 0) & (rows > -0.5) & (rows < size - 0.5)
+    index = np.clip(np.rint(np.where(valid, rows, 0)), 0, size - 1).astype(np.intp)
+    l, m, s = (column[index] for column in lms)
+    z = _box_cox_np(np.where(valid, y, 1.0), l, m, s)
+
+    if indicator in RESTRICTED_INDICATORS:
+        sd3_pos = _value_at_z_np(3.0, l, m, s)
+        sd3_neg = _value_at_z_np(-3.0, l, m, s)
+        sd23_pos = sd3_pos - _value_at_z_np(2.0, l, m, s)
+        sd23_neg = _value_at_z_np(-2.0, l, m, s) - sd3_neg
+        z = np.where(z > 3, 3 + (y - sd3_pos) / sd23_pos, z)
+        z = np.where(z < -3, -3 + (y - sd3_neg) / sd23_neg, z)
+    return np.where(valid & np.isfinite(z), z, np.nan)
+
+
+def _erf_np(x):
+    """erf nach Abramowitz/Stegun 7.1.26 (Fehler < 1,5e-7), NumPy hat keine eigene."""
+    sign = np.sign(x)
+    x = np.abs(x)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = ((((1.061405429 * t - 1.453152027) * t + 1.421413741) * t - 0.284496736) * t + 0.254829592) * t
+    return sign * (1.0 - poly * np.exp(-x * x))
+
+
+def _to_list(array, digits):
+    """NaN -> None, sonst gerundet (Ausgabe für JSON/Templates)."""
+    rounded = (np.round(array, digits) + 0.0).astype(object)  # + 0.0: keine -0.0
+    return np.where(np.isnan(array), None, rounded).tolist()
+
+
+# --- Python-Pfad (ohne NumPy) ------------------------------------------------
+
+def _value_at_z(z, l, m, s):
+    if abs(l) < 1e-6:
+        return m * math.exp(s * z)
+    return m * (1 + l * s * z) ** (1 / l)
+
+
+def _zscore_py(indicator, lms, position, value):
+    if position is None or value is None or value <= 0:
+        return None
+    row = _row_index(indicator, position)
+    if not -0.5 < row < len(lms[0]) - 0.5:
+        return None
+    index = int(round(row))
+    l, m, s = (column[index] for column in lms)
+    z = math.log(value / m) / s if abs(l) < 1e-6 else ((value / m) ** l - 1) / (l * s)
+    if indicator in RESTRICTED_INDICATORS:
+        if z > 3:
+            sd3 = _value_at_z(3, l, m, s)
+            z = 3 + (value - sd3) / (sd3 - _value_at_z(2, l, m, s))
+        elif z < -3:
+            sd3 = _value_at_z(-3, l, m, s)
+            z = -3 + (value - sd3) / (_value_at_z(-2, l, m, s) - sd3)
+    return z
+
+
+# --- Öffentliche API -----------------------------------------------------------
+
+def zscores(indicator, gender, positions, values):
+    """z-Scores einer ganzen Reihe.
+
+    positions: Alter in Tagen (weight, height, head) bzw. Länge/Größe in cm
+    (weight_for_length, weight_for_height); values: Messwerte. Liefert eine Liste mit z-Scores
+    (2 Nachkommastellen) bzw. None außerhalb der Tabelle oder bei fehlenden
+    Werten; bei unbekanntem Geschlecht nur None.
+    """
+    lms = _TABLES.get((indicator, gender))
+    if lms is None:
+        return [None] * len(values)
+    if np is not None:
+        # None wird beim Umwandeln in float-Arrays zu NaN
+        return _to_list(_zscores_np(indicator, gender, positions, values), 2)
+    return [None if z is None else round(z, 2)
+            for z in (_zscore_py(indicator, lms, p, v) for p, v in zip(positions, values))]
+
+
+def percentiles_from_z(zs):
+    """Perzentilen (0-100, 1 Nachkommastelle) zu einer Liste von z-Scores (None bleibt None)."""
+    if np is not None:
+        z = np.asarray(zs, dtype=np.float64)
+        return _to_list(50.0 * (1.0 + _erf_np(z / math.sqrt(2))), 1)
+    return [None if z is None else round(50.0 * (1.0 + math.erf(z / math.sqrt(2))), 1) for z in zs]
+
+
+def age_days(birth_date, timestamps):
+    """Alter in Tagen am lokalen Datum jedes Zeitstempels (None bei ungültigem Datum)."""
+    if np is not None:
+        try:
+            days = np.array(timestamps, dtype='U10').astype('datetime64[D]')
+        except ValueError:
+            pass
+        else:
+            ages = (days - np.datetime64(birth_date.isoformat(), 'D')).astype(np.int64)
+            return np.maximum(ages, 0).tolist()
+    ages = []
+    for timestamp in timestamps:
+        try:
+            ages.append(max(0, (date.fromisoformat(str(timestamp)[:10]) - birth_date).days))
+        except ValueError:
+            ages.append(None)
+    return ages
+
+
+def z_trajectory(indicator, gender, birth_date, entries, column):
+    """[{timestamp, value, z, percentile}] für nach Zeit sortierte Messungen (Einträge mit z=None entfallen)."""
+    if not entries or gender not in ('m', 'f') or birth_date is None:
+        return []
+    timestamps = [entry['timestamp'] for entry in entries]
+    values = [entry[column] for entry in entries]
+    zs = zscores(indicator, gender, age_days(birth_date, timestamps), values)
+    return _trajectory(timestamps, values, zs)
+
+
+def weight_for_length_trajectory(gender, weights, lengths, birth_date=None):
+    """Gewicht-für-Länge je Gewichtsmessung, mit der letzten Längenmessung davor.
+
+    weights/lengths: nach Zeit sortierte Einträge mit weight_kg bzw. height_cm.
+    Mit birth_date gilt ab Tag HEIGHT_FROM_DAYS die Gewicht-für-Größe-Tabelle.
+    """
+    if not weights or not lengths or gender not in ('m', 'f'):
+        return []
+    timestamps = [entry['timestamp'] for entry in weights]
+    values = [entry['weight_kg'] for entry in weights]
+    length_times = [entry['timestamp'] for entry in lengths]
+    length_values = [entry['height_cm'] for entry in lengths]
+    if np is not None:
+        index = np.searchsorted(np.array(length_times), np.array(timestamps), side='right') - 1
+        matched = np.where(index >= 0, np.asarray(length_values, dtype=np.float64)[np.maximum(index, 0)], np.nan)
+    else:
+        from bisect import bisect_right
+        matched = []
+        for timestamp in timestamps:
+            index = bisect_right(length_times, timestamp) - 1
+            matched.append(length_values[index] if index >= 0 else None)
+
+    indicators = ['weight_for_length'] * len(values)
+    if birth_date is not None:
+        indicators = ['weight_for_height' if age is not None and age >= HEIGHT_FROM_DAYS else 'weight_for_length'
+                      for age in age_days(birth_date, timestamps)]
+    zs = [None] * len(values)
+    for indicator in set(indicators):
+        picked = [i for i, name in enumerate(indicators) if name == indicator]
+        for i, z in zip(picked, zscores(indicator, gender, [matched[i] for i in picked], [values[i] for i in picked])):
+            zs[i] = z
+    return _trajectory(timestamps, values, zs)
+
+
+def _trajectory(timestamps, values, zs):
+    points = [(t, v, z) for t, v, z in zip(timestamps, values, zs) if z is not None]
+    percentiles = percentiles_from_z([z for _, _, z in points])
+    return [{'timestamp': t, 'value': v, 'z': z, 'percentile': p}
+            for (t, v, z), p in zip(points, percentiles)]
@@ -0,0 +1,211 @@
+"""Intervall-Index für sleep, night_waking und illness.
+
+Fragen wie "welche Aufwachen liegen in diesem Nachtschlaf" oder "was überlappt
+diesen Tag" wurden bisher pro Aufruf mit einer eigenen Query (plus
+Sicherheitsmarge, Issue #46) und anschließender Prüfung in Python beantwortet -
+bei Statistiken einmal pro Nacht. Der Index lädt stattdessen ein Zeitfenster
+einer Tabelle einmal pro Request und Kind und hält die Einträge nach Beginn
+sortiert (echte datetime-Objekte, also DST-fest). Damit sind
+
+    overlapping(lo, hi)   alle Intervalle mit Beginn <= hi und Ende >= lo
+    contained(lo, hi)     alle Intervalle vollständig in [lo, hi]
+    clipped(lo, hi)       überlappende Intervalle samt Sekunden innerhalb [lo, hi]
+    seconds_per_day(a, b) Dauer je lokalem Kalendertag, an Mitternacht geschnitten
+
+Die Beginn-Grenze kommt per Binärsuche über die Beginn-Zeiten. Für die
+Ende-Grenze liegt über derselben Reihenfolge ein Segmentbaum mit dem maximalen
+Ende je Teilbaum (_MaxEndTree): Teilbäume, deren spätestes Ende vor lo liegt,
+werden übersprungen, eine Abfrage kostet O(k log n) für k Treffer. Einzelne
+sehr lange Einträge (z.B. ein vergessener offener Eintrag) verbreitern die
+Suche also nicht. Offene Einträge (end_time IS NULL) laufen bis "jetzt".
+
+Der Index liegt wie der Aktiv-Snapshot in flask.g und wird bei
+Schreibzugriffen über invalidate_interval_indexes() verworfen. Liegt ein
+angefragtes Fenster außerhalb des geladenen, wird das Fenster vergrößert und
+neu geladen.
+"""
+import bisect
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from flask import g
+
+from app.models.database import get_db, get_active_baby_id
+from app.timezone import tz_berlin, normalize_to_berlin
+from app.timestamps import parse_timestamp
+
+INTERVAL_TABLES = ('sleep', 'night_waking', 'illness')
+
+# String-Grenzen weichen wegen unterschiedlicher Offsets (Sommer-/Winterzeit,
+# ältere 'Z'-Werte) um bis zu zwei Stunden von der echten Zeit ab
+_QUERY_MARGIN = timedelta(hours=2)
+
+# Intervall mit geparstem Beginn/Ende (end=None: noch offen) und der DB-Zeile als dict
+Interval = namedtuple('Interval', 'start end row')
+
+
+def _day_start(day):
+    return normalize_to_berlin(datetime.combine(day, datetime.min.time()))
+
+
+class _MaxEndTree:
+    """Segmentbaum über Enden (Epoch-Sekunden) in Beginn-Reihenfolge; Knoten = max. Ende."""
+
+    def __init__(self, ends):
+        size = 1
+        while size < len(ends):
+            size *= 2
+        self._size = size
+        self._max = [float('-inf')] * (2 * size)
+        self._max[size:size + len(ends)] = ends
+        for node in range(size - 1, 0, -1):
+            self._max[node] = max(self._max[2 * node], self._max[2 * node + 1])
+
+    def at_least(self, count, bound):
+        """Positionen < count mit Ende >= bound, aufsteigend."""
+        result = []
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= count or self._max[node] < bound:
+                continue
+            if node >= self._size:
+                result.append(lo)
+                continue
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+        return result
+
+
+class IntervalIndex:
+    """Nach Beginn sortierte Intervalle eines Zeitfensters (lower/upper: datetime)."""
+
+    def __init__(self, rows, lower, upper, now=None):
+        self.lower = lower
+        self.upper = upper
+        self.now = now or datetime.now(tz_berlin)
+
+        items = []
+        for row in rows:
+            start = parse_timestamp(row['start_time'])
+            if start is None:
+                continue
+            end = None
+            if row['end_time']:
+                end = parse_timestamp(row['end_time'])
+                if end is None:
+                    # Ungültiges Ende: Eintrag nicht auswertbar (wie bisher übersprungen)
+                    continue
+            items.append(Interval(start, end, dict(row)))
+        items.sort(key=lambda item: item.start)
+
+        self._items = items
+        self._starts = [item.start for item in items]
+        self._ends = _MaxEndTree([self.end_of(item).timestamp() for item in items])
+
+    def __len__(self):
+        return len(self._items)
+
+    def end_of(self, item):
+        """Ende eines Intervalls; offene Einträge laufen bis jetzt."""
+        return item.end if item.end is not None else self.now
+
+    def covers(self, lower, upper):
+        return self.lower <= lower and upper <= self.upper
+
+    def overlapping(self, lower, upper):
+        """Intervalle mit Beginn <= upper und Ende >= lower, nach Beginn sortiert."""
+        last = bisect.bisect_right(self._starts, upper)
+        return [self._items[position] for position in self._ends.at_least(last, lower.timestamp())]
+
+    def contained(self, lower, upper):
+        """Intervalle, die vollständig in [lower, upper] liegen.
+
+        Offene Einträge zählen, sobald ihr Beginn im Fenster liegt (ein laufendes
+        Aufwachen gehört zum laufenden Nachtschlaf).
+        """
+        first = bisect.bisect_left(self._starts, lower)
+        last = bisect.bisect_right(self._starts, upper)
+        return [item for item in self._items[first:last]
+                if item.end is None or lower <= item.end <= upper]
+
+    def clipped(self, lower, upper):
+        """[(Intervall, Sekunden innerhalb [lower, upper])] für alle überlappenden Intervalle."""
+        result = []
+        for item in self.overlapping(lower, upper):
+            seconds = (min(self.end_of(item), upper) - max(item.start, lower)).total_seconds()
+            result.append((item, max(0.0, seconds)))
+        return result
+
+    def seconds_per_day(self, first_day, last_day):
+        """{date: Sekunden} für jeden Tag in [first_day, last_day], an lokaler Mitternacht geschnitten.
+
+        Tage mit Zeitumstellung haben 23 bzw. 25 Stunden; Überlappungen mehrerer
+        Einträge werden nicht zusammengefasst.
+        """
+        result = {}
+        day = first_day
+        while day <= last_day:
+            next_day = day + timedelta(days=1)
+            lower, upper = _day_start(day), _day_start(next_day)
+            result[day] = sum(seconds for item, seconds in self.clipped(lower, upper)
+                              if item.start < upper and self.end_of(item) > lower)
+            day = next_day
+        return result
+
+
+def _load(db, table, baby_id, lower, upper):
+    """Alle Einträge, die [lower, upper] berühren können (mit String-Marge, exakt filtert der Index).
+
+    Drei Teilbereiche, jeweils über einen Index: Beginn im Fenster, Ende im
+    Fenster bzw. danach (lange Einträge, die vor dem Fenster beginnen) und
+    offene Einträge.
+    """
+    lower_str = (lower - _QUERY_MARGIN).strftime('%Y-%m-%dT%H:%M:%S')
+    upper_str = (upper + _QUERY_MARGIN).strftime('%Y-%m-%dT%H:%M:%S')
+    return db.execute(
+        f'''SELECT * FROM {table} WHERE baby_id = ? AND start_time >= ? AND start_time <= ?
+            UNION
+            SELECT * FROM {table} WHERE baby_id = ? AND end_time >= ? AND start_time < ?
+            UNION
+            SELECT * FROM {table} WHERE baby_id = ? AND end_time IS NULL AND start_time <= ?''',
+        (baby_id, lower_str, upper_str, baby_id, lower_str, lower_str, baby_id, upper_str)
+    ).fetchall()
+
+
+def _as_datetime(value, end_of_day=False):
+    if isinstance(value, datetime):
+        return normalize_to_berlin(value)
+    if isinstance(value, date):
+        return _day_start(value + timedelta(days=1)) if end_of_day else _day_start(value)
+    return parse_timestamp(value)
+
+
+def get_interval_index(table, lower, upper, baby_id=None):
+    """Request-weiter Intervall-Index einer Tabelle, der mindestens [lower, upper] abdeckt.
+
+    lower/upper dürfen datetime, date (ganzer Tag) oder ISO-Strings sein.
+    """
+    if table not in INTERVAL_TABLES:
+        raise ValueError(f'Kein Intervall-Index für Tabelle {table}')
+    baby_id = baby_id or get_active_baby_id()
+    lower = _as_datetime(lower)
+    upper = _as_datetime(upper, end_of_day=True)
+
+    cache = g.setdefault('interval_indexes', {})
+    index = cache.get((table, baby_id))
+    if index is not None:
+        if index.covers(lower, upper):
+            return index
+        # Fenster zusammenlegen, damit abwechselnde Anfragen nicht ständig neu laden
+        lower, upper = min(lower, index.lower), max(upper, index.upper)
+
+    index = IntervalIndex(_load(get_db(), table, baby_id, lower, upper), lower, upper)
+    cache[(table, baby_id)] = index
+    return index
+
+
+def invalidate_interval_indexes():
+    """Verwirft alle Indizes des Requests nach Schreibzugriffen."""
+    g.pop('interval_indexes', None)
@@ -1,14 +1,26 @@
 """Datenmodelle für die Baby-Tracking App"""
+from flask import g
 from app.models.database import get_db, get_active_baby_id
 from datetime import datetime, date, timedelta
-import bisect
+import heapq
 import json
-
-from app.timezone import tz_berlin, normalize_to_berlin
+import sqlite3
+import statistics
+from collections import namedtuple
+from contextlib import closing
+from itertools import islice
+
+from app.timezone import tz_berlin, normalize_to_berlin, to_berlin
+from app.timestamps import parse_timestamp
+from app.models.night_sleep_model import NightSleepModel
+from app.models import vectorized_stats
+from app.models.intervals import get_interval_index, invalidate_interval_indexes
+from app.models.stats_cache import cached_statistics
+from app.integrity import MAX_DURATION_HOURS
 
 # Tracking-Tabellen mit baby_id-Spalte (Issue #33). Bewusst ohne baby_info
-# (das ist die Profiltabelle selbst) und ohne nap_suggestions (interner Cache,
-# keine Nutzerdaten) - relevant für die Lösch-Sperre in BabyInfo.delete_baby().
+# (das ist die Profiltabelle selbst) und ohne daily_nap_suggestions/night_sleep_model/
+# quantile_sketches/quantile_sketch_months (interne Caches, keine Nutzerdaten) - relevant für die Lösch-Sperre in BabyInfo.delete_baby().
 TRACKING_TABLES_WITH_BABY_ID = [
     'sleep', 'feeding', 'bottle', 'diaper', 'temperature', 'medicine',
     'night_waking', 'porridge', 'illness', 'weight', 'height', 'head_circumference',
@@ -24,10 +36,8 @@ def _format_wake_duration(prev_end_str, current_start_str):
     if not prev_end_str or not current_start_str:
         return None
     try:
-        prev_dt = datetime.fromisoformat(str(prev_end_str).replace('Z', '+00:00'))
-        cur_dt = datetime.fromisoformat(str(current_start_str).replace('Z', '+00:00'))
-        prev_dt = normalize_to_berlin(prev_dt)
-        cur_dt = normalize_to_berlin(cur_dt)
+        prev_dt = to_berlin(prev_end_str)
+        cur_dt = to_berlin(current_start_str)
         if cur_dt <= prev_dt:
             return None
         total_minutes = int((cur_dt - prev_dt).total_seconds() // 60)
@@ -43,36 +53,36 @@ def _format_wake_duration(prev_end_str, current_start_str):
         return None
 
 
-def _load_sorted_sleep_end_times(db, upper_bound_str, baby_id):
-    """Lädt alle sleep.end_time-Werte bis zu einer oberen Grenze einmalig sortiert.
+# Feeding.get_feeding_statistics: Seiten (CHECK-Constraint der Tabelle) und
+# Obergrenze für plausible Stilldauern (längere gelten als vergessenes Ende)
+FEEDING_SIDES = ('links', 'rechts')
+FEEDING_MAX_HOURS = MAX_DURATION_HOURS['feeding']
 
-    Vermeidet das N+1-Query-Problem (Issue #45): statt pro Eintrag erneut nach dem
-    vorherigen Schlafende zu fragen, wird einmal sortiert geladen und per bisect
-    nachgeschlagen.
-    """
-    rows = db.execute(
-        '''SELECT end_time FROM sleep
-           WHERE end_time IS NOT NULL AND end_time <= ? AND baby_id = ?
-           ORDER BY end_time ASC''',
-        (upper_bound_str, baby_id)
-    ).fetchall()
-    return [row['end_time'] for row in rows]
+# Tageszeit-Abschnitte für Sleep.get_wake_window_statistics: (Schlüssel, Beginn-Stunde
+# ab der der Abschnitt gilt); alles vor 10 Uhr zählt als Morgen, ab 18 Uhr als Abend
+WAKE_WINDOW_BUCKETS = [('morning', 0), ('midday', 10), ('afternoon', 14), ('evening', 18)]
+# Längere "Wachfenster" entstehen nur durch fehlende Schlaf-Einträge
+MAX_WAKE_WINDOW_HOURS = 12
 
 
-def _find_prev_end(sorted_end_times, timestamp):
-    """Findet das größte end_time < timestamp aus einer sortierten Liste via bisect."""
-    idx = bisect.bisect_left(sorted_end_times, timestamp) - 1
-    return sorted_end_times[idx] if idx >= 0 else None
+def _wake_window_bucket(hour):
+    key = WAKE_WINDOW_BUCKETS[0][0]
+    for bucket_key, start_hour in WAKE_WINDOW_BUCKETS:
+        if hour >= start_hour:
+            key = bucket_key
+    return key
 
 
-def _parse_ts(value):
-    """Parst einen ISO-Zeitstempel; gibt None statt Exception bei ungültigem Wert."""
-    if not value:
-        return None
-    try:
-        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
-    except ValueError:
-        return None
+def _distribution(values):
+    """min/median/max (in ganzen Minuten) und Anzahl einer Werteliste."""
+    if not values:
+        return {'count': 0, 'min': None, 'median': None, 'max': None}
+    return {
+        'count': len(values),
+        'min': round(min(values)),
+        'median': round(statistics.median(values)),
+        'max': round(max(values)),
+    }
 
 
 def _is_recent_duplicate(db, table, timestamp_column, timestamp, match_fields, baby_id=None):
@@ -84,7 +94,7 @@ def _is_recent_duplicate(db, table, timestamp_column, timestamp, match_fields, b
     baby_id schränkt den Vergleich auf den zuletzt angelegten Eintrag DIESES Kindes ein
     (Issue #33) - sonst würde ein frisches Kind-Profil fälschlich mit dem letzten
     Eintrag eines anderen Kindes verglichen."""
-    new_ts = _parse_ts(timestamp)
+    new_ts = parse_timestamp(timestamp)
     if new_ts is None:
         return False
 
@@ -101,13 +111,178 @@ def _is_recent_duplicate(db, table, timestamp_column, timestamp, match_fields, b
     if row is None:
         return False
 
-    last_ts = _parse_ts(row[timestamp_column])
+    last_ts = parse_timestamp(row[timestamp_column])
     if last_ts is None or abs((new_ts - last_ts).total_seconds()) > DEDUP_WINDOW_SECONDS:
         return False
 
     return all(row[field] == expected for field, expected in match_fields.items())
 
 
+class OverlapError(ValueError):
+    """Ein Schlaf- bzw. Aufwach-Intervall überschneidet sich mit einem bestehenden Eintrag."""
+
+    def __init__(self, table, conflict):
+        self.table = table
+        self.conflict = conflict
+        super().__init__(
+            f"{table}: überschneidet sich mit Eintrag {conflict['id']} "
+            f"({conflict['start_time']} - {conflict['end_time'] or 'laufend'})"
+        )
+
+
+# Nachbarn je Seite: in der doppelten Stunde der Zeitumstellung (Herbst) kann sich
+# die String-Reihenfolge der Offsets gegenüber der echten Zeit um einen Platz verschieben
+_OVERLAP_NEIGHBORS = 2
+
+
+def _intervals_overlap(start, end, other_start, other_end):
+    """Halboffene Intervalle [start, end) gegen einen bestehenden Eintrag.
+
+    Ein bestehender laufender Eintrag (other_end None) ist nach oben offen: er läuft
+    bis jetzt und über jeden später beginnenden Eintrag hinweg. Ein neuer laufender
+    Eintrag (end None) zählt als Zeitpunkt; sein Intervall wird beim Beenden geprüft.
+    """
+    if other_end is None:
+        return other_start <= start if end is None else other_start < end
+    if end is None:
+        return other_start <= start < other_end
+    return start < other_end and other_start < end
+
+
+def _check_overlap(db, table, start_time, end_time, baby_id, exclude_id=None):
+    """Wirft OverlapError, wenn [start_time, end_time) einen Eintrag derselben Tabelle überschneidet.
+
+    Bestehende Einträge eines Kindes überschneiden sich untereinander nicht (das
+    stellt diese Prüfung sicher), daher genügen die direkten Nachbarn nach
+    Beginn: Vorgänger und Nachfolger über den Index (baby_id, start_time), je
+    ein LIMIT-Lookup - unabhängig von der Länge der Historie. Nach dem Beginn
+    eines laufenden Eintrags kann kein weiterer beginnen (sonst ließe er sich
+    später nicht mehr beenden); ein neuer laufender Eintrag wird mit seinem
+    Beginn geprüft, sein Intervall beim Beenden. Bloßes Berühren (Ende == Beginn)
+    ist erlaubt.
+    """
+    start_dt = parse_timestamp(start_time)
+    end_dt = parse_timestamp(end_time) if end_time else None
+    if start_dt is None or (end_time and end_dt is None):
+        return
+
+    rows = db.execute(
+        f'''SELECT * FROM (
+               SELECT id, start_time, end_time FROM {table}
+               WHERE baby_id = ? AND id <> ? AND start_time <= ?
+               ORDER BY start_time DESC LIMIT ?)
+           UNION ALL
+           SELECT * FROM (
+               SELECT id, start_time, end_time FROM {table}
+               WHERE baby_id = ? AND id <> ? AND start_time > ?
+               ORDER BY start_time LIMIT ?)''',
+        (baby_id, exclude_id or 0, start_time, _OVERLAP_NEIGHBORS,
+         baby_id, exclude_id or 0, start_time, _OVERLAP_NEIGHBORS)
+    ).fetchall()
+    for row in rows:
+        other_start = parse_timestamp(row['start_time'])
+        other_end = parse_timestamp(row['end_time']) if row['end_time'] else None
+        if other_start is None or (row['end_time'] and other_end is None):
+            continue
+        if _intervals_overlap(start_dt, end_dt, other_start, other_end):
+            raise OverlapError(table, dict(row))
+
+
+_SLEEP_COLUMNS = ('id', 'type', 'start_time', 'end_time', 'created_at',
+                  'sleep_quality', 'sleep_location', 'sleep_comment', 'baby_id')
+_NIGHT_WAKING_COLUMNS = ('id', 'start_time', 'end_time', 'created_at', 'baby_id')
+
+# Die ORDER BY in den Unterabfragen lenkt den Planer auf die partiellen Indizes
+# (baby_id, start_time) WHERE end_time IS NULL aus Migration 020; für night_waking
+# explizit, da der volle Index aus 025 dieselben Spalten hat
+_ACTIVE_STATE_SQL = f'''
+    SELECT * FROM (
+        SELECT 'sleep' AS kind, {', '.join(_SLEEP_COLUMNS)}
+        FROM sleep WHERE baby_id = ? AND end_time IS NULL
+        ORDER BY start_time DESC)
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'night_waking', id, NULL, start_time, end_time, created_at, NULL, NULL, NULL, baby_id
+        FROM night_waking INDEXED BY idx_night_waking_active_by_baby
+        WHERE baby_id = ? AND end_time IS NULL
+        ORDER BY start_time DESC)'''
+
+
+def _get_active_state(baby_id):
+    """Request-weiter Snapshot aller offenen Schlaf-/Aufwach-Einträge eines Kindes.
+
+    get_active_sleep, get_active_sleep_by_type, NightWaking.get_active und
+    get_today_sleep_duration fragen pro Dashboard-Aufruf mehrfach nach Zeilen
+    mit end_time IS NULL. Statt jeweils eigener Queries wird einmal pro Request
+    und Kind über die partiellen Indizes (020) gelesen und in flask.g gehalten
+    (analog zu get_active_baby_id). Schreibzugriffe auf sleep/night_waking
+    verwerfen den Snapshot über _sleep_data_changed().
+
+    Liefert {'sleeps': [...], 'wakings': [...]}, jeweils neueste zuerst.
+    """
+    cache = g.setdefault('active_state', {})
+    state = cache.get(baby_id)
+    if state is not None:
+        return state
+
+    rows = get_db().execute(_ACTIVE_STATE_SQL, (baby_id, baby_id)).fetchall()
+
+    sleeps, wakings = [], []
+    for row in rows:
+        if row['kind'] == 'sleep':
+            sleeps.append({col: row[col] for col in _SLEEP_COLUMNS})
+        else:
+            wakings.append({col: row[col] for col in _NIGHT_WAKING_COLUMNS})
+    # UNION ALL garantiert keine Reihenfolge; es sind ohnehin nur 0-2 Zeilen
+    sleeps.sort(key=lambda r: r['start_time'], reverse=True)
+    wakings.sort(key=lambda r: r['start_time'], reverse=True)
+    state = {'sleeps': sleeps, 'wakings': wakings}
+    cache[baby_id] = state
+    return state
+
+
+def _invalidate_active_state():
+    """Verwirft den Snapshot aus _get_active_state() und die Intervall-Indizes nach Schreibzugriffen."""
+    g.pop('active_state', None)
+    invalidate_interval_indexes()
+
+
+def _encode_nap_suggestions(suggestions):
+    """Serialisiert Nickerchen-Vorschläge für daily_nap_suggestions (datetime -> ISO)."""
+    return json.dumps([
+        {key: (value.isoformat() if isinstance(value, datetime) else value)
+         for key, value in suggestion.items()}
+        for suggestion in suggestions
+    ])
+
+
+def _decode_nap_suggestions(payload):
+    """Gegenstück zu _encode_nap_suggestions; suggested_time wird wieder zum datetime."""
+    suggestions = json.loads(payload)
+    for suggestion in suggestions:
+        if 'suggested_time' in suggestion:
+            suggestion['suggested_time'] = parse_timestamp(suggestion['suggested_time'])
+    return suggestions
+
+
+def _sleep_data_changed(baby_id):
+    """Nach jedem Schreibzugriff auf sleep/night_waking aufzurufen.
+
+    Verwirft den Aktiv-Snapshot und berechnet die Nickerchen-Vorschläge für heute
+    neu (Migration 021). Gespeicherte Vorschläge anderer Tage werden gelöscht und
+    beim nächsten Lesen neu berechnet, da eine Korrektur alter Einträge auch sie
+    betreffen kann. Der eigentliche Eintrag ist bereits committet - ein Fehler
+    beim Cache darf ihn nicht mit einem 500er quittieren.
+    """
+    _invalidate_active_state()
+    try:
+        get_db().execute('DELETE FROM daily_nap_suggestions WHERE baby_id = ? AND date <> ?',
+                         (baby_id, date.today().isoformat()))
+        BabyInfo.refresh_nap_suggestions(baby_id=baby_id)
+    except sqlite3.Error:
+        pass
+
+
 class Sleep:
     """Schlaf-Tracking"""
     @staticmethod
@@ -119,11 +294,16 @@ class Sleep:
                          'sleep_location': sleep_location, 'sleep_comment': sleep_comment}
         if _is_recent_duplicate(db, 'sleep', 'start_time', start_time, match_fields, baby_id=baby_id):
             return None
+        _check_overlap(db, 'sleep', start_time, end_time, baby_id)
         cursor = db.execute(
             'INSERT INTO sleep (type, start_time, end_time, sleep_quality, sleep_location, sleep_comment, baby_id) VALUES (?, ?, ?, ?, ?, ?, ?)',
             ('nap', start_time, end_time, sleep_quality, sleep_location, sleep_comment, baby_id)
         )
         db.commit()
+        if end_time:
+            # Nachgetragenes Nickerchen kann den Tagschlaf bereits eingerechneter Nächte ändern
+            NightSleepModel.invalidate_since(start_time, baby_id=baby_id)
+        _sleep_data_changed(baby_id)
         return cursor.lastrowid
 
     @staticmethod
@@ -135,11 +315,15 @@ class Sleep:
                          'sleep_location': sleep_location, 'sleep_comment': sleep_comment}
         if _is_recent_duplicate(db, 'sleep', 'start_time', start_time, match_fields, baby_id=baby_id):
             return None
+        _check_overlap(db, 'sleep', start_time, end_time, baby_id)
         cursor = db.execute(
             'INSERT INTO sleep (type, start_time, end_time, sleep_quality, sleep_location, sleep_comment, baby_id) VALUES (?, ?, ?, ?, ?, ?, ?)',
             ('night', start_time, end_time, sleep_quality, sleep_location, sleep_comment, baby_id)
         )
         db.commit()
+        if end_time:
+            NightSleepModel.observe_night(start_time, end_time, baby_id=baby_id)
+        _sleep_data_changed(baby_id)
         return cursor.lastrowid
 
     @staticmethod
@@ -147,40 +331,42 @@ class Sleep:
         """Beendet einen Schlaf"""
         baby_id = baby_id or get_active_baby_id()
         db = get_db()
+        row = db.execute('SELECT type, start_time FROM sleep WHERE id = ? AND baby_id = ?',
+                         (sleep_id, baby_id)).fetchone()
+        if row:
+            _check_overlap(db, 'sleep', row['start_time'], end_time, baby_id, exclude_id=sleep_id)
         db.execute(
             'UPDATE sleep SET end_time = ? WHERE id = ? AND baby_id = ?',
             (end_time, sleep_id, baby_id)
         )
         db.commit()
+        if row and row['type'] == 'night':
+            NightSleepModel.observe_night(row['start_time'], end_time, baby_id=baby_id)
+        elif row:
+            NightSleepModel.invalidate_since(row['start_time'], baby_id=baby_id)
+        _sleep_data_changed(baby_id)
 
     @staticmethod
     def get_active_sleep(baby_id=None):
         """Gibt den aktiven Schlaf zurück (falls vorhanden) – neuesten ohne Endzeit"""
         baby_id = baby_id or get_active_baby_id()
-        db = get_db()
-        row = db.execute(
-            'SELECT * FROM sleep WHERE end_time IS NULL AND baby_id = ? ORDER BY start_time DESC LIMIT 1',
-            (baby_id,)
-        ).fetchone()
-        return dict(row) if row else None
+        sleeps = _get_active_state(baby_id)['sleeps']
+        return dict(sleeps[0]) if sleeps else None
 
     @staticmethod
     def get_active_sleep_by_type(sleep_type, baby_id=None):
         """Gibt den aktiven Schlaf eines bestimmten Typs zurück ('nap' oder 'night').
         Verhindert, dass ein offenes Nickerchen einen aktiven Nachtschlaf überdeckt."""
         baby_id = baby_id or get_active_baby_id()
-        db = get_db()
-        row = db.execute(
-            'SELECT * FROM sleep WHERE end_time IS NULL AND type = ? AND baby_id = ? ORDER BY start_time DESC LIMIT 1',
-            (sleep_type, baby_id)
-        ).fetchone()
-        return dict(row) if row else None
+        for row in _get_active_state(baby_id)['sleeps']:
+            if row['type'] == sleep_type:
+                return dict(row)
+        return None
     
     @staticmethod
     def get_today_sleep_duration(selected_date=None, baby_id=None):
         """Berechnet die Schlafdauer für einen bestimmten Tag in Stunden"""
         baby_id = baby_id or get_active_baby_id()
-        db = get_db()
 
         # Normalisiere selected_date zu einem date-Objekt
         if selected_date is None:
@@ -192,122 +378,30 @@ class Sleep:
         
         total_seconds = 0.0
         
-        # PERFORMANCE-OPTIMIERUNG: Hole nur relevante Schlaf-Einträge mit Range-Query
-        # Statt alle Einträge zu holen, filtern wir direkt in der DB
-        # Ein Tag: von 00:00:00 bis 23:59:59
-        day_start = datetime.combine(selected_date, datetime.min.time())
-        day_end = datetime.combine(selected_date, datetime.max.time().replace(hour=23, minute=59, second=59))
-        day_start_str = day_start.strftime('%Y-%m-%dT%H:%M:%S')
-        day_end_str = day_end.strftime('%Y-%m-%dT%H:%M:%S')
-        
-        # Hole nur Einträge, die am ausgewählten Tag enden
-        # Dies nutzt den Index auf end_time viel besser als date(end_time)
-        all_rows = db.execute(
-            '''SELECT type, start_time, end_time FROM sleep
-               WHERE end_time IS NOT NULL
-               AND end_time >= ? AND end_time <= ?
-               AND baby_id = ?''',
-            (day_start_str, day_end_str, baby_id)
-        ).fetchall()
-        
-        # Hilfsfunktion zum Parsen von Zeitstempeln - EINFACH und DIREKT
-        def parse_to_berlin(dt_str):
-            """Parst einen Zeitstempel-String und konvertiert ihn zur Berliner Zeitzone"""
-            if not dt_str:
-                return None
-            
-            dt_str = str(dt_str).strip()
-            
-            # Format in DB: 2026-01-02T19:59 (ohne Sekunden, ohne Zeitzone)
-            # Entferne Zeitzone-Info falls vorhanden
-            if dt_str.endswith('Z'):
-                dt_str = dt_str[:-1]
-            elif '+' in dt_str:
-                plus_pos = dt_str.rfind('+')
-                if plus_pos > 10:
-                    dt_str = dt_str[:plus_pos]
-            elif dt_str.count('-') > 2:
-                # Prüfe ob letztes '-' eine Zeitzone ist (Format: -HH:MM)
-                parts = dt_str.rsplit('-', 1)
-                if len(parts) == 2 and ':' in parts[1] and len(parts[1]) <= 6:
-                    dt_str = parts[0]
-            
-            # Entferne Mikrosekunden
-            if '.' in dt_str:
-                dt_str = dt_str.split('.')[0]
-            
-            # Parse - versuche zuerst mit Sekunden, dann ohne
-            dt = None
-            for fmt in ['%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M']:
-                try:
-                    dt = datetime.strptime(dt_str, fmt)
-                    break
-                except ValueError:
-                    continue
-            
-            if dt is None:
-                return None
-            
-            # Konvertiere zu Berliner Zeitzone (immer, da DB keine Zeitzone hat)
-            dt = normalize_to_berlin(dt)
-            
-            return dt
-        
-        # Verarbeite jeden Eintrag
-        for row in all_rows:
-            try:
-                # Hole Spalten - verwende direkten Zugriff
-                sleep_type = str(row['type']).strip()
-                start_str = str(row['start_time']).strip()
-                end_str = str(row['end_time']).strip()
-                
-                # Parse Zeitstempel
-                start_dt = parse_to_berlin(start_str)
-                end_dt = parse_to_berlin(end_str)
-                
-                if start_dt is None or end_dt is None:
-                    # Wenn Parsing fehlschlägt, versuche es mit einem einfacheren Ansatz
-                    # Manchmal sind die Werte bereits datetime-Objekte
-                    if isinstance(row['start_time'], datetime):
-                        start_dt = row['start_time']
-                        start_dt = normalize_to_berlin(start_dt)
-                    if isinstance(row['end_time'], datetime):
-                        end_dt = row['end_time']
-                        end_dt = normalize_to_berlin(end_dt)
-                    
-                    if start_dt is None or end_dt is None:
-                        continue
-                
-                # Hole Datum von Start und Ende
-                start_date = start_dt.date()
-                end_date = end_dt.date()
-                
-                # Prüfe ob dieser Eintrag für den ausgewählten Tag relevant ist
-                # WICHTIG: Eintrag ist relevant, wenn er am ausgewählten Tag ENDET
-                if end_date == selected_date:
-                    # Für alle Schlaf-Einträge (Nickerchen und Nachtschlaf): Gesamte Dauer von Start bis Ende zählen
-                    duration_seconds = (end_dt - start_dt).total_seconds()
-                    
-                    # Für Nachtschlaf: Ziehe nächtliches Aufwachen ab
-                    if sleep_type == 'night':
-                        waking_duration = NightWaking.get_total_waking_duration(
-                            start_str, end_str, baby_id=baby_id
-                        )
-                        duration_seconds = max(0, duration_seconds - (waking_duration * 3600))
-
-                    total_seconds += duration_seconds
-                            
-            except Exception as e:
-                # Bei Fehler: Weiter mit nächstem Eintrag
+        # Einträge, die am ausgewählten Tag ENDEN (auch Nachtschlaf vom Vortag),
+        # über den Intervall-Index: exakt auch an Tagen mit Zeitumstellung
+        day_start_dt = normalize_to_berlin(datetime.combine(selected_date, datetime.min.time()))
+        day_end_dt = normalize_to_berlin(datetime.combine(selected_date + timedelta(days=1), datetime.min.time()))
+        sleep_index = get_interval_index('sleep', day_start_dt, day_end_dt, baby_id=baby_id)
+
+        for item in sleep_index.overlapping(day_start_dt, day_end_dt):
+            if item.end is None or item.end.date() != selected_date:
                 continue
+            # Für alle Schlaf-Einträge (Nickerchen und Nachtschlaf): Gesamte Dauer von Start bis Ende zählen
+            duration_seconds = (item.end - item.start).total_seconds()
+
+            # Für Nachtschlaf: Ziehe nächtliches Aufwachen ab
+            if str(item.row['type']).strip() == 'night':
+                waking_duration = NightWaking.get_total_waking_duration(
+                    item.row['start_time'], item.row['end_time'], baby_id=baby_id
+                )
+                duration_seconds = max(0, duration_seconds - (waking_duration * 3600))
+
+            total_seconds += duration_seconds
         
         # Aktive Schlaf-Einträge (noch nicht beendet) - nur für heute relevant
         if selected_date == date.today():
-            active_sleep_rows = db.execute(
-                '''SELECT type, start_time FROM sleep
-                   WHERE end_time IS NULL AND baby_id = ?''',
-                (baby_id,)
-            ).fetchall()
+            active_sleep_rows = _get_active_state(baby_id)['sleeps']
             
             day_start_dt = normalize_to_berlin(datetime.combine(selected_date, datetime.min.time()))
             day_end_dt = normalize_to_berlin(datetime.combine(selected_date, datetime.max.time().replace(hour=23, minute=59, second=59)))
@@ -319,7 +413,7 @@ class Sleep:
                     except (KeyError, IndexError):
                         sleep_type = 'night'
                     
-                    start_dt = parse_to_berlin(row['start_time'])
+                    start_dt = parse_timestamp(row['start_time'])
                     if start_dt is None:
                         continue
                     
@@ -370,6 +464,7 @@ class Sleep:
         """Aktualisiert einen Schlaf-Eintrag"""
         baby_id = baby_id or get_active_baby_id()
         db = get_db()
+        _check_overlap(db, 'sleep', start_time, end_time, baby_id, exclude_id=sleep_id)
         if sleep_type:
             db.execute(
                 '''UPDATE sleep
@@ -387,6 +482,9 @@ class Sleep:
                 (start_time, end_time, sleep_quality, sleep_location, sleep_comment, sleep_id, baby_id)
             )
         db.commit()
+        # Korrekturen der Historie lassen sich nicht inkrementell einrechnen
+        NightSleepModel.rebuild(baby_id=baby_id)
+        _sleep_data_changed(baby_id)
 
     @staticmethod
     def delete(sleep_id, baby_id=None):
@@ -395,8 +493,11 @@ class Sleep:
         db = get_db()
         db.execute('DELETE FROM sleep WHERE id = ? AND baby_id = ?', (sleep_id, baby_id))
         db.commit()
+        NightSleepModel.rebuild(baby_id=baby_id)
+        _sleep_data_changed(baby_id)
 
     @staticmethod
+    @cached_statistics('sleep', 'night_waking')
     def get_sleep_statistics(start_date, end_date, baby_id=None):
         """Gibt Schlaf-Statistiken für einen Zeitraum zurück"""
         baby_id = baby_id or get_active_baby_id()
@@ -417,6 +518,13 @@ class Sleep:
         range_end = datetime.combine(end_date_obj, datetime.max.time().replace(hour=23, minute=59, second=59))
         range_start_str = range_start.strftime('%Y-%m-%dT%H:%M:%S')
         range_end_str = range_end.strftime('%Y-%m-%dT%H:%M:%S')
+
+        # Lange Zeiträume mit NumPy als Arrays rechnen (gleiches Ergebnis, siehe Modul)
+        if (vectorized_stats.is_available()
+                and (end_date_obj - start_date_obj).days > vectorized_stats.VECTORIZE_MIN_DAYS):
+            return vectorized_stats.get_sleep_statistics(
+                db, baby_id, start_date_obj, end_date_obj, range_start_str, range_end_str, start_date, end_date
+            )
         
         # Alle Schlaf-Einträge, die im Zeitraum gestartet haben
         rows = db.execute(
@@ -433,6 +541,11 @@ class Sleep:
                ORDER BY start_time''',
             (range_start_str, range_start_str, range_end_str, baby_id)
         ).fetchall()
+
+        # Aufwachen aller Nächte des Zeitraums (inkl. Vortag/Folgetag) einmal in den
+        # Intervall-Index laden - get_total_waking_duration fragt dann ohne Query pro Nacht
+        get_interval_index('night_waking', start_date_obj - timedelta(days=1),
+                           end_date_obj + timedelta(days=1), baby_id=baby_id)
         
         daily_sleep = {}  # {date: total_hours}
         nap_hours = 0
@@ -446,13 +559,8 @@ class Sleep:
         # Verarbeite Einträge, die im Zeitraum gestartet haben
         for row in rows:
             try:
-                start = datetime.fromisoformat(row['start_time'].replace('Z', '+00:00'))
-                end = datetime.fromisoformat(row['end_time'].replace('Z', '+00:00'))
-                
-                # Konvertiere zu Berliner Zeitzone falls nötig
-                start = normalize_to_berlin(start)
-                
-                end = normalize_to_berlin(end)
+                start = to_berlin(row['start_time'])
+                end = to_berlin(row['end_time'])
                 
                 # Gesamtdauer berechnen
                 duration_hours = (end - start).total_seconds() / 3600
@@ -512,13 +620,8 @@ class Sleep:
         # Verarbeite Einträge, die vor dem Zeitraum gestartet haben, aber im Zeitraum enden
         for row in rows_prev:
             try:
-                start = datetime.fromisoformat(row['start_time'].replace('Z', '+00:00'))
-                end = datetime.fromisoformat(row['end_time'].replace('Z', '+00:00'))
-                
-                # Konvertiere zu Berliner Zeitzone falls nötig
-                start = normalize_to_berlin(start)
-                
-                end = normalize_to_berlin(end)
+                start = to_berlin(row['start_time'])
+                end = to_berlin(row['end_time'])
                 
                 # Gesamtdauer berechnen
                 duration_hours = (end - start).total_seconds() / 3600
@@ -620,6 +723,75 @@ class Sleep:
             'sleep_location_counts': location_counts,
         }
 
+    @staticmethod
+    @cached_statistics('sleep')
+    def get_wake_window_statistics(start_date, end_date, baby_id=None):
+        """Verteilung der Wachfenster (Schlafende -> nächster Schlafbeginn) im Zeitraum.
+
+        Die Wachfenster kommen per LAG() aus SQLite, beschränkt auf den Zeitraum plus
+        den letzten Schlaf davor. Einsortiert wird nach der Tageszeit, zu der das
+        Wachfenster beginnt (WAKE_WINDOW_BUCKETS), und nach dem Tag des folgenden
+        Schlafbeginns. Werte in Minuten.
+
+        Liefert {'count', 'buckets': [{key, count, min, median, max}],
+                 'days': [{date, count, min, median, max, buckets: {key: {...}}}]}.
+        """
+        baby_id = baby_id or get_active_baby_id()
+        db = get_db()
+        if isinstance(start_date, str):
+            start_date = date.fromisoformat(start_date)
+        if isinstance(end_date, str):
+            end_date = date.fromisoformat(end_date)
+        range_start_str = start_date.isoformat()
+        range_end_str = (end_date + timedelta(days=1)).isoformat()
+
+        rows = db.execute(
+            '''SELECT start_time, prev_end_time FROM (
+                   SELECT start_time,
+                          LAG(end_time) OVER (PARTITION BY baby_id ORDER BY start_time) AS prev_end_time
+                   FROM sleep
+                   WHERE baby_id = ?
+                   AND start_time >= COALESCE(
+                       (SELECT MAX(start_time) FROM sleep WHERE baby_id = ? AND start_time < ?), ?)
+                   AND start_time < ?
+               )
+               WHERE start_time >= ? AND prev_end_time IS NOT NULL''',
+            (baby_id, baby_id, range_start_str, range_start_str, range_end_str, range_start_str)
+        ).fetchall()
+
+        by_bucket = {key: [] for key, _ in WAKE_WINDOW_BUCKETS}
+        by_day = {}
+        for row in rows:
+            sleep_start = parse_timestamp(row['start_time'])
+            wake_start = parse_timestamp(row['prev_end_time'])
+            if sleep_start is None or wake_start is None:
+                continue
+            minutes = (sleep_start - wake_start).total_seconds() / 60
+            # Überlappungen und Lücken durch fehlende Einträge sind keine Wachfenster
+            if minutes <= 0 or minutes > MAX_WAKE_WINDOW_HOURS * 60:
+                continue
+            bucket = _wake_window_bucket(wake_start.hour)
+            by_bucket[bucket].append(minutes)
+            day = by_day.setdefault(sleep_start.date().isoformat(), {})
+            day.setdefault(bucket, []).append(minutes)
+
+        days = []
+        for day_str in sorted(by_day):
+            day_buckets = by_day[day_str]
+            values = [value for bucket_values in day_buckets.values() for value in bucket_values]
+            days.append({
+                'date': day_str,
+                **_distribution(values),
+                'buckets': {key: _distribution(day_buckets[key]) for key, _ in WAKE_WINDOW_BUCKETS
+                            if key in day_buckets},
+            })
+
+        return {
+            'count': sum(len(values) for values in by_bucket.values()),
+            'buckets': [{'key': key, **_distribution(by_bucket[key])} for key, _ in WAKE_WINDOW_BUCKETS],
+            'days': days,
+        }
+
 class NightWaking:
     """Nächtliches Aufwachen-Tracking"""
     @staticmethod
@@ -629,34 +801,42 @@ class NightWaking:
         db = get_db()
         if _is_recent_duplicate(db, 'night_waking', 'start_time', start_time, {'end_time': end_time}, baby_id=baby_id):
             return None
+        _check_overlap(db, 'night_waking', start_time, end_time, baby_id)
         cursor = db.execute(
             'INSERT INTO night_waking (start_time, end_time, baby_id) VALUES (?, ?, ?)',
             (start_time, end_time, baby_id)
         )
         db.commit()
+        if end_time:
+            NightSleepModel.invalidate_since(end_time, baby_id=baby_id)
+        _sleep_data_changed(baby_id)
         return cursor.lastrowid
 
     @staticmethod
     def get_active(baby_id=None):
         """Gibt das aktive nächtliche Aufwachen zurück (falls vorhanden)"""
         baby_id = baby_id or get_active_baby_id()
-        db = get_db()
-        row = db.execute(
-            'SELECT * FROM night_waking WHERE end_time IS NULL AND baby_id = ? ORDER BY start_time DESC LIMIT 1',
-            (baby_id,)
-        ).fetchone()
-        return dict(row) if row else None
+        wakings = _get_active_state(baby_id)['wakings']
+        return dict(wakings[0]) if wakings else None
 
     @staticmethod
     def end_waking(waking_id, end_time, baby_id=None):
         """Beendet ein nächtliches Aufwachen"""
         baby_id = baby_id or get_active_baby_id()
         db = get_db()
+        row = db.execute('SELECT start_time FROM night_waking WHERE id = ? AND baby_id = ?',
+                         (waking_id, baby_id)).fetchone()
+        if row:
+            _check_overlap(db, 'night_waking', row['start_time'], end_time, baby_id, exclude_id=waking_id)
         db.execute(
             'UPDATE night_waking SET end_time = ? WHERE id = ? AND baby_id = ?',
             (end_time, waking_id, baby_id)
         )
         db.commit()
+        # Endet das Aufwachen nach der zuletzt eingerechneten Nacht, liegt es in
+        # keiner davon vollständig - der Normalfall ohne Neuaufbau
+        NightSleepModel.invalidate_since(end_time, baby_id=baby_id)
+        _sleep_data_changed(baby_id)
 
     @staticmethod
     def get_by_id(waking_id, baby_id=None):
@@ -670,102 +850,35 @@ class NightWaking:
     def get_wakings_for_night_sleep(night_sleep_start, night_sleep_end, baby_id=None):
         """Gibt alle nächtlichen Aufwachen für einen bestimmten Nachtschlaf zurück"""
         baby_id = baby_id or get_active_baby_id()
-        db = get_db()
 
-        # Issue #46: night_sleep_start/-end tragen ein Zeitzonen-Offset (+01:00/+02:00),
-        # das sich zwischen Sommer- und Winterzeit ändert. Ein lexikografischer Vergleich
-        # zweier offset-behafteter Strings ist rund um eine Zeitumstellung nicht mehr
-        # verlässlich sortierbar (ein Aufwachen kurz nach der Umstellung kann trotz
-        # späterem tatsächlichem Zeitpunkt "kleiner" erscheinen als der Nachtschlaf-Start).
-        # Deshalb wird per SQL nur grosszügig mit Sicherheitsmarge vorgefiltert und die
-        # exakte Prüfung danach zeitzonen-bewusst mit echten datetime-Objekten gemacht.
-        try:
-            sleep_start = datetime.fromisoformat(str(night_sleep_start).replace('Z', '+00:00'))
-            sleep_start = normalize_to_berlin(sleep_start)
-            sleep_end = datetime.fromisoformat(str(night_sleep_end).replace('Z', '+00:00'))
-            sleep_end = normalize_to_berlin(sleep_end)
-        except (ValueError, AttributeError):
-            sleep_start = sleep_end = None
-
-        if sleep_start is not None:
-            margin = timedelta(hours=2)
-            query_start = (sleep_start - margin).strftime('%Y-%m-%dT%H:%M:%S')
-            query_end = (sleep_end + margin).strftime('%Y-%m-%dT%H:%M:%S')
-        else:
-            query_start, query_end = night_sleep_start, night_sleep_end
-
-        rows = db.execute(
-            '''SELECT * FROM night_waking
-               WHERE start_time >= ? AND start_time <= ?
-               AND (end_time IS NULL OR (end_time >= ? AND end_time <= ?))
-               AND baby_id = ?
-               ORDER BY start_time''',
-            (query_start, query_end, query_start, query_end, baby_id)
-        ).fetchall()
+        # Issue #46: Die Zeitstempel tragen wechselnde Offsets (+01:00/+02:00), ein
+        # String-Vergleich ist rund um eine Zeitumstellung nicht verlässlich. Der
+        # Intervall-Index vergleicht echte datetime-Objekte und wird pro Request
+        # einmal geladen - Statistiken fragen hier für jede Nacht an.
+        sleep_start = parse_timestamp(night_sleep_start)
+        sleep_end = parse_timestamp(night_sleep_end)
+        if sleep_start is None or sleep_end is None:
+            return []
 
-        if sleep_start is None:
-            return [dict(row) for row in rows]
-
-        result = []
-        for row in rows:
-            try:
-                start_time = datetime.fromisoformat(str(row['start_time']).replace('Z', '+00:00'))
-                start_time = normalize_to_berlin(start_time)
-                if not (sleep_start <= start_time <= sleep_end):
-                    continue
-                if row['end_time']:
-                    end_time = datetime.fromisoformat(str(row['end_time']).replace('Z', '+00:00'))
-                    end_time = normalize_to_berlin(end_time)
-                    if not (sleep_start <= end_time <= sleep_end):
-                        continue
-            except (ValueError, AttributeError):
-                continue
-            result.append(dict(row))
-        return result
+        index = get_interval_index('night_waking', sleep_start, sleep_end, baby_id=baby_id)
+        return [dict(item.row) for item in index.contained(sleep_start, sleep_end)]
     
     @staticmethod
     def get_total_waking_duration(night_sleep_start, night_sleep_end, baby_id=None):
         """Berechnet die Gesamtdauer des nächtlichen Aufwachens für einen Nachtschlaf in Stunden"""
-        wakings = NightWaking.get_wakings_for_night_sleep(night_sleep_start, night_sleep_end, baby_id=baby_id)
+        baby_id = baby_id or get_active_baby_id()
+        sleep_start = parse_timestamp(night_sleep_start)
+        sleep_end = parse_timestamp(night_sleep_end)
+        if sleep_start is None or sleep_end is None:
+            return 0.0
+
+        index = get_interval_index('night_waking', sleep_start, sleep_end, baby_id=baby_id)
         total_seconds = 0.0
-        
-        for waking in wakings:
-            if not waking.get('end_time'):
-                # Aktives Aufwachen: bis zum aktuellen Zeitpunkt oder Nachtschlaf-Ende
-                now = datetime.now(tz_berlin)
-                try:
-                    end_dt = datetime.fromisoformat(night_sleep_end.replace('Z', '+00:00'))
-                    end_dt = normalize_to_berlin(end_dt)
-                    end_time = min(now, end_dt)
-                except (ValueError, AttributeError):
-                    end_time = now
-            else:
-                try:
-                    end_time = datetime.fromisoformat(waking['end_time'].replace('Z', '+00:00'))
-                    end_time = normalize_to_berlin(end_time)
-                except (ValueError, AttributeError):
-                    continue
-            
-            try:
-                start_time = datetime.fromisoformat(waking['start_time'].replace('Z', '+00:00'))
-                start_time = normalize_to_berlin(start_time)
-                
-                # Prüfe ob das Aufwachen innerhalb des Nachtschlafs liegt
-                try:
-                    sleep_start = datetime.fromisoformat(night_sleep_start.replace('Z', '+00:00'))
-                    sleep_start = normalize_to_berlin(sleep_start)
-                    
-                    sleep_end = datetime.fromisoformat(night_sleep_end.replace('Z', '+00:00'))
-                    sleep_end = normalize_to_berlin(sleep_end)
-                    
-                    # Nur Aufwachen innerhalb des Nachtschlafs zählen
-                    if start_time >= sleep_start and end_time <= sleep_end:
-                        duration_seconds = (end_time - start_time).total_seconds()
-                        total_seconds += duration_seconds
-                except (ValueError, AttributeError):
-                    pass
-            except (ValueError, AttributeError):
-                continue
+        # Nur vollständig im Nachtschlaf liegendes Aufwachen zählt; ein aktives
+        # Aufwachen läuft bis jetzt bzw. bis zum Nachtschlaf-Ende
+        for item in index.contained(sleep_start, sleep_end):
+            end_time = item.end if item.end is not None else min(index.now, sleep_end)
+            total_seconds += (end_time - item.start).total_seconds()
         
         return round(total_seconds / 3600, 2) if total_seconds > 0 else 0.0
     
@@ -774,11 +887,14 @@ class NightWaking:
         """Aktualisiert einen nächtliches Aufwachen-Eintrag"""
         baby_id = baby_id or get_active_baby_id()
         db = get_db()
+        _check_overlap(db, 'night_waking', start_time, end_time, baby_id, exclude_id=waking_id)
         db.execute(
             'UPDATE night_waking SET start_time = ?, end_time = ? WHERE id = ? AND baby_id = ?',
             (start_time, end_time, waking_id, baby_id)
         )
         db.commit()
+        NightSleepModel.rebuild(baby_id=baby_id)
+        _sleep_data_changed(baby_id)
 
     @staticmethod
     def delete(waking_id, baby_id=None):
@@ -787,6 +903,8 @@ class NightWaking:
         db = get_db()
         db.execute('DELETE FROM night_waking WHERE id = ? AND baby_id = ?', (waking_id, baby_id))
         db.commit()
+        NightSleepModel.rebuild(baby_id=baby_id)
+        _sleep_data_changed(baby_id)
 
 class Feeding:
     """Stillen-Tracking"""
@@ -843,6 +961,7 @@ class Feeding:
         db.commit()
 
     @staticmethod
+    @cached_statistics('feeding')
     def get_feeding_statistics(start_date, end_date, baby_id=None):
         """Gibt Still-Statistiken für einen Zeitraum zurück"""
         baby_id = baby_id or get_active_baby_id()
@@ -863,25 +982,56 @@ class Feeding:
         range_start_str = range_start.strftime('%Y-%m-%dT%H:%M:%S')
         range_end_str = range_end.strftime('%Y-%m-%dT%H:%M:%S')
 
-        # Alle Still-Einträge im Zeitraum
+        # Aggregate je Tag und Seite in SQLite; Dauer nur mit plausiblem end_time
         rows = db.execute(
-            '''SELECT id FROM feeding
-               WHERE timestamp >= ? AND timestamp <= ? AND baby_id = ?''',
+            f'''SELECT substr(timestamp, 1, 10) AS day, side, COUNT(*) AS count,
+                      COUNT(duration) AS timed, SUM(duration) AS minutes
+               FROM (SELECT timestamp, side,
+                            CASE WHEN end_time IS NOT NULL
+                                  AND julianday(end_time) > julianday(timestamp)
+                                  AND julianday(end_time) - julianday(timestamp) <= {FEEDING_MAX_HOURS} / 24.0
+                                 THEN (julianday(end_time) - julianday(timestamp)) * 1440
+                            END AS duration
+                     FROM feeding
+                     WHERE timestamp >= ? AND timestamp <= ? AND baby_id = ?)
+               GROUP BY day, side''',
             (range_start_str, range_end_str, baby_id)
         ).fetchall()
-        
-        total_count = len(rows)
-        
+
+        daily_counts = {}
+        sides = {side: {'count': 0, 'timed_count': 0, 'minutes': 0.0} for side in FEEDING_SIDES}
+        for row in rows:
+            daily_counts[row['day']] = daily_counts.get(row['day'], 0) + row['count']
+            side = sides[row['side']]
+            side['count'] += row['count']
+            side['timed_count'] += row['timed']
+            side['minutes'] += row['minutes'] or 0.0
+
+        total_count = sum(side['count'] for side in sides.values())
+        timed_count = sum(side['timed_count'] for side in sides.values())
+        total_minutes = sum(side['minutes'] for side in sides.values())
+        for side in sides.values():
+            side['avg_minutes'] = round(side['minutes'] / side['timed_count'], 1) if side['timed_count'] else 0
+            side['minutes'] = round(side['minutes'], 1)
+
         # Berechne Anzahl der Tage im Zeitraum
         days_count = (end_date_obj - start_date_obj).days + 1
-        
+
         # Durchschnittswert
         avg_count = round(total_count / days_count, 1) if days_count > 0 else 0
-        
+
         return {
             'total_count': total_count,
             'avg_count': avg_count,
-            'days_count': days_count
+            'days_count': days_count,
+            'daily_counts': daily_counts,  # {date: Anzahl}, nur Tage mit Einträgen
+            'timed_count': timed_count,  # Einträge mit Dauer (end_time)
+            'total_minutes': round(total_minutes, 1),
+            'avg_duration_minutes': round(total_minutes / timed_count, 1) if timed_count else 0,
+            'sides': sides,  # {'links'/'rechts': count, timed_count, minutes, avg_minutes}
+            # Seitenverteilung: Anteil links in % nach Anzahl bzw. Dauer (None ohne Daten)
+            'left_share': round(100 * sides['links']['count'] / total_count) if total_count else None,
+            'left_minutes_share': round(100 * sides['links']['minutes'] / total_minutes) if total_minutes else None,
         }
 
 class Bottle:
@@ -1040,6 +1190,7 @@ class Diaper:
         db.commit()
 
     @staticmethod
+    @cached_statistics('diaper')
     def get_diaper_statistics(start_date, end_date, baby_id=None):
         """Gibt Windel-Statistiken für einen Zeitraum zurück"""
         baby_id = baby_id or get_active_baby_id()
@@ -1060,27 +1211,22 @@ class Diaper:
         range_start_str = range_start.strftime('%Y-%m-%dT%H:%M:%S')
         range_end_str = range_end.strftime('%Y-%m-%dT%H:%M:%S')
 
-        # Alle Windel-Einträge im Zeitraum
-        rows = db.execute(
-            '''SELECT type FROM diaper
+        # Zählung in SQLite: eine Ergebniszeile statt aller Einträge
+        row = db.execute(
+            '''SELECT COUNT(*) AS total,
+                      COALESCE(SUM(type = 'nass'), 0) AS nass,
+                      COALESCE(SUM(type = 'groß'), 0) AS gross,
+                      COALESCE(SUM(type = 'beides'), 0) AS beides
+               FROM diaper
                WHERE timestamp >= ? AND timestamp <= ? AND baby_id = ?''',
             (range_start_str, range_end_str, baby_id)
-        ).fetchall()
-        
-        total_count = len(rows)
-        nass_count = 0
-        groß_count = 0
-        beides_count = 0
-        
-        for row in rows:
-            diaper_type = row['type']
-            if diaper_type == 'nass':
-                nass_count += 1
-            elif diaper_type == 'groß':
-                groß_count += 1
-            elif diaper_type == 'beides':
-                beides_count += 1
-        
+        ).fetchone()
+
+        total_count = row['total']
+        nass_count = row['nass']
+        groß_count = row['gross']
+        beides_count = row['beides']
+
         # Berechne Anzahl der Tage im Zeitraum
         days_count = (end_date_obj - start_date_obj).days + 1
         
@@ -1144,6 +1290,7 @@ class Temperature:
         db.commit()
 
     @staticmethod
+    @cached_statistics('temperature')
     def get_temperature_statistics(start_date, end_date, baby_id=None):
         """Gibt Temperatur-Statistiken für einen Zeitraum zurück"""
         baby_id = baby_id or get_active_baby_id()
@@ -1165,59 +1312,53 @@ class Temperature:
         range_start_str = range_start.strftime('%Y-%m-%dT%H:%M:%S')
         range_end_str = range_end.strftime('%Y-%m-%dT%H:%M:%S')
 
+        # Tagesaggregate in SQLite (Datum des lokalen Zeitstempels), Gesamtwerte daraus
         rows = db.execute(
-            '''SELECT timestamp, value FROM temperature
+            '''SELECT substr(timestamp, 1, 10) AS day, COUNT(*) AS count, SUM(value) AS total,
+                      MIN(value) AS min_value, MAX(value) AS max_value
+               FROM temperature
                WHERE timestamp >= ? AND timestamp <= ? AND baby_id = ?
-               ORDER BY timestamp''',
+               GROUP BY day''',
             (range_start_str, range_end_str, baby_id)
         ).fetchall()
-        
-        daily_temps = {}  # {date: [temperatures]}
-        all_temps = []  # Liste aller Temperatur-Einträge mit vollständigem Zeitstempel
-        
-        for row in rows:
-            try:
-                ts = datetime.fromisoformat(row['timestamp'].replace('Z', '+00:00'))
-                day_key = ts.date().isoformat()
-                
-                if day_key not in daily_temps:
-                    daily_temps[day_key] = []
-                
-                daily_temps[day_key].append(row['value'])
-                all_temps.append({
-                    'date': day_key,
-                    'timestamp': row['timestamp'],
-                    'datetime': ts,
-                    'value': row['value']
-                })
-            except (ValueError, AttributeError):
-                continue
-        
-        # Durchschnittswerte pro Tag berechnen (für Übersicht)
-        daily_avg = {}
-        for day, temps in daily_temps.items():
-            if temps:
-                daily_avg[day] = round(sum(temps) / len(temps), 1)
-        
+
+        # Durchschnittswerte pro Tag (für Übersicht)
+        daily_avg = {row['day']: round(row['total'] / row['count'], 1) for row in rows}
+        count = sum(row['count'] for row in rows)
+
         # Gesamtdurchschnitt
-        if all_temps:
-            avg_temp = round(sum(t['value'] for t in all_temps) / len(all_temps), 1)
-            min_temp = round(min(t['value'] for t in all_temps), 1)
-            max_temp = round(max(t['value'] for t in all_temps), 1)
+        if count:
+            avg_temp = round(sum(row['total'] for row in rows) / count, 1)
+            min_temp = round(min(row['min_value'] for row in rows), 1)
+            max_temp = round(max(row['max_value'] for row in rows), 1)
         else:
             avg_temp = 0
             min_temp = 0
             max_temp = 0
-        
+
         return {
             'daily_avg': daily_avg,  # {date: avg_temp} - für Tagesübersicht
-            'all_temps': all_temps,  # Liste aller Temperatur-Einträge mit Zeitstempel
             'avg_temp': avg_temp,
             'min_temp': min_temp,
             'max_temp': max_temp,
-            'count': len(all_temps)
+            'count': count
         }
 
+    @staticmethod
+    def get_in_range(start_date, end_date, min_value=None, baby_id=None):
+        """Messwerte (timestamp, value) im Zeitraum, optional nur über min_value (z.B. Fieber)."""
+        baby_id = baby_id or get_active_baby_id()
+        db = get_db()
+        start_str = datetime.combine(start_date, datetime.min.time()).strftime('%Y-%m-%dT%H:%M:%S')
+        end_str = datetime.combine(end_date, datetime.max.time().replace(hour=23, minute=59, second=59)).strftime('%Y-%m-%dT%H:%M:%S')
+        query = 'SELECT timestamp, value FROM temperature WHERE timestamp >= ? AND timestamp <= ? AND baby_id = ?'
+        params = [start_str, end_str, baby_id]
+        if min_value is not None:
+            query += ' AND value > ?'
+            params.append(min_value)
+        rows = db.execute(query + ' ORDER BY timestamp', params).fetchall()
+        return [dict(r) for r in rows]
+
 class Medicine:
     """Medizin-Tracking"""
     @staticmethod
@@ -1272,6 +1413,7 @@ class Illness:
             (start_time, end_time, illness_type, symptoms, notes, baby_id)
         )
         db.commit()
+        invalidate_interval_indexes()
         return cursor.lastrowid
 
     @staticmethod
@@ -1283,6 +1425,7 @@ class Illness:
             (start_time, end_time, illness_type, symptoms, notes, illness_id, baby_id)
         )
         db.commit()
+        invalidate_interval_indexes()
 
     @staticmethod
     def delete(illness_id, baby_id=None):
@@ -1290,6 +1433,7 @@ class Illness:
         db = get_db()
         db.execute('DELETE FROM illness WHERE id = ? AND baby_id = ?', (illness_id, baby_id))
         db.commit()
+        invalidate_interval_indexes()
 
     @staticmethod
     def get_by_id(illness_id, baby_id=None):
@@ -1299,10 +1443,10 @@ class Illness:
         return dict(row) if row else None
 
     @staticmethod
+    @cached_statistics('illness')
     def get_illness_statistics(start_date, end_date, baby_id=None):
-        """Einfache Statistik: Anzahl Erkrankungs-Episoden im Zeitraum"""
+        """Einfache Statistik: Anzahl Erkrankungs-Episoden und Krankheitstage im Zeitraum"""
         baby_id = baby_id or get_active_baby_id()
-        db = get_db()
         if isinstance(start_date, str):
             start_date_obj = date.fromisoformat(start_date)
         else:
@@ -1312,18 +1456,14 @@ class Illness:
         else:
             end_date_obj = end_date
 
-        range_start = datetime.combine(start_date_obj, datetime.min.time())
-        range_end = datetime.combine(end_date_obj, datetime.max.time().replace(hour=23, minute=59, second=59))
-        range_start_str = range_start.strftime('%Y-%m-%dT%H:%M:%S')
-        range_end_str = range_end.strftime('%Y-%m-%dT%H:%M:%S')
-
-        rows = db.execute(
-            '''SELECT id FROM illness
-               WHERE start_time <= ? AND (end_time IS NULL OR end_time >= ?) AND baby_id = ?''',
-            (range_end_str, range_start_str, baby_id)
-        ).fetchall()
+        range_start = normalize_to_berlin(datetime.combine(start_date_obj, datetime.min.time()))
+        range_end = normalize_to_berlin(datetime.combine(end_date_obj + timedelta(days=1), datetime.min.time()))
+        index = get_interval_index('illness', range_start, range_end, baby_id=baby_id)
 
-        total_count = len(rows)
+        # Episoden, die den Zeitraum berühren (auch noch laufende)
+        total_count = len(index.overlapping(range_start, range_end))
+        # Tage, an denen mindestens eine Episode lief (an Mitternacht geschnitten)
+        sick_days = sum(1 for seconds in index.seconds_per_day(start_date_obj, end_date_obj).values() if seconds > 0)
         days_count = (end_date_obj - start_date_obj).days + 1
         avg_count = round(total_count / days_count, 2) if days_count > 0 else 0
 
@@ -1331,8 +1471,20 @@ class Illness:
             'total_count': total_count,
             'avg_count': avg_count,
             'days_count': days_count,
+            'sick_days': sick_days,
         }
 
+def _measurement_summary(table, column, baby_id):
+    """Anzahl, Minimum, Maximum und letzter Wert einer Messreihe in einer Query (None ohne Einträge)."""
+    row = get_db().execute(
+        f'''SELECT COUNT(*) AS count, MIN({column}) AS min, MAX({column}) AS max,
+                  (SELECT {column} FROM {table} WHERE baby_id = ? ORDER BY timestamp DESC LIMIT 1) AS latest
+           FROM {table} WHERE baby_id = ?''',
+        (baby_id, baby_id)
+    ).fetchone()
+    return dict(row) if row['count'] else None
+
+
 class Weight:
     """Gewichtstracking"""
 
@@ -1354,6 +1506,11 @@ class Weight:
         rows = db.execute('SELECT * FROM weight WHERE baby_id = ? ORDER BY timestamp ASC', (baby_id,)).fetchall()
         return [dict(r) for r in rows]
 
+    @staticmethod
+    def get_summary(baby_id=None):
+        """Letzter Wert sowie Minimum/Maximum der gesamten Historie (für die Trends-Karte)."""
+        return _measurement_summary('weight', 'weight_kg', baby_id or get_active_baby_id())
+
     @staticmethod
     def get_by_id(weight_id, baby_id=None):
         baby_id = baby_id or get_active_baby_id()
@@ -1420,6 +1577,11 @@ class Height:
         rows = db.execute('SELECT * FROM height WHERE baby_id = ? ORDER BY timestamp ASC', (baby_id,)).fetchall()
         return [dict(r) for r in rows]
 
+    @staticmethod
+    def get_summary(baby_id=None):
+        """Letzter Wert sowie Minimum/Maximum der gesamten Historie (für die Trends-Karte)."""
+        return _measurement_summary('height', 'height_cm', baby_id or get_active_baby_id())
+
     @staticmethod
     def get_by_id(height_id, baby_id=None):
         baby_id = baby_id or get_active_baby_id()
@@ -1486,6 +1648,11 @@ class HeadCircumference:
         rows = db.execute('SELECT * FROM head_circumference WHERE baby_id = ? ORDER BY timestamp ASC', (baby_id,)).fetchall()
         return [dict(r) for r in rows]
 
+    @staticmethod
+    def get_summary(baby_id=None):
+        """Letzter Wert sowie Minimum/Maximum der gesamten Historie (für die Trends-Karte)."""
+        return _measurement_summary('head_circumference', 'head_circumference_cm', baby_id or get_active_baby_id())
+
     @staticmethod
     def get_by_id(head_circumference_id, baby_id=None):
         baby_id = baby_id or get_active_baby_id()
@@ -1538,14 +1705,17 @@ def _entry_belongs_to_day(entry, day):
     ts = entry.get('timestamp')
     if not ts:
         return False
-    start_date = (datetime.fromisoformat(ts) if isinstance(ts, str) else ts).date()
+    start_dt = parse_timestamp(ts)
+    if start_dt is None:
+        return False
+    start_date = start_dt.date()
     if start_date == day:
         return True
 
     end_time = entry.get('end_time')
     if end_time and start_date == day - timedelta(days=1):
-        end_dt = datetime.fromisoformat(end_time) if isinstance(end_time, str) else end_time
-        return end_dt.date() == day
+        end_dt = parse_timestamp(end_time)
+        return end_dt is not None and end_dt.date() == day
     return False
 
 def get_all_entries_today(selected_date=None, baby_id=None):
@@ -1594,24 +1764,32 @@ def get_all_entries_range(start_date, end_date, baby_id=None):
     
     entries = []
 
-    # PERFORMANCE (Issue #45): Alle relevanten Schlafenden einmalig sortiert laden,
-    # statt pro Eintrag eine eigene Query für die Wachzeit-Berechnung abzusetzen.
-    sorted_sleep_ends = _load_sorted_sleep_end_times(db, range_end_str, baby_id)
-
-    # PERFORMANCE: Eine Query für alle Schlaf-Einträge im Bereich
+    # PERFORMANCE: Eine Query für alle Schlaf-Einträge im Bereich. Die Wachzeit seit
+    # dem vorherigen Schlaf liefert LAG() direkt aus SQLite (Issue #45); damit der
+    # erste Eintrag im Bereich seinen Vorgänger kennt, beginnt das Fenster beim
+    # letzten Schlaf vor range_start - die Datenmenge wächst mit dem Bereich,
+    # nicht mit der gesamten Historie.
     sleep_rows = db.execute(
-        '''SELECT id, "sleep" as category, type, start_time as timestamp, end_time,
-                  sleep_quality, sleep_location, sleep_comment
-           FROM sleep
-           WHERE ((start_time >= ? AND start_time <= ?)
-           OR (end_time >= ? AND end_time <= ? AND end_time IS NOT NULL))
-           AND baby_id = ?''',
-        (range_start_str, range_end_str, range_start_str, range_end_str, baby_id)
+        '''SELECT id, type, timestamp, end_time, sleep_quality, sleep_location, sleep_comment,
+                  prev_end_time
+           FROM (
+               SELECT id, type, start_time AS timestamp, end_time,
+                      sleep_quality, sleep_location, sleep_comment,
+                      LAG(end_time) OVER (PARTITION BY baby_id ORDER BY start_time) AS prev_end_time
+               FROM sleep
+               WHERE baby_id = ?
+               AND start_time >= COALESCE(
+                   (SELECT MAX(start_time) FROM sleep WHERE baby_id = ? AND start_time < ?), ?)
+               AND start_time <= ?
+           )
+           WHERE (timestamp >= ? AND timestamp <= ?)
+           OR (end_time >= ? AND end_time <= ? AND end_time IS NOT NULL)''',
+        (baby_id, baby_id, range_start_str, range_start_str, range_end_str,
+         range_start_str, range_end_str, range_start_str, range_end_str)
     ).fetchall()
     for row in sleep_rows:
         # Wachzeit seit letztem Schlaf
-        prev_end_time = _find_prev_end(sorted_sleep_ends, row['timestamp'])
-        wake_duration = _format_wake_duration(prev_end_time, row['timestamp'])
+        wake_duration = _format_wake_duration(row['prev_end_time'], row['timestamp'])
 
         sleep_type_display = "Nachtschlaf" if row['type'] == 'night' else "Nickerchen"
         entries.append({
@@ -1627,21 +1805,17 @@ def get_all_entries_range(start_date, end_date, baby_id=None):
             'display': sleep_type_display
         })
     
-    # Nächtliches Aufwachen im Bereich
-    waking_rows = db.execute(
-        '''SELECT id, start_time as timestamp, end_time
-           FROM night_waking
-           WHERE ((start_time >= ? AND start_time <= ?)
-           OR (end_time >= ? AND end_time <= ? AND end_time IS NOT NULL))
-           AND baby_id = ?''',
-        (range_start_str, range_end_str, range_start_str, range_end_str, baby_id)
-    ).fetchall()
-    for row in waking_rows:
+    # Nächtliches Aufwachen im Bereich (Intervall-Index, den die Schlafdauer im
+    # selben Request ohnehin lädt)
+    waking_index = get_interval_index('night_waking', extended_start, extended_end, baby_id=baby_id)
+    range_start_dt = normalize_to_berlin(range_start)
+    range_end_dt = normalize_to_berlin(range_end)
+    for item in waking_index.overlapping(range_start_dt, range_end_dt):
         entries.append({
-            'id': row['id'],
+            'id': item.row['id'],
             'category': 'night_waking',
-            'timestamp': row['timestamp'],
-            'end_time': row['end_time'],
+            'timestamp': item.row['start_time'],
+            'end_time': item.row['end_time'],
             'display': 'Nächtliches Aufwachen'
         })
     
@@ -1795,111 +1969,170 @@ def get_all_entries_range(start_date, end_date, baby_id=None):
 
     return entries
 
-def get_latest_activities(limit=3, baby_id=None):
-    """Gibt die letzten N Aktivitäten zurück (unabhängig von der Kategorie)"""
+# Kategorien der Timeline: Kategorie -> (Tabelle, Zeitspalte, weitere Spalten).
+# Schlüssel und Felder entsprechen den Einträgen aus get_all_entries_range().
+TIMELINE_SOURCES = {
+    'sleep': ('sleep', 'start_time', ('type', 'end_time', 'sleep_quality', 'sleep_location', 'sleep_comment')),
+    'night_waking': ('night_waking', 'start_time', ('end_time',)),
+    'feeding': ('feeding', 'timestamp', ('side', 'end_time')),
+    'bottle': ('bottle', 'timestamp', ('amount',)),
+    'porridge': ('porridge', 'timestamp', ('amount', 'food')),
+    'diaper': ('diaper', 'timestamp', ('type',)),
+    'temperature': ('temperature', 'timestamp', ('value',)),
+    'medicine': ('medicine', 'timestamp', ('name', 'dose')),
+    'illness': ('illness', 'start_time', ('type', 'end_time', 'symptoms', 'notes')),
+    'weight': ('weight', 'timestamp', ('weight_kg', 'notes')),
+    'height': ('height', 'timestamp', ('height_cm', 'notes')),
+    'head_circumference': ('head_circumference', 'timestamp', ('head_circumference_cm', 'notes')),
+}
+
+TIMELINE_PAGE_MAX = 200
+
+# Kategorien von get_latest_activities() (ohne Aufwachen, Erkrankung und Messwerte)
+LATEST_ACTIVITY_CATEGORIES = ('sleep', 'feeding', 'bottle', 'diaper', 'temperature', 'medicine', 'porridge')
+
+
+class TimelineEntry(namedtuple('TimelineEntry', 'timestamp category id row')):
+    """Timeline-Eintrag: Sortierschlüssel (timestamp, category, id) plus DB-Zeile.
+
+    Das Anzeige-dict wird erst mit as_dict() gebaut, also nur für Einträge,
+    die tatsächlich angezeigt werden.
+    """
+    __slots__ = ()
+
+    @property
+    def cursor(self):
+        """Cursor-String für /api/entries (parse_timeline_cursor)."""
+        return f'{self.timestamp},{self.category},{self.id}'
+
+    def as_dict(self):
+        entry = {'id': self.id, 'category': self.category, 'timestamp': self.timestamp}
+        for col in TIMELINE_SOURCES[self.category][2]:
+            entry[col] = self.row[col]
+        entry['display'] = _timeline_display(entry)
+        return entry
+
+
+def _timeline_key(entry):
+    return entry[:3]
+
+
+def _timeline_display(entry):
+    """Anzeigetext wie in get_all_entries_range()."""
+    category = entry['category']
+    if category == 'sleep':
+        return "Nachtschlaf" if entry['type'] == 'night' else "Nickerchen"
+    if category == 'night_waking':
+        return 'Nächtliches Aufwachen'
+    if category == 'feeding':
+        return f"Stillen ({entry['side']})"
+    if category == 'bottle':
+        return f"Flasche ({entry['amount']} ml)"
+    if category == 'porridge':
+        food_str = f", {entry['food']}" if entry['food'] else ''
+        return f"Brei ({entry['amount']} g{food_str})"
+    if category == 'diaper':
+        return f"Windel ({entry['type']})"
+    if category == 'temperature':
+        return f"Temperatur ({entry['value']}°C)"
+    if category == 'medicine':
+        return f"Medizin ({entry['name']}, {entry['dose']})"
+    if category == 'illness':
+        return 'Erkrankung'
+    if category == 'weight':
+        return f"Gewicht ({entry['weight_kg']} kg)"
+    if category == 'height':
+        return f"Größe ({entry['height_cm']} cm)"
+    return f"Kopfumfang ({entry['head_circumference_cm']} cm)"
+
+
+def parse_timeline_cursor(value):
+    """'<timestamp>,<category>,<id>' -> (timestamp, category, id); ValueError bei ungültigem Cursor."""
+    parts = str(value).rsplit(',', 2)
+    if len(parts) != 3 or parts[1] not in TIMELINE_SOURCES or parse_timestamp(parts[0]) is None:
+        raise ValueError(f'Ungültiger Cursor: {value!r}')
+    return parts[0], parts[1], int(parts[2])
+
+
+def _iter_category(db, category, baby_id, start_after, newest_first):
+    """Einträge einer Kategorie in Sortierreihenfolge, zeilenweise aus einem offenen Cursor."""
+    table, time_column, columns = TIMELINE_SOURCES[category]
+    condition, params = '', [baby_id]
+    if start_after is not None:
+        ts, cursor_category, cursor_id = start_after
+        op = '<' if newest_first else '>'
+        # (zeit, kategorie, id) jenseits des Cursors, aufgelöst für die feste Kategorie
+        if category == cursor_category:
+            condition = f'AND ({time_column} {op} ? OR ({time_column} = ? AND id {op} ?))'
+            params += [ts, ts, cursor_id]
+        elif (category < cursor_category) == newest_first:
+            condition = f'AND {time_column} {op}= ?'
+            params.append(ts)
+        else:
+            condition = f'AND {time_column} {op} ?'
+            params.append(ts)
+    order = 'DESC' if newest_first else 'ASC'
+    cursor = db.execute(
+        f'''SELECT id, {time_column} AS timestamp, {', '.join(columns)} FROM {table}
+            WHERE baby_id = ? {condition} ORDER BY {time_column} {order}, id {order}''',
+        params
+    )
+    try:
+        for row in cursor:
+            yield TimelineEntry(row['timestamp'], category, row['id'], row)
+    finally:
+        cursor.close()
+
+
+def iter_timeline(categories=None, start_after=None, newest_first=True, baby_id=None):
+    """Lazy Timeline über mehrere Kategorien, sortiert nach (timestamp, category, id).
+
+    Pro Kategorie läuft ein nach Zeit sortierter Cursor über den Index
+    (baby_id, Zeitspalte); heapq.merge führt sie zusammen. Zeilen werden erst
+    gelesen, wenn der Aufrufer den nächsten Eintrag anfordert - wer nach N
+    Einträgen aufhört (islice), hat höchstens N + eine Zeile pro Kategorie
+    gelesen, unabhängig von der Größe der Historie. start_after ist ein
+    (timestamp, category, id)-Tripel; geliefert wird alles strikt danach in
+    Laufrichtung. Verglichen wird der gespeicherte String (stabil, auch wenn
+    er in der doppelten Herbst-Stunde von der Wanduhr abweicht).
+
+    Die Cursor werden beim Schließen des Generators geschlossen; bei vorzeitigem
+    Abbruch contextlib.closing() verwenden.
+    """
     baby_id = baby_id or get_active_baby_id()
     db = get_db()
+    streams = [_iter_category(db, category, baby_id, start_after, newest_first)
+               for category in (categories or TIMELINE_SOURCES)]
+    try:
+        yield from heapq.merge(*streams, key=_timeline_key, reverse=newest_first)
+    finally:
+        for stream in streams:
+            stream.close()
 
-    all_entries = []
 
-    # Schlaf
-    sleep_rows = db.execute(
-        'SELECT id, "sleep" as category, type, start_time as timestamp, end_time FROM sleep WHERE baby_id = ? ORDER BY start_time DESC LIMIT ?',
-        (baby_id, limit * 2)  # Mehr holen, da wir später filtern
-    ).fetchall()
-    for row in sleep_rows:
-        all_entries.append({
-            'category': 'sleep',
-            'type': row['type'],
-            'timestamp': row['timestamp'],
-            'end_time': row['end_time'],
-            'display': f"Schlaf ({row['type']})"
-        })
+def get_latest_activities(limit=3, baby_id=None):
+    """Gibt die letzten N Aktivitäten zurück (unabhängig von der Kategorie)"""
+    with closing(iter_timeline(LATEST_ACTIVITY_CATEGORIES, baby_id=baby_id)) as timeline:
+        return [entry.as_dict() for entry in islice(timeline, limit)]
 
-    # Stillen
-    feeding_rows = db.execute(
-        'SELECT id, "feeding" as category, timestamp, side FROM feeding WHERE baby_id = ? ORDER BY timestamp DESC LIMIT ?',
-        (baby_id, limit * 2)
-    ).fetchall()
-    for row in feeding_rows:
-        all_entries.append({
-            'category': 'feeding',
-            'timestamp': row['timestamp'],
-            'side': row['side'],
-            'display': f"Stillen ({row['side']})"
-        })
 
-    # Flasche
-    bottle_rows = db.execute(
-        'SELECT id, "bottle" as category, timestamp, amount FROM bottle WHERE baby_id = ? ORDER BY timestamp DESC LIMIT ?',
-        (baby_id, limit * 2)
-    ).fetchall()
-    for row in bottle_rows:
-        all_entries.append({
-            'category': 'bottle',
-            'timestamp': row['timestamp'],
-            'amount': row['amount'],
-            'display': f"Flasche ({row['amount']} ml)"
-        })
+def get_entries_page(before=None, limit=50, baby_id=None):
+    """Eine Seite der Timeline aller Kategorien, neueste zuerst (Keyset-Pagination).
 
-    # Windel
-    diaper_rows = db.execute(
-        'SELECT id, "diaper" as category, timestamp, type FROM diaper WHERE baby_id = ? ORDER BY timestamp DESC LIMIT ?',
-        (baby_id, limit * 2)
-    ).fetchall()
-    for row in diaper_rows:
-        all_entries.append({
-            'category': 'diaper',
-            'timestamp': row['timestamp'],
-            'type': row['type'],
-            'display': f"Windel ({row['type']})"
-        })
+    Sortiert wird nach (timestamp, category, id) absteigend; `before` ist das
+    Tripel des letzten Eintrags der vorherigen Seite (parse_timeline_cursor).
+    Gelesen werden über iter_timeline() nur die Zeilen der Seite plus eine pro
+    Kategorie - kein OFFSET, die Kosten pro Seite hängen nicht davon ab, wie
+    weit zurück geblättert wird.
 
-    # Temperatur
-    temp_rows = db.execute(
-        'SELECT id, "temperature" as category, timestamp, value FROM temperature WHERE baby_id = ? ORDER BY timestamp DESC LIMIT ?',
-        (baby_id, limit * 2)
-    ).fetchall()
-    for row in temp_rows:
-        all_entries.append({
-            'category': 'temperature',
-            'timestamp': row['timestamp'],
-            'value': row['value'],
-            'display': f"Temperatur ({row['value']}°C)"
-        })
-
-    # Medizin
-    med_rows = db.execute(
-        'SELECT id, "medicine" as category, timestamp, name, dose FROM medicine WHERE baby_id = ? ORDER BY timestamp DESC LIMIT ?',
-        (baby_id, limit * 2)
-    ).fetchall()
-    for row in med_rows:
-        all_entries.append({
-            'category': 'medicine',
-            'timestamp': row['timestamp'],
-            'name': row['name'],
-            'dose': row['dose'],
-            'display': f"Medizin ({row['name']}, {row['dose']})"
-        })
-
-    # Brei
-    porridge_rows = db.execute(
-        'SELECT id, "porridge" as category, timestamp, amount, food FROM porridge WHERE baby_id = ? ORDER BY timestamp DESC LIMIT ?',
-        (baby_id, limit * 2)
-    ).fetchall()
-    for row in porridge_rows:
-        food_str = f', {row["food"]}' if row['food'] else ''
-        all_entries.append({
-            'category': 'porridge',
-            'timestamp': row['timestamp'],
-            'amount': row['amount'],
-            'food': row['food'],
-            'display': f"Brei ({row['amount']} g{food_str})"
-        })
+    Liefert (entries, next_before); next_before ist None auf der letzten Seite.
+    """
+    limit = max(1, min(int(limit), TIMELINE_PAGE_MAX))
+    with closing(iter_timeline(start_after=before, baby_id=baby_id)) as timeline:
+        page = list(islice(timeline, limit + 1))
+    next_before = page[limit - 1].cursor if len(page) > limit else None
+    return [entry.as_dict() for entry in page[:limit]], next_before
 
-    # Sortiere nach Zeitstempel und nimm die letzten N
-    all_entries.sort(key=lambda x: x['timestamp'], reverse=True)
-    return all_entries[:limit]
 
 class BabyInfo:
     """Baby-Informationen für Nickerchen-Vorschläge"""
@@ -1948,6 +2181,10 @@ class BabyInfo:
             if has_data:
                 raise ValueError('has_data')
 
+        db.execute('DELETE FROM daily_nap_suggestions WHERE baby_id = ?', (baby_id,))
+        db.execute('DELETE FROM night_sleep_model WHERE baby_id = ?', (baby_id,))
+        db.execute('DELETE FROM quantile_sketches WHERE baby_id = ?', (baby_id,))
+        db.execute('DELETE FROM quantile_sketch_months WHERE baby_id = ?', (baby_id,))
         db.execute('DELETE FROM baby_info WHERE id = ?', (baby_id,))
         db.commit()
 
@@ -1999,6 +2236,8 @@ class BabyInfo:
                 'INSERT INTO baby_info (birth_date) VALUES (?)',
                 (birth_date.isoformat(),)
             )
+        # Altersabhängige Empfehlungen ändern sich - gespeicherte Vorschläge verwerfen
+        db.execute('DELETE FROM daily_nap_suggestions WHERE baby_id = ?', (baby_id,))
         db.commit()
 
     @staticmethod
@@ -2062,6 +2301,9 @@ class BabyInfo:
                     'INSERT INTO baby_info (name, birth_date, gender, updated_at) VALUES (?, ?, ?, ?)',
                     (name, birth_date.isoformat(), gender_value, datetime.now(tz_berlin).isoformat())
                 )
+            if birth_date is not None:
+                # Altersabhängige Empfehlungen ändern sich - gespeicherte Vorschläge verwerfen
+                db.execute('DELETE FROM daily_nap_suggestions WHERE baby_id = ?', (baby_id,))
             db.commit()
     
     @staticmethod
@@ -2262,11 +2504,69 @@ class BabyInfo:
     
     @staticmethod
     def get_nap_suggestions(selected_date=None, baby_id=None):
-        """Berechnet Vorschläge für das nächste Nickerchen"""
+        """Liefert die Vorschläge für das nächste Nickerchen.
+
+        Die Berechnung passiert beim Schreiben von Schlaf-/Aufwach-Einträgen
+        (refresh_nap_suggestions); hier wird nur die gespeicherte Zeile per
+        Primärschlüssel gelesen. Fehlt sie (neuer Tag, geleerter Cache), wird
+        einmalig berechnet und gespeichert.
+        """
+        baby_id = baby_id or get_active_baby_id()
+        if selected_date is None:
+            selected_date = date.today()
+
+        row = get_db().execute(
+            'SELECT payload FROM daily_nap_suggestions WHERE baby_id = ? AND date = ?',
+            (baby_id, selected_date.isoformat())
+        ).fetchone()
+        if row is None:
+            suggestions = BabyInfo.refresh_nap_suggestions(selected_date, baby_id=baby_id)
+        else:
+            suggestions = _decode_nap_suggestions(row['payload'])
+
+        # Ein gespeicherter Zeitpunkt kann inzwischen verstrichen sein - wie bisher
+        # frühestens 15 Minuten ab jetzt vorschlagen
+        now = datetime.now(tz_berlin)
+        for suggestion in suggestions:
+            suggested_time = suggestion.get('suggested_time')
+            if suggested_time is not None and suggested_time < now:
+                suggestion['suggested_time'] = now + timedelta(minutes=15)
+        return suggestions
+
+    @staticmethod
+    def refresh_nap_suggestions(selected_date=None, baby_id=None):
+        """Berechnet die Nickerchen-Vorschläge neu und speichert sie pro (Kind, Tag).
+
+        Ein noch in der Zukunft liegender, bereits gespeicherter Zeitpunkt wird
+        übernommen, damit der Vorschlag nicht bei jedem Eintrag nach hinten wandert.
+        """
         baby_id = baby_id or get_active_baby_id()
         if selected_date is None:
             selected_date = date.today()
+        db = get_db()
+
+        previous_time = None
+        row = db.execute(
+            'SELECT payload FROM daily_nap_suggestions WHERE baby_id = ? AND date = ?',
+            (baby_id, selected_date.isoformat())
+        ).fetchone()
+        if row is not None:
+            for suggestion in _decode_nap_suggestions(row['payload']):
+                previous_time = suggestion.get('suggested_time') or previous_time
+
+        suggestions = BabyInfo._compute_nap_suggestions(selected_date, baby_id, previous_time)
+        db.execute(
+            '''INSERT OR REPLACE INTO daily_nap_suggestions (baby_id, date, payload, computed_at)
+               VALUES (?, ?, ?, ?)''',
+            (baby_id, selected_date.isoformat(), _encode_nap_suggestions(suggestions),
+             datetime.now(tz_berlin).isoformat())
+        )
+        db.commit()
+        return suggestions
 
+    @staticmethod
+    def _compute_nap_suggestions(selected_date, baby_id, previous_time=None):
+        """Berechnet Vorschläge für das nächste Nickerchen (ohne Speichern)"""
         # Prüfe ob ein aktiver Schlaf existiert
         active_sleep = Sleep.get_active_sleep(baby_id=baby_id)
         if active_sleep:
@@ -2280,8 +2580,7 @@ class BabyInfo:
                 try:
                     start_time_str = active_sleep.get('start_time')
                     if start_time_str:
-                        start_dt = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                        start_dt = normalize_to_berlin(start_dt)
+                        start_dt = to_berlin(start_time_str)
                         
                         # Wenn der Nachtschlaf heute gestartet wurde oder noch läuft und es ist heute,
                         # dann noch kein Nickerchen-Vorschlag
@@ -2300,15 +2599,21 @@ class BabyInfo:
         target_naps = int(avg_naps + 0.5)  # Aufrunden wenn >= 0.5
         target_day_sleep = recommendations['day']
 
-        # Hole alle Nickerchen des Tages
+        # Hole alle Nickerchen des Tages (inkl. über Mitternacht hineinlaufender).
+        # Bereichsfilter auf den lokalen ISO-Strings statt date(...) = ?, damit
+        # der Index auf start_time/end_time greift.
         db = get_db()
+        day_start = selected_date.isoformat()
+        day_end = (selected_date + timedelta(days=1)).isoformat()
         naps_today = db.execute(
             '''SELECT start_time, end_time FROM sleep
                WHERE type = 'nap'
-               AND (date(start_time) = ? OR (date(start_time) = ? AND date(end_time) = ?))
+               AND start_time >= ? AND start_time < ?
+               AND (start_time >= ? OR (end_time >= ? AND end_time < ?))
                AND end_time IS NOT NULL
                AND baby_id = ?''',
-            (selected_date.isoformat(), (selected_date - timedelta(days=1)).isoformat(), selected_date.isoformat(), baby_id)
+            ((selected_date - timedelta(days=1)).isoformat(), day_end,
+             day_start, day_start, day_end, baby_id)
         ).fetchall()
         
         completed_naps = len(naps_today)
@@ -2317,10 +2622,8 @@ class BabyInfo:
         total_day_sleep_hours = 0.0
         for nap in naps_today:
             try:
-                start_dt = datetime.fromisoformat(nap['start_time'].replace('Z', '+00:00'))
-                end_dt = datetime.fromisoformat(nap['end_time'].replace('Z', '+00:00'))
-                start_dt = normalize_to_berlin(start_dt)
-                end_dt = normalize_to_berlin(end_dt)
+                start_dt = to_berlin(nap['start_time'])
+                end_dt = to_berlin(nap['end_time'])
                 duration = (end_dt - start_dt).total_seconds() / 3600.0
                 total_day_sleep_hours += duration
             except (ValueError, AttributeError):
@@ -2341,28 +2644,22 @@ class BabyInfo:
             suggested_night_sleep_time = night_sleep_suggestion.get('suggested_time')
             if suggested_night_sleep_time:
                 try:
-                    if isinstance(suggested_night_sleep_time, str):
-                        night_sleep_dt = datetime.fromisoformat(suggested_night_sleep_time.replace('Z', '+00:00'))
-                    else:
-                        night_sleep_dt = suggested_night_sleep_time
-                    night_sleep_dt = normalize_to_berlin(night_sleep_dt)
+                    night_sleep_dt = to_berlin(suggested_night_sleep_time)
                     
                     # Finde letztes Aufwachen für Berechnung
                     now = datetime.now(tz_berlin)
                     last_wake_time = None
                     last_sleep_end = db.execute(
                         '''SELECT end_time FROM sleep
-                           WHERE end_time IS NOT NULL
-                           AND date(end_time) = ?
+                           WHERE end_time >= ? AND end_time < ?
                            AND baby_id = ?
                            ORDER BY end_time DESC LIMIT 1''',
-                        (selected_date.isoformat(), baby_id)
+                        (day_start, day_end, baby_id)
                     ).fetchone()
 
                     if last_sleep_end:
                         try:
-                            last_wake_time = datetime.fromisoformat(last_sleep_end['end_time'].replace('Z', '+00:00'))
-                            last_wake_time = normalize_to_berlin(last_wake_time)
+                            last_wake_time = to_berlin(last_sleep_end['end_time'])
                         except (ValueError, AttributeError):
                             pass
 
@@ -2406,8 +2703,7 @@ class BabyInfo:
                 try:
                     start_time_str = active_sleep.get('start_time')
                     if start_time_str:
-                        start_dt = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                        start_dt = normalize_to_berlin(start_dt)
+                        start_dt = to_berlin(start_time_str)
                         
                         # Wenn der Nachtschlaf heute noch läuft (gestartet heute oder gestern, aber noch aktiv),
                         # dann kein Nickerchen-Vorschlag bis zum Aufwachen
@@ -2422,17 +2718,15 @@ class BabyInfo:
             # WICHTIG: Dies sollte das tatsächliche Ende eines Schlafs sein, nicht die aktuelle Zeit
             last_sleep_end = db.execute(
                 '''SELECT end_time FROM sleep
-                   WHERE end_time IS NOT NULL
-                   AND date(end_time) = ?
+                   WHERE end_time >= ? AND end_time < ?
                    AND baby_id = ?
                    ORDER BY end_time DESC LIMIT 1''',
-                (selected_date.isoformat(), baby_id)
+                (day_start, day_end, baby_id)
             ).fetchone()
 
             if last_sleep_end:
                 try:
-                    last_wake_time = datetime.fromisoformat(last_sleep_end['end_time'].replace('Z', '+00:00'))
-                    last_wake_time = normalize_to_berlin(last_wake_time)
+                    last_wake_time = to_berlin(last_sleep_end['end_time'])
                 except (ValueError, AttributeError):
                     pass
 
@@ -2442,20 +2736,12 @@ class BabyInfo:
                 # (Das erste Nickerchen wird erst nach dem Aufwachen aus dem Nachtschlaf berechnet)
                 return []
 
-            # Prüfe ob bereits ein Vorschlag für heute existiert (in der Datenbank gespeichert)
-            # Dies verhindert, dass die Zeit nach hinten geschoben wird
-            existing_suggestion = db.execute(
-                '''SELECT suggested_time FROM nap_suggestions
-                   WHERE date = ? AND suggested_time > ? AND baby_id = ?
-                   ORDER BY created_at DESC LIMIT 1''',
-                (selected_date.isoformat(), now.isoformat(), baby_id)
-            ).fetchone()
-
-            if existing_suggestion:
+            # Prüfe ob bereits ein Vorschlag für heute existiert (von refresh_nap_suggestions
+            # übergeben). Dies verhindert, dass die Zeit nach hinten geschoben wird
+            if previous_time is not None:
                 # Verwende die bereits berechnete Zeit (verhindert Verschiebung nach hinten)
                 try:
-                    suggested_time = datetime.fromisoformat(existing_suggestion['suggested_time'].replace('Z', '+00:00'))
-                    suggested_time = normalize_to_berlin(suggested_time)
+                    suggested_time = previous_time
                     # Prüfe ob die Zeit noch in der Zukunft liegt
                     if suggested_time > now:
                         # Verwende die alte Zeit, aber aktualisiere die restlichen Werte
@@ -2485,8 +2771,8 @@ class BabyInfo:
                             'max_naps': max_naps
                         })
                         return suggestions
-                except (ValueError, AttributeError):
-                    # Falls Fehler beim Parsen, berechne neu
+                except (ValueError, AttributeError, TypeError):
+                    # Falls Fehler beim Vergleich, berechne neu
                     pass
             
             # Neue Berechnung (nur wenn noch kein Vorschlag existiert oder dieser in der Vergangenheit liegt)
@@ -2497,10 +2783,8 @@ class BabyInfo:
                 sorted_naps = []
                 for nap in naps_today:
                     try:
-                        start_dt = datetime.fromisoformat(nap['start_time'].replace('Z', '+00:00'))
-                        end_dt = datetime.fromisoformat(nap['end_time'].replace('Z', '+00:00'))
-                        start_dt = normalize_to_berlin(start_dt)
-                        end_dt = normalize_to_berlin(end_dt)
+                        start_dt = to_berlin(nap['start_time'])
+                        end_dt = to_berlin(nap['end_time'])
                         sorted_naps.append((start_dt, end_dt))
                     except (ValueError, AttributeError):
                         continue
@@ -2588,29 +2872,6 @@ class BabyInfo:
             # Aber mindestens 0.5 Stunden (30 Minuten)
             nap_duration = min(max_nap_duration, max(remaining_day_sleep, 0.5))
             
-            # Speichere den Vorschlag in der Datenbank (verhindert Verschiebung nach hinten)
-            # Hinweis (Issue #33): Der UNIQUE-Constraint der Tabelle ist weiterhin nur
-            # (date, suggested_time) ohne baby_id (siehe Migration 019) - ein SQLite-Rebuild
-            # dieser reinen Cache-Tabelle wurde bewusst nicht riskiert, da ein naiver Rebuild
-            # bei jedem Neustart dupliziert würde (keine Migrations-Tracking-Tabelle vorhanden).
-            # Kollidieren zwei Kinder auf exakt dieselbe Minute, schlägt der INSERT fehl und
-            # wird hier abgefangen - der Vorschlag wird trotzdem zurückgegeben, nur nicht
-            # gegen Rückwärts-Verschiebung zwischengespeichert. Extrem seltener Fall.
-            try:
-                # Lösche alte Vorschläge für heute
-                db.execute('DELETE FROM nap_suggestions WHERE date = ? AND baby_id = ?', (selected_date.isoformat(), baby_id))
-                # Füge neuen Vorschlag hinzu
-                db.execute(
-                    '''INSERT INTO nap_suggestions (date, suggested_time, created_at, baby_id)
-                       VALUES (?, ?, ?, ?)''',
-                    (selected_date.isoformat(), suggested_time.isoformat(), now.isoformat(), baby_id)
-                )
-                db.commit()
-            except Exception:
-                # Falls Tabelle noch nicht existiert, oder UNIQUE-Kollision mit einem anderen
-                # Kind (s.o.): ignoriere Fehler
-                pass
-            
             suggestions.append({
                 'suggested_time': suggested_time,
                 'nap_duration': nap_duration,
@@ -2686,8 +2947,7 @@ class BabyInfo:
         last_wake_time = None
         if last_sleep_end:
             try:
-                last_wake_time = datetime.fromisoformat(last_sleep_end['end_time'].replace('Z', '+00:00'))
-                last_wake_time = normalize_to_berlin(last_wake_time)
+                last_wake_time = to_berlin(last_sleep_end['end_time'])
             except (ValueError, AttributeError):
                 pass
 
@@ -2713,10 +2973,8 @@ class BabyInfo:
         total_day_sleep_hours = 0.0
         for nap in naps_today:
             try:
-                start_dt = datetime.fromisoformat(nap['start_time'].replace('Z', '+00:00'))
-                end_dt = datetime.fromisoformat(nap['end_time'].replace('Z', '+00:00'))
-                start_dt = normalize_to_berlin(start_dt)
-                end_dt = normalize_to_berlin(end_dt)
+                start_dt = to_berlin(nap['start_time'])
+                end_dt = to_berlin(nap['end_time'])
                 duration = (end_dt - start_dt).total_seconds() / 3600.0
                 total_day_sleep_hours += duration
             except (ValueError, AttributeError):
@@ -2725,49 +2983,12 @@ class BabyInfo:
         # Berechne verbleibende Tagschlafdauer
         remaining_day_sleep = target_day_sleep - total_day_sleep_hours
         
-        # Berechne tatsächliche Nachtschlafdauern aus den letzten Nachtschläfen
-        # Hole die letzten 7 Nachtschläfe (ca. eine Woche) für Durchschnittsberechnung
-        recent_night_sleeps = db.execute(
-            '''SELECT start_time, end_time FROM sleep
-               WHERE type = 'night'
-               AND end_time IS NOT NULL
-               AND start_time IS NOT NULL
-               AND baby_id = ?
-               ORDER BY end_time DESC LIMIT 7''',
-            (baby_id,)
-        ).fetchall()
-        
-        actual_night_sleep_durations = []
-        for night_sleep in recent_night_sleeps:
-            try:
-                start_dt = datetime.fromisoformat(night_sleep['start_time'].replace('Z', '+00:00'))
-                end_dt = datetime.fromisoformat(night_sleep['end_time'].replace('Z', '+00:00'))
-                start_dt = normalize_to_berlin(start_dt)
-                end_dt = normalize_to_berlin(end_dt)
-                
-                # Berechne Dauer (kann über Mitternacht gehen)
-                if end_dt < start_dt:
-                    # Endet am nächsten Tag
-                    duration = (end_dt + timedelta(days=1) - start_dt).total_seconds() / 3600.0
-                else:
-                    duration = (end_dt - start_dt).total_seconds() / 3600.0
-                
-                # Ziehe nächtliches Aufwachen ab
-                waking_duration = NightWaking.get_total_waking_duration(
-                    night_sleep['start_time'], night_sleep['end_time'], baby_id=baby_id
-                )
-                duration = max(0, duration - waking_duration)
+        # Durchschnittliche Nachtschlafdauer (netto, ohne nächtliches Aufwachen) und
+        # Aufwachzeit aus dem laufend fortgeschriebenen Modell statt aus den letzten
+        # sieben Nächten samt Aufwach-Queries pro Nacht
+        night_model = NightSleepModel.get(baby_id=baby_id)
+        avg_actual_night_sleep = night_model['duration_mean'] if night_model['duration_count'] else None
 
-                if duration > 0 and duration < 16:  # Plausibilitätsprüfung (max 16h)
-                    actual_night_sleep_durations.append(duration)
-            except (ValueError, AttributeError):
-                continue
-        
-        # Berechne Durchschnitt der tatsächlichen Nachtschlafdauern
-        avg_actual_night_sleep = None
-        if actual_night_sleep_durations:
-            avg_actual_night_sleep = sum(actual_night_sleep_durations) / len(actual_night_sleep_durations)
-        
         # Berechne die Nachtschlafdauer
         # Wenn tatsächliche Dauer vorhanden ist, verwende gewichteten Durchschnitt
         # 60% tatsächlicher Durchschnitt, 40% Tabellenwert (für Stabilität)
@@ -2807,30 +3028,18 @@ class BabyInfo:
         # 2. Berechne Einschlafzeit rückwärts: Einschlafzeit = Ziel-Aufwachzeit - Nachtschlafdauer
         # 3. Passe Einschlafzeit leicht an basierend auf aktuellem Zustand (Übermüdung, Tagschlaf)
         
-        # Berechne Ziel-Aufwachzeit aus den letzten Nachtschläfen
-        # Hole die letzten 7 Nachtschläfe und berechne Durchschnitt der Aufwachzeiten
+        # Ziel-Aufwachzeit: gewichteter Durchschnitt der Aufwachzeiten aus dem Modell
         desired_wake_time = None
-        if recent_night_sleeps:
-            wake_times = []
-            for night_sleep in recent_night_sleeps:
-                try:
-                    end_dt = datetime.fromisoformat(night_sleep['end_time'].replace('Z', '+00:00'))
-                    end_dt = normalize_to_berlin(end_dt)
-                    # Nur Stunden und Minuten für Durchschnitt
-                    wake_times.append(end_dt.hour + end_dt.minute / 60.0)
-                except (ValueError, AttributeError):
-                    continue
-            
-            if wake_times:
-                avg_wake_hour = sum(wake_times) / len(wake_times)
-                # Erstelle Ziel-Aufwachzeit für morgen
-                tomorrow = selected_date + timedelta(days=1)
-                desired_wake_time = normalize_to_berlin(
-                    datetime.combine(tomorrow, datetime.min.time().replace(
-                        hour=int(avg_wake_hour), 
-                        minute=int((avg_wake_hour - int(avg_wake_hour)) * 60)
-                    ))
-                )
+        if night_model['wake_count']:
+            avg_wake_hour = night_model['wake_mean']
+            # Erstelle Ziel-Aufwachzeit für morgen
+            tomorrow = selected_date + timedelta(days=1)
+            desired_wake_time = normalize_to_berlin(
+                datetime.combine(tomorrow, datetime.min.time().replace(
+                    hour=int(avg_wake_hour),
+                    minute=int((avg_wake_hour - int(avg_wake_hour)) * 60)
+                ))
+            )
         
         # Fallback: Wenn keine Daten vorhanden, verwende Standard (07:00 Uhr)
         if desired_wake_time is None:
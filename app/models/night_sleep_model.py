@@ -0,0 +1,230 @@
+"""Laufendes Nachtschlaf-Modell pro Kind.
+
+Statt bei jedem Dashboard-Aufruf die letzten Nachtschläfe samt nächtlichem
+Aufwachen neu zu laden, wird beim Beenden eines Nachtschlafs ein kleiner
+Zustand in night_sleep_model (Migration 022) fortgeschrieben: exponentiell
+gewichtete Mittelwerte und Varianzen von
+
+    duration   Nachtschlafdauer in Stunden, abzüglich nächtlichem Aufwachen
+    wake       Aufwachzeit als Stunde des Tages (z.B. 6.5 = 06:30)
+    bedtime    Einschlafzeit in Stunden seit 12:00 (19:30 -> 7.5, 00:30 -> 12.5),
+               damit Zeiten um Mitternacht nicht auseinanderfallen
+    day_sleep  Tagschlaf (Nickerchen) am Tag vor der Nacht in Stunden
+
+ALPHA = 0.25 entspricht der Spanne des bisherigen 7-Nächte-Durchschnitts
+(alpha = 2 / (N + 1)). Nachträgliche Korrekturen älterer Einträge lassen sich
+nicht inkrementell einrechnen - dann wird über rebuild() aus den letzten
+REBUILD_NIGHTS Nächten neu aufgebaut (ältere Nächte tragen bei alpha = 0.25
+ohnehin weniger als 1e-7 bei). CLI: ``flask rebuild-sleep-model``.
+"""
+import bisect
+from datetime import datetime
+
+from app.models.database import get_db, get_active_baby_id
+from app.timezone import tz_berlin
+from app.timestamps import parse_timestamp
+
+ALPHA = 0.25
+REBUILD_NIGHTS = 60
+# Plausibilitätsgrenze wie bisher in get_night_sleep_suggestion
+MAX_NIGHT_HOURS = 16
+
+METRICS = ('duration', 'wake', 'bedtime', 'day_sleep')
+
+
+def _ew_update(mean, var, value):
+    """Ein Schritt exponentiell gewichteter Mittelwert/Varianz (West 1979)."""
+    if mean is None:
+        return value, 0.0
+    diff = value - mean
+    increment = ALPHA * diff
+    return mean + increment, (1 - ALPHA) * (var + diff * increment)
+
+
+def _hours_of_day(dt):
+    return dt.hour + dt.minute / 60.0
+
+
+class NightSleepModel:
+    """Zugriff auf den gespeicherten Modellzustand eines Kindes"""
+
+    @staticmethod
+    def get(baby_id=None):
+        """Liefert den Modellzustand als dict (Schlüssel <metrik>_mean/_var/_count).
+
+        Fehlt die Zeile (neues Kind, frische Migration), wird sie einmalig aus
+        der Historie aufgebaut.
+        """
+        baby_id = baby_id or get_active_baby_id()
+        row = get_db().execute('SELECT * FROM night_sleep_model WHERE baby_id = ?', (baby_id,)).fetchone()
+        if row is None:
+            return NightSleepModel.rebuild(baby_id=baby_id)
+        return dict(row)
+
+    @staticmethod
+    def observe_night(start_time, end_time, baby_id=None):
+        """Rechnet einen gerade beendeten Nachtschlaf in das Modell ein.
+
+        Liegt das Ende vor der zuletzt eingerechneten Nacht (Nachtrag), wird
+        stattdessen neu aufgebaut, damit die Gewichtung chronologisch bleibt.
+        """
+        baby_id = baby_id or get_active_baby_id()
+        db = get_db()
+        row = db.execute('SELECT * FROM night_sleep_model WHERE baby_id = ?', (baby_id,)).fetchone()
+        end_dt = parse_timestamp(end_time)
+        if row is None or end_dt is None:
+            return NightSleepModel.rebuild(baby_id=baby_id)
+        last_end = parse_timestamp(row['last_end_time'])
+        if last_end is not None and end_dt <= last_end:
+            return NightSleepModel.rebuild(baby_id=baby_id)
+
+        state = dict(row)
+        wakings, naps = _load_context(db, baby_id, start_time, end_time)
+        observation = _observe(start_time, end_time, wakings, naps)
+        if observation is not None:
+            _fold(state, observation, end_time)
+        _store(db, baby_id, state)
+        return state
+
+    @staticmethod
+    def invalidate_since(timestamp, baby_id=None):
+        """Baut neu auf, wenn eine Änderung bereits eingerechnete Nächte betrifft."""
+        baby_id = baby_id or get_active_baby_id()
+        row = get_db().execute(
+            'SELECT last_end_time FROM night_sleep_model WHERE baby_id = ?', (baby_id,)
+        ).fetchone()
+        if row is None or row['last_end_time'] is None:
+            return
+        changed = parse_timestamp(timestamp)
+        last_end = parse_timestamp(row['last_end_time'])
+        if changed is None or last_end is None or changed < last_end:
+            NightSleepModel.rebuild(baby_id=baby_id)
+
+    @staticmethod
+    def rebuild(baby_id=None):
+        """Baut das Modell aus den letzten REBUILD_NIGHTS beendeten Nachtschläfen neu auf."""
+        baby_id = baby_id or get_active_baby_id()
+        db = get_db()
+        nights = db.execute(
+            '''SELECT start_time, end_time FROM sleep
+               WHERE type = 'night' AND start_time IS NOT NULL AND end_time IS NOT NULL
+               AND baby_id = ?
+               ORDER BY end_time DESC LIMIT ?''',
+            (baby_id, REBUILD_NIGHTS)
+        ).fetchall()
+
+        state = _empty_state()
+        nights = nights[::-1]
+        if nights:
+            first_start = min(night['start_time'] for night in nights)
+            wakings, naps = _load_context(db, baby_id, first_start, nights[-1]['end_time'])
+        for night in nights:
+            observation = _observe(night['start_time'], night['end_time'], wakings, naps)
+            if observation is not None:
+                _fold(state, observation, night['end_time'])
+        _store(db, baby_id, state)
+        return state
+
+    @staticmethod
+    def rebuild_all():
+        """Baut die Modelle aller Kinder neu auf; liefert die Anzahl der Kinder."""
+        baby_ids = [row['id'] for row in get_db().execute('SELECT id FROM baby_info').fetchall()]
+        for baby_id in baby_ids:
+            NightSleepModel.rebuild(baby_id=baby_id)
+        return len(baby_ids)
+
+
+def _empty_state():
+    state = {'night_count': 0, 'last_end_time': None}
+    for metric in METRICS:
+        state[f'{metric}_mean'] = None
+        state[f'{metric}_var'] = 0.0
+        state[f'{metric}_count'] = 0
+    return state
+
+
+def _load_intervals(db, table, lower, upper, baby_id, extra=''):
+    """Beendete Einträge mit lower <= start_time <= upper als sortierte (start, end)-Paare."""
+    rows = db.execute(
+        f'''SELECT start_time, end_time FROM {table}
+            WHERE start_time >= ? AND start_time <= ? AND end_time IS NOT NULL
+            AND baby_id = ? {extra}''',
+        (lower, upper, baby_id)
+    ).fetchall()
+    intervals = []
+    for row in rows:
+        start_dt = parse_timestamp(row['start_time'])
+        end_dt = parse_timestamp(row['end_time'])
+        if start_dt is not None and end_dt is not None and end_dt > start_dt:
+            intervals.append((start_dt, end_dt))
+    intervals.sort()
+    return intervals
+
+
+def _load_context(db, baby_id, first_start, last_end):
+    """Aufwachen und Nickerchen für alle Nächte zwischen first_start und last_end (2 Queries)."""
+    first_dt = parse_timestamp(first_start)
+    day_start = first_dt.date().isoformat() if first_dt else first_start
+    wakings = _load_intervals(db, 'night_waking', first_start, last_end, baby_id)
+    naps = _load_intervals(db, 'sleep', day_start, last_end, baby_id, "AND type = 'nap'")
+    return wakings, naps
+
+
+def _observe(start_time, end_time, wakings, naps):
+    """Kennzahlen einer Nacht: Dauer (netto), Aufwach-/Einschlafzeit, Tagschlaf davor."""
+    start_dt = parse_timestamp(start_time)
+    end_dt = parse_timestamp(end_time)
+    if start_dt is None or end_dt is None:
+        return None
+
+    observation = {
+        'wake': _hours_of_day(end_dt),
+        'bedtime': (_hours_of_day(start_dt) - 12) % 24,
+    }
+
+    # Nur vollständig im Nachtschlaf liegendes Aufwachen abziehen
+    # (wie NightWaking.get_total_waking_duration)
+    waking_seconds = 0.0
+    for waking_start, waking_end in wakings[bisect.bisect_left(wakings, (start_dt,)):]:
+        if waking_start > end_dt:
+            break
+        if waking_end <= end_dt:
+            waking_seconds += (waking_end - waking_start).total_seconds()
+    duration = max(0.0, (end_dt - start_dt).total_seconds() - waking_seconds) / 3600.0
+    if 0 < duration < MAX_NIGHT_HOURS:
+        observation['duration'] = duration
+
+    # Tagschlaf des Tages, an dem die Nacht begann (Nickerchen vor dem Einschlafen)
+    day_start = datetime.combine(start_dt.date(), datetime.min.time(), tzinfo=start_dt.tzinfo)
+    day_sleep_seconds = 0.0
+    for nap_start, nap_end in naps[bisect.bisect_left(naps, (day_start,)):]:
+        if nap_start >= start_dt:
+            break
+        day_sleep_seconds += (min(nap_end, start_dt) - nap_start).total_seconds()
+    observation['day_sleep'] = day_sleep_seconds / 3600.0
+    return observation
+
+
+def _fold(state, observation, end_time):
+    for metric, value in observation.items():
+        mean, var = _ew_update(state[f'{metric}_mean'], state[f'{metric}_var'], value)
+        state[f'{metric}_mean'] = mean
+        state[f'{metric}_var'] = var
+        state[f'{metric}_count'] += 1
+    state['night_count'] += 1
+    state['last_end_time'] = end_time
+
+
+def _store(db, baby_id, state):
+    columns = ['night_count', 'last_end_time']
+    for metric in METRICS:
+        columns += [f'{metric}_mean', f'{metric}_var', f'{metric}_count']
+    state['updated_at'] = datetime.now(tz_berlin).isoformat()
+    columns.append('updated_at')
+    db.execute(
+        f'''INSERT OR REPLACE INTO night_sleep_model (baby_id, {', '.join(columns)})
+            VALUES (?, {', '.join('?' for _ in columns)})''',
+        [baby_id] + [state[col] for col in columns]
+    )
+    db.commit()
+    state['baby_id'] = baby_id
@@ -0,0 +1,267 @@
+"""Quantile (P10/Median/P90) für Schlaf- und Stillverteilungen über beliebige Zeiträume.
+
+Pro Tag und Kennzahl wird ein Sketch abgelegt: ein dünn besetztes Histogramm
+auf ganze Minuten ({Minute: Anzahl}). Sketches sind exakt mischbar (Anzahlen
+addieren); das Quantil eines Zeitraums kommt aus der Mischung der Tages-
+Sketches, ein Jahr sind also 365 kleine Histogramme statt einer Sortierung
+aller Einzelwerte. Die Genauigkeit beträgt eine Minute, die Größe eines
+Sketches ist durch die Obergrenze der Kennzahl beschränkt.
+
+Kennzahlen (SKETCH_METRICS, Werte in Minuten):
+    nap               Nickerchen-Dauer, Tag des Endes
+    night             Nachtschlaf abzüglich nächtlichen Aufwachens, Aufwach-Tag
+    bedtime           Einschlafzeit des Nachtschlafs (Uhrzeit), Aufwach-Tag;
+                      intern ab 12 Uhr gezählt, damit 23:30 und 0:30 benachbart sind
+    wake_window       Schlafende -> nächster Schlafbeginn, Tag des Schlafbeginns
+                      (wie Sleep.get_wake_window_statistics)
+    feeding_interval  Abstand zweier Stillmahlzeiten, Tag der späteren
+
+Die Schlafzeilen sind dieselben wie in Sleep.get_sleep_statistics (type,
+start_time, end_time); Dauern über den Grenzen aus integrity.MAX_DURATION_HOURS
+bzw. MAX_WAKE_WINDOW_HOURS gelten als Erfassungsfehler und fehlen.
+
+Die Tages-Sketches werden in quantile_sketches gespeichert (Migration 029,
+eine Zeile pro Kind, Tag und Kennzahl). quantile_sketch_months hält je Monat
+die Monatsversionen aus data_month_versions (Migration 028), mit denen er
+berechnet wurde. Ein Monat liest nur Zeilen ab dem Vortag seines Ersten und
+veraltet nur durch Schreibzugriffe auf diese Tage. Gespeicherte Monate
+überstehen damit Neustarts und unabhängige Einträge.
+
+Lesen kostet zwei Queries (Versionen, gespeicherte Monate). Veraltete oder
+fehlende Monate werden beim Lesen zusätzlich berechnet (drei Queries: Schlaf,
+Aufwachen, Stillen; unabhängig von der Länge des Zeitraums), aber nicht
+gespeichert: Die Trends-Seite liest über Nur-Lese-Verbindungen
+(app/stats_pool.py). Gespeichert wird in der periodischen Wartung
+(app/maintenance.py, refresh_stored_sketches).
+"""
+import json
+from datetime import date, timedelta
+
+from app.integrity import MAX_DURATION_HOURS
+from app.models.database import get_db, get_active_baby_id
+from app.models.intervals import get_interval_index
+from app.models.models import MAX_WAKE_WINDOW_HOURS, NightWaking
+from app.models.stats_cache import as_date, month_spans, month_versions
+from app.timestamps import parse_timestamp
+
+SKETCH_METRICS = ('nap', 'night', 'bedtime', 'wake_window', 'feeding_interval')
+# Tabellen, aus denen die Sketches berechnet werden
+SKETCH_TABLES = ('sleep', 'night_waking', 'feeding')
+QUANTILES = (('p10', 0.1), ('median', 0.5), ('p90', 0.9))
+FEEDING_INTERVAL_MAX_HOURS = 12
+
+_MAX_MINUTES = {
+    'nap': MAX_DURATION_HOURS['nap'] * 60,
+    'night': MAX_DURATION_HOURS['night'] * 60,
+    'wake_window': MAX_WAKE_WINDOW_HOURS * 60,
+    'feeding_interval': FEEDING_INTERVAL_MAX_HOURS * 60,
+}
+# Einschlafzeiten relativ zu 12:00 (Minuten), siehe Moduldoku
+_BEDTIME_ORIGIN_MINUTES = 12 * 60
+
+
+def add_value(sketch, minutes):
+    key = int(round(minutes))
+    sketch[key] = sketch.get(key, 0) + 1
+
+
+def merge_sketches(sketches):
+    merged = {}
+    for sketch in sketches:
+        for key, count in sketch.items():
+            merged[key] = merged.get(key, 0) + count
+    return merged
+
+
+def _value_at_ranks(sketch, ranks):
+    """Werte an den (aufsteigenden, 0-basierten) Rängen des Histogramms."""
+    values, seen = [], 0
+    pending = iter(ranks)
+    rank = next(pending, None)
+    for key in sorted(sketch):
+        seen += sketch[key]
+        while rank is not None and rank < seen:
+            values.append(key)
+            rank = next(pending, None)
+    return values
+
+
+def sketch_quantile(sketch, q):
+    """Quantil mit linearer Interpolation zwischen Rängen (wie statistics.quantiles 'inclusive')."""
+    total = sum(sketch.values())
+    if not total:
+        return None
+    position = q * (total - 1)
+    rank = int(position)
+    lower, upper = _value_at_ranks(sketch, (rank, min(rank + 1, total - 1)))
+    return lower + (upper - lower) * (position - rank)
+
+
+def _minutes_between(earlier, later):
+    return (later - earlier).total_seconds() / 60
+
+
+def _day_sketches(db, baby_id, first, last):
+    """Je Tag von first bis last ein dict {Kennzahl: Sketch} (drei Queries)."""
+    days = [{} for _ in range((last - first).days + 1)]
+
+    def add(metric, day, minutes):
+        offset = (day - first).days
+        limit = _MAX_MINUTES.get(metric)
+        if not 0 <= offset < len(days) or (limit is not None and not 0 < minutes <= limit):
+            return
+        add_value(days[offset].setdefault(metric, {}), minutes)
+
+    # Einen Tag Vorlauf: Nächte vom Vorabend und das Wachfenster davor
+    lower = (first - timedelta(days=1)).isoformat()
+    upper = (last + timedelta(days=1)).isoformat()
+    rows = db.execute(
+        '''SELECT type, start_time, end_time,
+                  LAG(end_time) OVER (ORDER BY start_time) AS prev_end_time
+           FROM sleep
+           WHERE baby_id = ? AND start_time >= ? AND start_time < ?
+           ORDER BY start_time''',
+        (baby_id, lower, upper)
+    ).fetchall()
+    get_interval_index('night_waking', first - timedelta(days=1), last + timedelta(days=1), baby_id=baby_id)
+
+    for row in rows:
+        start = parse_timestamp(row['start_time'])
+        if start is None:
+            continue
+        prev_end = parse_timestamp(row['prev_end_time']) if row['prev_end_time'] else None
+        if prev_end is not None:
+            add('wake_window', start.date(), _minutes_between(prev_end, start))
+        end = parse_timestamp(row['end_time']) if row['end_time'] else None
+        if end is None:
+            continue
+        if row['type'] == 'night':
+            waking_hours = NightWaking.get_total_waking_duration(row['start_time'], row['end_time'], baby_id=baby_id)
+            add('night', end.date(), _minutes_between(start, end) - waking_hours * 60)
+            bedtime = (start.hour * 60 + start.minute - _BEDTIME_ORIGIN_MINUTES) % (24 * 60)
+            add('bedtime', end.date(), bedtime)
+        else:
+            add('nap', end.date(), _minutes_between(start, end))
+
+    rows = db.execute(
+        '''SELECT timestamp, LAG(timestamp) OVER (ORDER BY timestamp) AS prev_timestamp
+           FROM feeding
+           WHERE baby_id = ? AND timestamp >= ? AND timestamp < ?''',
+        (baby_id, lower, upper)
+    ).fetchall()
+    for row in rows:
+        current = parse_timestamp(row['timestamp'])
+        previous = parse_timestamp(row['prev_timestamp']) if row['prev_timestamp'] else None
+        if current is not None and previous is not None:
+            add('feeding_interval', current.date(), _minutes_between(previous, current))
+    return days
+
+
+def _month_label(first):
+    return first.isoformat()[:7]
+
+
+def _encode_versions(versions):
+    return json.dumps(versions)
+
+
+def _stored_months(db, baby_id, months, versions):
+    """{Monatserster: Tages-Sketches} der gespeicherten Monate mit aktuellen Versionen (eine Query)."""
+    spans = {_month_label(first): (first, last) for first, last in months}
+    rows = db.execute(
+        '''SELECT m.month, m.versions, s.day, s.metric, s.sketch
+           FROM quantile_sketch_months m
+           LEFT JOIN quantile_sketches s
+             ON s.baby_id = m.baby_id AND s.day >= m.month || '-01' AND s.day <= m.month || '-31'
+           WHERE m.baby_id = ? AND m.month BETWEEN ? AND ?''',
+        (baby_id, min(spans), max(spans))
+    ).fetchall()
+    result = {}
+    for row in rows:
+        first, last = spans[row['month']]
+        if row['versions'] != _encode_versions(versions[first]):
+            continue
+        days = result.setdefault(first, [{} for _ in range((last - first).days + 1)])
+        if row['day'] is not None:
+            sketch = {int(minute): count for minute, count in json.loads(row['sketch']).items()}
+            days[date.fromisoformat(row['day']).day - 1][row['metric']] = sketch
+    return result
+
+
+def _month_sketches(db, baby_id, months):
+    """(alle Monate, davon neu berechnete, Versionen) - {Monatserster: Tages-Sketches}."""
+    versions = month_versions(SKETCH_TABLES, baby_id, months)
+    result = _stored_months(db, baby_id, months, versions)
+    missing = [(first, last) for first, last in months if first not in result]
+    computed = {}
+    if missing:
+        span_first = missing[0][0]
+        days = _day_sketches(db, baby_id, span_first, missing[-1][1])
+        for first, last in missing:
+            offset = (first - span_first).days
+            computed[first] = days[offset:offset + (last - first).days + 1]
+    result.update(computed)
+    return result, computed, versions
+
+
+def _store_months(db, baby_id, by_month, versions):
+    for first, days in by_month.items():
+        last = first + timedelta(days=len(days) - 1)
+        db.execute('DELETE FROM quantile_sketches WHERE baby_id = ? AND day BETWEEN ? AND ?',
+                   (baby_id, first.isoformat(), last.isoformat()))
+        db.executemany(
+            'INSERT INTO quantile_sketches (baby_id, day, metric, sketch) VALUES (?, ?, ?, ?)',
+            [(baby_id, (first + timedelta(days=index)).isoformat(), metric, json.dumps(sketch))
+             for index, sketches in enumerate(days) for metric, sketch in sketches.items()]
+        )
+        db.execute('INSERT OR REPLACE INTO quantile_sketch_months (baby_id, month, versions) VALUES (?, ?, ?)',
+                   (baby_id, _month_label(first), _encode_versions(versions[first])))
+
+
+def refresh_stored_sketches(baby_id, today):
+    """Berechnet veraltete Monate vom ersten Eintrag bis heute neu und speichert sie.
+
+    Liefert die Zahl der neu gespeicherten Monate; der Aufrufer committet.
+    """
+    db = get_db()
+    row = db.execute(
+        '''SELECT MIN(first) AS first FROM (
+               SELECT MIN(start_time) AS first FROM sleep WHERE baby_id = ?
+               UNION ALL SELECT MIN(timestamp) FROM feeding WHERE baby_id = ?)''',
+        (baby_id, baby_id)
+    ).fetchone()
+    try:
+        first = date.fromisoformat(row['first'][:10])
+    except (TypeError, ValueError):
+        return 0
+    if first > today:
+        return 0
+    _, computed, versions = _month_sketches(db, baby_id, month_spans(first, today))
+    _store_months(db, baby_id, computed, versions)
+    return len(computed)
+
+
+def get_distribution_quantiles(start_date, end_date, baby_id=None):
+    """{Kennzahl: {'count', 'p10', 'median', 'p90'}} in Minuten (bedtime: Minuten ab Mitternacht)."""
+    baby_id = baby_id or get_active_baby_id()
+    start_date, end_date = as_date(start_date), as_date(end_date)
+    months = month_spans(start_date, end_date)
+    by_month, _, _ = _month_sketches(get_db(), baby_id, months)
+
+    selected = []
+    for first, _ in months:
+        for index, sketches in enumerate(by_month[first]):
+            if start_date <= first + timedelta(days=index) <= end_date:
+                selected.append(sketches)
+
+    result = {}
+    for metric in SKETCH_METRICS:
+        merged = merge_sketches(day[metric] for day in selected if metric in day)
+        quantiles = {key: sketch_quantile(merged, q) for key, q in QUANTILES}
+        if metric == 'bedtime':
+            quantiles = {key: None if value is None else round(value + _BEDTIME_ORIGIN_MINUTES) % (24 * 60)
+                         for key, value in quantiles.items()}
+        else:
+            quantiles = {key: None if value is None else round(value) for key, value in quantiles.items()}
+        result[metric] = {'count': sum(merged.values()), **quantiles}
+    return result
@@ -0,0 +1,203 @@
+"""LRU-Cache für die get_*_statistics-Funktionen.
+
+Auf der Trends-Seite wird oft zwischen denselben Zeiträumen ("letzte 7 Tage",
+"letzte 30 Tage") gewechselt, und jeder Besuch rechnet alles neu. Der Cache
+liegt prozessweit vor den Statistik-Funktionen; Schlüssel ist
+
+    (Funktion, baby_id, start_date, end_date, Datenversionen)
+
+Die Datenversionen stammen aus der Tabelle data_versions (Migration 027):
+Trigger erhöhen die Version einer Tabelle bei jedem INSERT/UPDATE/DELETE, egal
+über welchen Code geschrieben wird. Ein Schreibzugriff macht damit alle
+Einträge der betroffenen Tabellen unerreichbar; sie fallen per LRU heraus.
+Der Zufallswert '_database' gehört ebenfalls zum Schlüssel, damit Einträge nie
+für eine andere Datenbankdatei gelten.
+
+Zeiträume, die vor heute enden, ändern sich nur durch Schreibzugriffe und
+bleiben bis zur Verdrängung gültig. Reicht ein Zeitraum bis heute, hängt das
+Ergebnis zusätzlich von der Uhrzeit ab (laufende Einträge, angebrochener Tag);
+solche Einträge verfallen nach CURRENT_RANGE_TTL_SECONDS.
+
+Tageswerte für lange Zeiträume (Aktogramm) werden pro
+(Kind, Monat) abgelegt (cached_months): Ein Jahr setzt sich aus zwölf
+Einträgen zusammen, fehlende Monate werden gemeinsam berechnet. Statt der
+globalen Tabellenversionen stehen hier die Monatsversionen aus
+data_month_versions (Migration 028) im Schlüssel; ein Eintrag von heute lässt
+abgeschlossene Monate also gültig. Die Quantil-Sketches speichern ihre
+Monate mit denselben Versionen in der Datenbank (app/models/quantile_sketches.py).
+
+Der Cache ist thread-sicher (die Trends-Seite rechnet parallel, siehe
+app/stats_pool.py). Treffer liefern eine Kopie, weil Aufrufer die Ergebnisse
+teils ergänzen.
+
+Konfiguration über Umgebungsvariablen:
+    STATS_CACHE_SIZE  maximale Anzahl Einträge (Standard 128, 0 = aus)
+"""
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from app.env import env_int
+from app.models.database import get_db, get_active_baby_id
+
+CURRENT_RANGE_TTL_SECONDS = 60
+
+
+def cache_size():
+    return env_int('STATS_CACHE_SIZE', 128, 0)
+
+
+class StatsCache:
+    """LRU-Cache mit Größenlimit; Werte optional mit Ablaufzeit (monotonic)."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value, ttl=None, maxsize=None):
+        maxsize = cache_size() if maxsize is None else maxsize
+        if maxsize <= 0:
+            return
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(value), expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+_cache = StatsCache()
+
+
+def get_stats_cache():
+    return _cache
+
+
+def clear_stats_cache():
+    _cache.clear()
+
+
+def data_versions(tables):
+    """Versionen der Tabellen samt '_database' - Teil jedes Cache-Schlüssels."""
+    rows = get_db().execute(
+        f'''SELECT table_name, version FROM data_versions
+            WHERE table_name IN ('_database', {', '.join('?' for _ in tables)})
+            ORDER BY table_name''',
+        tables
+    ).fetchall()
+    return tuple((row['table_name'], row['version']) for row in rows)
+
+
+def as_date(value):
+    """date oder ISO-String -> date (auch für die Quantil-Sketches)."""
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def cached_statistics(*tables):
+    """Dekorator für ``func(start_date, end_date, baby_id=None)``, die nur `tables` liest."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(start_date, end_date, baby_id=None):
+            if cache_size() <= 0:
+                return func(start_date, end_date, baby_id=baby_id)
+            baby_id = baby_id or get_active_baby_id()
+            key = (func.__qualname__, baby_id, start_date, end_date, data_versions(tables))
+            result = _cache.get(key)
+            if result is None:
+                result = func(start_date, end_date, baby_id=baby_id)
+                ttl = CURRENT_RANGE_TTL_SECONDS if as_date(end_date) >= date.today() else None
+                _cache.put(key, result, ttl=ttl)
+            return result
+        return wrapper
+    return decorator
+
+
+def month_spans(start_date, end_date):
+    """[(Monatserster, Monatsletzter), ...] für alle Monate, die der Zeitraum berührt."""
+    months = []
+    first = start_date.replace(day=1)
+    while first <= end_date:
+        following = (first + timedelta(days=32)).replace(day=1)
+        months.append((first, following - timedelta(days=1)))
+        first = following
+    return months
+
+
+def month_versions(tables, baby_id, months):
+    """{Monatserster: Versionen der Tabellen in diesem Monat samt '_database'} (eine Query)."""
+    labels = {first.isoformat()[:7]: first for first, _ in months}
+    rows = get_db().execute(
+        f'''SELECT table_name, NULL AS month, version FROM data_versions WHERE table_name = '_database'
+            UNION ALL
+            SELECT table_name, month, version FROM data_month_versions
+            WHERE baby_id = ? AND month BETWEEN ? AND ?
+              AND table_name IN ({', '.join('?' for _ in tables)})
+            ORDER BY table_name''',
+        (baby_id, min(labels), max(labels), *tables)
+    ).fetchall()
+    database = tuple((row['table_name'], row['version']) for row in rows if row['month'] is None)
+    versions = {first: database for first in labels.values()}
+    for row in rows:
+        if row['month'] in labels:
+            first = labels[row['month']]
+            versions[first] = versions[first] + ((row['table_name'], row['version']),)
+    return versions
+
+
+def cached_months(name, tables, baby_id, months, compute_span):
+    """{Monatserster: Tageswerte des ganzen Monats} - aus dem Cache oder berechnet.
+
+    compute_span(first, last) liefert eine Liste mit einem Wert pro Tag; alle
+    fehlenden Monate werden in einem Aufruf (von erstem bis letztem) berechnet.
+    Die Werte eines Monats dürfen nur von Zeilen mit Beginn vom Vortag des
+    Monatsersten bis zum Monatsletzten abhängen (siehe Migration 028).
+    """
+    use_cache = cache_size() > 0
+    versions = month_versions(tables, baby_id, months) if use_cache else {}
+    keys = {first: (name, baby_id, first, versions.get(first)) for first, _ in months}
+
+    result, missing = {}, []
+    for first, last in months:
+        cached = _cache.get(keys[first]) if use_cache else None
+        if cached is None:
+            missing.append((first, last))
+        else:
+            result[first] = cached
+    if not missing:
+        return result
+
+    span_first = missing[0][0]
+    values = compute_span(span_first, missing[-1][1])
+    for first, last in missing:
+        offset = (first - span_first).days
+        result[first] = values[offset:offset + (last - first).days + 1]
+        if use_cache:
+            ttl = CURRENT_RANGE_TTL_SECONDS if last >= date.today() else None
+            _cache.put(keys[first], result[first], ttl=ttl)
+    return result
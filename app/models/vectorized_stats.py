@@ -0,0 +1,241 @@
+"""Vektorisierte Schlaf-Statistik für lange Zeiträume (optional, benötigt NumPy).
+
+Sleep.get_sleep_statistics verarbeitet die Einträge Zeile für Zeile und fragt
+für jeden Nachtschlaf das nächtliche Aufwachen einzeln ab. Ab
+VECTORIZE_MIN_DAYS Tagen lädt dieser Pfad den Zeitraum stattdessen als
+Epoch-Arrays (eine Query für Schlaf, eine für Aufwachen) und rechnet
+Tageszuordnung, Nacht/Nickerchen-Aufteilung, Aufwachen-Abzug, Durchschnitte
+und Qualitäts-/Ort-Verteilung mit Array-Operationen.
+
+Die Ergebnisse entsprechen dem Python-Pfad, inklusive dessen Eigenheiten
+(Aufwachen pro Nacht auf 0,01 h gerundet, Nachtschlaf dem Aufwach-Tag
+zugerechnet, Zeilen vor dem Zeitraum ohne Einschlafzeit). Summen werden in
+derselben Reihenfolge gebildet, damit auch die Gleitkommawerte übereinstimmen.
+
+Ohne installiertes NumPy ist is_available() False und der Python-Pfad bleibt
+aktiv (requirements.txt bleibt unverändert).
+"""
+from datetime import datetime, date
+
+from app.timezone import tz_berlin, normalize_to_berlin
+from app.timestamps import parse_timestamp
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - abhängig von der Umgebung
+    np = None
+
+# Ab dieser Zeitraumlänge (in Tagen) lohnt sich der Array-Aufbau
+VECTORIZE_MIN_DAYS = 21
+
+SECONDS_PER_DAY = 86400
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def is_available():
+    return np is not None
+
+
+def epoch_arrays(values):
+    """Parst Zeitstempel-Strings -> (gültig, Epoch-Sekunden, lokale Epoch-Sekunden).
+
+    Öffentlich, weil auch das Aktogramm Zeitstempel so in Arrays umwandelt.
+    """
+    count = len(values)
+    valid = np.zeros(count, dtype=bool)
+    epoch = np.zeros(count, dtype=np.float64)
+    local = np.zeros(count, dtype=np.float64)
+    for i, value in enumerate(values):
+        dt = parse_timestamp(value) if value else None
+        if dt is None:
+            continue
+        ts = dt.timestamp()
+        valid[i] = True
+        epoch[i] = ts
+        local[i] = ts + dt.utcoffset().total_seconds()
+    return valid, epoch, local
+
+
+def _local_day(local_seconds):
+    return np.floor_divide(local_seconds, SECONDS_PER_DAY).astype(np.int64)
+
+
+def _hour_fraction(local_seconds):
+    """Stunde + Minute/60 wie end.hour + end.minute / 60.0 im Python-Pfad."""
+    seconds_of_day = np.mod(local_seconds, SECONDS_PER_DAY)
+    hours = np.floor_divide(seconds_of_day, 3600)
+    minutes = np.mod(np.floor_divide(seconds_of_day, 60), 60)
+    return hours + minutes / 60.0
+
+
+def _day_key(day_index):
+    return date.fromordinal(int(day_index) + EPOCH_ORDINAL).isoformat()
+
+
+def _sequential_sum(values):
+    """Summe in Zeilenreihenfolge (np.sum summiert paarweise und weicht minimal ab)."""
+    return float(np.cumsum(values)[-1]) if len(values) else 0
+
+
+def _histogram(values):
+    """Zählt nicht-leere (getrimmte) Werte -> {Wert: Anzahl}."""
+    labels = [label for label in ((value or '').strip() for value in values) if label]
+    if not labels:
+        return {}
+    keys, counts = np.unique(np.array(labels, dtype=object), return_counts=True)
+    return dict(zip(keys.tolist(), counts.tolist()))
+
+
+def _night_waking_hours(db, baby_id, night_start, night_end, now_epoch):
+    """Aufwach-Dauer je Nacht wie NightWaking.get_total_waking_duration (in Stunden,
+    auf 0,01 gerundet) - ohne Query pro Nacht: alle Paare (Nacht, Aufwachen) mit
+    Aufwach-Beginn innerhalb der Nacht werden per searchsorted gebildet."""
+    result = np.zeros(len(night_start), dtype=np.float64)
+    if not len(night_start):
+        return result
+
+    lower = datetime.fromtimestamp(float(night_start.min()) - 86400, tz_berlin).strftime('%Y-%m-%dT%H:%M:%S')
+    upper = datetime.fromtimestamp(float(night_end.max()) + 86400, tz_berlin).strftime('%Y-%m-%dT%H:%M:%S')
+    rows = db.execute(
+        '''SELECT start_time, end_time FROM night_waking
+           WHERE start_time >= ? AND start_time <= ? AND baby_id = ?''',
+        (lower, upper, baby_id)
+    ).fetchall()
+    if not rows:
+        return result
+
+    start_valid, waking_start, _ = epoch_arrays([row['start_time'] for row in rows])
+    end_values = [row['end_time'] for row in rows]
+    end_valid, waking_end, _ = epoch_arrays(end_values)
+    is_open = np.array([not value for value in end_values], dtype=bool)
+    # Ungültiges Ende verwirft das Aufwachen (wie der ValueError-Zweig im Python-Pfad)
+    keep = start_valid & (end_valid | is_open)
+    waking_start, waking_end, is_open = waking_start[keep], waking_end[keep], is_open[keep]
+
+    order = np.argsort(waking_start, kind='stable')
+    waking_start, waking_end, is_open = waking_start[order], waking_end[order], is_open[order]
+
+    first = np.searchsorted(waking_start, night_start, side='left')
+    last = np.searchsorted(waking_start, night_end, side='right')
+    counts = last - first
+    if not counts.sum():
+        return result
+
+    # Paare (Nacht, Aufwachen) ohne Python-Schleife aufspannen
+    night_idx = np.repeat(np.arange(len(night_start)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    waking_idx = np.repeat(first, counts) + offsets
+
+    pair_night_end = night_end[night_idx]
+    pair_start = waking_start[waking_idx]
+    pair_end = np.where(is_open[waking_idx],
+                        np.minimum(now_epoch, pair_night_end),
+                        waking_end[waking_idx])
+    # Ein offenes Aufwachen gilt als im Nachtschlaf liegend (min(jetzt, Ende)),
+    # ein beendetes nur, wenn sein Ende ebenfalls in die Nacht fällt
+    inside = is_open[waking_idx] | ((pair_end >= night_start[night_idx]) & (pair_end <= pair_night_end))
+    durations = np.where(inside, pair_end - pair_start, 0.0)
+    totals = np.bincount(night_idx, weights=durations, minlength=len(night_start))
+    # Rundung exakt wie round(total_seconds / 3600, 2) im Python-Pfad
+    return np.array([round(total / 3600, 2) if total > 0 else 0.0 for total in totals.tolist()])
+
+
+def get_sleep_statistics(db, baby_id, start_date_obj, end_date_obj, range_start_str, range_end_str, start_date, end_date):
+    """Gegenstück zu Sleep.get_sleep_statistics; gleiche Rückgabestruktur."""
+    rows = db.execute(
+        '''SELECT type, start_time, end_time, sleep_quality, sleep_location,
+                  (start_time >= ? AND start_time <= ?) AS in_range
+           FROM sleep
+           WHERE baby_id = ?
+           AND ((start_time >= ? AND start_time <= ?)
+                OR (start_time < ? AND end_time >= ? AND end_time <= ?))
+           ORDER BY in_range DESC, start_time''',
+        (range_start_str, range_end_str, baby_id, range_start_str, range_end_str,
+         range_start_str, range_start_str, range_end_str)
+    ).fetchall()
+
+    # Verteilung nach Qualität/Ort: alle im Zeitraum gestarteten Einträge (auch laufende)
+    quality_counts = _histogram(row['sleep_quality'] for row in rows if row['in_range'])
+    location_counts = _histogram(row['sleep_location'] for row in rows if row['in_range'])
+
+    rows = [row for row in rows if row['end_time'] is not None]
+    start_valid, start_epoch, start_local = epoch_arrays([row['start_time'] for row in rows])
+    end_valid, end_epoch, end_local = epoch_arrays([row['end_time'] for row in rows])
+    valid = start_valid & end_valid
+    in_range = np.array([bool(row['in_range']) for row in rows], dtype=bool)[valid]
+    is_night = np.array([row['type'] == 'night' for row in rows], dtype=bool)[valid]
+    start_epoch, start_local = start_epoch[valid], start_local[valid]
+    end_epoch, end_local = end_epoch[valid], end_local[valid]
+
+    first_day = start_date_obj.toordinal() - EPOCH_ORDINAL
+    last_day = end_date_obj.toordinal() - EPOCH_ORDINAL
+    start_day = _local_day(start_local)
+    end_day = _local_day(end_local)
+    end_in_range = (end_day >= first_day) & (end_day <= last_day)
+
+    duration = (end_epoch - start_epoch) / 3600
+    now_epoch = datetime.now(tz_berlin).timestamp()
+    waking = _night_waking_hours(db, baby_id, start_epoch[is_night], end_epoch[is_night], now_epoch)
+    duration[is_night] = np.maximum(0, duration[is_night] - waking)
+
+    # Beitrag zum Tageswert: grundsätzlich volle Dauer am End-Tag
+    contribution = duration.copy()
+    counted = end_in_range.copy()
+    # Nickerchen vor dem Zeitraum: nur der Teil ab Mitternacht des End-Tags, sofern
+    # sie vor Beginn des Zeitraums starten; sonst entscheidet der String-Vergleich
+    # des End-Tags mit den übergebenen Grenzen (wie im Python-Pfad)
+    period_start = normalize_to_berlin(datetime.combine(start_date_obj, datetime.min.time())).timestamp()
+    prev_nap = ~in_range & ~is_night
+    clipped = prev_nap & (start_epoch < period_start)
+    if clipped.any():
+        end_midnight = np.array([
+            normalize_to_berlin(datetime.combine(date.fromordinal(int(day) + EPOCH_ORDINAL), datetime.min.time())).timestamp()
+            for day in end_day[clipped]
+        ])
+        contribution[clipped] = (end_epoch[clipped] - end_midnight) / 3600
+    unclipped_prev_nap = prev_nap & ~clipped
+    if unclipped_prev_nap.any():
+        start_key, end_key = str(start_date), str(end_date)
+        counted[unclipped_prev_nap] = [start_key <= _day_key(day) <= end_key
+                                       for day in end_day[unclipped_prev_nap]]
+
+    counted_days = end_day[counted]
+    daily_sleep = {}
+    if len(counted_days):
+        unique_days, first_index, inverse = np.unique(counted_days, return_index=True, return_inverse=True)
+        sums = np.bincount(inverse, weights=contribution[counted], minlength=len(unique_days))
+        # Schlüssel in Reihenfolge des ersten Auftretens, wie beim dict im Python-Pfad
+        for position in np.argsort(first_index, kind='stable'):
+            daily_sleep[_day_key(unique_days[position])] = 0 + float(sums[position])
+
+    nap_hours = _sequential_sum(duration[~is_night])
+    night_hours = _sequential_sum(duration[is_night])
+
+    # Aufwachzeiten: Nächte im Zeitraum nur mit End-Tag im Zeitraum, Nächte davor immer
+    wake_mask = is_night & (~in_range | end_in_range)
+    wake_times = _hour_fraction(end_local[wake_mask]).tolist()
+    start_in_range = (start_day >= first_day) & (start_day <= last_day)
+    sleep_times = _hour_fraction(start_local[is_night & in_range & start_in_range]).tolist()
+
+    total_sleep = sum(daily_sleep.values())
+    total_days = len(daily_sleep)
+    avg_daily_sleep = total_sleep / total_days if total_days > 0 else 0
+    avg_wake_time = sum(wake_times) / len(wake_times) if wake_times else 0
+    avg_sleep_time = sum(sleep_times) / len(sleep_times) if sleep_times else 0
+
+    return {
+        'daily_sleep': daily_sleep,
+        'total_sleep': round(total_sleep, 1),
+        'avg_daily_sleep': round(avg_daily_sleep, 1),
+        'nap_hours': round(nap_hours, 1),
+        'night_hours': round(night_hours, 1),
+        'nap_percentage': round(nap_hours / total_sleep * 100, 1) if total_sleep > 0 else 0,
+        'night_percentage': round(night_hours / total_sleep * 100, 1) if total_sleep > 0 else 0,
+        'wake_times': wake_times,
+        'sleep_times': sleep_times,
+        'avg_wake_time': round(avg_wake_time, 1),
+        'avg_sleep_time': round(avg_sleep_time, 1),
+        'total_days': total_days,
+        'sleep_quality_counts': quality_counts,
+        'sleep_location_counts': location_counts,
+    }
@@ -0,0 +1,167 @@
+"""Stichproben-Profiler für den laufenden Server.
+
+Ein Hintergrund-Thread liest in festem Takt die Stacks aller Threads über
+sys._current_frames() aus und zählt sie als "folded stacks"
+(``frame;frame;frame count`` – direkt kompatibel mit flamegraph.pl bzw.
+speedscope). Erfasst werden nur Frames aus dem app-Paket, damit die Ausgabe
+auf models.py und die Routen fokussiert bleibt und nicht von Flask/Werkzeug-
+Interna dominiert wird.
+
+Der Speicherbedarf ist begrenzt: es werden höchstens PROFILER_MAX_STACKS
+unterschiedliche Stacks gehalten, weitere Samples landen gesammelt im
+Overflow-Eintrag, und die Stacktiefe ist auf PROFILER_MAX_DEPTH gekappt.
+
+Konfiguration über Umgebungsvariablen (analog zu APP_TIMEZONE/DATABASE_PATH):
+    PROFILER_ENABLED     "1"/"true" startet den Sampler beim App-Start und
+                         registriert die Endpunkte unter /debug/profiler
+    PROFILER_TOKEN       Pflicht-Header X-Profiler-Token für diese Endpunkte
+    PROFILER_INTERVAL_MS Abtastintervall in Millisekunden (Standard 10)
+    PROFILER_MAX_STACKS  max. Anzahl unterschiedlicher Stacks (Standard 5000)
+    PROFILER_MAX_DEPTH   max. Frames pro Stack (Standard 64)
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from app.env import env_int
+
+_APP_ROOT = os.path.dirname(os.path.abspath(__file__))
+OVERFLOW_STACK = '[overflow]'
+
+
+def is_enabled_by_env():
+    return os.environ.get('PROFILER_ENABLED', '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class SamplingProfiler:
+    """Sammelt Stack-Samples in einem Daemon-Thread."""
+
+    def __init__(self, interval=None, max_stacks=None, max_depth=None):
+        if interval is None:
+            interval = env_int('PROFILER_INTERVAL_MS', 10, 1) / 1000.0
+        self.interval = max(0.001, float(interval))
+        self.max_stacks = max_stacks or env_int('PROFILER_MAX_STACKS', 5000, 1)
+        self.max_depth = max_depth or env_int('PROFILER_MAX_DEPTH', 64, 1)
+        self._stacks = Counter()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.samples = 0
+        self.started_at = None
+        # Pfad -> Label bzw. None (nicht im app-Paket); vermeidet wiederholte
+        # String-Operationen pro Frame
+        self._file_labels = {}
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return False
+        self._stop_event.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        if not self.running:
+            return False
+        self._stop_event.set()
+        self._thread.join(timeout=max(1.0, self.interval * 10))
+        self._thread = None
+        return True
+
+    def reset(self):
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            self.sample(skip_ident=own_ident)
+
+    def _label(self, filename):
+        label = self._file_labels.get(filename, False)
+        if label is False:
+            path = os.path.abspath(filename)
+            if path.startswith(_APP_ROOT + os.sep):
+                rel = os.path.relpath(path, os.path.dirname(_APP_ROOT))
+                label = rel.replace(os.sep, '/')
+            else:
+                label = None
+            self._file_labels[filename] = label
+        return label
+
+    def _fold(self, frame):
+        """Baut aus einem Frame den gefalteten Stack (Wurzel zuerst)."""
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._label(code.co_filename)
+            if label is not None:
+                parts.append(f'{label}:{code.co_name}')
+            frame = frame.f_back
+        if not parts:
+            return None
+        # Bei zu tiefen Stacks die innersten (heißesten) Frames behalten
+        parts = parts[:self.max_depth]
+        parts.reverse()
+        return ';'.join(parts)
+
+    def sample(self, skip_ident=None):
+        """Nimmt ein einzelnes Sample aller Threads auf."""
+        frames = sys._current_frames()
+        folded = []
+        for ident, frame in frames.items():
+            if ident == skip_ident:
+                continue
+            stack = self._fold(frame)
+            if stack:
+                folded.append(stack)
+        del frames
+        self._record(folded)
+
+    def _record(self, folded):
+        with self._lock:
+            self.samples += 1
+            for stack in folded:
+                if stack in self._stacks or len(self._stacks) < self.max_stacks:
+                    self._stacks[stack] += 1
+                else:
+                    self._stacks[OVERFLOW_STACK] += 1
+
+    def folded(self):
+        """Liefert die Samples als flamegraph-kompatiblen Text."""
+        with self._lock:
+            items = sorted(self._stacks.items(), key=lambda item: (-item[1], item[0]))
+        return ''.join(f'{stack} {count}\n' for stack, count in items)
+
+    def status(self):
+        with self._lock:
+            distinct = len(self._stacks)
+        return {
+            'running': self.running,
+            'interval_ms': round(self.interval * 1000, 3),
+            'samples': self.samples,
+            'distinct_stacks': distinct,
+            'max_stacks': self.max_stacks,
+            'started_at': self.started_at,
+        }
+
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler():
+    """Prozessweite Profiler-Instanz (lazy erzeugt)."""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = SamplingProfiler()
+        return _profiler
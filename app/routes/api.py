@@ -0,0 +1,23 @@
+from flask import Blueprint, request, jsonify
+
+from app.models.models import get_entries_page, parse_timeline_cursor
+
+bp = Blueprint('api', __name__, url_prefix='/api')
+
+
+@bp.route('/entries')
+def entries():
+    """Timeline aller Kategorien als JSON, neueste zuerst.
+
+    Parameter: before=<timestamp>,<category>,<id> (next_before der vorherigen
+    Seite) und limit (Standard 50, höchstens 200).
+    """
+    before = request.args.get('before')
+    try:
+        cursor = parse_timeline_cursor(before) if before else None
+        limit = int(request.args.get('limit', 50))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    page, next_before = get_entries_page(before=cursor, limit=limit)
+    return jsonify({'entries': page, 'next_before': next_before})
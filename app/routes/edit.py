@@ -1,6 +1,6 @@
 from flask import Blueprint, request, redirect, url_for, flash, current_app
-from app.models.models import Sleep, Feeding, Bottle, Diaper, Temperature, Medicine, NightWaking, Porridge
-from app.form_datetime import normalize_form_datetime, is_end_before_start
+from app.models.models import Sleep, Feeding, Bottle, Diaper, Temperature, Medicine, NightWaking, Porridge, OverlapError
+from app.form_datetime import normalize_form_datetime, is_end_before_start, describe_overlap
 from app.form_validation import parse_bounded_number
 from app.i18n import _
 
@@ -31,6 +31,8 @@ def edit_sleep(sleep_id):
 
         Sleep.update(sleep_id, start_time, end_time, sleep_type, sleep_quality, sleep_location, sleep_comment)
         flash('Schlaf-Eintrag aktualisiert', 'success')
+    except OverlapError as e:
+        flash(describe_overlap(e), 'error')
     except Exception:
         current_app.logger.exception('Fehler beim Aktualisieren des Schlaf-Eintrags')
         flash(_('messages.error.update_error'), 'error')
@@ -239,6 +241,8 @@ def edit_night_waking(waking_id):
 
         NightWaking.update(waking_id, start_time, end_time)
         flash('Nächtliches Aufwachen aktualisiert', 'success')
+    except OverlapError as e:
+        flash(describe_overlap(e), 'error')
     except Exception:
         current_app.logger.exception('Fehler beim Aktualisieren des Aufwachen-Eintrags')
         flash(_('messages.error.update_error'), 'error')
@@ -1,54 +1,120 @@
-from flask import Blueprint, render_template, request
+from flask import Blueprint, render_template, request, url_for
 from app.models.models import get_all_entries_today, get_all_entries_date_range, BabyInfo
 from datetime import datetime, date, timedelta
 from app.i18n import get_language, _
 
-from app.timezone import normalize_to_berlin, to_berlin
+from app.timezone import normalize_to_berlin
+from app.timestamps import parse_timestamp
 
 bp = Blueprint('entries', __name__, url_prefix='/entries')
 
 
+# Obergrenze für die frei wählbare Zeitspanne (view=range), in Tagen
+MAX_RANGE_DAYS = 92
+
+_FALLBACK_TIME = normalize_to_berlin(datetime(2000, 1, 1))
+
+
 def _get_entry_time(entry):
     """Hilfsfunktion zum Extrahieren der Zeit für Sortierung"""
-    time_str = entry.get('timestamp') or entry.get('start_time', '2000-01-01T00:00:00')
+    return parse_timestamp(entry.get('timestamp') or entry.get('start_time')) or _FALLBACK_TIME
+
+
+def bucket_entries_by_day(entries, first_day, last_day):
+    """Ordnet Einträge in einem Durchlauf lokalen Kalendertagen zu.
+
+    Jeder Zeitstempel wird einmal geparst (parse_timestamp); Tag und
+    Sortierschlüssel (Tag, Zeit) werden dabei festgehalten, statt beim
+    Sortieren neu berechnet zu werden. Schlaf mit Ende zählt zum Tag des
+    Endes, alles andere zum Tag des Beginns. Duplikate werden über
+    (category, id) erkannt - ids sind nur je Kategorie eindeutig.
+    Einträge außerhalb [first_day, last_day] fallen weg; ungültige
+    Zeitstempel landen wie bisher am ersten Tag.
+    """
+    seen = set()
+    keyed = []
+    for entry in entries:
+        identity = (entry.get('category'), entry.get('id'))
+        if entry.get('id') is not None:
+            if identity in seen:
+                continue
+            seen.add(identity)
+
+        start_dt = parse_timestamp(entry.get('timestamp'))
+        day_dt = start_dt
+        if entry.get('category') == 'sleep' and entry.get('end_time'):
+            day_dt = parse_timestamp(entry['end_time']) or start_dt
+        day = day_dt.date() if day_dt is not None else first_day
+        if not first_day <= day <= last_day:
+            continue
+
+        entry['day'] = day
+        keyed.append(((day, start_dt or _FALLBACK_TIME), entry))
+
+    keyed.sort(key=lambda item: item[0])
+    return [entry for _, entry in keyed]
+
+
+def _parse_date(value, default):
     try:
-        return to_berlin(time_str)
-    except (ValueError, AttributeError):
-        return normalize_to_berlin(datetime(2000, 1, 1))
+        return date.fromisoformat(value) if value else default
+    except ValueError:
+        return default
+
+
+def _month_bounds(day):
+    first = day.replace(day=1)
+    following = (first + timedelta(days=32)).replace(day=1)
+    return first, following - timedelta(days=1)
 
 
 @bp.route('/')
 def entries():
-    """Zeigt alle Einträge mit Tages- oder Wochenansicht"""
+    """Zeigt alle Einträge mit Tages-, Wochen-, Monats- oder frei wählbarer Ansicht"""
     # Hole Parameter aus URL
-    view = request.args.get('view', 'day')  # 'day' oder 'week'
-    selected_date_str = request.args.get('date', None)
-    
-    # Bestimme das ausgewählte Datum
-    if selected_date_str:
-        try:
-            selected_date = date.fromisoformat(selected_date_str)
-        except ValueError:
-            selected_date = date.today()
-    else:
-        selected_date = date.today()
-    
-    # Berechne vorheriges und nächstes Datum
+    view = request.args.get('view', 'day')  # 'day', 'week', 'month' oder 'range'
+    if view not in ('day', 'week', 'month', 'range'):
+        view = 'day'
+    selected_date = _parse_date(request.args.get('date'), date.today())
+
+    # Zeitraum und Navigation (vorheriges/nächstes Datum) je Ansicht
     if view == 'day':
+        range_start = range_end = selected_date
         prev_date = selected_date - timedelta(days=1)
         next_date = selected_date + timedelta(days=1)
-    else:  # week
-        # Berechne Wochenanfang (Montag)
-        days_since_monday = selected_date.weekday()
-        week_start = selected_date - timedelta(days=days_since_monday)
-        prev_date = week_start - timedelta(days=7)
-        next_date = week_start + timedelta(days=7)
-    
-    # Hole alle Einträge
+    elif view == 'week':
+        # Wochenanfang (Montag)
+        range_start = selected_date - timedelta(days=selected_date.weekday())
+        range_end = range_start + timedelta(days=6)
+        prev_date = range_start - timedelta(days=7)
+        next_date = range_start + timedelta(days=7)
+    elif view == 'month':
+        range_start, range_end = _month_bounds(selected_date)
+        prev_date = _month_bounds(range_start - timedelta(days=1))[0]
+        next_date = range_end + timedelta(days=1)
+    else:  # range
+        range_end = _parse_date(request.args.get('end'), selected_date)
+        range_start = _parse_date(request.args.get('start'), range_end - timedelta(days=6))
+        if range_start > range_end:
+            range_start, range_end = range_end, range_start
+        range_start = max(range_start, range_end - timedelta(days=MAX_RANGE_DAYS - 1))
+        selected_date = range_end
+        span = range_end - range_start + timedelta(days=1)
+        prev_date = range_end - span
+        next_date = range_end + span
+
+    if view == 'range':
+        prev_url = url_for('entries.entries', view=view, start=(range_start - span).isoformat(),
+                           end=prev_date.isoformat())
+        next_url = url_for('entries.entries', view=view, start=(range_start + span).isoformat(),
+                           end=next_date.isoformat())
+    else:
+        prev_url = url_for('entries.entries', view=view, date=prev_date.isoformat())
+        next_url = url_for('entries.entries', view=view, date=next_date.isoformat())
+
     if view == 'day':
-        # Tagesansicht: Hole Einträge für den ausgewählten Tag
+        # Tagesansicht: Hole Einträge für den ausgewählten Tag, chronologisch (älteste zuerst)
         entries = get_all_entries_today(selected_date)
-        # Sortiere chronologisch (älteste zuerst)
         entries.sort(key=_get_entry_time)
         date_display = selected_date.strftime('%d.%m.%Y')
         if selected_date == date.today():
@@ -57,98 +123,13 @@ def entries():
             date_display = _('common.yesterday')
         elif selected_date == date.today() - timedelta(days=2):
             date_display = _('common.day_before_yesterday')
-    else:  # week
-        # Wochenansicht: Hole Einträge für die gesamte Woche
-        days_since_monday = selected_date.weekday()
-        week_start = selected_date - timedelta(days=days_since_monday)
-        week_end = week_start + timedelta(days=6)
-        
-        # PERFORMANCE-OPTIMIERUNG: Hole alle Einträge in einem Batch statt 7x get_all_entries_today()
-        # Dies reduziert DB-Queries von ~56 (7 Tage × 8 Queries) auf ~8 Queries
-        all_entries_raw = get_all_entries_date_range(week_start, week_end)
-        
-        all_entries = []
-        seen_entry_ids = set()  # Verhindere Duplikate
-        
-        # PERFORMANCE: Cached datetime parsing - parse einmal und cache das Ergebnis
-        def parse_timestamp_cached(ts_str):
-            """Parst einen Timestamp und cached das Ergebnis im Entry"""
-            if not ts_str:
-                return None
-            try:
-                return to_berlin(ts_str)
-            except (ValueError, AttributeError):
-                return None
-        
-        # Filtere und gruppiere Einträge nach Tag
-        for entry in all_entries_raw:
-            entry_id = entry.get('id')
-            
-            # Überspringe wenn dieser Eintrag bereits verarbeitet wurde
-            if entry_id and entry_id in seen_entry_ids:
-                continue
-            
-            # Bestimme zu welchem Tag der Eintrag gehört
-            entry_day = None
-            # Für Schlaf-Einträge mit end_time: Tag aus end_time
-            if entry.get('category') == 'sleep' and entry.get('end_time'):
-                end_dt = parse_timestamp_cached(entry['end_time'])
-                if end_dt:
-                    entry_day = end_dt.date()
-            
-            # Für alle anderen Einträge: Tag aus timestamp
-            if entry_day is None:
-                ts_dt = parse_timestamp_cached(entry.get('timestamp', ''))
-                if ts_dt:
-                    entry_day = ts_dt.date()
-                else:
-                    # Fallback: verwende week_start
-                    entry_day = week_start
-            
-            # Stelle sicher, dass entry_day ein date-Objekt ist (nicht datetime)
-            if isinstance(entry_day, datetime):
-                entry_day = entry_day.date()
-            elif not isinstance(entry_day, date):
-                try:
-                    entry_day = date.fromisoformat(str(entry_day))
-                except (ValueError, AttributeError):
-                    entry_day = week_start
-            
-            # Setze entry.day explizit als date-Objekt
-            entry['day'] = entry_day
-            
-            # Nur Einträge innerhalb der Woche hinzufügen
-            if entry_day and week_start <= entry_day <= week_end:
-                all_entries.append(entry)
-                if entry_id:
-                    seen_entry_ids.add(entry_id)
-        
-        # Stelle sicher, dass alle entry['day'] Werte date-Objekte sind (BEVOR sortiert wird)
-        for entry in all_entries:
-            entry_day = entry.get('day')
-            if entry_day is None or not isinstance(entry_day, date):
-                # Fallback: Tag aus timestamp extrahieren
-                try:
-                    ts_str = entry.get('timestamp', '')
-                    if ts_str:
-                        entry['day'] = to_berlin(ts_str).date()
-                    else:
-                        entry['day'] = date(2000, 1, 1)
-                except (ValueError, AttributeError):
-                    entry['day'] = date(2000, 1, 1)
-            elif isinstance(entry_day, datetime):
-                # Konvertiere datetime zu date
-                entry['day'] = entry_day.date()
-        
-        # Sortiere zuerst nach Tag, dann nach timestamp
-        all_entries.sort(key=lambda x: (
-            x.get('day', date(2000, 1, 1)),
-            _get_entry_time(x)
-        ))
-        
-        entries = all_entries
-        date_display = f"{week_start.strftime('%d.%m.%Y')} - {week_end.strftime('%d.%m.%Y')}"
-    
+    else:
+        # PERFORMANCE-OPTIMIERUNG: Ein Batch für den ganzen Zeitraum (eine Query pro
+        # Kategorie), Zuordnung zu Tagen in einem Durchlauf
+        entries = bucket_entries_by_day(get_all_entries_date_range(range_start, range_end),
+                                        range_start, range_end)
+        date_display = f"{range_start.strftime('%d.%m.%Y')} - {range_end.strftime('%d.%m.%Y')}"
+
     today = date.today()
     sleep_meta = BabyInfo.get_sleep_meta_settings()
     # Wochentags-Mapping basierend auf aktueller Sprache
@@ -168,7 +149,11 @@ def entries():
                          selected_date=selected_date,
                          prev_date=prev_date,
                          next_date=next_date,
+                         prev_url=prev_url,
+                         next_url=next_url,
                          view=view,
+                         range_start=range_start,
+                         range_end=range_end,
                          date_display=date_display,
                          today=today,
                          timedelta=timedelta,
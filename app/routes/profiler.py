@@ -0,0 +1,59 @@
+"""Steuer- und Download-Endpunkte des Stichproben-Profilers.
+
+Nur registriert, wenn PROFILER_ENABLED gesetzt ist (siehe create_app). Jeder
+Aufruf braucht zusätzlich den Header X-Profiler-Token mit dem Wert von
+PROFILER_TOKEN; ohne gesetztes Token sind die Endpunkte gesperrt. Damit kann
+keine fremde Seite den Sampler per Formular-POST schalten oder die Stacks lesen.
+"""
+import hmac
+import os
+
+from flask import Blueprint, Response, abort, jsonify, request
+from app.profiler import get_profiler
+
+bp = Blueprint('profiler', __name__, url_prefix='/debug/profiler')
+
+
+@bp.before_request
+def require_token():
+    expected = os.environ.get('PROFILER_TOKEN', '')
+    given = request.headers.get('X-Profiler-Token', '')
+    if not expected or not hmac.compare_digest(given.encode(), expected.encode()):
+        abort(403)
+
+
+@bp.route('/')
+def status():
+    """Zustand des Stichproben-Profilers als JSON"""
+    return jsonify(get_profiler().status())
+
+
+@bp.route('/start', methods=['POST'])
+def start():
+    profiler = get_profiler()
+    profiler.start()
+    return jsonify(profiler.status())
+
+
+@bp.route('/stop', methods=['POST'])
+def stop():
+    profiler = get_profiler()
+    profiler.stop()
+    return jsonify(profiler.status())
+
+
+@bp.route('/reset', methods=['POST'])
+def reset():
+    profiler = get_profiler()
+    profiler.reset()
+    return jsonify(profiler.status())
+
+
+@bp.route('/folded')
+def download():
+    """Gefaltete Stacks zum Download (flamegraph.pl / speedscope)"""
+    return Response(
+        get_profiler().folded(),
+        mimetype='text/plain',
+        headers={'Content-Disposition': 'attachment; filename=profile.folded'},
+    )
@@ -1,19 +1,26 @@
 from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify, Response, current_app
-from app.models.models import BabyInfo, Weight, Height, Sleep, Feeding, Diaper, Temperature
+from app.models.models import BabyInfo, Weight, Height, HeadCircumference, Sleep, Feeding, Diaper, Temperature
+from app.models.growth_lms import z_trajectory, weight_for_length_trajectory
+from app.models.actogram import get_actogram
 from app.models.database import get_db, get_database_path, get_active_baby_id
 from app.i18n import _
+from app.timestamps import parse_timestamp
 from datetime import date, datetime, timedelta
 from fpdf import FPDF
 from fpdf.enums import XPos, YPos
 import os
 import csv
 import io
+import itertools
 import json
 import requests
 import time
 
 bp = Blueprint('settings', __name__, url_prefix='/settings')
 
+# Aktogramm-Seite im Arztbericht: höchstens so viele Tage (die letzten des Zeitraums)
+REPORT_ACTOGRAM_MAX_DAYS = 92
+
 _version_cache = {'data': None, 'ts': 0}
 _VERSION_CACHE_TTL = 3600  # 1 Stunde
 
@@ -333,6 +340,10 @@ def restore_backup():
         _create_restore_point(db)
         for table in BACKUP_TABLES:
             _restore_table(db, table, backup.get(table, []))
+        # Abgeleitete Zustände passen nicht mehr zu den neuen Daten und werden
+        # beim nächsten Lesen neu aufgebaut
+        db.execute('DELETE FROM daily_nap_suggestions')
+        db.execute('DELETE FROM night_sleep_model')
         db.commit()
     except Exception:
         db.rollback()
@@ -344,6 +355,27 @@ def restore_backup():
     return redirect(url_for('settings.settings'))
 
 
+@bp.route('/integrity')
+def integrity_report():
+    """Datenprüfung aller Kinder als JSON (nur lesend)"""
+    from app.integrity import scan_integrity
+    return jsonify(scan_integrity().as_dict())
+
+
+@bp.route('/integrity/fix', methods=['POST'])
+def integrity_fix():
+    """Wendet die eindeutigen Reparaturen der Datenprüfung in einer Transaktion an"""
+    from app.integrity import scan_integrity
+    try:
+        report = scan_integrity(fix=True)
+    except Exception:
+        current_app.logger.exception('Fehler bei der automatischen Reparatur')
+        flash(_('settings.integrity_fix_error'), 'error')
+        return redirect(url_for('settings.settings'))
+    flash(_('settings.integrity_fixed', fixed=report.fixed, total=report.total), 'success')
+    return redirect(url_for('settings.settings'))
+
+
 @bp.route('/check-version')
 def check_version():
     """Prüft ob eine neuere Version auf Docker Hub verfügbar ist"""
@@ -418,11 +450,10 @@ def _fmt_date(d):
 
 def _fmt_ts(ts_str):
     """Formatiert einen ISO-Zeitstempel-String als 'DD.MM.YYYY HH:MM'"""
-    try:
-        dt = datetime.fromisoformat(str(ts_str).replace('Z', '+00:00'))
-        return dt.strftime('%d.%m.%Y %H:%M')
-    except (ValueError, TypeError):
+    dt = parse_timestamp(ts_str)
+    if dt is None:
         return str(ts_str)
+    return dt.strftime('%d.%m.%Y %H:%M')
 
 
 def _format_hours_as_time(hours):
@@ -481,6 +512,20 @@ def _build_medical_report_pdf(ctx):
     else:
         kv('Größe', 'Keine Daten im Zeitraum')
 
+    # WHO-z-Scores je Messung (nur mit Geschlecht und Geburtsdatum)
+    zscores = ctx['zscores']
+    if any(zscores.values()):
+        section_title('WHO-z-Scores')
+        for key, label in (('weight', 'Gewicht-für-Alter'), ('height', 'Größe-für-Alter'),
+                           ('head', 'Kopfumfang-für-Alter'), ('weight_for_length', 'Gewicht-für-Länge/Größe')):
+            if not zscores[key]:
+                continue
+            line(label, style='B')
+            pdf.set_font('Helvetica', '', 11)
+            points = ', '.join(f"{_fmt_ts(p['timestamp'])[:10]}: {p['z']:+.2f} (P{p['percentile']})"
+                               for p in zscores[key])
+            pdf.multi_cell(0, 6, text=f"   {points}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
     # Schlaf
     section_title('Schlaf')
     s = ctx['sleep_stats']
@@ -496,6 +541,11 @@ def _build_medical_report_pdf(ctx):
     section_title('Fütterung')
     f = ctx['feeding_stats']
     kv('Stillmahlzeiten', f"{f['total_count']} gesamt, Ø {f['avg_count']}/Tag")
+    if f['timed_count'] > 0:
+        kv('Stilldauer', f"Ø {f['avg_duration_minutes']} min, {f['total_minutes']} min gesamt")
+    if f['total_count'] > 0:
+        links, rechts = f['sides']['links'], f['sides']['rechts']
+        kv('Links / Rechts', f"{links['count']} / {rechts['count']} ({f['left_share']} % links)")
     if ctx['bottle_count'] > 0:
         kv('Flasche', f"{ctx['bottle_count']} Mahlzeiten, {ctx['bottle_total_ml']} ml gesamt, "
                        f"Ø {ctx['bottle_avg_ml_per_day']} ml/Tag")
@@ -513,7 +563,7 @@ def _build_medical_report_pdf(ctx):
     t = ctx['temp_stats']
     if t['count'] > 0:
         kv('Min / Ø / Max', f"{t['min_temp']} / {t['avg_temp']} / {t['max_temp']} °C")
-        high_temps = [x for x in t['all_temps'] if x['value'] > 38.0]
+        high_temps = ctx['high_temps']
         if high_temps:
             line('Erhöhte Werte (> 38.0 °C):')
             for x in high_temps:
@@ -548,9 +598,51 @@ def _build_medical_report_pdf(ctx):
     else:
         kv('Medikamente', 'Keine im Zeitraum')
 
+    _draw_actogram_page(pdf, ctx['actogram'])
+
     return pdf
 
 
+def _draw_actogram_page(pdf, actogram):
+    """Schlafmuster als eigene Seite: eine Zeile pro Tag, 00-24 Uhr (app/models/actogram.py)."""
+    rows = actogram['rows']
+    if not any(row.strip('0') for row in rows):
+        return
+    pdf.add_page()
+    pdf.set_font('Helvetica', 'B', 13)
+    pdf.cell(0, 8, text='Schlafmuster (24 h)', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font('Helvetica', '', 8)
+
+    left = pdf.l_margin + 14
+    width = pdf.w - pdf.r_margin - left
+    bin_width = width / len(rows[0])
+    top = pdf.get_y() + 6
+    row_height = min(4.0, (pdf.h - pdf.b_margin - top - 10) / len(rows))
+    for hour in range(0, 25, 3):
+        pdf.text(left + width * hour / 24 - 2, top - 1.5, f'{hour:02d}')
+
+    colors = {'1': (2, 94, 115), '2': (237, 137, 54)}
+    for index, (day, row) in enumerate(zip(actogram['days'], rows)):
+        y = top + index * row_height
+        pdf.set_fill_color(235, 235, 235)
+        pdf.rect(left, y, width, row_height * 0.85, style='F')
+        # Gleiche Zustände am Stück als ein Rechteck
+        position = 0
+        for state, run in itertools.groupby(row):
+            length = len(list(run))
+            if state in colors:
+                pdf.set_fill_color(*colors[state])
+                pdf.rect(left + position * bin_width, y, length * bin_width, row_height * 0.85, style='F')
+            position += length
+        if row_height >= 3 or index % 7 == 0:
+            pdf.text(pdf.l_margin, y + row_height * 0.8, f'{day[8:10]}.{day[5:7]}.')
+
+    pdf.set_y(top + len(rows) * row_height + 3)
+    pdf.set_font('Helvetica', '', 9)
+    pdf.cell(0, 5, text='Blau: Schlaf   Orange: nächtliches Aufwachen   Grau: wach',
+             new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+
 @bp.route('/export/report')
 def export_report():
     """Erstellt einen für Menschen lesbaren PDF-Arztbericht für einen wählbaren Zeitraum.
@@ -598,17 +690,34 @@ def export_report():
     days_count = (end_date_obj - start_date_obj).days + 1
     bottle_avg_ml_per_day = round(bottle_total_ml / days_count, 1) if days_count > 0 else 0
 
+    weight_entries = Weight.get_in_range(start_date_obj, end_date_obj)
+    height_entries = Height.get_in_range(start_date_obj, end_date_obj)
+    gender = BabyInfo.get_gender()
+    birth_date = BabyInfo.get_birth_date()
+    zscores = {
+        'weight': z_trajectory('weight', gender, birth_date, weight_entries, 'weight_kg'),
+        'height': z_trajectory('height', gender, birth_date, height_entries, 'height_cm'),
+        'head': z_trajectory('head', gender, birth_date,
+                             HeadCircumference.get_in_range(start_date_obj, end_date_obj), 'head_circumference_cm'),
+        # Länge auch vor dem Zeitraum gemessen zulassen
+        'weight_for_length': weight_for_length_trajectory(gender, weight_entries, Height.get_all(), birth_date),
+    }
+
     ctx = {
         'baby_name': BabyInfo.get_name(),
-        'baby_age_months': BabyInfo.get_age_months() if BabyInfo.get_birth_date() else None,
+        'baby_age_months': BabyInfo.get_age_months() if birth_date else None,
         'start_date': start_date_obj,
         'end_date': end_date_obj,
-        'weight_entries': Weight.get_in_range(start_date_obj, end_date_obj),
-        'height_entries': Height.get_in_range(start_date_obj, end_date_obj),
+        'weight_entries': weight_entries,
+        'height_entries': height_entries,
+        'zscores': zscores,
+        'actogram': get_actogram(max(start_date_obj, end_date_obj - timedelta(days=REPORT_ACTOGRAM_MAX_DAYS - 1)),
+                                 end_date_obj),
         'sleep_stats': Sleep.get_sleep_statistics(start_date_obj, end_date_obj),
         'feeding_stats': Feeding.get_feeding_statistics(start_date_obj, end_date_obj),
         'diaper_stats': Diaper.get_diaper_statistics(start_date_obj, end_date_obj),
         'temp_stats': Temperature.get_temperature_statistics(start_date_obj, end_date_obj),
+        'high_temps': Temperature.get_in_range(start_date_obj, end_date_obj, min_value=38.0),
         'illness_rows': illness_rows,
         'medicine_rows': medicine_rows,
         'bottle_count': bottle_count,
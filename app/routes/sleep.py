@@ -1,7 +1,7 @@
 from flask import Blueprint, request, redirect, url_for, flash
-from app.models.models import Sleep, NightWaking
+from app.models.models import Sleep, NightWaking, OverlapError
 
-from app.form_datetime import normalize_form_datetime, is_end_before_start
+from app.form_datetime import normalize_form_datetime, is_end_before_start, describe_overlap
 
 from app.timezone import tz_berlin
 
@@ -38,7 +38,11 @@ def start_nap():
     sleep_location = request.form.get('sleep_location') or None
     sleep_comment = request.form.get('sleep_comment') or None
 
-    Sleep.create_nap(timestamp, sleep_quality=sleep_quality, sleep_location=sleep_location, sleep_comment=sleep_comment)
+    try:
+        Sleep.create_nap(timestamp, sleep_quality=sleep_quality, sleep_location=sleep_location, sleep_comment=sleep_comment)
+    except OverlapError as e:
+        flash(describe_overlap(e), 'error')
+        return redirect(url_for('main.index'))
     flash('Nickerchen gestartet', 'success')
     return redirect(url_for('main.index'))
 
@@ -52,7 +56,11 @@ def end_nap():
         if is_end_before_start(active_sleep['start_time'], timestamp):
             flash('Endzeit muss nach der Startzeit liegen', 'error')
             return redirect(url_for('main.index'))
-        Sleep.end_sleep(active_sleep['id'], timestamp)
+        try:
+            Sleep.end_sleep(active_sleep['id'], timestamp)
+        except OverlapError as e:
+            flash(describe_overlap(e), 'error')
+            return redirect(url_for('main.index'))
         flash('Nickerchen beendet', 'success')
     else:
         flash('Kein aktives Nickerchen gefunden', 'warning')
@@ -72,7 +80,11 @@ def start_night_sleep():
     sleep_location = request.form.get('sleep_location') or None
     sleep_comment = request.form.get('sleep_comment') or None
 
-    Sleep.create_night_sleep(timestamp, sleep_quality=sleep_quality, sleep_location=sleep_location, sleep_comment=sleep_comment)
+    try:
+        Sleep.create_night_sleep(timestamp, sleep_quality=sleep_quality, sleep_location=sleep_location, sleep_comment=sleep_comment)
+    except OverlapError as e:
+        flash(describe_overlap(e), 'error')
+        return redirect(url_for('main.index'))
     flash('Nachtschlaf gestartet', 'success')
     return redirect(url_for('main.index'))
 
@@ -86,7 +98,11 @@ def end_night_sleep():
         if is_end_before_start(active_sleep['start_time'], timestamp):
             flash('Endzeit muss nach der Startzeit liegen', 'error')
             return redirect(url_for('main.index'))
-        Sleep.end_sleep(active_sleep['id'], timestamp)
+        try:
+            Sleep.end_sleep(active_sleep['id'], timestamp)
+        except OverlapError as e:
+            flash(describe_overlap(e), 'error')
+            return redirect(url_for('main.index'))
         flash('Nachtschlaf beendet', 'success')
     else:
         flash('Kein aktiver Nachtschlaf gefunden', 'warning')
@@ -97,7 +113,11 @@ def end_night_sleep():
 def start_night_waking():
     """Startet ein nächtliches Aufwachen"""
     timestamp = _effective_timestamp('start_time')
-    NightWaking.create(timestamp)
+    try:
+        NightWaking.create(timestamp)
+    except OverlapError as e:
+        flash(describe_overlap(e), 'error')
+        return redirect(url_for('main.index'))
     flash('Nächtliches Aufwachen gestartet', 'success')
     return redirect(url_for('main.index'))
 
@@ -111,7 +131,11 @@ def end_night_waking():
         if is_end_before_start(active_waking['start_time'], timestamp):
             flash('Endzeit muss nach der Startzeit liegen', 'error')
             return redirect(url_for('main.index'))
-        NightWaking.end_waking(active_waking['id'], timestamp)
+        try:
+            NightWaking.end_waking(active_waking['id'], timestamp)
+        except OverlapError as e:
+            flash(describe_overlap(e), 'error')
+            return redirect(url_for('main.index'))
         flash('Nächtliches Aufwachen beendet', 'success')
     else:
         flash('Kein aktives nächtliches Aufwachen gefunden', 'warning')
@@ -1,10 +1,25 @@
-from flask import Blueprint, render_template, request
+from flask import Blueprint, render_template, request, jsonify, abort
 from app.models.models import Sleep, Temperature, Diaper, Feeding, Illness, Weight, Height, HeadCircumference, BabyInfo
-from app.models.growth_reference import get_weight_percentiles, get_height_percentiles
+from app.models.growth_reference import get_percentiles_batch
+from app.models.growth_lms import z_trajectory, weight_for_length_trajectory
+from app.models.calendar_heatmap import get_calendar_heatmap
+from app.models.actogram import get_actogram
+from app.models.quantile_sketches import get_distribution_quantiles
+from app.downsampling import lttb
+from app.stats_pool import run_concurrently
+from app.timestamps import parse_timestamp
 from datetime import datetime, date, timedelta
 
 bp = Blueprint('trends', __name__, url_prefix='/trends')
 
+# Zielanzahl Punkte pro Chart-Reihe (?points=, begrenzt auf CHART_POINTS_RANGE)
+DEFAULT_CHART_POINTS = 300
+CHART_POINTS_RANGE = (10, 2000)
+# Kalender-Heatmap ohne start_date im Request: die letzten 365 Tage
+HEATMAP_DEFAULT_DAYS = 365
+# Aktogramm: längere Zeiträume werden auf die letzten Tage gekürzt
+ACTOGRAM_MAX_DAYS = 366
+
 def format_time(hours):
     """Formatiert Stunden in HH:MM Format"""
     if hours is None or hours == 0:
@@ -13,80 +28,212 @@ def format_time(hours):
     m = int((hours - h) * 60)
     return f"{h:02d}:{m:02d}"
 
-def _age_months_at(birth_date, timestamp_str):
-    """Berechnet das Alter in Monaten (als Fließkommazahl) an einem gegebenen Zeitpunkt."""
+def _age_days_at(birth_date, timestamp_str):
+    """Berechnet das Alter in Tagen an einem gegebenen Zeitpunkt (None bei ungültigem Datum)."""
     try:
         entry_date = date.fromisoformat(str(timestamp_str)[:10])
     except ValueError:
         return None
-    delta_days = (entry_date - birth_date).days
-    return max(0.0, delta_days / 30.4375)
+    return max(0, (entry_date - birth_date).days)
 
-def _attach_percentiles(entries, gender, birth_date, percentile_fn):
+def _attach_percentiles(entries, gender, birth_date, metric):
     """Ergänzt jeden Eintrag um p3/p15/p50/p85/p97, passend zum Alter am jeweiligen
     Zeitpunkt. Rein additiv - ohne gesetztes Geschlecht bleiben die Einträge unverändert."""
     if not gender or not birth_date:
         return entries
-    for entry in entries:
-        age_months = _age_months_at(birth_date, entry.get('timestamp'))
-        percentiles = percentile_fn(gender, age_months) if age_months is not None else None
+    ages = [_age_days_at(birth_date, entry.get('timestamp')) for entry in entries]
+    for entry, percentiles in zip(entries, get_percentiles_batch(metric, gender, ages)):
         if percentiles:
             entry.update(percentiles)
     return entries
 
+def _selected_range():
+    """(start_date, end_date) als ISO-Strings aus dem Request, Standard: letzte 7 Tage."""
+    end_date = request.args.get('end_date') or date.today().isoformat()
+    start_date = request.args.get('start_date') or (date.today() - timedelta(days=7)).isoformat()
+    return start_date, end_date
+
+
+def _epoch(timestamp):
+    parsed = parse_timestamp(timestamp)
+    return parsed.timestamp() if parsed else 0.0
+
+
+def _daily_sleep_chart(start_date, end_date, points):
+    daily_sleep = Sleep.get_sleep_statistics(start_date, end_date)['daily_sleep']
+    series = [{'date': day, 'hours': hours} for day, hours in sorted(daily_sleep.items())]
+    return {'points': lttb(series, points, x=lambda p: date.fromisoformat(p['date']).toordinal(),
+                           y=lambda p: p['hours']),
+            'total': len(series)}
+
+
+def _sleep_times_chart(start_date, end_date, points):
+    """Aufwach-/Einschlafzeiten als 24 Stunden-Bins - feste Größe, kein Downsampling nötig."""
+    stats = Sleep.get_sleep_statistics(start_date, end_date)
+    bins = {}
+    for key in ('wake_times', 'sleep_times'):
+        counts = [0] * 24
+        for hours in stats[key]:
+            if 0 <= hours < 24:
+                counts[int(hours)] += 1
+        bins[key] = counts
+    return bins
+
+
+def _wake_windows_chart(start_date, end_date, points):
+    days = Sleep.get_wake_window_statistics(start_date, end_date)['days']
+    days = [{key: day[key] for key in ('date', 'min', 'median', 'max')} for day in days]
+    return {'days': lttb(days, points, x=lambda d: date.fromisoformat(d['date']).toordinal(),
+                         y=lambda d: d['median']),
+            'total': len(days)}
+
+
+def _temperature_chart(start_date, end_date, points):
+    series = Temperature.get_in_range(date.fromisoformat(start_date), date.fromisoformat(end_date))
+    return {'points': lttb(series, points, x=lambda t: _epoch(t['timestamp']), y=lambda t: t['value']),
+            'total': len(series),
+            'single_day': start_date == end_date}
+
+
+def _growth_entries(start_date, end_date):
+    """(Gewicht, Größe, Kopfumfang); ohne start_date/end_date im Request die gesamte Historie."""
+    models = (Weight, Height, HeadCircumference)
+    if request.args.get('start_date') or request.args.get('end_date'):
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        return tuple(model.get_in_range(start, end) for model in models)
+    return tuple(model.get_all() for model in models)
+
+
+def _growth_chart(start_date, end_date, points):
+    """Wachstumskurve; ohne start_date/end_date im Request die gesamte Historie.
+
+    Perzentilen werden erst nach dem Downsampling ergänzt, also nur für
+    Punkte, die tatsächlich ausgeliefert werden.
+    """
+    weight, height, head = _growth_entries(start_date, end_date)
+
+    def reduce(entries, column):
+        entries = [{'timestamp': e['timestamp'], column: e[column]} for e in entries]
+        return lttb(entries, points, x=lambda e: _epoch(e['timestamp']), y=lambda e: e[column])
+
+    gender = BabyInfo.get_gender()
+    birth_date = BabyInfo.get_birth_date()
+    return {
+        'weight': _attach_percentiles(reduce(weight, 'weight_kg'), gender, birth_date, 'weight'),
+        'height': _attach_percentiles(reduce(height, 'height_cm'), gender, birth_date, 'height'),
+        'head': _attach_percentiles(reduce(head, 'head_circumference_cm'), gender, birth_date, 'head'),
+    }
+
+
+def _zscore_chart(start_date, end_date, points):
+    """WHO-z-Score-Verläufe (app/models/growth_lms.py) - Zeitraum wie _growth_chart.
+
+    Die z-Scores werden für alle Messungen gerechnet (die Gewicht-für-Länge-
+    Zuordnung braucht die vollständige Reihe) und erst danach reduziert.
+    """
+    weight, height, head = _growth_entries(start_date, end_date)
+
+    gender = BabyInfo.get_gender()
+    birth_date = BabyInfo.get_birth_date()
+    series = {
+        'weight': z_trajectory('weight', gender, birth_date, weight, 'weight_kg'),
+        'height': z_trajectory('height', gender, birth_date, height, 'height_cm'),
+        'head': z_trajectory('head', gender, birth_date, head, 'head_circumference_cm'),
+        'weight_for_length': weight_for_length_trajectory(gender, weight, height, birth_date),
+    }
+    result = {name: lttb(values, points, x=lambda e: _epoch(e['timestamp']), y=lambda e: e['z'])
+              for name, values in series.items()}
+    result['available'] = bool(gender and birth_date)
+    return result
+
+
+def _heatmap_chart(start_date, end_date, points):
+    """Jahresübersicht (app/models/calendar_heatmap.py) - eine Aggregat-Query pro Tabelle.
+
+    Ohne start_date im Request die letzten HEATMAP_DEFAULT_DAYS Tage bis end_date.
+    """
+    end = date.fromisoformat(end_date)
+    if request.args.get('start_date'):
+        start = date.fromisoformat(start_date)
+    else:
+        start = end - timedelta(days=HEATMAP_DEFAULT_DAYS - 1)
+    if start > end:
+        start, end = end, start
+    heatmap = get_calendar_heatmap(start, end)
+    return {'start': start.isoformat(), 'end': end.isoformat(), **heatmap}
+
+
+def _actogram_chart(start_date, end_date, points):
+    """24-h-Schlafmuster (app/models/actogram.py), eine Zeile aus 96 Viertelstunden pro Tag."""
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    if start > end:
+        start, end = end, start
+    start = max(start, end - timedelta(days=ACTOGRAM_MAX_DAYS - 1))
+    return get_actogram(start, end)
+
+
+CHARTS = {
+    'daily_sleep': _daily_sleep_chart,
+    'sleep_times': _sleep_times_chart,
+    'wake_windows': _wake_windows_chart,
+    'temperature': _temperature_chart,
+    'growth': _growth_chart,
+    'zscores': _zscore_chart,
+    'heatmap': _heatmap_chart,
+    'actogram': _actogram_chart,
+}
+
+
+@bp.route('/data/<chart>')
+def chart_data(chart):
+    """Daten eines Trends-Charts als JSON, vom Template erst beim Aufklappen geladen.
+
+    Parameter: start_date/end_date wie die Seite, points = Zielanzahl Punkte
+    pro Reihe (LTTB-Downsampling, app/downsampling.py).
+    """
+    build = CHARTS.get(chart)
+    if build is None:
+        abort(404)
+    start_date, end_date = _selected_range()
+    try:
+        date.fromisoformat(start_date)
+        date.fromisoformat(end_date)
+        points = int(request.args.get('points', DEFAULT_CHART_POINTS))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    points = max(CHART_POINTS_RANGE[0], min(points, CHART_POINTS_RANGE[1]))
+    return jsonify(build(start_date, end_date, points))
+
+
 @bp.route('/')
 def trends():
     """Trends und Statistiken Seite"""
-    # Standard: Letzte 7 Tage
-    end_date = date.today().isoformat()
-    start_date = (date.today() - timedelta(days=7)).isoformat()
-    
-    # Filter aus Request
-    if request.args.get('start_date'):
-        start_date = request.args.get('start_date')
-    if request.args.get('end_date'):
-        end_date = request.args.get('end_date')
-    
-    # Statistiken holen
-    stats = Sleep.get_sleep_statistics(start_date, end_date)
-    
+    # Standard: Letzte 7 Tage, sonst Filter aus Request
+    start_date, end_date = _selected_range()
+
+    # Unabhängige Statistiken parallel auf dem gemeinsamen Pool berechnen
+    # (je eigene Nur-Lese-Verbindung, siehe app/stats_pool.py)
+    results = run_concurrently({
+        'stats': (Sleep.get_sleep_statistics, start_date, end_date),
+        'wake_window_stats': (Sleep.get_wake_window_statistics, start_date, end_date),
+        'quantiles': (get_distribution_quantiles, start_date, end_date),
+        'temp_stats': (Temperature.get_temperature_statistics, start_date, end_date),
+        'diaper_stats': (Diaper.get_diaper_statistics, start_date, end_date),
+        'feeding_stats': (Feeding.get_feeding_statistics, start_date, end_date),
+        'illness_stats': (Illness.get_illness_statistics, start_date, end_date),
+        # Wachstum: nur Kennzahlen für die Karte; die Kurve lädt das Template über chart_data()
+        'weight_summary': (Weight.get_summary,),
+        'height_summary': (Height.get_summary,),
+        'head_summary': (HeadCircumference.get_summary,),
+    })
+
     # Uhrzeiten formatieren
+    stats = results['stats']
     stats['avg_wake_time_formatted'] = format_time(stats['avg_wake_time'])
     stats['avg_sleep_time_formatted'] = format_time(stats['avg_sleep_time'])
-    
-    # Temperatur-Statistiken holen
-    temp_stats = Temperature.get_temperature_statistics(start_date, end_date)
-    
-    # Windel-Statistiken holen
-    diaper_stats = Diaper.get_diaper_statistics(start_date, end_date)
-    
-    # Still-Statistiken holen
-    feeding_stats = Feeding.get_feeding_statistics(start_date, end_date)
-    
-    # Erkrankungs-Statistiken holen
-    illness_stats = Illness.get_illness_statistics(start_date, end_date)
-
-    # Gewichts-, Größen- und Kopfumfang-Daten holen (alle, nicht nur im Zeitraum – für Wachstumskurve)
-    weight_entries = Weight.get_all()
-    height_entries = Height.get_all()
-    head_entries = HeadCircumference.get_all()
-
-    # WHO-Perzentilen ergänzen, sofern Geschlecht und Geburtsdatum gesetzt sind.
-    # Ohne Geschlecht bleibt das Chart exakt wie bisher (keine Bänder, kein Fehler).
-    gender = BabyInfo.get_gender()
-    birth_date = BabyInfo.get_birth_date()
-    weight_entries = _attach_percentiles(weight_entries, gender, birth_date, get_weight_percentiles)
-    height_entries = _attach_percentiles(height_entries, gender, birth_date, get_height_percentiles)
 
     return render_template('trends.html',
-                         stats=stats,
-                         temp_stats=temp_stats,
-                         diaper_stats=diaper_stats,
-                         feeding_stats=feeding_stats,
-                         illness_stats=illness_stats,
-                         weight_entries=weight_entries,
-                         height_entries=height_entries,
-                         head_entries=head_entries,
+                         **results,
                          start_date=start_date,
                          end_date=end_date)
 
@@ -0,0 +1,85 @@
+"""Parallele Berechnung unabhängiger Statistiken.
+
+Die Trends-Seite braucht Schlaf-, Wachfenster-, Temperatur-, Windel-, Still-
+und Erkrankungs-Statistiken sowie die Wachstums-Kennzahlen. Keine davon hängt
+von einer anderen ab; nacheinander auf einer Verbindung addieren sich ihre
+Laufzeiten. run_concurrently() verteilt sie auf einen kleinen Thread-Pool, die
+Seite wartet damit ungefähr so lange wie die langsamste einzelne Statistik.
+
+Der Pool ist begrenzt und wird von allen Requests geteilt (ein Request belegt
+nie mehr als STATS_POOL_WORKERS Threads, gleichzeitige Requests warten in der
+Queue statt weitere Threads zu erzeugen). Jede Aufgabe läuft in einem eigenen
+App-Kontext mit eigener Verbindung im Nur-Lese-Modus (SQLite ``mode=ro``):
+Verbindungen werden nicht zwischen Threads geteilt, und eine Statistik kann
+versehentlich nichts schreiben. Das aktive Kind wird im Request aufgelöst und
+in den Kontext der Aufgabe übernommen (Session gibt es dort nicht).
+
+Konfiguration über Umgebungsvariablen (analog zu MAINTENANCE_*):
+    STATS_POOL_WORKERS  Anzahl Worker-Threads (Standard 4, 0 = seriell im Request)
+"""
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from flask import current_app, g
+
+from app.env import env_int
+from app.models.database import get_database_path, get_active_baby_id
+
+_executor = None
+_executor_workers = None
+_lock = threading.Lock()
+
+
+def pool_size():
+    return env_int('STATS_POOL_WORKERS', 4, 0)
+
+
+def get_executor():
+    """Gemeinsamer Pool aller Requests (None, wenn deaktiviert); wird bei geänderter Größe ersetzt."""
+    global _executor, _executor_workers
+    workers = pool_size()
+    if workers == 0:
+        return None
+    with _lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='stats')
+            _executor_workers = workers
+        return _executor
+
+
+def connect_read_only(db_path):
+    """Eigene Nur-Lese-Verbindung (sqlite3.Row wie get_db())."""
+    db = sqlite3.connect(f'file:{quote(db_path)}?mode=ro', uri=True)
+    db.row_factory = sqlite3.Row
+    return db
+
+
+def _run_task(app, db_path, baby_id, func, args):
+    with app.app_context():
+        # close_db() im Teardown des Kontexts schließt die Verbindung wieder
+        g.db = connect_read_only(db_path)
+        g.active_baby_id = baby_id
+        return func(*args)
+
+
+def run_concurrently(tasks):
+    """Führt {name: (func, *args)} parallel aus und liefert {name: Ergebnis}.
+
+    Aufruf im Request-Kontext. Die Funktionen dürfen nur lesen. Exceptions
+    einer Aufgabe werden im Request erneut ausgelöst. Ist der Pool deaktiviert,
+    laufen die Aufgaben nacheinander auf der Request-Verbindung.
+    """
+    executor = get_executor()
+    if executor is None:
+        return {name: func(*args) for name, (func, *args) in tasks.items()}
+
+    app = current_app._get_current_object()
+    db_path = get_database_path()
+    baby_id = get_active_baby_id()
+    futures = {name: executor.submit(_run_task, app, db_path, baby_id, func, args)
+               for name, (func, *args) in tasks.items()}
+    return {name: future.result() for name, future in futures.items()}
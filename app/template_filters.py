@@ -110,8 +110,30 @@ def calculate_duration(start_time, end_time):
         return ""
 
 
+def format_minutes(minutes):
+    """Formatiert eine Minutenanzahl als 'Xh Ym' bzw. 'Ym' ('–' ohne Wert)"""
+    if minutes is None:
+        return "–"
+    hours, rest = divmod(int(minutes), 60)
+    if hours > 0 and rest > 0:
+        return f"{hours}h {rest}m"
+    elif hours > 0:
+        return f"{hours}h"
+    return f"{rest}m"
+
+
+def format_clock_minutes(minutes):
+    """Formatiert Minuten ab Mitternacht als 'HH:MM' ('–' ohne Wert)"""
+    if minutes is None:
+        return "–"
+    hours, rest = divmod(int(minutes) % (24 * 60), 60)
+    return f"{hours:02d}:{rest:02d}"
+
+
 def register_template_filters(app):
     """Registriert alle gemeinsamen Template-Filter genau einmal auf App-Ebene."""
     app.template_filter('translate_entry_display')(translate_entry_display)
     app.template_filter('format_datetime_de')(format_datetime_de)
     app.template_filter('calculate_duration')(calculate_duration)
+    app.template_filter('format_minutes')(format_minutes)
+    app.template_filter('format_clock_minutes')(format_clock_minutes)
@@ -0,0 +1,67 @@
+"""Zentrales Parsen von Zeitstempeln.
+
+Zeitstempel liegen in der DB als ISO-Strings vor (kanonisch
+'YYYY-MM-DDTHH:MM:SS+01:00', ältere bzw. Test-Daten auch ohne Offset oder mit
+'Z'). Statt an jeder Stelle fromisoformat()/replace('Z')/normalize_to_berlin()
+neu zu kombinieren, läuft alles über parse_timestamp(): ein begrenzter LRU-Cache,
+dessen Schlüssel der rohe String ist. Dieselben Zeitstempel werden pro Request
+oft mehrfach geparst (Statistik, Vorschläge, Timeline, Template-Filter) – ab dem
+zweiten Mal kostet das nur noch einen Dict-Lookup.
+
+Die gecachten datetime-Objekte sind unveränderlich und können gefahrlos geteilt
+werden.
+"""
+from datetime import datetime
+from functools import lru_cache
+
+from app.timezone import normalize_to_berlin
+
+# Reicht für mehrere Jahre an Einträgen (~20 Zeitstempel pro Tag), bleibt aber
+# im einstelligen MB-Bereich
+PARSE_CACHE_SIZE = 32768
+
+
+def _parse_uncached(raw):
+    # Fastpath: alle kanonischen Formate (mit/ohne Sekunden, mit/ohne Offset,
+    # 'Z') versteht fromisoformat direkt
+    try:
+        dt = datetime.fromisoformat(raw)
+    except ValueError:
+        # Seltene Altformate: Leerraum, kleines 'z'
+        cleaned = raw.strip()
+        if cleaned[-1:] in ('Z', 'z'):
+            cleaned = cleaned[:-1] + '+00:00'
+        try:
+            dt = datetime.fromisoformat(cleaned)
+        except ValueError:
+            return None
+    return normalize_to_berlin(dt)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(raw):
+    return _parse_uncached(raw)
+
+
+def parse_timestamp(value):
+    """Parst einen ISO-Zeitstempel (String oder datetime) in die Anwendungs-Zeitzone.
+
+    Naive Werte gelten als lokale Zeit. Gibt None für leere oder ungültige Werte
+    zurück, statt eine Exception zu werfen.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return normalize_to_berlin(value)
+    if not isinstance(value, str):
+        value = str(value)
+    return _parse_cached(value)
+
+
+def clear_parse_cache():
+    """Leert den Cache (z. B. nach einem Wechsel der Anwendungs-Zeitzone)."""
+    _parse_cached.cache_clear()
+
+
+def parse_cache_info():
+    return _parse_cached.cache_info()
@@ -1,6 +1,7 @@
 """Zentrale Quelle für die im gesamten Modul verwendete Zeitzone."""
 import os
-from datetime import datetime
+from bisect import bisect_right
+from datetime import datetime, timedelta
 from datetime import timezone as _fixed_timezone
 from zoneinfo import ZoneInfo
 
@@ -13,6 +14,90 @@ def get_app_timezone():
 
 tz_berlin = get_app_timezone()
 
+# Zeitraum der vorberechneten Übergangstabelle; Werte außerhalb laufen über den
+# (langsameren) zoneinfo-Weg
+_TABLE_START = datetime(1970, 1, 1)
+_TABLE_END = datetime(2100, 1, 1)
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _build_transition_table(tz, start=_TABLE_START, end=_TABLE_END):
+    """Ermittelt alle Offset-Wechsel von `tz` zwischen start und end (naive UTC).
+
+    zoneinfo legt seine Übergänge nicht offen; daher wird tageweise abgetastet
+    und jeder gefundene Wechsel sekundengenau per Intervallhalbierung bestimmt.
+    Liefert (utc_transitions, offsets) mit len(offsets) == len(utc_transitions) + 1:
+    offsets[i] gilt vor utc_transitions[i], offsets[-1] nach dem letzten Wechsel.
+    """
+    def offset_at(seconds):
+        return datetime.fromtimestamp(seconds, tz).utcoffset()
+
+    start_s = int((start - _EPOCH).total_seconds())
+    end_s = int((end - _EPOCH).total_seconds())
+    step = 86400
+
+    transitions = []
+    offsets = [offset_at(start_s)]
+    prev_s = start_s
+    for cur_s in range(start_s + step, end_s + step, step):
+        if offset_at(cur_s) == offsets[-1]:
+            prev_s = cur_s
+            continue
+        lo, hi = prev_s, cur_s  # offset_at(lo) == alt, offset_at(hi) == neu
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if offset_at(mid) == offsets[-1]:
+                lo = mid
+            else:
+                hi = mid
+        transitions.append(_EPOCH + timedelta(seconds=hi))
+        offsets.append(offset_at(hi))
+        prev_s = cur_s
+    return transitions, offsets
+
+
+_utc_transitions, _offsets = _build_transition_table(tz_berlin)
+
+# Ein tzinfo-Objekt pro vorkommendem Offset, von allen normalisierten Werten geteilt
+_interned_tz = {offset: _fixed_timezone(offset) for offset in set(_offsets)}
+_offset_tzinfos = [_interned_tz[offset] for offset in _offsets]
+
+# Schwellen für naive Wanduhrzeiten: ab welcher lokalen Zeit gilt der neue Offset?
+# fold=0 nimmt in Lücke/Doppelstunde den Offset vor dem Wechsel, fold=1 den danach
+# (PEP 495) - also Schwelle T+max(alt, neu) bzw. T+min(alt, neu).
+_wall_thresholds = (
+    [t + max(_offsets[i], _offsets[i + 1]) for i, t in enumerate(_utc_transitions)],
+    [t + min(_offsets[i], _offsets[i + 1]) for i, t in enumerate(_utc_transitions)],
+)
+_WALL_START = _TABLE_START + max(_offsets)
+_WALL_END = _TABLE_END + min(_offsets)
+
+# Dieselbe Tabelle als Unix-Sekunden für aware Eingaben (dt.timestamp() ist billig)
+_transition_epochs = [(t - _EPOCH).total_seconds() for t in _utc_transitions]
+_EPOCH_START = (_TABLE_START - _EPOCH).total_seconds()
+_EPOCH_END = (_TABLE_END - _EPOCH).total_seconds()
+# Bis zu welchem Zeitpunkt liegt ein Instant in der zweiten Hälfte einer doppelten
+# Stunde (fold=1)? Nur nach Wechseln auf einen kleineren Offset relevant.
+_fold_until = [float('-inf')] + [
+    epoch + (_offsets[i] - _offsets[i + 1]).total_seconds() if _offsets[i + 1] < _offsets[i] else float('-inf')
+    for i, epoch in enumerate(_transition_epochs)
+]
+
+def interned_timezone(offset):
+    """Liefert das geteilte Fixed-Offset-tzinfo für `offset` (timedelta)."""
+    tz = _interned_tz.get(offset)
+    if tz is None:
+        tz = _interned_tz.setdefault(offset, _fixed_timezone(offset))
+    return tz
+
+
+def _normalize_via_zoneinfo(dt):
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=tz_berlin)
+    elif dt.tzinfo != tz_berlin:
+        dt = dt.astimezone(tz_berlin)
+    return dt.replace(tzinfo=interned_timezone(dt.utcoffset()))
+
 
 def normalize_to_berlin(dt):
     """Normalisiert ein datetime auf die Anwendungs-Zeitzone mit einem fixen Offset.
@@ -22,14 +107,34 @@ def normalize_to_berlin(dt):
     den UTC-Offset ignoriert und stattdessen die naiven Wanduhrzeiten vergleicht.
     Rund um eine Zeitumstellung (wenn sich der Offset ändert, das tzinfo-Objekt
     aber gleich bleibt) liefert das falsche Ergebnisse - anders als bei pytz, das
-    pro Offset ein eigenes tzinfo-Objekt verwendet. Ein pro Aufruf frisch über
-    zoneinfo aufgelöster, danach fixer Offset umgeht diesen Fastpath zuverlässig.
+    pro Offset ein eigenes tzinfo-Objekt verwendet. Das Ergebnis trägt daher ein
+    fixes Offset-tzinfo; pro Offset wird genau ein Objekt geteilt, sodass der
+    Fastpath nur noch bei tatsächlich gleichem Offset greift.
+
+    Der Offset wird per bisect in der beim Import vorberechneten Übergangstabelle
+    nachgeschlagen statt pro Aufruf über astimezone()/utcoffset() aufgelöst.
     """
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=tz_berlin)
-    elif dt.tzinfo != tz_berlin:
-        dt = dt.astimezone(tz_berlin)
-    return dt.replace(tzinfo=_fixed_timezone(dt.utcoffset()))
+    tzinfo = dt.tzinfo
+    if tzinfo is None or tzinfo is tz_berlin:
+        # Naive bzw. bereits lokale Wanduhrzeit
+        wall = dt.replace(tzinfo=None) if tzinfo is not None else dt
+        if not (_WALL_START <= wall < _WALL_END):
+            return _normalize_via_zoneinfo(dt)
+        idx = bisect_right(_wall_thresholds[dt.fold], wall)
+        return dt.replace(tzinfo=_offset_tzinfos[idx])
+
+    if dt.utcoffset() is None:
+        return _normalize_via_zoneinfo(dt)
+    ts = dt.timestamp()
+    if not (_EPOCH_START <= ts < _EPOCH_END):
+        return _normalize_via_zoneinfo(dt)
+    idx = bisect_right(_transition_epochs, ts)
+    # astimezone() auf ein fixes tzinfo ist deutlich billiger als replace(tzinfo=...)
+    result = dt.astimezone(_offset_tzinfos[idx])
+    # Zweites Auftreten einer doppelten Stunde wie astimezone() mit fold=1 markieren
+    if ts < _fold_until[idx]:
+        result = result.replace(fold=1)
+    return result
 
 
 def to_berlin(value):
@@ -39,8 +144,12 @@ def to_berlin(value):
     if value is None:
         return None
     if isinstance(value, str):
-        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
-    else:
-        dt = value
+        # Strings laufen über den gecachten Parser (app/timestamps.py); Import
+        # hier, weil app.timestamps seinerseits dieses Modul importiert
+        from app.timestamps import parse_timestamp
+        dt = parse_timestamp(value)
+        if dt is None:
+            raise ValueError(f'Invalid isoformat string: {value!r}')
+        return dt
 
-    return normalize_to_berlin(dt)
+    return normalize_to_berlin(value)
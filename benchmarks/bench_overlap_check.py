@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Benchmark: Überschneidungsprüfung beim Anlegen von Schlaf-Einträgen.
+
+_check_overlap() liest nur Vorgänger und Nachfolger nach Beginn über den Index
+(baby_id, start_time). Die zusätzliche Latenz pro Schreibzugriff soll daher
+nicht mit der Historie wachsen. Gemessen wird die Prüfung bei 1k, 10k und 100k
+bestehenden Schlaf-Einträgen, jeweils für ein neues Nickerchen am Ende der
+Historie und für einen Nachtrag mitten darin.
+
+Aufruf aus dem Projektverzeichnis:
+    python benchmarks/bench_overlap_check.py
+"""
+import os
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SIZES = (1_000, 10_000, 100_000)
+REPEAT = 200
+
+
+def _ts(dt):
+    from app.timezone import normalize_to_berlin
+    return normalize_to_berlin(dt).isoformat()
+
+
+def populate(db, count, origin):
+    """`count` nicht überlappende Nickerchen à 45 Minuten im 4-Stunden-Takt."""
+    rows = []
+    for i in range(count):
+        start = origin + timedelta(hours=4 * i)
+        rows.append(('nap', _ts(start), _ts(start + timedelta(minutes=45))))
+    db.executemany('INSERT INTO sleep (type, start_time, end_time) VALUES (?, ?, ?)', rows)
+    db.commit()
+
+
+def main():
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.environ['DATABASE_PATH'] = path
+    os.environ['MAINTENANCE_INTERVAL_SECONDS'] = '0'
+    try:
+        from app import create_app
+        from app.models.database import get_db
+        from app.models.models import _check_overlap
+
+        app = create_app()
+        origin = datetime(2000, 1, 1, 8, 0)
+        print(f"{'Einträge':>9}  {'Ende':>12}  {'Nachtrag':>12}")
+        loaded = 0
+        for size in SIZES:
+            with app.app_context():
+                db = get_db()
+                populate(db, size - loaded, origin + timedelta(hours=4 * loaded))
+                loaded = size
+                # Lücken zwischen zwei bestehenden Nickerchen: am Ende bzw. in der Mitte
+                tail = origin + timedelta(hours=4 * size + 1)
+                middle = origin + timedelta(hours=4 * (size // 2) + 1)
+                results = []
+                for start in (tail, middle):
+                    args = (db, 'sleep', _ts(start), _ts(start + timedelta(hours=2)), 1)
+                    best = min(timeit.repeat(lambda: _check_overlap(*args), number=REPEAT, repeat=5))
+                    results.append(best / REPEAT * 1e6)
+            print(f'{size:>9}  {results[0]:>9.1f} µs  {results[1]:>9.1f} µs')
+    finally:
+        os.close(fd)
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
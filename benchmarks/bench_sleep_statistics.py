@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark: Sleep.get_sleep_statistics zeilenweise vs. vektorisiert (NumPy).
+
+Legt eine temporäre Datenbank mit zwei Jahren Schlafdaten an (Nachtschlaf mit
+1-3 Aufwachen, 2-3 Nickerchen pro Tag) und misst beide Pfade für Zeiträume
+von 1, 6 und 24 Monaten bis zum letzten Datentag. Der Python-Pfad enthält die
+Aufwach-Abfrage pro Nacht, der vektorisierte Pfad lädt das Aufwachen einmal.
+
+Aufruf aus dem Projektverzeichnis (NumPy muss installiert sein):
+    python benchmarks/bench_sleep_statistics.py
+"""
+import os
+import random
+import sys
+import tempfile
+import timeit
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DAYS = 730
+RANGES_MONTHS = (1, 6, 24)
+
+
+def _ts(day, minutes):
+    from app.timezone import normalize_to_berlin
+    naive = datetime.combine(day, datetime.min.time()) + timedelta(minutes=minutes)
+    return normalize_to_berlin(naive).isoformat()
+
+
+def populate(db, last_day):
+    rng = random.Random(1)
+    sleep_rows, waking_rows = [], []
+    for offset in range(DAYS, 0, -1):
+        day = last_day - timedelta(days=offset)
+        bedtime = 19 * 60 + rng.randint(0, 120)
+        wake = 24 * 60 + 6 * 60 + rng.randint(0, 90)
+        sleep_rows.append(('night', _ts(day, bedtime), _ts(day, wake), rng.choice(['gut', 'unruhig']), 'Bett'))
+        for i in range(rng.randint(1, 3)):
+            start = bedtime + 120 + i * 150
+            waking_rows.append((_ts(day, start), _ts(day, start + rng.randint(5, 30))))
+        for nap in (9 * 60, 13 * 60, 16 * 60)[:rng.randint(2, 3)]:
+            start = nap + rng.randint(-20, 20)
+            sleep_rows.append(('nap', _ts(day, start), _ts(day, start + rng.randint(30, 90)), None, 'Kinderwagen'))
+    db.executemany('INSERT INTO sleep (type, start_time, end_time, sleep_quality, sleep_location) '
+                   'VALUES (?, ?, ?, ?, ?)', sleep_rows)
+    db.executemany('INSERT INTO night_waking (start_time, end_time) VALUES (?, ?)', waking_rows)
+    db.commit()
+
+
+def main():
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.environ['DATABASE_PATH'] = path
+    os.environ['MAINTENANCE_INTERVAL_SECONDS'] = '0'
+    try:
+        from app import create_app
+        from app.models import vectorized_stats
+        from app.models.database import get_db
+        from app.models.models import Sleep
+
+        if not vectorized_stats.is_available():
+            print('NumPy nicht installiert - nur der Python-Pfad ist verfügbar.')
+            return
+
+        app = create_app()
+        last_day = date.today()
+        with app.app_context():
+            populate(get_db(), last_day)
+
+        available = vectorized_stats.is_available
+        print(f"{'Zeitraum':>9}  {'Python':>10}  {'NumPy':>10}  Faktor")
+        for months in RANGES_MONTHS:
+            start = (last_day - timedelta(days=int(months * 30.44))).isoformat()
+            end = last_day.isoformat()
+            with app.test_request_context():
+                vectorized_stats.is_available = lambda: False
+                python_s = min(timeit.repeat(lambda: Sleep.get_sleep_statistics(start, end), number=1, repeat=3))
+                python_result = Sleep.get_sleep_statistics(start, end)
+                vectorized_stats.is_available = available
+                numpy_s = min(timeit.repeat(lambda: Sleep.get_sleep_statistics(start, end), number=1, repeat=3))
+                assert Sleep.get_sleep_statistics(start, end) == python_result
+            print(f'{months:>6} Mo  {python_s * 1000:>8.1f}ms  {numpy_s * 1000:>8.1f}ms  {python_s / numpy_s:>5.1f}x')
+    finally:
+        os.close(fd)
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
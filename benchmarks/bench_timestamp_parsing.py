@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Micro-Benchmark: Kosten pro Zeile beim Parsen von Zeitstempeln.
+
+Vergleicht das frühere Inline-Muster
+    normalize_to_berlin(datetime.fromisoformat(s.replace('Z', '+00:00')))
+mit app.timestamps.parse_timestamp (kalter und warmer Cache). Die Zeitstempel
+entsprechen einem Jahr Schlafdaten (~6 Zeitstempel pro Tag), die – wie in
+Statistik, Vorschlägen und Timeline – mehrfach pro Request geparst werden.
+
+Aufruf aus dem Projektverzeichnis:
+    python benchmarks/bench_timestamp_parsing.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.timezone import normalize_to_berlin  # noqa: E402
+from app.timestamps import parse_timestamp, clear_parse_cache  # noqa: E402
+
+
+def build_samples(days=365, per_day=6):
+    base = datetime(2025, 1, 1, 6, 0)
+    samples = []
+    for i in range(days * per_day):
+        dt = normalize_to_berlin(base + timedelta(minutes=i * (1440 // per_day) + (i * 7) % 60))
+        samples.append(dt.replace(microsecond=0).isoformat())
+    return samples
+
+
+def legacy(samples):
+    for s in samples:
+        normalize_to_berlin(datetime.fromisoformat(s.replace('Z', '+00:00')))
+
+
+def cached(samples):
+    for s in samples:
+        parse_timestamp(s)
+
+
+def cold(samples):
+    clear_parse_cache()
+    cached(samples)
+
+
+def main():
+    samples = build_samples()
+    n = len(samples)
+    repeat = 5
+    for label, func in (('vorher (inline)', legacy), ('parse_timestamp kalt', cold),
+                        ('parse_timestamp warm', cached)):
+        cached(samples)  # warm-up für den warmen Fall
+        best = min(timeit.repeat(lambda: func(samples), number=1, repeat=repeat))
+        print(f'{label:<24} {best / n * 1e6:8.3f} µs/Zeile  ({n} Zeilen)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+-- Migration 020: Partielle Indizes für laufenden Schlaf / laufendes Aufwachen
+-- Dashboard und Vorschläge fragen bei jedem Aufruf nach Zeilen mit
+-- end_time IS NULL. Diese Indizes enthalten nur genau diese (wenigen) offenen
+-- Zeilen pro Kind und bleiben damit unabhängig von der Historie winzig.
+
+CREATE INDEX IF NOT EXISTS idx_sleep_active_by_baby ON sleep(baby_id, start_time) WHERE end_time IS NULL;
+CREATE INDEX IF NOT EXISTS idx_night_waking_active_by_baby ON night_waking(baby_id, start_time) WHERE end_time IS NULL;
@@ -0,0 +1,17 @@
+-- Migration 021: Nickerchen-Vorschläge pro Kind und Tag
+-- Die Vorschläge werden beim Schreiben eines Schlaf-/Aufwach-Eintrags berechnet
+-- (BabyInfo.refresh_nap_suggestions) und hier als JSON abgelegt; das Dashboard
+-- liest nur noch eine Zeile über den Primärschlüssel. Reiner Cache ohne
+-- Nutzerdaten - kann jederzeit geleert werden und füllt sich beim Lesen neu.
+--
+-- Die alte Tabelle nap_suggestions (003/019) bleibt ungenutzt und leer stehen:
+-- Alle Migrationen laufen bei jedem Start erneut, ein DROP würde sie nur bei
+-- jedem Start neu anlegen und wieder löschen.
+
+CREATE TABLE IF NOT EXISTS daily_nap_suggestions (
+    baby_id INTEGER NOT NULL REFERENCES baby_info(id),
+    date TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    computed_at TEXT NOT NULL,
+    PRIMARY KEY (baby_id, date)
+) WITHOUT ROWID;
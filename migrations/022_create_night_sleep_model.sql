@@ -0,0 +1,23 @@
+-- Migration 022: Laufendes Nachtschlaf-Modell pro Kind
+-- Exponentiell gewichtete Mittelwerte/Varianzen (siehe app/models/night_sleep_model.py),
+-- fortgeschrieben beim Beenden eines Nachtschlafs. Abgeleiteter Zustand ohne
+-- Nutzerdaten - "flask rebuild-sleep-model" baut ihn aus der Historie neu auf.
+
+CREATE TABLE IF NOT EXISTS night_sleep_model (
+    baby_id INTEGER PRIMARY KEY REFERENCES baby_info(id),
+    night_count INTEGER NOT NULL DEFAULT 0,
+    last_end_time TEXT,
+    duration_mean REAL,
+    duration_var REAL NOT NULL DEFAULT 0,
+    duration_count INTEGER NOT NULL DEFAULT 0,
+    wake_mean REAL,
+    wake_var REAL NOT NULL DEFAULT 0,
+    wake_count INTEGER NOT NULL DEFAULT 0,
+    bedtime_mean REAL,
+    bedtime_var REAL NOT NULL DEFAULT 0,
+    bedtime_count INTEGER NOT NULL DEFAULT 0,
+    day_sleep_mean REAL,
+    day_sleep_var REAL NOT NULL DEFAULT 0,
+    day_sleep_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
@@ -0,0 +1,7 @@
+-- Migration 023: Index für Wachzeit-Berechnung per Fensterfunktion
+-- LAG(end_time) OVER (PARTITION BY baby_id ORDER BY start_time) in
+-- get_all_entries_range / Sleep.get_wake_window_statistics liest die Zeilen eines
+-- Kindes in start_time-Reihenfolge; mit diesem Index ohne Sortierschritt und nur
+-- für den angefragten Bereich (plus einen Vorgänger).
+
+CREATE INDEX IF NOT EXISTS idx_sleep_baby_start ON sleep(baby_id, start_time);
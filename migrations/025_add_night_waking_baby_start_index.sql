@@ -0,0 +1,6 @@
+-- Migration 025: Nachbar-Lookup für die Überschneidungsprüfung
+-- _check_overlap() sucht Vorgänger/Nachfolger eines neuen Intervalls per
+-- ORDER BY start_time LIMIT innerhalb eines Kindes. Für sleep existiert
+-- idx_sleep_baby_start (023) bereits; night_waking bekommt den gleichen Index.
+
+CREATE INDEX IF NOT EXISTS idx_night_waking_baby_start ON night_waking(baby_id, start_time);
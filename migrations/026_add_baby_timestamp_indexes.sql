@@ -0,0 +1,16 @@
+-- Migration 026: Zusammengesetzte Indizes (baby_id, Zeitspalte) für die Timeline-API
+-- get_entries_page() liest je Kategorie die neuesten Einträge eines Kindes vor
+-- einem Keyset-Cursor (ORDER BY <zeit> DESC, id DESC LIMIT n). Mit diesen
+-- Indizes ist das ein Index-Scan ab dem Cursor, unabhängig davon, wie weit
+-- zurück geblättert wird. sleep (023) und night_waking (025) haben ihn bereits.
+
+CREATE INDEX IF NOT EXISTS idx_feeding_baby_timestamp ON feeding(baby_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_bottle_baby_timestamp ON bottle(baby_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_porridge_baby_timestamp ON porridge(baby_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_diaper_baby_timestamp ON diaper(baby_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_temperature_baby_timestamp ON temperature(baby_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_medicine_baby_timestamp ON medicine(baby_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_illness_baby_start ON illness(baby_id, start_time);
+CREATE INDEX IF NOT EXISTS idx_weight_baby_timestamp ON weight(baby_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_height_baby_timestamp ON height(baby_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_head_circumference_baby_timestamp ON head_circumference(baby_id, timestamp);
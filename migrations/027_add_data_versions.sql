@@ -0,0 +1,184 @@
+-- Migration 027: Datenversion pro Tabelle für den Statistik-Cache
+-- Jeder Schreibzugriff auf eine Tracking-Tabelle erhöht deren Version per
+-- Trigger - unabhängig davon, über welchen Code (Routen, Import, Restore,
+-- Integritäts-Reparatur) geschrieben wird. app/models/stats_cache.py nimmt die
+-- Versionen der gelesenen Tabellen in den Cache-Schlüssel auf; ein Eintrag
+-- veraltet damit automatisch, sobald sich seine Daten ändern.
+-- '_database' ist ein Zufallswert pro Datenbankdatei, damit ein Cache-Eintrag
+-- nie für eine andere (z.B. ersetzte) Datei gilt.
+
+CREATE TABLE IF NOT EXISTS data_versions (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO data_versions (table_name, version) VALUES ('_database', abs(random()));
+
+INSERT OR IGNORE INTO data_versions (table_name) VALUES ('sleep');
+INSERT OR IGNORE INTO data_versions (table_name) VALUES ('night_waking');
+INSERT OR IGNORE INTO data_versions (table_name) VALUES ('feeding');
+INSERT OR IGNORE INTO data_versions (table_name) VALUES ('bottle');
+INSERT OR IGNORE INTO data_versions (table_name) VALUES ('porridge');
+INSERT OR IGNORE INTO data_versions (table_name) VALUES ('diaper');
+INSERT OR IGNORE INTO data_versions (table_name) VALUES ('temperature');
+INSERT OR IGNORE INTO data_versions (table_name) VALUES ('medicine');
+INSERT OR IGNORE INTO data_versions (table_name) VALUES ('illness');
+INSERT OR IGNORE INTO data_versions (table_name) VALUES ('weight');
+INSERT OR IGNORE INTO data_versions (table_name) VALUES ('height');
+INSERT OR IGNORE INTO data_versions (table_name) VALUES ('head_circumference');
+
+CREATE TRIGGER IF NOT EXISTS trg_sleep_version_insert AFTER INSERT ON sleep
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'sleep';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_sleep_version_update AFTER UPDATE ON sleep
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'sleep';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_sleep_version_delete AFTER DELETE ON sleep
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'sleep';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_night_waking_version_insert AFTER INSERT ON night_waking
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'night_waking';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_night_waking_version_update AFTER UPDATE ON night_waking
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'night_waking';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_night_waking_version_delete AFTER DELETE ON night_waking
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'night_waking';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_feeding_version_insert AFTER INSERT ON feeding
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'feeding';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_feeding_version_update AFTER UPDATE ON feeding
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'feeding';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_feeding_version_delete AFTER DELETE ON feeding
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'feeding';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_bottle_version_insert AFTER INSERT ON bottle
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'bottle';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_bottle_version_update AFTER UPDATE ON bottle
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'bottle';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_bottle_version_delete AFTER DELETE ON bottle
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'bottle';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_porridge_version_insert AFTER INSERT ON porridge
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'porridge';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_porridge_version_update AFTER UPDATE ON porridge
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'porridge';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_porridge_version_delete AFTER DELETE ON porridge
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'porridge';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_diaper_version_insert AFTER INSERT ON diaper
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'diaper';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_diaper_version_update AFTER UPDATE ON diaper
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'diaper';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_diaper_version_delete AFTER DELETE ON diaper
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'diaper';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_temperature_version_insert AFTER INSERT ON temperature
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'temperature';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_temperature_version_update AFTER UPDATE ON temperature
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'temperature';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_temperature_version_delete AFTER DELETE ON temperature
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'temperature';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_medicine_version_insert AFTER INSERT ON medicine
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'medicine';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_medicine_version_update AFTER UPDATE ON medicine
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'medicine';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_medicine_version_delete AFTER DELETE ON medicine
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'medicine';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_illness_version_insert AFTER INSERT ON illness
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'illness';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_illness_version_update AFTER UPDATE ON illness
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'illness';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_illness_version_delete AFTER DELETE ON illness
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'illness';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_weight_version_insert AFTER INSERT ON weight
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'weight';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_weight_version_update AFTER UPDATE ON weight
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'weight';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_weight_version_delete AFTER DELETE ON weight
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'weight';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_height_version_insert AFTER INSERT ON height
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'height';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_height_version_update AFTER UPDATE ON height
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'height';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_height_version_delete AFTER DELETE ON height
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'height';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_head_circumference_version_insert AFTER INSERT ON head_circumference
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'head_circumference';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_head_circumference_version_update AFTER UPDATE ON head_circumference
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'head_circumference';
+END;
+CREATE TRIGGER IF NOT EXISTS trg_head_circumference_version_delete AFTER DELETE ON head_circumference
+BEGIN
+    UPDATE data_versions SET version = version + 1 WHERE table_name = 'head_circumference';
+END;
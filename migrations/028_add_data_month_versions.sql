@@ -0,0 +1,110 @@
+-- Migration 028: Datenversion pro (Tabelle, Kind, Monat) für die Monats-Caches
+-- stats_cache.cached_months (Aktogramm, Quantil-Sketches) legt Tageswerte pro
+-- (Kind, Monat) ab. Mit den globalen Versionen aus 027 im Schlüssel würde jeder
+-- Eintrag von heute auch alle abgeschlossenen Monate verwerfen. Diese Trigger
+-- erhöhen deshalb nur die Versionen der Monate, deren Werte sich ändern können:
+-- Die Monats-Berechnungen lesen Zeilen mit Beginn vom Vortag des Monatsersten
+-- bis zum Monatsletzten, eine Zeile wirkt also auf den Monat ihres Beginns und
+-- den Monat des Folgetags (feeding: timestamp). UPDATE erhöht die Monate des
+-- alten und neuen Beginns.
+-- Datum und Monat kommen aus den ersten zehn Zeichen (Wanduhrzeit, ohne
+-- Umrechnung nach UTC); unlesbare Zeitstempel ergeben NULL und werden übersprungen.
+-- Fehlende Zeilen entsprechen Version 0.
+
+CREATE TABLE IF NOT EXISTS data_month_versions (
+    table_name TEXT NOT NULL,
+    baby_id INTEGER NOT NULL,
+    month TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (table_name, baby_id, month)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_sleep_month_version_insert AFTER INSERT ON sleep
+BEGIN
+    INSERT INTO data_month_versions (table_name, baby_id, month, version)
+    SELECT 'sleep', baby_id, month, 1
+    FROM (SELECT NEW.baby_id AS baby_id, strftime('%Y-%m', substr(NEW.start_time, 1, 10)) AS month
+              UNION SELECT NEW.baby_id AS baby_id, strftime('%Y-%m', substr(NEW.start_time, 1, 10), '+1 day') AS month)
+    WHERE month IS NOT NULL
+    ON CONFLICT (table_name, baby_id, month) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_sleep_month_version_update AFTER UPDATE ON sleep
+BEGIN
+    INSERT INTO data_month_versions (table_name, baby_id, month, version)
+    SELECT 'sleep', baby_id, month, 1
+    FROM (SELECT OLD.baby_id AS baby_id, strftime('%Y-%m', substr(OLD.start_time, 1, 10)) AS month
+              UNION SELECT OLD.baby_id AS baby_id, strftime('%Y-%m', substr(OLD.start_time, 1, 10), '+1 day') AS month
+              UNION SELECT NEW.baby_id AS baby_id, strftime('%Y-%m', substr(NEW.start_time, 1, 10)) AS month
+              UNION SELECT NEW.baby_id AS baby_id, strftime('%Y-%m', substr(NEW.start_time, 1, 10), '+1 day') AS month)
+    WHERE month IS NOT NULL
+    ON CONFLICT (table_name, baby_id, month) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_sleep_month_version_delete AFTER DELETE ON sleep
+BEGIN
+    INSERT INTO data_month_versions (table_name, baby_id, month, version)
+    SELECT 'sleep', baby_id, month, 1
+    FROM (SELECT OLD.baby_id AS baby_id, strftime('%Y-%m', substr(OLD.start_time, 1, 10)) AS month
+              UNION SELECT OLD.baby_id AS baby_id, strftime('%Y-%m', substr(OLD.start_time, 1, 10), '+1 day') AS month)
+    WHERE month IS NOT NULL
+    ON CONFLICT (table_name, baby_id, month) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_night_waking_month_version_insert AFTER INSERT ON night_waking
+BEGIN
+    INSERT INTO data_month_versions (table_name, baby_id, month, version)
+    SELECT 'night_waking', baby_id, month, 1
+    FROM (SELECT NEW.baby_id AS baby_id, strftime('%Y-%m', substr(NEW.start_time, 1, 10)) AS month
+              UNION SELECT NEW.baby_id AS baby_id, strftime('%Y-%m', substr(NEW.start_time, 1, 10), '+1 day') AS month)
+    WHERE month IS NOT NULL
+    ON CONFLICT (table_name, baby_id, month) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_night_waking_month_version_update AFTER UPDATE ON night_waking
+BEGIN
+    INSERT INTO data_month_versions (table_name, baby_id, month, version)
+    SELECT 'night_waking', baby_id, month, 1
+    FROM (SELECT OLD.baby_id AS baby_id, strftime('%Y-%m', substr(OLD.start_time, 1, 10)) AS month
+              UNION SELECT OLD.baby_id AS baby_id, strftime('%Y-%m', substr(OLD.start_time, 1, 10), '+1 day') AS month
+              UNION SELECT NEW.baby_id AS baby_id, strftime('%Y-%m', substr(NEW.start_time, 1, 10)) AS month
+              UNION SELECT NEW.baby_id AS baby_id, strftime('%Y-%m', substr(NEW.start_time, 1, 10), '+1 day') AS month)
+    WHERE month IS NOT NULL
+    ON CONFLICT (table_name, baby_id, month) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_night_waking_month_version_delete AFTER DELETE ON night_waking
+BEGIN
+    INSERT INTO data_month_versions (table_name, baby_id, month, version)
+    SELECT 'night_waking', baby_id, month, 1
+    FROM (SELECT OLD.baby_id AS baby_id, strftime('%Y-%m', substr(OLD.start_time, 1, 10)) AS month
+              UNION SELECT OLD.baby_id AS baby_id, strftime('%Y-%m', substr(OLD.start_time, 1, 10), '+1 day') AS month)
+    WHERE month IS NOT NULL
+    ON CONFLICT (table_name, baby_id, month) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_feeding_month_version_insert AFTER INSERT ON feeding
+BEGIN
+    INSERT INTO data_month_versions (table_name, baby_id, month, version)
+    SELECT 'feeding', baby_id, month, 1
+    FROM (SELECT NEW.baby_id AS baby_id, strftime('%Y-%m', substr(NEW.timestamp, 1, 10)) AS month
+              UNION SELECT NEW.baby_id AS baby_id, strftime('%Y-%m', substr(NEW.timestamp, 1, 10), '+1 day') AS month)
+    WHERE month IS NOT NULL
+    ON CONFLICT (table_name, baby_id, month) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_feeding_month_version_update AFTER UPDATE ON feeding
+BEGIN
+    INSERT INTO data_month_versions (table_name, baby_id, month, version)
+    SELECT 'feeding', baby_id, month, 1
+    FROM (SELECT OLD.baby_id AS baby_id, strftime('%Y-%m', substr(OLD.timestamp, 1, 10)) AS month
+              UNION SELECT OLD.baby_id AS baby_id, strftime('%Y-%m', substr(OLD.timestamp, 1, 10), '+1 day') AS month
+              UNION SELECT NEW.baby_id AS baby_id, strftime('%Y-%m', substr(NEW.timestamp, 1, 10)) AS month
+              UNION SELECT NEW.baby_id AS baby_id, strftime('%Y-%m', substr(NEW.timestamp, 1, 10), '+1 day') AS month)
+    WHERE month IS NOT NULL
+    ON CONFLICT (table_name, baby_id, month) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_feeding_month_version_delete AFTER DELETE ON feeding
+BEGIN
+    INSERT INTO data_month_versions (table_name, baby_id, month, version)
+    SELECT 'feeding', baby_id, month, 1
+    FROM (SELECT OLD.baby_id AS baby_id, strftime('%Y-%m', substr(OLD.timestamp, 1, 10)) AS month
+              UNION SELECT OLD.baby_id AS baby_id, strftime('%Y-%m', substr(OLD.timestamp, 1, 10), '+1 day') AS month)
+    WHERE month IS NOT NULL
+    ON CONFLICT (table_name, baby_id, month) DO UPDATE SET version = version + 1;
+END;
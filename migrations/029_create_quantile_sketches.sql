@@ -0,0 +1,22 @@
+-- Migration 029: Gespeicherte Tages-Sketches für die Quantile (app/models/quantile_sketches.py)
+-- Ein Sketch ist ein Minuten-Histogramm als JSON ({Minute: Anzahl}) pro Kind,
+-- Tag und Kennzahl. quantile_sketch_months hält je (Kind, Monat) die
+-- Monatsversionen aus data_month_versions (Migration 028), mit denen die Tage
+-- dieses Monats berechnet wurden; weichen sie ab, ist der Monat veraltet und
+-- wird neu berechnet. Abgeleiteter Zustand ohne Nutzerdaten - kann jederzeit
+-- geleert werden, die Wartung (app/maintenance.py) füllt ihn wieder.
+
+CREATE TABLE IF NOT EXISTS quantile_sketches (
+    baby_id INTEGER NOT NULL REFERENCES baby_info(id),
+    day TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    sketch TEXT NOT NULL,
+    PRIMARY KEY (baby_id, day, metric)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS quantile_sketch_months (
+    baby_id INTEGER NOT NULL REFERENCES baby_info(id),
+    month TEXT NOT NULL,
+    versions TEXT NOT NULL,
+    PRIMARY KEY (baby_id, month)
+) WITHOUT ROWID;
@@ -1,13 +1,24 @@
 import os
 import tempfile
+from datetime import datetime, timedelta
 
 import pytest
 
+from app.timezone import normalize_to_berlin
+
+
+def ts(day, hour, minute=0):
+    """ISO-Zeitstempel wie in der Datenbank: `day` um hour:minute Ortszeit (Testdaten)."""
+    naive = datetime.combine(day, datetime.min.time()) + timedelta(hours=hour, minutes=minute)
+    return normalize_to_berlin(naive).isoformat()
+
 
 @pytest.fixture
 def app():
     db_fd, db_path = tempfile.mkstemp(suffix='.db')
     os.environ['DATABASE_PATH'] = db_path
+    # Kein Wartungs-Thread pro Test-App (die DB-Datei wird nach dem Test gelöscht)
+    os.environ['MAINTENANCE_INTERVAL_SECONDS'] = '0'
 
     from app import create_app
     flask_app = create_app()
@@ -18,8 +29,49 @@ def app():
     os.close(db_fd)
     os.remove(db_path)
     os.environ.pop('DATABASE_PATH', None)
+    os.environ.pop('MAINTENANCE_INTERVAL_SECONDS', None)
 
 
 @pytest.fixture
 def client(app):
     return app.test_client()
+
+
+@pytest.fixture
+def query_counter(monkeypatch):
+    """Zählt alle SQL-Statements, die während eines Requests über sqlite3 laufen.
+
+    Verallgemeinert count_queries() aus test_wake_duration_query_count.py: statt
+    einer einzelnen Verbindung wird sqlite3.connect umgebogen, damit auch
+    Verbindungen erfasst werden, die erst im Request (get_db) entstehen.
+    Liefert measure(client, url) -> (response, query_count, elapsed_seconds).
+    """
+    import sqlite3
+    import time
+
+    real_connect = sqlite3.connect
+    state = {'n': 0, 'active': False}
+
+    def trace(statement):
+        if state['active']:
+            state['n'] += 1
+
+    def connect(*args, **kwargs):
+        conn = real_connect(*args, **kwargs)
+        conn.set_trace_callback(trace)
+        return conn
+
+    monkeypatch.setattr(sqlite3, 'connect', connect)
+
+    def measure(client, url):
+        state['n'] = 0
+        state['active'] = True
+        started = time.perf_counter()
+        try:
+            response = client.get(url)
+        finally:
+            elapsed = time.perf_counter() - started
+            state['active'] = False
+        return response, state['n'], elapsed
+
+    return measure
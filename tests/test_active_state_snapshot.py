@@ -0,0 +1,72 @@
+"""
+Laufender Schlaf / laufendes Aufwachen: alle Abfragen nach end_time IS NULL
+teilen sich einen Snapshot pro Request (eine Query über die partiellen Indizes
+aus Migration 020), der nach Schreibzugriffen verworfen wird.
+"""
+from datetime import date
+
+
+def insert(app, sql, params):
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        db.execute(sql, params)
+        db.commit()
+
+
+def test_active_lookups_share_one_query(app):
+    today = date.today().isoformat()
+    insert(app, 'INSERT INTO sleep (type, start_time) VALUES (?, ?)', ('night', f'{today}T00:30:00'))
+    insert(app, 'INSERT INTO night_waking (start_time) VALUES (?)', (f'{today}T02:00:00',))
+
+    from app.models import database
+    from app.models.models import Sleep, NightWaking
+
+    statements = []
+    with app.test_request_context():
+        db = database.get_db()
+        database.get_active_baby_id()
+        db.set_trace_callback(statements.append)
+        try:
+            assert Sleep.get_active_sleep()['type'] == 'night'
+            assert Sleep.get_active_sleep_by_type('night')['start_time'] == f'{today}T00:30:00'
+            assert Sleep.get_active_sleep_by_type('nap') is None
+            assert NightWaking.get_active()['start_time'] == f'{today}T02:00:00'
+        finally:
+            db.set_trace_callback(None)
+
+    assert len(statements) == 1
+    assert 'end_time IS NULL' in statements[0]
+
+
+def test_snapshot_is_invalidated_by_writes(app):
+    today = date.today().isoformat()
+    from app.models.models import Sleep, NightWaking
+
+    with app.test_request_context():
+        assert Sleep.get_active_sleep() is None
+        sleep_id = Sleep.create_nap(f'{today}T09:00:00')
+        assert Sleep.get_active_sleep()['id'] == sleep_id
+
+        Sleep.end_sleep(sleep_id, f'{today}T09:45:00')
+        assert Sleep.get_active_sleep() is None
+
+        waking_id = NightWaking.create(f'{today}T03:00:00')
+        assert NightWaking.get_active()['id'] == waking_id
+        NightWaking.end_waking(waking_id, f'{today}T03:10:00')
+        assert NightWaking.get_active() is None
+
+
+def test_snapshot_query_uses_partial_indexes(app):
+    from app.models.models import _ACTIVE_STATE_SQL
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        db.executemany('INSERT INTO sleep (type, start_time, end_time) VALUES (?, ?, ?)',
+                       [('nap', f'2026-01-{d:02d}T09:00:00', f'2026-01-{d:02d}T10:00:00') for d in range(1, 29)])
+        db.executemany('INSERT INTO night_waking (start_time, end_time) VALUES (?, ?)',
+                       [(f'2026-01-{d:02d}T02:00:00', f'2026-01-{d:02d}T02:10:00') for d in range(1, 29)])
+        db.commit()
+        plan = ' '.join(row[3] for row in db.execute('EXPLAIN QUERY PLAN ' + _ACTIVE_STATE_SQL, (1, 1)))
+    assert 'idx_sleep_active_by_baby' in plan
+    assert 'idx_night_waking_active_by_baby' in plan
@@ -0,0 +1,149 @@
+"""
+Aktogramm (app/models/actogram.py): 96 Viertelstunden pro Tag aus sleep und
+night_waking, in einem Schritt gerastert, pro (Kind, Monat) gecacht; als
+Trends-Chart und als Seite im PDF-Bericht.
+"""
+import re
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from app.models import actogram
+
+from conftest import ts
+
+DAY = date(2026, 1, 10)
+
+
+def _bins(hour, minute=0):
+    return (hour * 60 + minute) // actogram.BIN_MINUTES
+
+
+@pytest.fixture
+def night(app):
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        db.execute("INSERT INTO sleep (type, start_time, end_time) VALUES ('night', ?, ?)", (ts(DAY, -4), ts(DAY, 6, 30)))
+        db.execute('INSERT INTO night_waking (start_time, end_time) VALUES (?, ?)', (ts(DAY, 2), ts(DAY, 2, 40)))
+        # 13:05 - 13:10 bedeckt weniger als ein halbes Bin
+        db.execute("INSERT INTO sleep (type, start_time, end_time) VALUES ('nap', ?, ?)", (ts(DAY, 13, 5), ts(DAY, 13, 10)))
+        db.commit()
+
+
+def test_bins_follow_intervals_across_midnight(app, night):
+    with app.test_request_context():
+        result = actogram.get_actogram(DAY - timedelta(days=1), DAY)
+    assert result['days'] == [(DAY - timedelta(days=1)).isoformat(), DAY.isoformat()]
+    before, day = result['rows']
+    assert len(day) == actogram.BINS_PER_DAY
+    assert before == '0' * _bins(20) + '1' * _bins(4)
+    expected = '1' * _bins(2) + '2' * 3 + '1' * (_bins(6, 30) - _bins(2) - 3)
+    assert day == expected + '0' * (actogram.BINS_PER_DAY - len(expected))
+
+
+def test_python_path_matches_numpy(app, night, monkeypatch):
+    if actogram.np is None:
+        pytest.skip('NumPy nicht installiert')
+    from app.models.stats_cache import clear_stats_cache
+
+    with app.test_request_context():
+        vectorized = actogram.get_actogram(DAY - timedelta(days=40), DAY + timedelta(days=3))
+        clear_stats_cache()
+        monkeypatch.setattr(actogram, 'np', None)
+        python = actogram.get_actogram(DAY - timedelta(days=40), DAY + timedelta(days=3))
+    assert python == vectorized
+
+
+def test_months_are_cached_and_invalidated_by_writes(app, night, query_counter, client):
+    from app.models.stats_cache import clear_stats_cache
+
+    clear_stats_cache()
+    url = f'/trends/data/actogram?start_date={DAY - timedelta(days=100)}&end_date={DAY}'
+    _, cold, _ = query_counter(client, url)
+    _, warm, _ = query_counter(client, url)
+    assert warm == cold - 2  # keine Intervall-Queries mehr
+
+    _, short, _ = query_counter(client, f'/trends/data/actogram?start_date={DAY}&end_date={DAY}')
+    clear_stats_cache()
+    _, short_cold, _ = query_counter(client, f'/trends/data/actogram?start_date={DAY}&end_date={DAY}')
+    assert short_cold == cold
+
+    with app.app_context():
+        from app.models.database import get_db
+        get_db().execute('DELETE FROM night_waking')
+        get_db().commit()
+    data = client.get(url).get_json()
+    assert '2' not in data['rows'][-1]
+
+
+def test_writes_only_invalidate_the_months_they_touch(app, night, monkeypatch):
+    from app.models.database import get_db
+    from app.models.stats_cache import clear_stats_cache
+
+    spans = []
+    rasterize = actogram._rasterize_span
+    monkeypatch.setattr(actogram, '_rasterize_span',
+                        lambda db, baby_id, first, last: spans.append((first, last)) or rasterize(db, baby_id, first, last))
+    start, end = date(2025, 11, 1), date(2026, 1, 31)
+    clear_stats_cache()
+
+    with app.test_request_context():
+        before = actogram.get_actogram(start, end)
+        spans.clear()
+        # Laufender Nachtschlaf von heute: Vormonate bleiben im Cache
+        get_db().execute("INSERT INTO sleep (type, start_time) VALUES ('night', ?)", (ts(date.today(), 0, 30),))
+        get_db().commit()
+        assert actogram.get_actogram(start, end) == before
+        assert spans == []
+
+        # Nacht ab 30.11.: November und Dezember, nicht Januar
+        get_db().execute("INSERT INTO sleep (type, start_time, end_time) VALUES ('night', ?, ?)",
+                         (ts(date(2025, 11, 30), 20), ts(date(2025, 12, 1), 6)))
+        get_db().commit()
+        after = actogram.get_actogram(start, end)
+    assert spans == [(date(2025, 11, 1), date(2025, 12, 31))]
+    assert after['rows'][29].endswith('1' * _bins(4)) and after['rows'][30].startswith('1' * _bins(6))
+    assert after['rows'][-31:] == before['rows'][-31:]
+
+
+def test_six_months_render_quickly(app, client):
+    end = date.today()
+    start = end - timedelta(days=183)
+    sleeps, wakings = [], []
+    for offset in range(184):
+        day = start + timedelta(days=offset)
+        sleeps.append(('night', ts(day, -4, 30), ts(day, 6, 15)))
+        sleeps += [('nap', ts(day, h), ts(day, h, 50)) for h in (9, 13, 16)]
+        wakings += [(ts(day, 1), ts(day, 1, 20)), (ts(day, 4), ts(day, 4, 15))]
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        db.executemany('INSERT INTO sleep (type, start_time, end_time) VALUES (?, ?, ?)', sleeps)
+        db.executemany('INSERT INTO night_waking (start_time, end_time) VALUES (?, ?)', wakings)
+        db.commit()
+
+    started = time.perf_counter()
+    data = client.get(f'/trends/data/actogram?start_date={start}&end_date={end}').get_json()
+    assert time.perf_counter() - started < 1.0
+    assert len(data['rows']) == 184
+    assert data['rows'][100][_bins(1, 5)] == '2'
+    assert data['rows'][100][_bins(13, 15)] == '1'
+
+
+def _page_count(pdf_bytes):
+    return len(re.findall(rb'/Type /Page(?!s)', pdf_bytes))
+
+
+def test_report_adds_actogram_page_only_with_sleep_data(app, client):
+    url = f'/settings/export/report?start_date={DAY - timedelta(days=3)}&end_date={DAY}'
+    without = client.get(url)
+    assert without.status_code == 200
+
+    with app.app_context():
+        from app.models.database import get_db
+        get_db().execute("INSERT INTO sleep (type, start_time, end_time) VALUES ('nap', ?, ?)", (ts(DAY, 9), ts(DAY, 10)))
+        get_db().commit()
+    with_sleep = client.get(url)
+    assert _page_count(with_sleep.data) == _page_count(without.data) + 1
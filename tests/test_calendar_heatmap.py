@@ -0,0 +1,66 @@
+"""
+Kalender-Heatmap (/trends/data/heatmap): Tageswerte über lange Zeiträume aus
+einer GROUP-BY-Query pro Tabelle - die Zahl der Queries hängt nicht von der
+Länge des Zeitraums ab.
+"""
+from datetime import date, timedelta
+
+from conftest import ts
+
+DAY = date(2026, 1, 10)
+
+
+def _insert(app, table, rows):
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        for values in rows:
+            db.execute(f'INSERT INTO {table} ({", ".join(values)}) VALUES ({", ".join("?" for _ in values)})',
+                       tuple(values.values()))
+        db.commit()
+
+
+def test_daily_values_per_category(app, client):
+    _insert(app, 'sleep', [
+        {'type': 'night', 'start_time': ts(DAY, -4), 'end_time': ts(DAY, 6, 30)},    # Vorabend -> Aufwach-Tag
+        {'type': 'nap', 'start_time': ts(DAY, 13), 'end_time': ts(DAY, 14, 30)},
+        {'type': 'nap', 'start_time': ts(DAY, 16)},   # läuft noch
+    ])
+    _insert(app, 'feeding', [{'timestamp': ts(DAY, h), 'side': 'links'} for h in (7, 11, 15)])
+    _insert(app, 'diaper', [{'timestamp': ts(DAY + timedelta(days=1), 8), 'type': 'nass'}])
+    _insert(app, 'bottle', [{'timestamp': ts(DAY, 18), 'amount': 90}, {'timestamp': ts(DAY, 22), 'amount': 60}])
+    _insert(app, 'temperature', [{'timestamp': ts(DAY, 9), 'value': 37.2}, {'timestamp': ts(DAY, 20), 'value': 38.4},
+                                 {'timestamp': ts(DAY + timedelta(days=1), 9), 'value': 37.0}])
+
+    data = client.get(f'/trends/data/heatmap?start_date={DAY - timedelta(days=1)}&end_date={DAY + timedelta(days=1)}').get_json()
+    assert data['columns'] == ['sleep_hours', 'feedings', 'diapers', 'bottle_ml', 'fever']
+    assert data['start'] == (DAY - timedelta(days=1)).isoformat()
+    assert data['days'] == [
+        [DAY.isoformat(), 12.0, 3, 0, 150, 1],
+        [(DAY + timedelta(days=1)).isoformat(), 0, 0, 1, 0, 0],
+    ]
+
+
+def test_default_range_is_last_year_and_bounds_are_swapped(app, client):
+    data = client.get('/trends/data/heatmap').get_json()
+    assert data['end'] == date.today().isoformat()
+    assert data['start'] == (date.today() - timedelta(days=364)).isoformat()
+    assert data['days'] == []
+
+    data = client.get('/trends/data/heatmap?start_date=2026-03-01&end_date=2026-01-01').get_json()
+    assert (data['start'], data['end']) == ('2026-01-01', '2026-03-01')
+
+
+def test_query_count_independent_of_range_length(app, client, query_counter):
+    from app.models.stats_cache import clear_stats_cache
+
+    _insert(app, 'feeding', [{'timestamp': ts(DAY - timedelta(days=d), 8), 'side': 'links'} for d in range(400)])
+    counts = []
+    for days in (7, 90, 1000):
+        clear_stats_cache()
+        start = DAY - timedelta(days=days)
+        response, queries, _ = query_counter(client, f'/trends/data/heatmap?start_date={start}&end_date={DAY}')
+        assert response.status_code == 200
+        counts.append(queries)
+    assert counts[0] == counts[1] == counts[2]
+    assert len(response.get_json()['days']) == 400
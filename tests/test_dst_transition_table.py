@@ -0,0 +1,64 @@
+"""
+Die vorberechnete Übergangstabelle in app/timezone.py muss für jede Eingabeart
+exakt dasselbe liefern wie der frühere Weg über zoneinfo (astimezone/utcoffset),
+insbesondere rund um die Zeitumstellungen (Lücke im Frühjahr, doppelte Stunde im
+Herbst), und pro Offset ein geteiltes tzinfo-Objekt verwenden.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import timezone as app_timezone
+from app.timezone import normalize_to_berlin, tz_berlin
+
+
+def _reference(dt):
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=tz_berlin)
+    elif dt.tzinfo != tz_berlin:
+        dt = dt.astimezone(tz_berlin)
+    return dt.replace(tzinfo=timezone(dt.utcoffset()))
+
+
+def _variants(wall):
+    yield wall
+    yield wall.replace(fold=1)
+    yield wall.replace(tzinfo=tz_berlin)
+    yield wall.replace(tzinfo=tz_berlin, fold=1)
+    yield wall.replace(tzinfo=timezone.utc)
+    yield wall.replace(tzinfo=timezone(timedelta(hours=1)))
+    yield wall.replace(tzinfo=timezone(timedelta(hours=2)))
+    yield wall.replace(tzinfo=timezone(timedelta(hours=-5)))
+
+
+@pytest.mark.parametrize('day', ['2026-03-29', '2026-10-25', '1996-10-27', '2080-03-31'])
+def test_matches_zoneinfo_minute_by_minute_around_transitions(day):
+    start = datetime.fromisoformat(day) - timedelta(hours=12)
+    for minute in range(0, 36 * 60, 5):
+        wall = start + timedelta(minutes=minute)
+        for dt in _variants(wall):
+            expected = _reference(dt)
+            actual = normalize_to_berlin(dt)
+            assert actual.isoformat() == expected.isoformat(), dt
+            assert actual.fold == expected.fold, dt
+
+
+def test_outside_table_range_falls_back_to_zoneinfo():
+    for dt in (datetime(1950, 7, 1, 12), datetime(2150, 1, 1, 12, tzinfo=timezone.utc)):
+        assert normalize_to_berlin(dt).isoformat() == _reference(dt).isoformat()
+
+
+def test_tzinfo_objects_are_interned_per_offset():
+    summer = normalize_to_berlin(datetime(2026, 7, 1, 12))
+    summer_utc = normalize_to_berlin(datetime(2026, 7, 1, 10, tzinfo=timezone.utc))
+    winter = normalize_to_berlin(datetime(2026, 1, 1, 12))
+    assert summer.tzinfo is summer_utc.tzinfo
+    assert summer.tzinfo is not winter.tzinfo
+    assert summer.tzinfo is app_timezone.interned_timezone(timedelta(hours=2))
+
+
+def test_ordering_across_fallback_stays_correct():
+    # Entspricht dem Beispiel aus test_dst_timestamp_ordering.py (#46)
+    sleep_end = normalize_to_berlin(datetime.fromisoformat('2026-10-25T02:15:00+01:00'))
+    waking_start = normalize_to_berlin(datetime.fromisoformat('2026-10-25T02:45:00+02:00'))
+    assert waking_start < sleep_end
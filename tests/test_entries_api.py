@@ -0,0 +1,107 @@
+"""
+Timeline-API /api/entries: Keyset-Pagination über alle Kategorien, sortiert nach
+(timestamp, category, id) absteigend. Jede Seite liest pro Kategorie ab dem
+Cursor über den Index (baby_id, Zeitspalte) - kein OFFSET.
+"""
+from datetime import date
+from urllib.parse import quote
+
+import pytest
+
+from conftest import ts
+
+DAY = date(2026, 1, 10)
+
+
+@pytest.fixture
+def history(app):
+    """Einträge über mehrere Kategorien, teils mit identischem Zeitstempel."""
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        for hour in range(0, 48, 3):
+            db.execute('INSERT INTO diaper (timestamp, type) VALUES (?, ?)', (ts(DAY, hour), 'nass'))
+            db.execute('INSERT INTO bottle (timestamp, amount) VALUES (?, ?)', (ts(DAY, hour), 120))
+        for hour in range(1, 48, 4):
+            db.execute('INSERT INTO feeding (timestamp, side) VALUES (?, ?)', (ts(DAY, hour), 'links'))
+            db.execute('INSERT INTO sleep (type, start_time, end_time) VALUES (?, ?, ?)',
+                       ('nap', ts(DAY, hour, 30), ts(DAY, hour + 1)))
+        # Gleicher Zeitstempel zweimal in derselben Kategorie
+        db.execute('INSERT INTO diaper (timestamp, type) VALUES (?, ?)', (ts(DAY, 6), 'groß'))
+        db.execute('INSERT INTO weight (timestamp, weight_kg) VALUES (?, ?)', (ts(DAY, 12), 6.2))
+        db.execute('INSERT INTO temperature (timestamp, value) VALUES (?, ?)', (ts(DAY, 20), 37.4))
+        db.commit()
+        total = sum(db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                    for table in ('diaper', 'bottle', 'feeding', 'sleep', 'weight', 'temperature'))
+    return total
+
+
+def _key(entry):
+    return (entry['timestamp'], entry['category'], entry['id'])
+
+
+def test_pages_cover_every_entry_once_in_order(client, history):
+    seen, before, pages = [], None, 0
+    while True:
+        url = '/api/entries?limit=7' + (f'&before={quote(before)}' if before else '')
+        data = client.get(url).get_json()
+        seen.extend(data['entries'])
+        pages += 1
+        before = data['next_before']
+        if before is None:
+            break
+
+    keys = [_key(entry) for entry in seen]
+    assert len(keys) == history
+    assert len(set(keys)) == history
+    assert keys == sorted(keys, reverse=True)
+    assert pages == -(-history // 7)
+
+
+def test_entries_carry_category_fields_and_display(client, history):
+    entries = client.get('/api/entries?limit=200').get_json()['entries']
+    by_category = {entry['category']: entry for entry in entries}
+    assert by_category['bottle']['amount'] == 120
+    assert by_category['bottle']['display'] == 'Flasche (120 ml)'
+    assert by_category['sleep']['display'] == 'Nickerchen'
+    assert by_category['sleep']['end_time']
+    assert by_category['weight']['weight_kg'] == 6.2
+    assert 'amount' not in by_category['diaper']
+
+
+def test_query_count_is_flat_across_pages(client, history, query_counter):
+    counts, before = [], None
+    for _ in range(4):
+        url = '/api/entries?limit=5' + (f'&before={quote(before)}' if before else '')
+        response, queries, _ = query_counter(client, url)
+        counts.append(queries)
+        before = response.get_json()['next_before']
+    assert len(set(counts)) == 1, counts
+
+
+def test_deep_page_reads_through_indexes(app, history):
+    from app.models.models import get_entries_page
+
+    with app.test_request_context():
+        from app.models.database import get_db
+        db = get_db()
+        statements = []
+        db.set_trace_callback(statements.append)
+        get_entries_page(before=(ts(DAY, 20), 'diaper', 3), limit=10, baby_id=1)
+        db.set_trace_callback(None)
+        plans = [[row[3] for row in db.execute('EXPLAIN QUERY PLAN ' + sql).fetchall()] for sql in statements]
+
+    assert len(plans) == 12
+    for plan in plans:
+        # Jede Kategorie liest in Indexreihenfolge ab dem Cursor, sortiert wird nichts
+        assert len(plan) == 1 and plan[0].startswith('SEARCH') and 'USING INDEX' in plan[0], plan
+
+
+@pytest.mark.parametrize('before', ['kaputt', '2026-01-10T06:00:00+01:00,unbekannt,1',
+                                    '2026-01-10T06:00:00+01:00,diaper,x',
+                                    # unkodiertes '+' kommt als Leerzeichen an
+                                    '2026-01-10T06:00:00 01:00,diaper,3'])
+def test_invalid_cursor_is_rejected(client, before):
+    response = client.get(f'/api/entries?before={quote(before)}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
@@ -0,0 +1,95 @@
+"""
+Tagesgruppierung der Einträge-Seite (Woche, Monat, freier Zeitraum): jeder
+Eintrag wird einmal geparst und einem lokalen Tag zugeordnet; Duplikate werden
+über (category, id) erkannt, nicht über die id allein.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import ts
+
+MONDAY = date(2026, 3, 23)  # Woche mit Sommerzeit-Beginn am Sonntag, 29.03.
+
+
+def test_single_pass_assigns_days_and_keeps_colliding_ids():
+    from app.routes.entries import bucket_entries_by_day
+
+    sunday = MONDAY + timedelta(days=6)
+    raw = [
+        {'id': 1, 'category': 'diaper', 'timestamp': ts(MONDAY, 9)},
+        {'id': 1, 'category': 'sleep', 'timestamp': ts(MONDAY, 20), 'end_time': ts(MONDAY, 30)},
+        {'id': 1, 'category': 'sleep', 'timestamp': ts(MONDAY, 20), 'end_time': ts(MONDAY, 30)},
+        {'id': 2, 'category': 'feeding', 'timestamp': ts(MONDAY, 7)},
+        {'id': 3, 'category': 'bottle', 'timestamp': ts(sunday, 3)},        # nach der Umstellung
+        {'id': 4, 'category': 'bottle', 'timestamp': ts(sunday + timedelta(days=1), 1)},
+        {'id': 5, 'category': 'diaper', 'timestamp': 'kaputt'},
+    ]
+    entries = bucket_entries_by_day(raw, MONDAY, sunday)
+
+    assert [(e['category'], e['id'], e['day']) for e in entries] == [
+        ('diaper', 5, MONDAY),
+        ('feeding', 2, MONDAY),
+        ('diaper', 1, MONDAY),
+        ('sleep', 1, MONDAY + timedelta(days=1)),   # Nachtschlaf zählt zum Tag des Endes
+        ('bottle', 3, sunday),
+    ]
+
+
+def test_each_timestamp_is_parsed_once(monkeypatch):
+    from app.routes import entries as entries_route
+
+    calls = []
+    real = entries_route.parse_timestamp
+
+    def counting(value):
+        calls.append(value)
+        return real(value)
+
+    monkeypatch.setattr(entries_route, 'parse_timestamp', counting)
+    raw = [{'id': i, 'category': 'diaper', 'timestamp': ts(MONDAY, 0, i)} for i in range(200)]
+    raw += [{'id': i, 'category': 'sleep', 'timestamp': ts(MONDAY, 1, i), 'end_time': ts(MONDAY, 2, i)}
+            for i in range(100)]
+    entries_route.bucket_entries_by_day(raw, MONDAY, MONDAY + timedelta(days=6))
+    assert len(calls) == 200 + 2 * 100
+
+
+@pytest.fixture
+def month_of_entries(app):
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        for offset in range(31):
+            day = date(2026, 3, 1) + timedelta(days=offset)
+            db.execute('INSERT INTO diaper (timestamp, type) VALUES (?, ?)', (ts(day, 10), 'nass'))
+        db.commit()
+
+
+@pytest.mark.parametrize('query,days', [
+    ('view=month&date=2026-03-15', 31),
+    ('view=week&date=2026-03-25', 7),
+    ('view=range&start=2026-03-10&end=2026-03-14', 5),
+    ('view=range&start=2026-03-14&end=2026-03-10', 5),   # vertauschte Grenzen
+])
+def test_grouped_views_render_one_group_per_day(client, month_of_entries, query, days):
+    html = client.get(f'/entries/?{query}').get_data(as_text=True)
+    assert html.count('class="day-group') == days
+
+
+def test_range_view_is_capped_and_navigates_by_its_span(client, month_of_entries):
+    from app.routes.entries import MAX_RANGE_DAYS
+
+    html = client.get('/entries/?view=range&start=2020-01-01&end=2026-03-31').get_data(as_text=True)
+    assert html.count('class="day-group') == 31
+    first = date(2026, 3, 31) - timedelta(days=MAX_RANGE_DAYS - 1)
+    assert f'value="{first.isoformat()}"' in html
+
+    html = client.get('/entries/?view=range&start=2026-03-10&end=2026-03-14').get_data(as_text=True)
+    assert 'start=2026-03-05&amp;end=2026-03-09' in html
+    assert 'start=2026-03-15&amp;end=2026-03-19' in html
+
+
+def test_month_navigation_crosses_year_boundary(client):
+    html = client.get('/entries/?view=month&date=2026-01-20').get_data(as_text=True)
+    assert 'view=month&amp;date=2025-12-01' in html
+    assert 'view=month&amp;date=2026-02-01' in html
@@ -0,0 +1,71 @@
+"""
+WHO-Perzentilen (app/models/growth_reference.py): Tagestabellen aus denselben
+LMS-Parametern wie die z-Scores (growth_lms), Abfragen sind Listenzugriffe;
+Kopfumfang nutzt dieselbe Struktur und der Wachstums-Chart fragt alle Punkte
+gebündelt ab.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from app.models import growth_lms as lms
+from app.models import growth_reference as ref
+
+from conftest import ts
+
+
+def test_bands_come_from_the_lms_tables():
+    for metric in ref.METRICS:
+        for gender in ('m', 'f'):
+            rows = ref._DAILY[(metric, gender)]
+            assert len(rows) == ref.MAX_AGE_DAYS + 1
+            assert [row[2] for row in rows] == [round(m, 2) for m in lms.LMS_TABLES[(metric, gender)][1]]
+            # Jedes Band liegt auf seinem z-Score
+            age = 400
+            zs = lms.zscores(metric, gender, [age] * 5, list(rows[age]))
+            assert zs == pytest.approx(ref.PERCENTILE_Z, abs=0.01)
+
+    # Veröffentlichte WHO-Perzentilen (eine Nachkommastelle)
+    assert list(ref._DAILY[('weight', 'm')][365]) == pytest.approx([7.8, 8.6, 9.6, 10.8, 11.8], abs=0.06)
+    assert list(ref._DAILY[('head', 'm')][0]) == pytest.approx([32.1, 33.1, 34.5, 35.8, 36.9], abs=0.06)
+
+
+def test_height_bands_switch_to_standing_height_at_731_days():
+    lying, standing = ref.get_percentiles_batch('height', 'f', [730, 731])
+    assert lying['p50'] - standing['p50'] == pytest.approx(0.7, abs=0.06)
+
+
+def test_lookups_clamp_and_reject_invalid_input():
+    assert ref.get_height_percentiles('f', 100)['p50'] == ref._DAILY[('height', 'f')][ref.MAX_AGE_DAYS][2]
+    assert ref.get_head_percentiles('m', 0)['p3'] == ref._DAILY[('head', 'm')][0][0]
+    assert ref.get_weight_percentiles('x', 3) is None
+    assert ref.get_weight_percentiles('m', -1) is None
+    assert ref.get_head_percentiles('f', None) is None
+
+
+def test_batch_matches_single_lookups():
+    ages = [0, 10, 45, 200, 365, None, -3, 5000]
+    batch = ref.get_percentiles_batch('head', 'f', ages)
+    assert batch[5] is None and batch[6] is None
+    for age, result in zip(ages, batch):
+        if age is not None and age >= 0:
+            assert result == ref.get_head_percentiles('f', age / ref.DAYS_PER_MONTH)
+    assert ref.get_percentiles_batch('weight', None, ages) == [None] * len(ages)
+
+
+def test_growth_chart_attaches_head_percentiles(app, client):
+    from app.models.models import HeadCircumference
+
+    birth = date.today() - timedelta(days=120)
+    with app.test_request_context():
+        for week in range(0, 15):
+            HeadCircumference.create(ts(birth + timedelta(days=7 * week), 10), 34.0 + week * 0.4)
+    with app.app_context():
+        from app.models.database import get_db
+        get_db().execute("UPDATE baby_info SET gender = 'm', birth_date = ?", (birth.isoformat(),))
+        get_db().commit()
+
+    head = client.get('/trends/data/growth').get_json()['head']
+    assert len(head) == 15
+    assert head[0]['p50'] == round(lms.LMS_TABLES[('head', 'm')][1][0], 2)
+    assert head[-1]['p50'] == ref.get_percentiles_batch('head', 'm', [98])[0]['p50']
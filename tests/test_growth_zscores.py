@@ -0,0 +1,129 @@
+"""
+WHO-z-Scores (app/models/growth_lms.py): LMS-Parameter je Lebenstag bzw.
+0,1 cm, ganze Reihen in einem Schritt (NumPy) mit identischem Python-Pfad,
+Verläufe im Trends-Chart und im PDF-Bericht.
+"""
+import math
+from datetime import date, timedelta
+
+import pytest
+
+from app.models import growth_lms as lms
+
+from conftest import ts
+
+
+def test_median_is_zero_and_box_cox_matches_formula():
+    age = round(12 * lms.DAYS_PER_MONTH)
+    l, m, s = (column[age] for column in lms.LMS_TABLES[('weight', 'f')])
+    zs = lms.zscores('weight', 'f', [age, age, age], [m, m * 1.1, None])
+    expected = round(((1.1 ** l) - 1) / (l * s), 2)
+    assert zs == [0.0, pytest.approx(expected, abs=0.02), None]
+
+    # Länge: L = 1, also (y - M) / (M * S)
+    _, m, s = (column[0] for column in lms.LMS_TABLES[('height', 'm')])
+    assert lms.zscores('height', 'm', [0], [m + 2 * m * s]) == [2.0]
+
+
+def test_restricted_application_beyond_three_sd():
+    l, m, s = (column[0] for column in lms.LMS_TABLES[('weight', 'm')])
+    sd3 = m * (1 + l * s * 3) ** (1 / l)
+    sd2 = m * (1 + l * s * 2) ** (1 / l)
+    heavy = sd3 + (sd3 - sd2)  # genau eine SD2-SD3-Distanz über SD3
+    assert lms.zscores('weight', 'm', [0], [heavy]) == [4.0]
+    # Kopfumfang ohne Anpassung: reine Box-Cox-Formel
+    _, m, s = (column[0] for column in lms.LMS_TABLES[('head', 'm')])
+    assert lms.zscores('head', 'm', [0], [m * (1 + 4 * s)]) == [4.0]
+
+
+def test_tables_are_the_daily_who_files():
+    for indicator, rows in (('weight', lms.MAX_AGE_DAYS + 1), ('height', lms.MAX_AGE_DAYS + 1),
+                            ('head', lms.MAX_AGE_DAYS + 1), ('weight_for_length', 651), ('weight_for_height', 551)):
+        for gender in ('m', 'f'):
+            assert all(len(column) == rows for column in lms.LMS_TABLES[(indicator, gender)])
+    # Stichproben aus den WHO-Tabellen (Tag bzw. cm: L, M, S)
+    assert [c[365] for c in lms.LMS_TABLES[('weight', 'm')]] == [0.0645, 9.646, 0.10925]
+    assert [c[1856] for c in lms.LMS_TABLES[('head', 'f')]] == [1.0, 49.9652, 0.02848]
+    assert [c[50] for c in lms.LMS_TABLES[('weight_for_length', 'f')]] == [-0.3833, 3.3518, 0.09068]
+
+
+def test_height_switches_from_length_to_height_at_731_days():
+    _, m, _ = lms.LMS_TABLES[('height', 'm')]
+    assert m[730] == 87.8018 and m[731] == 87.1303
+    # Dasselbe Kind, am Folgetag stehend gemessen: z-Score bleibt fast gleich
+    lying, standing = lms.zscores('height', 'm', [730, 731], [88.5, 88.5 - 0.7])
+    assert lying == pytest.approx(standing, abs=0.03)
+
+
+def test_out_of_range_and_unknown_gender_give_none():
+    assert lms.zscores('weight', 'm', [lms.MAX_AGE_DAYS + 1, -5], [20, 3]) == [None, None]
+    assert lms.zscores('weight_for_length', 'f', [44.0, 111.0, 50.0], [2, 20, 3.3518]) == [None, None, 0.0]
+    assert lms.zscores('weight', None, [0], [3.3]) == [None]
+
+
+def test_percentiles_from_z():
+    assert lms.percentiles_from_z([0, 1.96, -1.88, None]) == [50.0, 97.5, 3.0, None]
+
+
+@pytest.mark.skipif(not lms.is_vectorized(), reason='NumPy nicht installiert')
+def test_numpy_and_python_paths_agree():
+    ages = list(range(0, lms.MAX_AGE_DAYS, 37))
+    for indicator in lms.AGE_INDICATORS:
+        table = lms._TABLES[(indicator, 'f')]
+        plain = tuple(column.tolist() for column in table)
+        for factor in (0.6, 0.9, 1.0, 1.15, 1.5):
+            values = [table[1][age] * factor for age in ages]
+            vectorized = lms.zscores(indicator, 'f', ages, values)
+            python = [round(lms._zscore_py(indicator, plain, age, value), 2) for age, value in zip(ages, values)]
+            assert vectorized == pytest.approx(python, abs=0.011)
+    assert lms.percentiles_from_z([-2.5, 0.3, 1.1]) == [
+        round(50 * (1 + math.erf(z / math.sqrt(2))), 1) for z in (-2.5, 0.3, 1.1)]
+
+
+def test_weight_for_length_uses_latest_length_before_each_weight():
+    day = date(2026, 1, 1)
+    weights = [{'timestamp': ts(day + timedelta(days=d), 10), 'weight_kg': w} for d, w in ((0, 3.3), (10, 3.6), (20, 3.9))]
+    lengths = [{'timestamp': ts(day + timedelta(days=5), 10), 'height_cm': 50.0}]
+    points = lms.weight_for_length_trajectory('m', weights, lengths)
+    assert [p['timestamp'] for p in points] == [weights[1]['timestamp'], weights[2]['timestamp']]
+    assert points[0]['z'] == lms.zscores('weight_for_length', 'm', [50.0], [3.6])[0]
+
+
+def test_weight_for_height_from_731_days():
+    birth = date(2024, 1, 1)
+    weights = [{'timestamp': ts(birth + timedelta(days=d), 10), 'weight_kg': 12.0} for d in (700, 760)]
+    lengths = [{'timestamp': ts(birth + timedelta(days=690), 10), 'height_cm': 86.0}]
+    points = lms.weight_for_length_trajectory('f', weights, lengths, birth)
+    assert [p['z'] for p in points] == [lms.zscores('weight_for_length', 'f', [86.0], [12.0])[0],
+                                        lms.zscores('weight_for_height', 'f', [86.0], [12.0])[0]]
+    assert points[0]['z'] != points[1]['z']
+
+
+def test_zscore_chart_and_report(app, client):
+    from app.models.models import Weight, Height
+
+    birth = date.today() - timedelta(days=200)
+    with app.test_request_context():
+        for week in range(0, 28):
+            Weight.create(ts(birth + timedelta(days=7 * week), 10), 3.3 + week * 0.16)
+        for month in range(0, 7):
+            Height.create(ts(birth + timedelta(days=30 * month), 10), 50.0 + month * 2.8)
+
+    data = client.get('/trends/data/zscores').get_json()
+    assert data['available'] is False and data['weight'] == []
+
+    with app.app_context():
+        from app.models.database import get_db
+        get_db().execute("UPDATE baby_info SET gender = 'm', birth_date = ?", (birth.isoformat(),))
+        get_db().commit()
+
+    data = client.get('/trends/data/zscores?points=10').get_json()
+    assert data['available'] is True
+    assert len(data['weight']) == 10 and len(data['height']) == 7
+    assert data['weight'][0]['z'] == lms.zscores('weight', 'm', [0], [3.3])[0]
+    assert len(data['weight_for_length']) == 10
+    assert all(-3 < p['z'] < 3 and 0 < p['percentile'] < 100 for p in data['height'])
+
+    response = client.get(f'/settings/export/report?start_date={birth.isoformat()}')
+    assert response.status_code == 200
+    assert response.data.startswith(b'%PDF')
@@ -0,0 +1,148 @@
+"""
+Datenprüfung (app/integrity.py): Sweep über die sortierte Historie findet
+Überschneidungen, Aufwachen außerhalb des Nachtschlafs, unplausible Dauern,
+verwaiste baby_ids und ungültige Zeitstempel; eindeutige Fälle werden mit
+fix=True in einer Transaktion repariert.
+"""
+import sqlite3
+from datetime import date
+
+import pytest
+
+from conftest import ts
+
+DAY = date(2026, 1, 10)
+
+
+def _insert(app, table, **values):
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        columns = ', '.join(values)
+        cursor = db.execute(f'INSERT INTO {table} ({columns}) VALUES ({", ".join("?" for _ in values)})',
+                            tuple(values.values()))
+        db.commit()
+        return cursor.lastrowid
+
+
+@pytest.fixture
+def messy_history(app):
+    ids = {
+        'night': _insert(app, 'sleep', type='night', start_time=ts(DAY, -5), end_time=ts(DAY, 6)),
+        'waking_inside': _insert(app, 'night_waking', start_time=ts(DAY, 2), end_time=ts(DAY, 2, 20)),
+        'waking_outside': _insert(app, 'night_waking', start_time=ts(DAY, 14), end_time=ts(DAY, 14, 10)),
+        'nap': _insert(app, 'sleep', type='nap', start_time=ts(DAY, 9), end_time=ts(DAY, 10)),
+        'nap_overlap': _insert(app, 'sleep', type='nap', start_time=ts(DAY, 9, 30), end_time=ts(DAY, 10, 30)),
+        'nap_duplicate': _insert(app, 'sleep', type='nap', start_time=ts(DAY, 13), end_time=ts(DAY, 14)),
+        'nap_duplicate_2': _insert(app, 'sleep', type='nap', start_time=ts(DAY, 13), end_time=ts(DAY, 14)),
+        # 23:00 - 01:00 am selben Datum eingetragen: Ende gehört auf den Folgetag
+        'night_swapped': _insert(app, 'sleep', type='night', start_time=ts(DAY, 23), end_time=ts(DAY, 1)),
+        'nap_absurd': _insert(app, 'sleep', type='nap', start_time=ts(DAY, 24 * 3), end_time=ts(DAY, 24 * 3 + 11)),
+        'feeding_bad': _insert(app, 'feeding', timestamp='gestern abend', side='links'),
+        'diaper_orphan': _insert(app, 'diaper', timestamp=ts(DAY, 8), type='nass', baby_id=99),
+    }
+    return ids
+
+
+def test_scan_reports_each_problem_once(app, messy_history):
+    from app.integrity import scan_integrity
+
+    with app.app_context():
+        report = scan_integrity()
+
+    assert report.counts == {
+        'unparseable_timestamp': 1,
+        'negative_duration': 1,
+        'absurd_duration': 1,
+        'orphaned_baby_id': 1,
+        'overlapping_sleep': 2,
+        'overlapping_waking': 0,
+        'waking_outside_night': 1,
+    }
+    examples = report.as_dict()['checks']
+    assert examples['waking_outside_night']['examples'][0]['id'] == messy_history['waking_outside']
+    assert examples['orphaned_baby_id']['examples'][0]['baby_id'] == 99
+    # Gekürztes Nickerchen, gelöschtes Duplikat, verschobenes Ende
+    assert len(report.fixes) == 3
+
+
+def test_fix_applies_clear_cut_repairs(app, messy_history):
+    from app.integrity import scan_integrity
+    from app.models.database import get_db
+
+    with app.app_context():
+        report = scan_integrity(fix=True)
+        assert report.fixed == 3
+        db = get_db()
+        nap = db.execute('SELECT end_time FROM sleep WHERE id = ?', (messy_history['nap'],)).fetchone()
+        assert nap['end_time'] == ts(DAY, 9, 30)
+        assert db.execute('SELECT id FROM sleep WHERE id = ?', (messy_history['nap_duplicate_2'],)).fetchone() is None
+        swapped = db.execute('SELECT end_time FROM sleep WHERE id = ?', (messy_history['night_swapped'],)).fetchone()
+        assert swapped['end_time'] == ts(DAY, 25)
+
+        again = scan_integrity()
+    assert again.counts['overlapping_sleep'] == 0
+    assert again.counts['negative_duration'] == 0
+    # Nicht eindeutig reparierbar - bleibt gemeldet
+    assert again.counts['absurd_duration'] == 1
+    assert again.counts['waking_outside_night'] == 1
+    assert again.fixes == []
+
+
+def test_fixes_are_all_or_nothing(app, messy_history):
+    from app.integrity import scan_integrity, apply_fixes
+    from app.models.database import get_db
+
+    with app.app_context():
+        report = scan_integrity()
+        report.fixes.append(('UPDATE no_such_table SET x = 1', ()))
+        with pytest.raises(sqlite3.Error):
+            apply_fixes(get_db(), report)
+        nap = get_db().execute('SELECT end_time FROM sleep WHERE id = ?', (messy_history['nap'],)).fetchone()
+    assert nap['end_time'] == ts(DAY, 10)
+
+
+def test_contained_entry_is_reported_without_trimming_the_outer(app):
+    from app.integrity import scan_integrity
+    from app.models.database import get_db
+
+    night = _insert(app, 'sleep', type='night', start_time=ts(DAY, -5), end_time=ts(DAY, 6))
+    nap = _insert(app, 'sleep', type='nap', start_time=ts(DAY, -1), end_time=ts(DAY, -1, 30))
+
+    with app.app_context():
+        report = scan_integrity(fix=True)
+        ends = dict(get_db().execute('SELECT id, end_time FROM sleep').fetchall())
+    assert report.counts['overlapping_sleep'] == 1
+    assert report.examples['overlapping_sleep'][0]['id'] == nap
+    assert 'liegt vollständig in' in report.examples['overlapping_sleep'][0]['detail']
+    assert report.fixed == 0
+    assert ends == {night: ts(DAY, 6), nap: ts(DAY, -1, 30)}
+
+
+def test_wakings_are_matched_per_baby(app):
+    from app.integrity import scan_integrity
+    from app.models.models import BabyInfo
+
+    with app.test_request_context():
+        second = BabyInfo.create_baby('Zwilling', date(2025, 6, 1))
+    _insert(app, 'sleep', type='night', start_time=ts(DAY, -5), end_time=ts(DAY, 6))
+    _insert(app, 'night_waking', start_time=ts(DAY, 2), end_time=ts(DAY, 2, 20), baby_id=second)
+
+    with app.app_context():
+        report = scan_integrity()
+    assert report.counts['waking_outside_night'] == 1
+
+
+def test_cli_and_endpoints(app, client, messy_history):
+    result = app.test_cli_runner().invoke(args=['check-integrity'])
+    assert result.exit_code == 0
+    assert '7 Auffälligkeit(en)' in result.output
+    assert '3 davon automatisch reparierbar' in result.output
+
+    data = client.get('/settings/integrity').get_json()
+    assert data['total'] == 7
+    assert data['fixable'] == 3
+
+    response = client.post('/settings/integrity/fix')
+    assert response.status_code == 302
+    assert client.get('/settings/integrity').get_json()['fixable'] == 0
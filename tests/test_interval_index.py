@@ -0,0 +1,152 @@
+"""
+Intervall-Index (app/models/intervals.py): Überlappung, Enthaltensein und
+Tages-Zuschnitt über sortierte Beginn-Zeiten, einmal pro Request geladen.
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.models.intervals import IntervalIndex
+from app.timezone import normalize_to_berlin
+
+from conftest import ts
+
+
+def _dt(day, hour, minute=0):
+    return normalize_to_berlin(datetime.combine(day, datetime.min.time()) + timedelta(hours=hour, minutes=minute))
+
+
+def _index(intervals, now=None):
+    rows = [{'id': i, 'start_time': start, 'end_time': end} for i, (start, end) in enumerate(intervals)]
+    day = date(2026, 1, 10)
+    return IntervalIndex(rows, _dt(day, 0), _dt(day, 24), now=now)
+
+
+def test_overlapping_finds_long_interval_started_earlier():
+    day = date(2026, 1, 10)
+    index = _index([
+        (ts(day, -30), ts(day, 5)),      # beginnt anderthalb Tage vorher
+        (ts(day, 9), ts(day, 10)),
+        (ts(day, 12), ts(day, 13)),
+        (ts(day, 20), None),             # offen
+    ], now=_dt(day, 22))
+
+    ids = [item.row['id'] for item in index.overlapping(_dt(day, 4), _dt(day, 9, 30))]
+    assert ids == [0, 1]
+    assert [item.row['id'] for item in index.overlapping(_dt(day, 21), _dt(day, 23))] == [3]
+    # Offenes Intervall endet "jetzt" (22:00)
+    assert index.overlapping(_dt(day, 22, 30), _dt(day, 23)) == []
+
+
+class _CountingList(list):
+    def __init__(self, values):
+        super().__init__(values)
+        self.reads = 0
+
+    def __getitem__(self, key):
+        self.reads += 1
+        return super().__getitem__(key)
+
+
+def test_forgotten_open_entry_does_not_widen_search():
+    day = date(2026, 1, 10)
+    start = _dt(day, 0) - timedelta(days=400)
+    # Ein vergessener offener Eintrag ganz am Anfang, danach ein Jahr Nickerchen
+    intervals = [(start.isoformat(), None)]
+    intervals += [((start + timedelta(hours=2 * i)).isoformat(), (start + timedelta(hours=2 * i, minutes=45)).isoformat())
+                  for i in range(1, 4800)]
+    index = _index(intervals, now=_dt(day, 12))
+    index._ends._max = _CountingList(index._ends._max)
+
+    lower = start + timedelta(days=200, minutes=10)
+    found = [item.row['id'] for item in index.overlapping(lower, lower + timedelta(hours=3))]
+    assert found == [0, 2400, 2401]
+    # Logarithmisch statt linear: eine Handvoll Pfade durch den Baum (Tiefe 13)
+    assert index._ends._max.reads < 200
+
+
+def test_contained_and_clipped():
+    day = date(2026, 1, 10)
+    index = _index([
+        (ts(day, 1), ts(day, 2)),
+        (ts(day, 3), ts(day, 8)),        # ragt über das Fenster hinaus
+        (ts(day, 4), None),              # offen, Beginn im Fenster
+    ], now=_dt(day, 5))
+
+    contained = [item.row['id'] for item in index.contained(_dt(day, 0), _dt(day, 6))]
+    assert contained == [0, 2]
+    clipped = {item.row['id']: seconds for item, seconds in index.clipped(_dt(day, 1, 30), _dt(day, 6))}
+    assert clipped == {0: 1800.0, 1: 3 * 3600.0, 2: 3600.0}
+
+
+def test_seconds_per_day_cuts_at_local_midnight_across_dst():
+    # 29.03.2026: Sommerzeit-Beginn, der Tag hat nur 23 Stunden
+    day = date(2026, 3, 29)
+    index = _index([(ts(day, -2), ts(day, 26))])
+    per_day = index.seconds_per_day(day - timedelta(days=1), day + timedelta(days=1))
+    assert per_day == {
+        day - timedelta(days=1): 2 * 3600.0,
+        day: 23 * 3600.0,
+        day + timedelta(days=1): 2 * 3600.0,
+    }
+
+
+def test_waking_durations_share_one_query_per_request(app):
+    from app.models.database import get_db
+    from app.models.models import NightWaking
+
+    today = date.today()
+    with app.app_context():
+        db = get_db()
+        for offset in range(1, 11):
+            evening = today - timedelta(days=offset)
+            db.execute('INSERT INTO night_waking (start_time, end_time) VALUES (?, ?)',
+                       (ts(evening, 23), ts(evening, 23, 30)))
+        db.commit()
+
+    with app.test_request_context():
+        from app.models.intervals import get_interval_index
+        get_interval_index('night_waking', today - timedelta(days=11), today)
+
+        statements = []
+        get_db().set_trace_callback(statements.append)
+        totals = [NightWaking.get_total_waking_duration(ts(today - timedelta(days=offset), 20),
+                                                        ts(today - timedelta(days=offset), 30))
+                  for offset in range(1, 11)]
+        get_db().set_trace_callback(None)
+
+    assert totals == [0.5] * 10
+    assert statements == []
+
+
+def test_writes_invalidate_request_index(app):
+    from app.models.models import NightWaking
+
+    evening = date.today() - timedelta(days=1)
+    with app.test_request_context():
+        assert NightWaking.get_total_waking_duration(ts(evening, 20), ts(evening, 30)) == 0.0
+        NightWaking.create(ts(evening, 23), ts(evening, 23, 45))
+        assert NightWaking.get_total_waking_duration(ts(evening, 20), ts(evening, 30)) == 0.75
+
+
+def test_illness_statistics_count_sick_days(app):
+    from app.models.models import Illness
+
+    start = date(2026, 2, 1)
+    with app.test_request_context():
+        Illness.create(ts(start, -12), ts(start, 36), 'Erkältung')     # 31.01. 12:00 - 02.02. 12:00
+        Illness.create(ts(start, 24 * 5), None, 'Fieber')               # läuft noch
+        stats = Illness.get_illness_statistics(start, start + timedelta(days=6))
+
+    assert stats['total_count'] == 2
+    assert stats['sick_days'] == 4  # 01., 02. sowie 06., 07.
+    assert stats['days_count'] == 7
+
+
+@pytest.mark.parametrize('table', ['feeding', 'weight'])
+def test_only_interval_tables_supported(app, table):
+    from app.models.intervals import get_interval_index
+
+    with app.test_request_context():
+        with pytest.raises(ValueError):
+            get_interval_index(table, date.today(), date.today())
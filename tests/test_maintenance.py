@@ -0,0 +1,72 @@
+"""
+Periodische Wartung: daily_nap_suggestions wird per TTL begrenzt; die alte
+nap_suggestions-Tabelle bleibt ungenutzt stehen, ohne DDL bei jedem Start.
+"""
+import time
+from datetime import date, timedelta
+
+from app.maintenance import MaintenanceThread, run_maintenance
+
+
+def _store_rows(app, days_back):
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        for offset in days_back:
+            db.execute(
+                'INSERT INTO daily_nap_suggestions (baby_id, date, payload, computed_at) VALUES (1, ?, ?, ?)',
+                ((date.today() - timedelta(days=offset)).isoformat(), '[]', 'x')
+            )
+        db.commit()
+
+
+def _stored_dates(app):
+    with app.app_context():
+        from app.models.database import get_db
+        rows = get_db().execute('SELECT date FROM daily_nap_suggestions ORDER BY date').fetchall()
+        return [row['date'] for row in rows]
+
+
+def test_prune_keeps_only_recent_days(app, monkeypatch):
+    monkeypatch.setenv('NAP_SUGGESTION_TTL_DAYS', '2')
+    _store_rows(app, [0, 1, 2, 3, 30, 400])
+
+    with app.app_context():
+        results = run_maintenance()
+
+    assert results['daily_nap_suggestions'] == 3
+    assert _stored_dates(app) == [(date.today() - timedelta(days=offset)).isoformat() for offset in (2, 1, 0)]
+
+
+def test_restart_leaves_schema_unchanged(app):
+    from app.models.database import get_db, init_db
+
+    def schema():
+        return get_db().execute('SELECT type, name, sql FROM sqlite_master ORDER BY type, name').fetchall()
+
+    with app.app_context():
+        before = [tuple(row) for row in schema()]
+        statements = []
+        get_db().set_trace_callback(statements.append)
+        init_db()
+        get_db().set_trace_callback(None)
+        after = [tuple(row) for row in schema()]
+
+    assert after == before
+    # Kein Anlegen-und-wieder-Löschen des alten Caches beim Start
+    assert not any('DROP TABLE' in statement.upper() for statement in statements)
+    assert ('table', 'nap_suggestions') in [row[:2] for row in after]
+
+
+def test_background_thread_prunes_periodically(app):
+    worker = MaintenanceThread(app, interval=0.05)
+    assert worker.start()
+    try:
+        _store_rows(app, [10])
+        deadline = time.time() + 2
+        while _stored_dates(app) and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        worker.stop()
+    assert _stored_dates(app) == []
+    assert not worker.running
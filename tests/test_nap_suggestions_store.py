@@ -0,0 +1,69 @@
+"""
+Nickerchen-Vorschläge werden beim Schreiben von Schlaf-Einträgen berechnet und
+pro (Kind, Tag) in daily_nap_suggestions abgelegt (Migration 021). Das
+Dashboard liest nur noch diese eine Zeile.
+"""
+import json
+from datetime import date, datetime, timedelta
+
+from app.timezone import tz_berlin
+
+
+def stored_rows(baby_id=1):
+    from app.models.database import get_db
+    return get_db().execute(
+        'SELECT date, payload FROM daily_nap_suggestions WHERE baby_id = ?', (baby_id,)
+    ).fetchall()
+
+
+def test_writes_store_suggestions_for_today(app):
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    from app.models.models import Sleep
+
+    with app.test_request_context():
+        assert stored_rows() == []
+        sleep_id = Sleep.create_night_sleep(f'{yesterday.isoformat()}T20:00:00')
+        rows = stored_rows()
+        assert [row['date'] for row in rows] == [today.isoformat()]
+        assert json.loads(rows[0]['payload']) == [{'waiting_for_night_sleep_end': True}]
+
+        Sleep.end_sleep(sleep_id, f'{today.isoformat()}T06:00:00')
+        payload = json.loads(stored_rows()[0]['payload'])
+        assert payload != [{'waiting_for_night_sleep_end': True}]
+
+
+def test_dashboard_read_is_a_single_lookup(app):
+    today = date.today()
+    from app.models import database
+    from app.models.models import BabyInfo, Sleep
+
+    with app.test_request_context():
+        Sleep.create_nap(f'{today.isoformat()}T09:00:00', f'{today.isoformat()}T09:45:00')
+        database.get_active_baby_id()
+        statements = []
+        db = database.get_db()
+        db.set_trace_callback(statements.append)
+        try:
+            suggestions = BabyInfo.get_nap_suggestions(today)
+        finally:
+            db.set_trace_callback(None)
+
+    assert len(statements) == 1
+    assert 'daily_nap_suggestions' in statements[0]
+    now = datetime.now(tz_berlin)
+    for suggestion in suggestions:
+        if 'suggested_time' in suggestion:
+            assert suggestion['suggested_time'] > now
+
+
+def test_missing_row_is_computed_lazily_and_invalidated_by_birth_date(app):
+    today = date.today()
+    from app.models.models import BabyInfo
+
+    with app.test_request_context():
+        BabyInfo.get_nap_suggestions(today)
+        assert [row['date'] for row in stored_rows()] == [today.isoformat()]
+
+        BabyInfo.set_birth_date(today - timedelta(days=400))
+        assert stored_rows() == []
@@ -0,0 +1,93 @@
+"""
+Nachtschlaf-Modell (Migration 022): exponentiell gewichtete Mittelwerte werden
+beim Beenden eines Nachtschlafs fortgeschrieben; get_night_sleep_suggestion
+liest nur noch diesen Zustand statt pro Nacht das Aufwachen abzufragen.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.night_sleep_model import ALPHA
+
+from conftest import ts
+
+
+def _create_nights(count, end_day=None):
+    """Legt `count` Nächte über das Modell an; jede mit 20 Minuten Aufwachen."""
+    from app.models.models import Sleep, NightWaking
+    end_day = end_day or date.today()
+    durations = []
+    for offset in range(count, 0, -1):
+        evening = end_day - timedelta(days=offset)
+        morning = evening + timedelta(days=1)
+        wake_minute = (offset * 7) % 60
+        sleep_id = Sleep.create_night_sleep(ts(evening, 19, 30))
+        waking_id = NightWaking.create(ts(morning, 2, 0))
+        NightWaking.end_waking(waking_id, ts(morning, 2, 20))
+        Sleep.end_sleep(sleep_id, ts(morning, 6, wake_minute))
+        durations.append(10.5 + wake_minute / 60 - 20 / 60)
+    return durations
+
+
+def test_incremental_updates_match_rebuild(app):
+    from app.models.night_sleep_model import NightSleepModel
+
+    with app.test_request_context():
+        durations = _create_nights(5)
+        incremental = NightSleepModel.get()
+        rebuilt = NightSleepModel.rebuild()
+
+    expected = durations[0]
+    for value in durations[1:]:
+        expected += ALPHA * (value - expected)
+
+    assert incremental['night_count'] == rebuilt['night_count'] == 5
+    assert incremental['duration_mean'] == pytest.approx(expected)
+    for key in ('duration_mean', 'duration_var', 'wake_mean', 'bedtime_mean', 'day_sleep_mean'):
+        assert incremental[key] == pytest.approx(rebuilt[key]), key
+    assert rebuilt['bedtime_mean'] == pytest.approx(7.5)
+
+
+def test_history_edit_rebuilds_model(app):
+    from app.models.models import Sleep
+    from app.models.night_sleep_model import NightSleepModel
+
+    with app.test_request_context():
+        _create_nights(3)
+        before = NightSleepModel.get()['night_count']
+        from app.models.database import get_db
+        oldest = get_db().execute("SELECT id FROM sleep WHERE type = 'night' ORDER BY start_time LIMIT 1").fetchone()['id']
+        Sleep.delete(oldest)
+        assert NightSleepModel.get()['night_count'] == before - 1
+
+
+def test_suggestion_queries_do_not_grow_with_history(app):
+    from app.models import database
+    from app.models.models import BabyInfo
+
+    def count_queries():
+        with app.test_request_context():
+            database.get_active_baby_id()
+            statements = []
+            db = database.get_db()
+            db.set_trace_callback(statements.append)
+            try:
+                BabyInfo.get_night_sleep_suggestion(date.today())
+            finally:
+                db.set_trace_callback(None)
+        return len(statements)
+
+    with app.test_request_context():
+        _create_nights(2)
+    few = count_queries()
+    with app.test_request_context():
+        _create_nights(10, end_day=date.today() - timedelta(days=5))
+    assert count_queries() == few
+
+
+def test_rebuild_cli_command(app):
+    with app.test_request_context():
+        _create_nights(2)
+    result = app.test_cli_runner().invoke(args=['rebuild-sleep-model'])
+    assert result.exit_code == 0
+    assert '1 Kind' in result.output
@@ -0,0 +1,155 @@
+"""
+Quantil-Sketches (app/models/quantile_sketches.py): Minuten-Histogramme pro
+Tag, exakt mischbar; P10/Median/P90 für Nickerchen, Nacht, Einschlafzeit,
+Wachfenster und Stillabstände über beliebige Zeiträume.
+"""
+import json
+import random
+import statistics
+from datetime import date, timedelta
+
+import pytest
+
+from app.models import quantile_sketches as qs
+
+from conftest import ts
+
+DAY = date(2026, 2, 10)
+
+
+def test_merged_sketch_quantiles_match_exact_quantiles():
+    rng = random.Random(7)
+    values = [rng.randint(20, 180) for _ in range(501)]
+    sketches = []
+    for chunk in range(0, len(values), 37):
+        sketch = {}
+        for value in values[chunk:chunk + 37]:
+            qs.add_value(sketch, value)
+        sketches.append(sketch)
+    merged = qs.merge_sketches(sketches)
+
+    assert sum(merged.values()) == len(values)
+    deciles = statistics.quantiles(values, n=10, method='inclusive')
+    assert qs.sketch_quantile(merged, 0.1) == pytest.approx(deciles[0])
+    assert qs.sketch_quantile(merged, 0.5) == statistics.median(values)
+    assert qs.sketch_quantile(merged, 0.9) == pytest.approx(deciles[-1])
+    assert qs.sketch_quantile({}, 0.5) is None
+    assert qs.sketch_quantile({42: 1}, 0.9) == 42
+
+
+@pytest.fixture
+def history(app):
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        for offset in range(4):
+            day = DAY + timedelta(days=offset)
+            # Nacht vom Vorabend: 23:30 bzw. 0:30 Einschlafen, 6:30 Aufwachen
+            bedtime = (-1, 30) if offset % 2 == 0 else (0, 30)
+            db.execute("INSERT INTO sleep (type, start_time, end_time) VALUES ('night', ?, ?)",
+                       (ts(day, *bedtime), ts(day, 6, 30)))
+            db.execute("INSERT INTO sleep (type, start_time, end_time) VALUES ('nap', ?, ?)",
+                       (ts(day, 9, 30), ts(day, 9, 30 + 20 * (offset + 1))))
+            for hour in (7, 10, 14):
+                db.execute("INSERT INTO feeding (timestamp, side) VALUES (?, 'links')", (ts(day, hour),))
+        db.execute('INSERT INTO night_waking (start_time, end_time) VALUES (?, ?)',
+                   (ts(DAY, 2), ts(DAY, 3)))
+        # Unplausibles Nickerchen (> 8 h) fließt nicht ein
+        db.execute("INSERT INTO sleep (type, start_time, end_time) VALUES ('nap', ?, ?)",
+                   (ts(DAY + timedelta(days=10), 8), ts(DAY + timedelta(days=10), 20)))
+        db.commit()
+
+
+def test_distribution_quantiles(app, history):
+    with app.test_request_context():
+        result = qs.get_distribution_quantiles(DAY, DAY + timedelta(days=20))
+
+    assert result['nap'] == {'count': 4, 'p10': 26, 'median': 50, 'p90': 74}
+    # 7 h, 6 h, 7 h, 6 h abzüglich einer Stunde Aufwachen in der ersten Nacht
+    assert result['night'] == {'count': 4, 'p10': 360, 'median': 360, 'p90': 402}
+    # 23:30 und 0:30 liegen nebeneinander, der Median ist Mitternacht
+    assert result['bedtime'] == {'count': 4, 'p10': 23 * 60 + 30, 'median': 0, 'p90': 30}
+    # 6:30 -> 9:30 jeden Tag; Nickerchen-Ende -> nächste Nacht liegt über 12 h
+    assert result['wake_window'] == {'count': 4, 'p10': 180, 'median': 180, 'p90': 180}
+    # 7 -> 10 -> 14 Uhr, 14 -> 7 Uhr (17 h) liegt über der Obergrenze
+    assert result['feeding_interval'] == {'count': 8, 'p10': 180, 'median': 210, 'p90': 240}
+
+
+def test_long_ranges_merge_cached_months(app, history, client, query_counter):
+    with app.test_request_context():
+        year = qs.get_distribution_quantiles(DAY - timedelta(days=300), DAY + timedelta(days=64))
+        single_day = qs.get_distribution_quantiles(DAY + timedelta(days=1), DAY + timedelta(days=1))
+    assert year['nap']['count'] == 4
+    assert single_day['nap'] == {'count': 1, 'p10': 40, 'median': 40, 'p90': 40}
+
+    def trends_url(start):
+        return f'/trends/?start_date={start.isoformat()}&end_date={(DAY + timedelta(days=64)).isoformat()}'
+
+    # Ein Jahr kostet nicht mehr Queries als zwei Monate (Tages-Sketches je Monat)
+    _, queries_short, _ = query_counter(client, trends_url(DAY))
+    response, queries_year, _ = query_counter(client, trends_url(DAY - timedelta(days=300)))
+    assert response.status_code == 200
+    assert 'Einschlafzeit (Nacht)'.encode() in response.data
+    assert queries_year <= queries_short
+
+
+def test_maintenance_stores_sketches_and_writes_only_invalidate_their_months(app, history, monkeypatch):
+    from app.maintenance import run_maintenance
+    from app.models.database import get_db
+    from app.models.stats_cache import clear_stats_cache, month_spans
+
+    spans = []
+    compute = qs._day_sketches
+    monkeypatch.setattr(qs, '_day_sketches',
+                        lambda db, baby_id, first, last: spans.append((first, last)) or compute(db, baby_id, first, last))
+    start, end = date(2026, 2, 1), date(2026, 4, 30)
+
+    with app.test_request_context():
+        db = get_db()
+        # Vor der ersten Wartung wird gerechnet, aber nichts gespeichert
+        before = qs.get_distribution_quantiles(start, end)
+        assert spans == [(start, end)]
+        assert db.execute('SELECT COUNT(*) FROM quantile_sketches').fetchone()[0] == 0
+
+        # Die Wartung speichert alle Monate vom ersten Eintrag (9.2.) bis heute
+        spans.clear()
+        assert run_maintenance()['quantile_sketches'] == len(month_spans(date(2026, 2, 9), date.today()))
+        sketch = db.execute("SELECT sketch FROM quantile_sketches WHERE day = ? AND metric = 'nap'",
+                            ((DAY + timedelta(days=1)).isoformat(),)).fetchone()['sketch']
+        assert json.loads(sketch) == {'40': 1}
+
+        # Gespeicherte Monate überstehen einen leeren Statistik-Cache (Neustart)
+        spans.clear()
+        clear_stats_cache()
+        assert qs.get_distribution_quantiles(start, end) == before
+        assert spans == []
+
+        # Eintrag von heute: abgeschlossene Monate bleiben gültig
+        db.execute("INSERT INTO feeding (timestamp, side) VALUES (?, 'links')", (ts(date.today(), 8),))
+        db.execute("INSERT INTO sleep (type, start_time, end_time) VALUES ('nap', ?, ?)",
+                   (ts(date.today(), 9), ts(date.today(), 10)))
+        db.commit()
+        assert qs.get_distribution_quantiles(start, end) == before
+        assert spans == []
+
+        # Stillen am 31.1. um 23 Uhr wirkt auf Januar und Februar, nicht auf März
+        db.execute("INSERT INTO feeding (timestamp, side) VALUES (?, 'links')", (ts(date(2026, 1, 31), 23),))
+        db.commit()
+        qs.get_distribution_quantiles(start, end)
+        assert spans == [(date(2026, 2, 1), date(2026, 2, 28))]
+
+        # Geänderter Beginn: alter und neuer Monat veralten
+        spans.clear()
+        db.execute("UPDATE sleep SET start_time = ?, end_time = ? WHERE start_time = ?",
+                   (ts(date(2026, 3, 15), 9, 30), ts(date(2026, 3, 15), 10), ts(DAY, 9, 30)))
+        db.commit()
+        after = qs.get_distribution_quantiles(start, end)
+        assert spans == [(date(2026, 2, 1), date(2026, 3, 31))]
+
+        # Die nächste Wartung rechnet nur die veralteten Monate neu
+        # (Januar bis März und der laufende Monat)
+        assert run_maintenance()['quantile_sketches'] == 4
+        spans.clear()
+        assert qs.get_distribution_quantiles(start, end) == after
+        assert spans == []
+    assert after['nap']['count'] == before['nap']['count']
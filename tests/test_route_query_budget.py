@@ -0,0 +1,132 @@
+"""
+Query-Budget für alle GET-Seiten: jede Route wird gegen einen großen, generierten
+Datenbestand gerendert und muss mit einer festen Anzahl SQL-Statements und
+innerhalb eines Zeitbudgets auskommen. Verallgemeinert den Ansatz aus
+test_wake_duration_query_count.py (#45), damit N+1-Muster als Testfehler
+auffallen statt ausgeliefert zu werden.
+
+Budgets sind bewusst knapp über dem aktuellen Stand gewählt. Wird eines
+überschritten, nennt die Fehlermeldung Route, gemessenen Wert und Budget.
+Jede Route läuft mit und ohne NumPy: ausgeliefert wird ohne (requirements.txt,
+Dockerfile), die Budgets richten sich nach dem langsameren Python-Pfad.
+"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import ts
+
+DATASET_DAYS = 120
+
+# Wanduhr-Budget pro Request in Sekunden (großzügig für langsame CI-Runner)
+TIME_BUDGET_SECONDS = 2.0
+
+ROUTE_BUDGETS = {
+    '/': 60,
+    '/entries/?view=day': 18,
+    '/entries/?view=week': 18,
+    '/entries/?view=month': 18,
+    '/entries/?view=range&start=2000-01-01': 18,
+    '/trends/': 28,
+    '/trends/data/daily_sleep': 8,
+    '/trends/data/sleep_times': 8,
+    '/trends/data/wake_windows': 4,
+    '/trends/data/temperature': 4,
+    '/trends/data/growth': 8,
+    '/trends/data/zscores': 8,
+    '/trends/data/heatmap': 10,
+    '/trends/data/actogram': 6,
+    '/settings/': 12,
+    '/settings/export/csv': 18,
+    '/settings/export/backup': 16,
+    '/settings/export/report': 28,  # Python-Pfad; mit NumPy 25
+}
+
+
+def generate_dataset(app, days=DATASET_DAYS, seed=42):
+    """Erzeugt einen realistischen Datenbestand über `days` Tage bis heute."""
+    rng = random.Random(seed)
+    today = date.today()
+    sleep_rows, waking_rows, feeding_rows = [], [], []
+    bottle_rows, diaper_rows, temp_rows, weight_rows = [], [], [], []
+
+    for offset in range(days, 0, -1):
+        day = today - timedelta(days=offset)
+        night_start = 19.5 + rng.random()
+        night_end = 24 + 6 + rng.random()
+        sleep_rows.append(('night', ts(day, 0, int(night_start * 60)), ts(day, 0, int(night_end * 60))))
+        for waking in range(2):
+            start = night_start + 2 + waking * 4 + rng.random()
+            waking_rows.append((ts(day, 0, int(start * 60)), ts(day, 0, int(start * 60) + 15)))
+        for nap_hour in (9, 13, 16):
+            start = nap_hour + rng.random() * 0.5
+            sleep_rows.append(('nap', ts(day, 0, int(start * 60)), ts(day, 0, int(start * 60) + 45)))
+        for hour in range(6, 22, 2):
+            feeding_rows.append((ts(day, hour, rng.randint(0, 59)), rng.choice(['links', 'rechts'])))
+            diaper_rows.append((ts(day, hour, rng.randint(0, 59)), rng.choice(['nass', 'groß', 'beides'])))
+        bottle_rows.append((ts(day, 18, 30), rng.choice([60, 90, 120])))
+        temp_rows.append((ts(day, 12, 0), round(36.5 + rng.random(), 1)))
+        if offset % 14 == 0:
+            weight_rows.append((ts(day, 10, 0), round(4 + (days - offset) * 0.02, 2)))
+
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        db.executemany('INSERT INTO sleep (type, start_time, end_time) VALUES (?, ?, ?)', sleep_rows)
+        db.executemany('INSERT INTO night_waking (start_time, end_time) VALUES (?, ?)', waking_rows)
+        db.executemany('INSERT INTO feeding (timestamp, side) VALUES (?, ?)', feeding_rows)
+        db.executemany('INSERT INTO bottle (timestamp, amount) VALUES (?, ?)', bottle_rows)
+        db.executemany('INSERT INTO diaper (timestamp, type) VALUES (?, ?)', diaper_rows)
+        db.executemany('INSERT INTO temperature (timestamp, value) VALUES (?, ?)', temp_rows)
+        db.executemany('INSERT INTO weight (timestamp, weight_kg) VALUES (?, ?)', weight_rows)
+        db.execute("UPDATE baby_info SET gender = 'f', birth_date = ?",
+                   ((today - timedelta(days=days + 30)).isoformat(),))
+        db.commit()
+
+
+@pytest.fixture
+def large_dataset(app):
+    generate_dataset(app)
+    return app
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def statistics_path(request, monkeypatch):
+    """'python' schaltet die optionalen NumPy-Pfade ab, wie in einer Installation ohne NumPy."""
+    from app.models import actogram, growth_lms, vectorized_stats
+    if request.param == 'numpy' and not vectorized_stats.is_available():
+        pytest.skip('NumPy nicht installiert')
+    if request.param == 'python':
+        monkeypatch.setattr(vectorized_stats, 'is_available', lambda: False)
+        # z-Scores und Perzentilen (Wachstum, Bericht) über die LMS-Listen
+        monkeypatch.setattr(growth_lms, 'np', None)
+        monkeypatch.setattr(growth_lms, '_TABLES', growth_lms.LMS_TABLES)
+        # Aktogramm (Trends, Bericht) Intervall für Intervall
+        monkeypatch.setattr(actogram, 'np', None)
+    return request.param
+
+
+@pytest.mark.parametrize('url', sorted(ROUTE_BUDGETS))
+def test_route_stays_within_query_and_time_budget(large_dataset, statistics_path, client, query_counter, url):
+    response, queries, elapsed = query_counter(client, url)
+
+    assert response.status_code == 200, f'{url}: HTTP {response.status_code}'
+    budget = ROUTE_BUDGETS[url]
+    assert queries <= budget, f'{url}: {queries} SQL-Statements (Budget {budget})'
+    assert elapsed <= TIME_BUDGET_SECONDS, f'{url}: {elapsed:.2f}s (Budget {TIME_BUDGET_SECONDS}s)'
+
+
+@pytest.mark.parametrize('path', ['/trends/', '/settings/export/report'])
+def test_query_count_independent_of_date_range(large_dataset, client, query_counter, monkeypatch, path):
+    # Zeilenweiser Pfad für beide Zeiträume (der NumPy-Pfad ab 21 Tagen braucht weniger Queries)
+    from app.models import vectorized_stats
+    monkeypatch.setattr(vectorized_stats, 'is_available', lambda: False)
+    today = date.today()
+    counts = []
+    for days in (7, 90):
+        start = (today - timedelta(days=days)).isoformat()
+        response, queries, _ = query_counter(client, f'{path}?start_date={start}&end_date={today.isoformat()}')
+        assert response.status_code == 200
+        counts.append(queries)
+    assert counts[0] == counts[1], f'{path}: {counts[0]} Queries für 7 Tage, {counts[1]} für 90 Tage'
@@ -0,0 +1,114 @@
+"""
+Tests für den Stichproben-Profiler: gefaltete Stacks enthalten nur app-Frames,
+der Speicher bleibt durch max_stacks begrenzt und die Endpunkte steuern den
+prozessweiten Sampler - nur mit PROFILER_ENABLED und passendem PROFILER_TOKEN.
+"""
+import threading
+import time
+
+import pytest
+
+from app.profiler import SamplingProfiler, OVERFLOW_STACK, get_profiler
+
+
+def _busy_app_worker(stop_event):
+    # Läuft in einem Thread und rechnet fast durchgehend in app/downsampling.py
+    from app.downsampling import lttb
+    points = [(i, (i * 7919) % 101) for i in range(20000)]
+    while not stop_event.is_set():
+        lttb(points, 100)
+
+
+def test_sample_collects_only_app_frames():
+    profiler = SamplingProfiler(interval=0.01)
+    stop_event = threading.Event()
+    thread = threading.Thread(target=_busy_app_worker, args=(stop_event,))
+    thread.start()
+    try:
+        # Zwischen zwei lttb-Aufrufen steht der Thread im Testcode (kein app-Frame)
+        for _ in range(200):
+            profiler.sample()
+            if 'app/downsampling.py:lttb' in profiler.folded():
+                break
+            time.sleep(0.005)
+    finally:
+        stop_event.set()
+        thread.join()
+
+    folded = profiler.folded()
+    assert 'app/downsampling.py:lttb' in folded
+    assert 'tests/' not in folded
+    lines = folded.splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(' ', 1)
+        assert int(count) >= 1
+        assert all(part.startswith('app/') for part in stack.split(';'))
+
+
+def test_stack_table_is_bounded():
+    profiler = SamplingProfiler(interval=0.01, max_stacks=2)
+    profiler._record([f'app/x.py:f{i}' for i in range(5)])
+    profiler._record(['app/x.py:f0'])
+    assert len(profiler._stacks) == 3
+    folded = profiler.folded()
+    assert 'app/x.py:f0 2\n' in folded
+    assert f'{OVERFLOW_STACK} 3\n' in folded
+
+
+@pytest.fixture
+def profiler_client(monkeypatch, tmp_path):
+    monkeypatch.setenv('DATABASE_PATH', str(tmp_path / 'profiler.db'))
+    monkeypatch.setenv('MAINTENANCE_INTERVAL_SECONDS', '0')
+    monkeypatch.setenv('PROFILER_ENABLED', '1')
+    monkeypatch.setenv('PROFILER_TOKEN', 'geheim')
+    from app import create_app
+    flask_app = create_app()
+    flask_app.config.update(TESTING=True)
+    try:
+        yield flask_app.test_client()
+    finally:
+        get_profiler().stop()
+        get_profiler().reset()
+
+
+def test_endpoints_not_registered_without_env(client):
+    assert client.post('/debug/profiler/start').status_code == 404
+    assert client.get('/debug/profiler/folded').status_code == 404
+    assert get_profiler().running is False
+
+
+def test_endpoints_require_token(profiler_client, monkeypatch):
+    assert profiler_client.post('/debug/profiler/stop').status_code == 403
+    assert profiler_client.get('/debug/profiler/folded').status_code == 403
+    wrong = {'X-Profiler-Token': 'falsch'}
+    assert profiler_client.post('/debug/profiler/reset', headers=wrong).status_code == 403
+    # Ohne konfiguriertes Token bleibt alles gesperrt
+    monkeypatch.delenv('PROFILER_TOKEN')
+    assert profiler_client.get('/debug/profiler/', headers={'X-Profiler-Token': ''}).status_code == 403
+
+
+def test_endpoints_start_stop_and_download(profiler_client):
+    client = profiler_client
+    headers = {'X-Profiler-Token': 'geheim'}
+    profiler = get_profiler()
+    # PROFILER_ENABLED startet den Sampler schon beim App-Start
+    assert profiler.running is True
+    client.post('/debug/profiler/stop', headers=headers)
+
+    response = client.post('/debug/profiler/start', headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()['running'] is True
+
+    # Ein paar Requests erzeugen, während der Sampler läuft
+    for _ in range(5):
+        client.get('/')
+    time.sleep(profiler.interval * 5)
+
+    response = client.post('/debug/profiler/stop', headers=headers)
+    assert response.get_json()['running'] is False
+    assert response.get_json()['samples'] > 0
+
+    response = client.get('/debug/profiler/folded', headers=headers)
+    assert response.status_code == 200
+    assert 'attachment' in response.headers['Content-Disposition']
@@ -0,0 +1,167 @@
+"""
+Überschneidungsprüfung für sleep/night_waking: neue oder geänderte Intervalle, die
+einen bestehenden Eintrag desselben Kindes überschneiden, werden mit OverlapError
+abgelehnt (Routen zeigen eine Fehlermeldung). Die Prüfung liest nur Vorgänger und
+Nachfolger nach Beginn über den Index (baby_id, start_time).
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import ts
+
+DAY = date.today() - timedelta(days=3)
+
+
+def _row(app, table, row_id):
+    with app.app_context():
+        from app.models.database import get_db
+        row = get_db().execute(f'SELECT * FROM {table} WHERE id = ?', (row_id,)).fetchone()
+        return dict(row) if row else None
+
+
+@pytest.mark.parametrize('start,end,overlaps', [
+    ((12, 30), (13, 30), True),    # beginnt im bestehenden Nickerchen
+    ((11, 0), (12, 30), True),     # endet darin
+    ((11, 0), (15, 0), True),      # umschließt es
+    ((12, 15), (12, 45), True),    # liegt darin
+    ((11, 0), (12, 0), False),     # endet genau bei dessen Beginn
+    ((13, 0), (14, 0), False),     # beginnt genau bei dessen Ende
+])
+def test_closed_intervals(app, start, end, overlaps):
+    from app.models.models import Sleep, OverlapError
+
+    with app.test_request_context():
+        existing = Sleep.create_nap(ts(DAY, 12), ts(DAY, 13))
+        if overlaps:
+            with pytest.raises(OverlapError) as exc:
+                Sleep.create_nap(ts(DAY, *start), ts(DAY, *end))
+            assert exc.value.conflict['id'] == existing
+        else:
+            assert Sleep.create_nap(ts(DAY, *start), ts(DAY, *end))
+
+
+def test_naps_and_night_sleep_share_one_timeline(app):
+    from app.models.models import Sleep, OverlapError
+
+    with app.test_request_context():
+        Sleep.create_night_sleep(ts(DAY, 19), ts(DAY, 30))
+        with pytest.raises(OverlapError):
+            Sleep.create_nap(ts(DAY, 26), ts(DAY, 27))
+        # Nächtliches Aufwachen liegt in einer eigenen Tabelle und darf im Nachtschlaf liegen
+        from app.models.models import NightWaking
+        assert NightWaking.create(ts(DAY, 26), ts(DAY, 26, 20))
+        with pytest.raises(OverlapError):
+            NightWaking.create(ts(DAY, 26, 10), ts(DAY, 26, 30))
+
+
+def test_running_entries_block_later_starts_and_are_checked_when_ended(app):
+    from app.models.models import Sleep, OverlapError
+
+    with app.test_request_context():
+        Sleep.create_nap(ts(DAY, 12), ts(DAY, 13))
+        with pytest.raises(OverlapError):
+            Sleep.create_nap(ts(DAY, 12, 30))
+        # Nachgetragener laufender Eintrag vor einem bestehenden: beim Beenden geprüft
+        earlier = Sleep.create_nap(ts(DAY, 9))
+        with pytest.raises(OverlapError):
+            Sleep.end_sleep(earlier, ts(DAY, 12, 30))
+        assert _row(app, 'sleep', earlier)['end_time'] is None
+        Sleep.end_sleep(earlier, ts(DAY, 10))
+
+        # Nach dem Beginn eines laufenden Eintrags beginnt nichts mehr
+        running = Sleep.create_nap(ts(DAY, 15))
+        with pytest.raises(OverlapError) as exc:
+            Sleep.create_nap(ts(DAY, 16), ts(DAY, 17))
+        assert exc.value.conflict['id'] == running
+        with pytest.raises(OverlapError):
+            Sleep.create_nap(ts(DAY, 16))
+        # Davor endende Einträge bleiben möglich
+        assert Sleep.create_nap(ts(DAY, 14), ts(DAY, 14, 30))
+        with pytest.raises(OverlapError):
+            Sleep.create_nap(ts(DAY, 14, 45), ts(DAY, 15, 15))
+        Sleep.end_sleep(running, ts(DAY, 17))
+        assert _row(app, 'sleep', running)['end_time'] == ts(DAY, 17)
+
+
+def test_running_night_rejects_naps_and_can_still_be_ended(app):
+    from app.models.models import Sleep, OverlapError
+
+    with app.test_request_context():
+        night = Sleep.create_night_sleep(ts(DAY, 19))
+        with pytest.raises(OverlapError) as exc:
+            Sleep.create_nap(ts(DAY, 21), ts(DAY, 21, 30))
+        assert exc.value.conflict['id'] == night
+        with pytest.raises(OverlapError):
+            Sleep.create_nap(ts(DAY, 22))
+        Sleep.end_sleep(night, ts(DAY, 30))
+        assert _row(app, 'sleep', night)['end_time'] == ts(DAY, 30)
+        # Nach dem Ende ist der Morgen wieder frei
+        assert Sleep.create_nap(ts(DAY, 33), ts(DAY, 34))
+
+
+def test_update_ignores_the_entry_itself(app):
+    from app.models.models import Sleep, NightWaking, OverlapError
+
+    with app.test_request_context():
+        nap = Sleep.create_nap(ts(DAY, 12), ts(DAY, 13))
+        other = Sleep.create_nap(ts(DAY, 15), ts(DAY, 16))
+        Sleep.update(nap, ts(DAY, 12, 30), ts(DAY, 14))
+        with pytest.raises(OverlapError):
+            Sleep.update(other, ts(DAY, 13, 30), ts(DAY, 16))
+        assert _row(app, 'sleep', other)['start_time'] == ts(DAY, 15)
+
+        waking = NightWaking.create(ts(DAY, 2), ts(DAY, 2, 15))
+        NightWaking.update(waking, ts(DAY, 2), ts(DAY, 2, 30))
+        assert _row(app, 'night_waking', waking)['end_time'] == ts(DAY, 2, 30)
+
+
+def test_other_babies_do_not_conflict(app):
+    from app.models.models import Sleep, BabyInfo
+
+    with app.test_request_context():
+        Sleep.create_nap(ts(DAY, 12), ts(DAY, 13))
+        second = BabyInfo.create_baby('Zwilling', date(2026, 1, 1))
+        assert Sleep.create_nap(ts(DAY, 12), ts(DAY, 13), baby_id=second)
+
+
+def test_double_submit_is_deduplicated_before_overlap_check(app, client):
+    client.post('/sleep/nap/start', data={})
+    response = client.post('/sleep/nap/start', data={}, follow_redirects=True)
+    assert response.status_code == 200
+    with app.app_context():
+        from app.models.database import get_db
+        assert get_db().execute('SELECT COUNT(*) AS c FROM sleep').fetchone()['c'] == 1
+
+
+def test_edit_route_rejects_overlap_with_message(app, client):
+    from app.models.models import Sleep
+
+    with app.test_request_context():
+        Sleep.create_nap(ts(DAY, 12), ts(DAY, 13))
+        other = Sleep.create_nap(ts(DAY, 15), ts(DAY, 16))
+
+    response = client.post(f'/edit/sleep/{other}', data={
+        'start_time': ts(DAY, 12, 30), 'end_time': ts(DAY, 16), 'type': 'nap',
+    }, follow_redirects=True)
+    assert response.status_code == 200
+    assert 'Überschneidet sich mit einem bestehenden Eintrag' in response.get_data(as_text=True)
+    assert _row(app, 'sleep', other)['start_time'] == ts(DAY, 15)
+
+
+@pytest.mark.parametrize('table', ['sleep', 'night_waking'])
+def test_neighbor_lookup_uses_baby_start_index(app, table):
+    from app.models.models import _check_overlap
+
+    with app.test_request_context():
+        from app.models.database import get_db
+        db = get_db()
+        statements = []
+        db.set_trace_callback(statements.append)
+        _check_overlap(db, table, ts(DAY, 12), ts(DAY, 13), 1)
+        db.set_trace_callback(None)
+        assert len(statements) == 1
+        plan = ' '.join(row[3] for row in db.execute('EXPLAIN QUERY PLAN ' + statements[0]).fetchall())
+
+    assert f'idx_{table}_baby_start' in plan
+    assert 'TEMP B-TREE' not in plan
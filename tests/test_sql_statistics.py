@@ -0,0 +1,105 @@
+"""
+Still-, Windel- und Temperatur-Statistiken als SQL-Aggregate: COUNT/SUM/MIN/
+MAX je Tag bzw. Seite in SQLite, nach Python kommen nur Aggregatzeilen. Die
+Einzelwerte für Temperatur-Chart und Fieberliste liefert Temperature.get_in_range.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import ts
+
+DAY = date(2026, 3, 10)
+
+
+def test_feeding_statistics_durations_and_side_balance(app):
+    from app.models.models import Feeding
+
+    with app.test_request_context():
+        Feeding.create(ts(DAY, 6), 'links', ts(DAY, 6, 20))
+        Feeding.create(ts(DAY, 9), 'rechts', ts(DAY, 9, 10))
+        Feeding.create(ts(DAY, 12), 'links', None)   # ohne Ende: zählt, aber ohne Dauer
+        Feeding.create(ts(DAY + timedelta(days=1), 7), 'links', ts(DAY + timedelta(days=1), 7, 30))
+        Feeding.create(ts(DAY + timedelta(days=1), 8), 'rechts', ts(DAY + timedelta(days=1), 20))    # > 3 h
+        Feeding.create(ts(DAY + timedelta(days=5), 8), 'links', ts(DAY + timedelta(days=5), 8, 15))
+
+        stats = Feeding.get_feeding_statistics(DAY, DAY + timedelta(days=1))
+
+    assert stats['total_count'] == 5
+    assert stats['avg_count'] == 2.5
+    assert stats['daily_counts'] == {DAY.isoformat(): 3, (DAY + timedelta(days=1)).isoformat(): 2}
+    assert stats['timed_count'] == 3
+    assert stats['total_minutes'] == pytest.approx(60, abs=0.1)
+    assert stats['avg_duration_minutes'] == pytest.approx(20, abs=0.1)
+    assert stats['sides']['links'] == {'count': 3, 'timed_count': 2, 'minutes': pytest.approx(50, abs=0.1),
+                                       'avg_minutes': pytest.approx(25, abs=0.1)}
+    assert stats['sides']['rechts']['count'] == 2 and stats['sides']['rechts']['timed_count'] == 1
+    assert stats['left_share'] == 60
+    assert stats['left_minutes_share'] == 83
+
+
+def test_empty_ranges(app):
+    from app.models.models import Feeding, Diaper, Temperature
+
+    with app.test_request_context():
+        feeding = Feeding.get_feeding_statistics(DAY, DAY)
+        diaper = Diaper.get_diaper_statistics(DAY, DAY)
+        temperature = Temperature.get_temperature_statistics(DAY, DAY)
+
+    assert feeding['total_count'] == 0 and feeding['avg_duration_minutes'] == 0
+    assert feeding['left_share'] is None and feeding['daily_counts'] == {}
+    assert diaper['total_count'] == 0 and diaper['nass_count'] == 0 and diaper['avg_total'] == 0
+    assert temperature == {'daily_avg': {}, 'avg_temp': 0, 'min_temp': 0, 'max_temp': 0, 'count': 0}
+
+
+def test_diaper_statistics_conditional_counts(app):
+    from app.models.models import Diaper
+
+    with app.test_request_context():
+        for hour, kind in ((6, 'nass'), (9, 'nass'), (12, 'groß'), (15, 'beides'), (18, 'nass')):
+            Diaper.create(ts(DAY, hour), kind)
+        Diaper.create(ts(DAY + timedelta(days=3), 8), 'nass')
+        stats = Diaper.get_diaper_statistics(DAY, DAY + timedelta(days=1))
+
+    assert (stats['total_count'], stats['nass_count'], stats['groß_count'], stats['beides_count']) == (5, 3, 1, 1)
+    assert (stats['avg_total'], stats['avg_nass'], stats['avg_groß']) == (2.5, 1.5, 0.5)
+
+
+def test_temperature_statistics_and_readings(app):
+    from app.models.models import Temperature
+
+    with app.test_request_context():
+        for hour, value in ((6, 36.8), (12, 38.4), (20, 37.1)):
+            Temperature.create(ts(DAY, hour), value)
+        Temperature.create(ts(DAY + timedelta(days=1), 8), 39.0)
+        stats = Temperature.get_temperature_statistics(DAY, DAY + timedelta(days=1))
+        readings = Temperature.get_in_range(DAY, DAY + timedelta(days=1))
+        fever = Temperature.get_in_range(DAY, DAY + timedelta(days=1), min_value=38.0)
+
+    assert stats['count'] == 4
+    assert stats['daily_avg'] == {DAY.isoformat(): 37.4, (DAY + timedelta(days=1)).isoformat(): 39.0}
+    assert (stats['min_temp'], stats['avg_temp'], stats['max_temp']) == (36.8, 37.8, 39.0)
+    assert [r['value'] for r in readings] == [36.8, 38.4, 37.1, 39.0]
+    assert [r['value'] for r in fever] == [38.4, 39.0]
+
+
+def test_trends_and_report_render_feeding_balance(app, client):
+    from app.models.models import Feeding, Temperature
+
+    today = date.today()
+    with app.test_request_context():
+        Feeding.create(ts(today, 6), 'links', ts(today, 6, 20))
+        Feeding.create(ts(today, 7), 'rechts', ts(today, 7, 10))
+        Temperature.create(ts(today, 8), 38.6)
+
+    response = client.get('/trends/')
+    assert response.status_code == 200
+    assert b'15.0 min' in response.data
+    assert b'1 / 1' in response.data
+
+    points = client.get('/trends/data/temperature').get_json()['points']
+    assert [p['value'] for p in points] == [38.6]
+
+    response = client.get(f'/settings/export/report?start_date={today.isoformat()}')
+    assert response.status_code == 200
+    assert response.data.startswith(b'%PDF')
@@ -0,0 +1,141 @@
+"""
+Statistik-Cache (app/models/stats_cache.py): Ergebnisse der get_*_statistics-
+Funktionen werden pro (Kind, Zeitraum, Datenversion) gecacht. Trigger
+(Migration 027) erhöhen die Version bei jedem Schreibzugriff auf eine Tabelle.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import ts
+
+DAY = date(2026, 2, 10)
+START, END = '2026-02-04', '2026-02-10'
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    from app.models.stats_cache import clear_stats_cache
+    clear_stats_cache()
+    yield
+    clear_stats_cache()
+
+
+@pytest.fixture
+def sleep_history(app):
+    from app.models.models import Sleep
+
+    with app.test_request_context():
+        for offset in range(7):
+            day = DAY - timedelta(days=offset)
+            Sleep.create_nap(ts(day, 13), ts(day, 14))
+
+
+def _count_statements(func, *args):
+    from app.models.database import get_db
+    statements = []
+    get_db().set_trace_callback(statements.append)
+    result = func(*args)
+    get_db().set_trace_callback(None)
+    return result, statements
+
+
+def test_repeat_visit_only_reads_versions(app, sleep_history):
+    from app.models.models import Sleep
+
+    with app.test_request_context():
+        first, cold = _count_statements(Sleep.get_sleep_statistics, START, END)
+        second, warm = _count_statements(Sleep.get_sleep_statistics, START, END)
+
+    assert first == second
+    assert len(cold) > 1
+    assert len(warm) == 1 and 'data_versions' in warm[0]
+
+
+@pytest.mark.parametrize('write', [
+    lambda db: db.execute('INSERT INTO sleep (type, start_time, end_time) VALUES (?, ?, ?)',
+                          ('nap', ts(DAY, 16), ts(DAY, 17))),
+    lambda db: db.execute('UPDATE sleep SET end_time = ? WHERE start_time = ?', (ts(DAY, 15), ts(DAY, 13))),
+    lambda db: db.execute('DELETE FROM sleep WHERE start_time = ?', (ts(DAY, 13),)),
+])
+def test_any_write_to_a_read_table_invalidates(app, sleep_history, write):
+    from app.models.database import get_db
+    from app.models.models import Sleep
+
+    with app.test_request_context():
+        before = Sleep.get_sleep_statistics(START, END)['total_sleep']
+        write(get_db())
+        get_db().commit()
+        after = Sleep.get_sleep_statistics(START, END)['total_sleep']
+    assert after != before
+
+
+def test_writes_to_other_tables_keep_entries(app, sleep_history):
+    from app.models.models import Sleep, Diaper
+    from app.models.stats_cache import get_stats_cache
+
+    with app.test_request_context():
+        Sleep.get_sleep_statistics(START, END)
+        Diaper.create(ts(DAY, 9), 'nass')
+        Diaper.get_diaper_statistics(START, END)
+        Sleep.get_sleep_statistics(START, END)
+    assert get_stats_cache().hits == 1
+
+
+def test_entries_are_per_baby_and_copies(app, sleep_history):
+    from app.models.models import Sleep, BabyInfo
+
+    with app.test_request_context():
+        second = BabyInfo.create_baby('Zwilling', date(2025, 6, 1))
+        mine = Sleep.get_sleep_statistics(START, END)
+        theirs = Sleep.get_sleep_statistics(START, END, baby_id=second)
+        mine['total_sleep'] = -1
+        again = Sleep.get_sleep_statistics(START, END)
+    assert theirs['total_sleep'] == 0
+    assert again['total_sleep'] > 0
+
+
+def test_size_bound_evicts_least_recently_used(app, sleep_history, monkeypatch):
+    from app.models.models import Sleep
+    from app.models.stats_cache import get_stats_cache
+
+    monkeypatch.setenv('STATS_CACHE_SIZE', '2')
+    cache = get_stats_cache()
+    with app.test_request_context():
+        Sleep.get_sleep_statistics('2026-02-01', '2026-02-07')
+        Sleep.get_sleep_statistics('2026-02-02', '2026-02-08')
+        Sleep.get_sleep_statistics('2026-02-01', '2026-02-07')   # Treffer, jetzt zuletzt benutzt
+        Sleep.get_sleep_statistics('2026-02-03', '2026-02-09')   # verdrängt 02.-08.
+        Sleep.get_sleep_statistics('2026-02-01', '2026-02-07')
+        Sleep.get_sleep_statistics('2026-02-02', '2026-02-08')
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_only_ranges_reaching_today_expire(app, monkeypatch):
+    from app.models import stats_cache
+    from app.models.models import Diaper
+
+    clock = [1000.0]
+    monkeypatch.setattr(stats_cache.time, 'monotonic', lambda: clock[0])
+    today = date.today()
+    with app.test_request_context():
+        Diaper.get_diaper_statistics(today - timedelta(days=7), today)
+        Diaper.get_diaper_statistics(today - timedelta(days=8), today - timedelta(days=1))
+        clock[0] += stats_cache.CURRENT_RANGE_TTL_SECONDS + 1
+        Diaper.get_diaper_statistics(today - timedelta(days=7), today)
+        Diaper.get_diaper_statistics(today - timedelta(days=8), today - timedelta(days=1))
+    cache = stats_cache.get_stats_cache()
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_disabled_cache_always_computes(app, sleep_history, monkeypatch):
+    from app.models.models import Sleep
+    from app.models.stats_cache import get_stats_cache
+
+    monkeypatch.setenv('STATS_CACHE_SIZE', '0')
+    with app.test_request_context():
+        Sleep.get_sleep_statistics(START, END)
+        _, statements = _count_statements(Sleep.get_sleep_statistics, START, END)
+    assert len(get_stats_cache()) == 0
+    assert not any('data_versions' in sql for sql in statements)
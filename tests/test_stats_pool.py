@@ -0,0 +1,128 @@
+"""
+Statistik-Pool (app/stats_pool.py): unabhängige Statistiken der Trends-Seite
+laufen parallel auf einem begrenzten, geteilten Thread-Pool, jede Aufgabe mit
+eigener Nur-Lese-Verbindung und dem im Request aufgelösten Kind.
+"""
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import ts
+
+
+def _connection_info():
+    from flask import g
+    from app.models.database import get_db, get_active_baby_id
+    return threading.current_thread().name, id(get_db()), get_active_baby_id(), g.db is get_db()
+
+
+def _write_attempt():
+    from app.models.database import get_db
+    get_db().execute("INSERT INTO diaper (timestamp, type) VALUES ('2026-01-01T10:00:00+01:00', 'nass')")
+
+
+def test_tasks_run_on_pool_threads_with_own_read_only_connections(app):
+    from app.stats_pool import run_concurrently
+
+    with app.test_request_context():
+        from app.models.database import get_db
+        request_db = id(get_db())
+        results = run_concurrently({name: (_connection_info,) for name in 'abc'})
+        with pytest.raises(sqlite3.OperationalError, match='readonly'):
+            run_concurrently({'write': (_write_attempt,)})
+
+    assert all(name.startswith('stats') for name, _, _, _ in results.values())
+    assert request_db not in {db for _, db, _, _ in results.values()}
+    assert {baby for _, _, baby, _ in results.values()} == {1}
+
+
+def test_active_baby_comes_from_the_request(app):
+    from app.models.models import BabyInfo, Diaper
+    from app.stats_pool import run_concurrently
+
+    day = date.today() - timedelta(days=1)
+    with app.test_request_context():
+        second = BabyInfo.create_baby('Zwilling', date(2026, 1, 1))
+        Diaper.create(ts(day, 9), 'nass', baby_id=second)
+        Diaper.create(ts(day, 10), 'nass', baby_id=second)
+
+    with app.test_request_context():
+        from flask import session
+        session['active_baby_id'] = second
+        results = run_concurrently({
+            'info': (_connection_info,),
+            'diapers': (Diaper.get_diaper_statistics, day.isoformat(), day.isoformat()),
+        })
+    assert results['info'][2] == second
+    assert results['diapers']['total_count'] == 2
+
+
+def test_pool_is_shared_and_bounded(app, monkeypatch):
+    from app import stats_pool
+
+    monkeypatch.setenv('STATS_POOL_WORKERS', '2')
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def slow():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    with app.test_request_context():
+        executor = stats_pool.get_executor()
+        stats_pool.run_concurrently({i: (slow,) for i in range(6)})
+        assert stats_pool.get_executor() is executor
+    assert peak[0] == 2
+
+
+def test_latency_is_the_slowest_task_not_the_sum(app, monkeypatch):
+    from app.stats_pool import run_concurrently
+
+    monkeypatch.setenv('STATS_POOL_WORKERS', '4')
+    with app.test_request_context():
+        started = time.perf_counter()
+        run_concurrently({i: (time.sleep, 0.2) for i in range(4)})
+        elapsed = time.perf_counter() - started
+    assert elapsed < 0.6
+
+
+def test_disabled_pool_runs_serially_on_request_connection(app, monkeypatch):
+    from app.stats_pool import run_concurrently
+
+    monkeypatch.setenv('STATS_POOL_WORKERS', '0')
+    with app.test_request_context():
+        from app.models.database import get_db
+        results = run_concurrently({'a': (_connection_info,)})
+        assert results['a'][1] == id(get_db())
+
+
+def test_task_errors_reach_the_request(app):
+    from app.stats_pool import run_concurrently
+
+    def broken():
+        raise ValueError('kaputt')
+
+    with app.test_request_context():
+        with pytest.raises(ValueError, match='kaputt'):
+            run_concurrently({'ok': (_connection_info,), 'broken': (broken,)})
+
+
+def test_trends_page_matches_serial_results(app, client, monkeypatch):
+    from app.models.models import Sleep, Diaper
+
+    day = date.today() - timedelta(days=2)
+    with app.test_request_context():
+        Sleep.create_night_sleep(ts(day, 19, 30), ts(day, 30))
+        Sleep.create_nap(ts(day, 13), ts(day, 14, 30))
+        Diaper.create(ts(day, 8), 'groß')
+
+    parallel = client.get('/trends/').get_data(as_text=True)
+    monkeypatch.setenv('STATS_POOL_WORKERS', '0')
+    serial = client.get('/trends/').get_data(as_text=True)
+    assert parallel == serial
@@ -0,0 +1,92 @@
+"""
+Lazy Timeline (iter_timeline): ein sortierter Cursor pro Kategorie, per
+heapq.merge zusammengeführt. Wer nach N Einträgen aufhört, liest nur N Zeilen
+plus eine pro Kategorie.
+"""
+from contextlib import closing
+from datetime import date
+from itertools import islice
+
+import pytest
+
+from conftest import ts
+
+DAY = date(2026, 1, 10)
+
+
+@pytest.fixture
+def history(app):
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        db.executemany('INSERT INTO diaper (timestamp, type) VALUES (?, ?)',
+                       [(ts(DAY, 0, minute), 'nass') for minute in range(0, 24 * 60, 10)])
+        db.executemany('INSERT INTO bottle (timestamp, amount) VALUES (?, ?)',
+                       [(ts(DAY, 0, minute), 90) for minute in range(5, 24 * 60, 30)])
+        db.executemany('INSERT INTO sleep (type, start_time, end_time) VALUES (?, ?, ?)',
+                       [('nap', ts(DAY, hour), ts(DAY, hour, 45)) for hour in range(8, 20, 3)])
+        db.execute('INSERT INTO night_waking (start_time, end_time) VALUES (?, ?)', (ts(DAY, 2), ts(DAY, 2, 20)))
+        db.commit()
+
+
+@pytest.fixture
+def row_counter(monkeypatch):
+    """Zählt die TimelineEntry-Objekte, also die tatsächlich gelesenen Zeilen."""
+    from app.models import models
+
+    created = []
+
+    class CountingEntry(models.TimelineEntry):
+        __slots__ = ()
+
+        def __new__(cls, *args):
+            created.append(args[1])
+            return super().__new__(cls, *args)
+
+    monkeypatch.setattr(models, 'TimelineEntry', CountingEntry)
+    return created
+
+
+@pytest.mark.parametrize('newest_first', [True, False])
+def test_merge_is_globally_ordered(app, history, newest_first):
+    from app.models.models import iter_timeline
+
+    with app.test_request_context():
+        keys = [entry[:3] for entry in iter_timeline(newest_first=newest_first)]
+    assert len(keys) == 144 + 48 + 4 + 1
+    assert keys == sorted(keys, reverse=newest_first)
+
+
+def test_start_after_continues_in_both_directions(app, history):
+    from app.models.models import iter_timeline
+
+    with app.test_request_context():
+        everything = list(iter_timeline(newest_first=False))
+        pivot = everything[57]
+        assert list(iter_timeline(start_after=pivot[:3], newest_first=False)) == everything[58:]
+        assert list(iter_timeline(start_after=pivot[:3])) == everything[:57][::-1]
+
+
+def test_latest_activities_read_only_displayed_rows(app, history, row_counter):
+    from app.models.models import get_latest_activities
+
+    with app.test_request_context():
+        latest = get_latest_activities(limit=3)
+
+    assert [entry['timestamp'] for entry in latest] == [ts(DAY, 23, 50), ts(DAY, 23, 40), ts(DAY, 23, 35)]
+    assert latest[2]['display'] == 'Flasche (90 ml)'
+    # 3 angezeigte Zeilen plus je Kategorie höchstens eine vorgelesene
+    assert len(row_counter) <= 3 + 7
+
+
+def test_early_exit_closes_cursors(app, history):
+    from app.models.models import iter_timeline
+
+    with app.test_request_context():
+        with closing(iter_timeline()) as timeline:
+            first = list(islice(timeline, 5))
+        assert len(first) == 5
+        # Nach dem Schließen lässt sich schreiben, ohne dass offene Leser stören
+        from app.models.models import Diaper
+        Diaper.create(ts(DAY, 23, 55), 'nass')
+        assert next(iter_timeline())[1] == 'diaper'
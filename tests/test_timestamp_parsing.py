@@ -0,0 +1,44 @@
+"""
+Tests für den zentralen, gecachten Zeitstempel-Parser (app/timestamps.py), der die
+früheren Inline-Varianten (_parse_ts, parse_to_berlin, fromisoformat+replace('Z'))
+ersetzt.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.timestamps import parse_timestamp, clear_parse_cache, parse_cache_info
+from app.timezone import to_berlin
+
+
+@pytest.mark.parametrize('raw,expected_wall,expected_offset_h', [
+    ('2026-01-15T08:00:00', datetime(2026, 1, 15, 8, 0), 1),
+    ('2026-01-15T08:00', datetime(2026, 1, 15, 8, 0), 1),
+    ('2026-07-15T08:00:00+02:00', datetime(2026, 7, 15, 8, 0), 2),
+    ('2026-07-15T06:00:00Z', datetime(2026, 7, 15, 8, 0), 2),
+    ('2026-07-15T06:00:00+00:00', datetime(2026, 7, 15, 8, 0), 2),
+    (' 2026-07-15T06:00:00z ', datetime(2026, 7, 15, 8, 0), 2),
+])
+def test_parses_canonical_and_legacy_formats(raw, expected_wall, expected_offset_h):
+    dt = parse_timestamp(raw)
+    assert dt.replace(tzinfo=None) == expected_wall
+    assert dt.utcoffset() == timedelta(hours=expected_offset_h)
+
+
+@pytest.mark.parametrize('raw', [None, '', 'kein datum', '2026-13-01T00:00:00'])
+def test_invalid_values_return_none(raw):
+    assert parse_timestamp(raw) is None
+
+
+def test_to_berlin_keeps_raising_for_invalid_strings():
+    with pytest.raises(ValueError):
+        to_berlin('kein datum')
+
+
+def test_repeated_parsing_hits_cache():
+    clear_parse_cache()
+    first = parse_timestamp('2026-03-29T01:30:00+01:00')
+    second = parse_timestamp('2026-03-29T01:30:00+01:00')
+    assert first is second
+    info = parse_cache_info()
+    assert info.hits >= 1 and info.misses >= 1
@@ -0,0 +1,106 @@
+"""
+Chart-Daten der Trends-Seite als JSON (/trends/data/<chart>): das Template
+bettet keine Datenreihen mehr ein, die Endpunkte filtern nach Zeitraum und
+reduzieren lange Reihen per LTTB auf die angefragte Punktzahl.
+"""
+import math
+from datetime import date, timedelta
+
+import pytest
+
+from app.downsampling import lttb
+
+from conftest import ts
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    points = [(i, math.sin(i / 50)) for i in range(5000)]
+    points[2345] = (2345, 25.0)   # einzelner Ausreißer
+
+    sampled = lttb(points, 100)
+    assert len(sampled) == 100
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert (2345, 25.0) in sampled
+    assert [p[0] for p in sampled] == sorted(p[0] for p in sampled)
+
+
+@pytest.mark.parametrize('count,threshold,expected', [(0, 10, 0), (5, 10, 5), (10, 10, 10), (50, 2, 2)])
+def test_lttb_short_series(count, threshold, expected):
+    points = [(i, i * i) for i in range(count)]
+    assert len(lttb(points, threshold)) == expected
+
+
+@pytest.fixture
+def temperature_history(app):
+    start = date.today() - timedelta(days=29)
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        db.executemany('INSERT INTO temperature (timestamp, value) VALUES (?, ?)',
+                       [(ts(start + timedelta(days=i // 24), i % 24), 36.5 + (i % 7) / 10) for i in range(30 * 24)])
+        db.commit()
+    return start
+
+
+def test_temperature_is_downsampled_and_range_filtered(client, temperature_history):
+    start = temperature_history
+    data = client.get(f'/trends/data/temperature?start_date={start.isoformat()}'
+                      f'&end_date={date.today().isoformat()}&points=50').get_json()
+    assert data['total'] == 30 * 24
+    assert len(data['points']) == 50
+    assert data['points'][0]['timestamp'] == ts(start, 0)
+
+    one_day = (start + timedelta(days=3)).isoformat()
+    data = client.get(f'/trends/data/temperature?start_date={one_day}&end_date={one_day}').get_json()
+    assert data['total'] == 24 and len(data['points']) == 24
+    assert data['single_day'] is True
+
+
+def test_growth_uses_whole_history_and_percentiles_for_sent_points(app, client):
+    from app.models.models import Weight
+
+    birth = date.today() - timedelta(days=400)
+    with app.test_request_context():
+        for week in range(0, 57):
+            Weight.create(ts(birth + timedelta(days=7 * week), 10), 3.5 + week * 0.12)
+    with app.app_context():
+        from app.models.database import get_db
+        get_db().execute("UPDATE baby_info SET gender = 'f', birth_date = ?", (birth.isoformat(),))
+        get_db().commit()
+
+    data = client.get('/trends/data/growth?points=20').get_json()
+    assert len(data['weight']) == 20
+    assert data['weight'][0]['timestamp'] == ts(birth, 10)
+    assert all('p50' in entry for entry in data['weight'])
+    assert data['height'] == [] and data['head'] == []
+
+    recent = (date.today() - timedelta(days=30)).isoformat()
+    data = client.get(f'/trends/data/growth?start_date={recent}').get_json()
+    assert 1 <= len(data['weight']) <= 5
+
+
+def test_sleep_times_are_binned_on_the_server(app, client):
+    from app.models.models import Sleep
+
+    day = date.today() - timedelta(days=2)
+    with app.test_request_context():
+        Sleep.create_night_sleep(ts(day, 19, 30), ts(day, 30, 15))
+    data = client.get('/trends/data/sleep_times').get_json()
+    assert len(data['wake_times']) == len(data['sleep_times']) == 24
+    assert data['sleep_times'][19] == 1
+    assert data['wake_times'][6] == 1
+
+
+def test_page_no_longer_embeds_series(client, temperature_history):
+    html = client.get('/trends/').get_data(as_text=True)
+    assert '/trends/data/temperature' in html
+    assert '36.5' not in html.split('<script>')[-1]
+
+
+@pytest.mark.parametrize('url,status', [
+    ('/trends/data/unknown', 404),
+    ('/trends/data/temperature?start_date=gestern', 400),
+    ('/trends/data/temperature?points=viele', 400),
+])
+def test_invalid_requests(client, url, status):
+    assert client.get(url).status_code == status
@@ -0,0 +1,84 @@
+"""
+Vektorisierte Schlaf-Statistik (NumPy, optional): für lange Zeiträume muss sie
+exakt dasselbe liefern wie der zeilenweise Python-Pfad.
+"""
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from app.models import vectorized_stats  # noqa: E402
+from app.timezone import normalize_to_berlin  # noqa: E402
+
+
+def _ts(day, minutes, aware=True):
+    naive = datetime.combine(day, datetime.min.time()) + timedelta(minutes=minutes)
+    if not aware:
+        return naive.strftime('%Y-%m-%dT%H:%M:%S')
+    return normalize_to_berlin(naive).isoformat()
+
+
+def _generate(app, days, seed):
+    rng = random.Random(seed)
+    first = date(2026, 1, 1)
+    sleep_rows, waking_rows = [], []
+    qualities = [None, '', 'gut', ' schlecht ', 'unruhig']
+    locations = [None, 'Bett', 'Kinderwagen', '  ']
+    for offset in range(days):
+        day = first + timedelta(days=offset)
+        aware = rng.random() < 0.8
+        bedtime = 19 * 60 + rng.randint(0, 180)
+        wake = 24 * 60 + 5 * 60 + rng.randint(0, 150)
+        sleep_rows.append(('night', _ts(day, bedtime, aware), _ts(day, wake, aware),
+                           rng.choice(qualities), rng.choice(locations)))
+        for _ in range(rng.randint(0, 3)):
+            start = bedtime + rng.randint(30, wake - bedtime - 60)
+            end = None if rng.random() < 0.05 else _ts(day, start + rng.randint(5, 40), aware)
+            waking_rows.append((_ts(day, start, aware), end))
+        for nap_start in (9 * 60, 13 * 60, 16 * 60):
+            if rng.random() < 0.8:
+                start = nap_start + rng.randint(-30, 30)
+                sleep_rows.append(('nap', _ts(day, start, aware), _ts(day, start + rng.randint(20, 120), aware),
+                                   rng.choice(qualities), rng.choice(locations)))
+    # Nickerchen über Mitternacht und ein noch laufender Schlaf
+    sleep_rows.append(('nap', _ts(first + timedelta(days=40), 23 * 60 + 30), _ts(first + timedelta(days=41), 20),
+                       'gut', 'Auto'))
+    sleep_rows.append(('nap', _ts(first + timedelta(days=days), 10 * 60), None, 'gut', 'Bett'))
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        db.executemany('INSERT INTO sleep (type, start_time, end_time, sleep_quality, sleep_location) '
+                       'VALUES (?, ?, ?, ?, ?)', sleep_rows)
+        db.executemany('INSERT INTO night_waking (start_time, end_time) VALUES (?, ?)', waking_rows)
+        db.commit()
+
+
+@pytest.mark.parametrize('start, end', [
+    ('2026-01-10', '2026-03-15'),
+    ('2026-02-11', '2026-06-30'),   # beginnt am Tag nach dem Mitternachts-Nickerchen
+    ('2026-01-01', '2026-04-10'),
+])
+def test_vectorized_path_matches_python_path(app, monkeypatch, start, end):
+    _generate(app, days=120, seed=7)
+    from app.models.models import Sleep
+    from app.models.stats_cache import clear_stats_cache
+
+    with app.test_request_context():
+        vectorized = Sleep.get_sleep_statistics(start, end)
+        monkeypatch.setattr(vectorized_stats, 'is_available', lambda: False)
+        clear_stats_cache()
+        python = Sleep.get_sleep_statistics(start, end)
+
+    assert vectorized == python
+
+
+def test_short_ranges_stay_on_python_path(app, monkeypatch):
+    calls = []
+    monkeypatch.setattr(vectorized_stats, 'get_sleep_statistics', lambda *args: calls.append(args))
+    from app.models.models import Sleep
+
+    with app.test_request_context():
+        Sleep.get_sleep_statistics('2026-01-01', '2026-01-07')
+    assert calls == []
@@ -0,0 +1,94 @@
+"""
+Wachfenster per LAG() in SQLite: get_all_entries_range liest nur den Bereich plus
+einen Vorgänger, Sleep.get_wake_window_statistics verteilt die Wachfenster auf
+Tageszeit-Abschnitte.
+"""
+
+
+def insert_sleeps(app, rows):
+    with app.app_context():
+        from app.models.database import get_db
+        db = get_db()
+        db.executemany('INSERT INTO sleep (type, start_time, end_time) VALUES (?, ?, ?)', rows)
+        db.commit()
+
+
+def test_wake_window_buckets_and_days(app):
+    insert_sleeps(app, [
+        ('night', '2026-03-01T19:00:00', '2026-03-02T06:00:00'),
+        ('nap', '2026-03-02T08:00:00', '2026-03-02T09:00:00'),   # morgens: 2h
+        ('nap', '2026-03-02T11:30:00', '2026-03-02T12:30:00'),   # morgens (ab 09:00): 2h30m
+        ('nap', '2026-03-02T15:30:00', '2026-03-02T16:00:00'),   # mittags (ab 12:30): 3h
+        ('night', '2026-03-02T19:30:00', '2026-03-03T06:30:00'), # nachmittags (ab 16:00): 3h30m
+        ('nap', '2026-03-03T09:00:00', '2026-03-03T10:00:00'),   # morgens: 2h30m
+    ])
+
+    from app.models.models import Sleep
+    with app.test_request_context():
+        stats = Sleep.get_wake_window_statistics('2026-03-02', '2026-03-03')
+
+    buckets = {bucket['key']: bucket for bucket in stats['buckets']}
+    assert stats['count'] == 5
+    assert (buckets['morning']['min'], buckets['morning']['median'], buckets['morning']['max']) == (120, 150, 150)
+    assert buckets['midday']['median'] == 180
+    assert buckets['afternoon']['median'] == 210
+    assert buckets['evening']['count'] == 0 and buckets['evening']['median'] is None
+
+    days = {day['date']: day for day in stats['days']}
+    assert days['2026-03-02']['count'] == 4
+    assert days['2026-03-02']['buckets']['morning']['max'] == 150
+    assert days['2026-03-03']['median'] == 150
+
+
+def _vm_steps(db, func):
+    """Ausgeführte VM-Instruktionen (Progress-Handler pro Opcode) während func()."""
+    steps = [0]
+
+    def count():
+        steps[0] += 1
+        return 0
+
+    db.set_progress_handler(count, 1)
+    try:
+        result = func()
+    finally:
+        db.set_progress_handler(None, 0)
+    return steps[0], result
+
+
+def test_range_queries_use_window_function_and_skip_history(app):
+    # Lange Historie vor dem Bereich, die nicht mehr geladen werden darf
+    history = [('nap', f'2025-{m:02d}-{d:02d}T10:00:00', f'2025-{m:02d}-{d:02d}T11:00:00')
+               for m in range(1, 13) for d in range(1, 28)]
+    insert_sleeps(app, history + [
+        ('nap', '2026-01-10T13:00:00', '2026-01-10T14:00:00'),
+        ('nap', '2026-01-20T09:00:00', '2026-01-20T10:00:00'),
+    ])
+
+    from app.models import database
+    from app.models.models import get_all_entries_today
+
+    statements = []
+    with app.test_request_context():
+        db = database.get_db()
+        db.set_trace_callback(statements.append)
+        try:
+            steps_short, entries = _vm_steps(db, lambda: get_all_entries_today('2026-01-20'))
+        finally:
+            db.set_trace_callback(None)
+        lag_statement = next(statement for statement in statements if 'LAG(end_time)' in statement)
+        plan = [row['detail'] for row in db.execute('EXPLAIN QUERY PLAN ' + lag_statement)]
+
+    # Die Range-Query läuft über den Index, nicht als Scan über alle Schlafeinträge
+    assert any('idx_sleep_baby_start' in detail for detail in plan)
+    assert not any(detail.startswith('SCAN sleep') for detail in plan)
+    # Vorgänger (10.01.) liegt außerhalb des erweiterten Bereichs, wird aber für LAG() mitgelesen
+    sleep_entry = next(e for e in entries if e['category'] == 'sleep')
+    assert sleep_entry['wake_duration'] == '235h'
+
+    # Zehnmal mehr Historie vor dem Bereich ändert den Aufwand praktisch nicht
+    insert_sleeps(app, [('nap', f'{y}-{m:02d}-{d:02d}T10:00:00', f'{y}-{m:02d}-{d:02d}T11:00:00')
+                        for y in range(2015, 2025) for m in range(1, 13) for d in range(1, 28)])
+    with app.test_request_context():
+        steps_long, _ = _vm_steps(database.get_db(), lambda: get_all_entries_today('2026-01-20'))
+    assert steps_long < steps_short * 1.2